@@ -0,0 +1,81 @@
+# filename: test_catalog_columnar.py
+# @Time    : 2026/10/19 16:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+列式目录测试 / Columnar catalog tests
+"""
+
+from itertools import pairwise
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from whosellm import LLMeta, ModelFamily  # noqa: E402
+from whosellm.catalog import get_capability_index  # noqa: E402
+from whosellm.catalog.columnar import capability_mask, get_columnar_catalog  # noqa: E402
+from whosellm.provider import Provider  # noqa: E402
+
+
+class TestColumnarCatalog:
+    """列式目录测试类 / Columnar catalog test class"""
+
+    def test_columns_aligned(self):
+        """各列与条目对齐 / Every column is aligned with the entries"""
+        catalog = get_columnar_catalog()
+        n = len(catalog)
+        assert catalog.provider_code.shape == (n,)
+        assert catalog.version.shape[0] == n
+        assert catalog.variant_priority.shape[0] == n
+        assert all(column.shape == (n,) for column in catalog.numeric.values())
+        for row, entry in enumerate(catalog.entries):
+            assert catalog.providers[catalog.provider_code[row]] == entry.provider
+            assert catalog.families[catalog.family_code[row]] == entry.family
+        assert catalog.is_family_default.sum() > 0
+
+    def test_mask_matches_capability_index(self):
+        """向量化掩码与位集索引结果一致 / The vectorized mask agrees with the bitset index"""
+        catalog = get_columnar_catalog()
+        index = get_capability_index(include_family_defaults=True)
+        criteria = {"supports_vision": True, "supports_thinking": False, "min_context_window": 128_000}
+        selected = [catalog.entries[i] for i in np.flatnonzero(catalog.mask(**criteria))]
+        assert selected == index.query(**criteria)
+
+        openai = catalog.mask(provider=Provider.OPENAI)
+        assert all(catalog.entries[i].provider == Provider.OPENAI for i in np.flatnonzero(openai))
+
+    def test_match_matrix(self):
+        """批量请求矩阵与逐个掩码一致 / The batch matrix agrees with per-request masks"""
+        catalog = get_columnar_catalog()
+        required = np.array(
+            [capability_mask("supports_vision", "supports_function_calling"), 0, capability_mask("supports_pdf")],
+            dtype=np.uint64,
+        )
+        fits = catalog.match_matrix(required, min_context_window=np.array([200_000, np.nan, 1_000_000]))
+        assert fits.shape == (3, len(catalog))
+        assert (
+            fits[0] == catalog.mask(supports_vision=True, supports_function_calling=True, min_context_window=200_000)
+        ).all()
+        assert fits[1].all()
+        assert (fits[2] == catalog.mask(supports_pdf=True, min_context_window=1_000_000)).all()
+
+    def test_ordering_matches_llmeta(self):
+        """家族内排序与 LLMeta 比较一致 / In-family ordering agrees with LLMeta comparison"""
+        catalog = get_columnar_catalog(include_family_defaults=False)
+        in_family = catalog.mask(family=ModelFamily.CLAUDE, provider=Provider.ANTHROPIC)
+        ordered = [catalog.entries[i] for i in catalog.ordering() if in_family[i]]
+        models = [LLMeta(entry.qualified_name) for entry in ordered]
+        for lower, higher in pairwise(models):
+            assert lower <= higher
+
+    def test_unknown_fields(self):
+        """未知字段抛出 ValueError / Unknown fields raise ValueError"""
+        catalog = get_columnar_catalog()
+        with pytest.raises(ValueError, match="Unknown boolean capability field"):
+            capability_mask("supports_teleportation")
+        with pytest.raises(ValueError, match="Unknown query criterion"):
+            catalog.mask(min_iq=1)
+        with pytest.raises(ValueError, match="Unknown numeric field"):
+            catalog.match_matrix(np.zeros(1, dtype=np.uint64), min_iq=np.zeros(1))
@@ -0,0 +1,130 @@
+# filename: test_catalog_diff.py
+# @Time    : 2026/10/19 19:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+能力差异矩阵测试 / Capability diff matrix tests
+"""
+
+from dataclasses import fields
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from whosellm import ModelFamily  # noqa: E402
+from whosellm.capabilities import ModelCapabilities  # noqa: E402
+from whosellm.catalog import CatalogEntry, query_models  # noqa: E402
+from whosellm.catalog.diff import DIFF_FIELDS, MIME_CAPABILITY_FIELDS, diff_matrix  # noqa: E402
+from whosellm.models.base import get_model_info  # noqa: E402
+from whosellm.provider import Provider  # noqa: E402
+
+MODELS = ["gpt-5", "gpt-5-mini", "gpt-5-nano", "gpt-4o"]
+COMPARED = set(DIFF_FIELDS)
+
+
+def _python_diff(a, b) -> list[str]:
+    """逐字段比较数据类（参照实现，媒体类型按集合比较） / Compare dataclasses field by field (MIME lists as sets)"""
+
+    def value(caps, name):
+        return set(getattr(caps, name)) if name in MIME_CAPABILITY_FIELDS else getattr(caps, name)
+
+    return [f.name for f in fields(a) if f.name in COMPARED and value(a, f.name) != value(b, f.name)]
+
+
+class TestDiffMatrix:
+    """差异矩阵测试类 / Diff matrix test class"""
+
+    def test_matches_pairwise_comparison(self):
+        """向量化结果与逐对比较一致 / The vectorized result agrees with pairwise comparison"""
+        matrix = diff_matrix(MODELS)
+        counts = matrix.difference_count()
+        assert counts.shape == (4, 4)
+        assert (np.diag(counts) == 0).all()
+        assert (counts == counts.T).all()
+        for i, a in enumerate(MODELS):
+            for j, b in enumerate(MODELS):
+                expected = _python_diff(get_model_info(a).capabilities, get_model_info(b).capabilities)
+                assert sorted(matrix.differing_fields(a, b)) == sorted(expected)
+                assert counts[i, j] == len(expected)
+
+    def test_numeric_delta(self):
+        """数值差为 numeric[j] - numeric[i]，缺失为 NaN / Deltas are numeric[j] - numeric[i], NaN when missing"""
+        matrix = diff_matrix(["gpt-5", "gpt-4o"])
+        gpt5 = get_model_info("gpt-5").capabilities
+        gpt4o = get_model_info("gpt-4o").capabilities
+        delta = matrix.numeric_delta["context_window"]
+        assert delta[0, 1] == gpt4o.context_window - gpt5.context_window
+        assert delta[1, 0] == -delta[0, 1]
+        assert np.isnan(matrix.numeric_delta["max_video_size_mb"]).all()
+        assert not matrix.numeric_changed["max_video_size_mb"].any()
+        assert matrix.bool_changed("supports_thinking")[0, 1]
+
+    def test_entries_and_whole_catalog(self):
+        """支持目录条目与整个目录 / Catalog entries and the whole catalog are supported"""
+        entries = query_models(family=ModelFamily.GEMINI)
+        matrix = diff_matrix(entries)
+        assert matrix.labels == tuple(entry.qualified_name for entry in entries)
+
+        whole = diff_matrix()
+        assert whole.changed_bits.shape == (len(whole), len(whole))
+        assert len(whole) == len(query_models())
+
+    def test_format(self):
+        """表格只列出有差异的字段 / The table only lists varying fields"""
+        matrix = diff_matrix(["gpt-5", "gpt-5-mini"])
+        lines = matrix.format().splitlines()
+        assert lines[0].split() == ["field", "gpt-5", "gpt-5-mini"]
+        assert {line.split()[0] for line in lines[1:]} == set(matrix.varying_fields())
+        assert len(matrix.format(all_fields=True).splitlines()) == 1 + len(COMPARED)
+
+        with pytest.raises(KeyError, match="not in the diff matrix"):
+            matrix.differing_fields("gpt-5", "gpt-4o")
+
+    def test_format_exact_integers(self):
+        """整数上限原样输出，不用科学计数法 / Integer limits print exactly, not in scientific notation"""
+        matrix = diff_matrix(["gemini-2.5-pro", "gpt-4o"])
+        window = get_model_info("gemini-2.5-pro").capabilities.context_window
+        row = next(line for line in matrix.format(all_fields=True).splitlines() if line.startswith("context_window"))
+        assert str(window) in row.split()
+        assert "e+" not in matrix.format(all_fields=True)
+
+    def test_pixels_and_mime_types(self):
+        """只有像素上限与媒体类型不同的模型也能区分 / Models differing only in pixel limits and MIME types are told apart"""
+        base = ModelCapabilities(supports_vision=True, max_image_pixels=(1024, 1024))
+        entries = [
+            base,
+            ModelCapabilities(supports_vision=True, max_image_pixels=(2048, 1024)),
+            ModelCapabilities(
+                supports_vision=True,
+                max_image_pixels=(1024, 1024),
+                supported_image_mime_type=["image/png", "image/webp"],
+            ),
+            # 顺序不同视为相同 / Order does not matter
+            ModelCapabilities(
+                supports_vision=True,
+                max_image_pixels=(1024, 1024),
+                supported_image_mime_type=["image/png", "image/jpeg"],
+            ),
+        ]
+        labels = ["base", "pixels", "mime", "reordered"]
+        matrix = diff_matrix(
+            [
+                CatalogEntry(label, ModelFamily.GPT, Provider.OPENAI, "1.0", label, (1, 0), (0,), None, caps)
+                for label, caps in zip(labels, entries, strict=True)
+            ]
+        )
+        assert matrix.differing_fields("openai::base", "openai::pixels") == ["max_image_pixels"]
+        assert matrix.differing_fields("openai::base", "openai::mime") == ["supported_image_mime_type"]
+        assert matrix.differing_fields("openai::base", "openai::reordered") == []
+        assert matrix.difference_count()[0].tolist() == [0, 1, 1, 0]
+        assert matrix.varying_fields() == ["max_image_pixels", "supported_image_mime_type"]
+
+        added, removed = matrix.mime_changes("supported_image_mime_type", "openai::base", "openai::mime")
+        assert (added, removed) == ({"image/webp"}, {"image/jpeg"})
+        with pytest.raises(ValueError, match="Not a MIME type list field"):
+            matrix.mime_changes("max_image_pixels", 0, 1)
+
+        table = matrix.format().splitlines()
+        assert table[1].split() == ["max_image_pixels", "1024x1024", "2048x1024", "1024x1024", "1024x1024"]
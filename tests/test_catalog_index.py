@@ -0,0 +1,123 @@
+# filename: test_catalog_index.py
+# @Time    : 2026/10/19 15:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+目录能力索引测试 / Catalog capability index tests
+"""
+
+import pytest
+
+from whosellm import LLMeta, ModelFamily
+from whosellm.capabilities import ModelCapabilities
+from whosellm.catalog import build_catalog, get_capability_index, query_models
+from whosellm.catalog.index import _INDEX_CACHE
+from whosellm.models.config import ModelFamilyConfig, SpecificModelConfig
+from whosellm.models.registry import _FAMILY_CONFIGS
+from whosellm.provider import Provider
+
+
+def _brute_force(entries, predicate):
+    """逐条过滤作为对照 / Per-entry filtering as the reference"""
+    return [entry for entry in entries if predicate(entry.capabilities)]
+
+
+class TestCatalogEntries:
+    """目录条目测试类 / Catalog entry test class"""
+
+    def test_entries_match_llmeta(self):
+        """条目与 LLMeta 解析结果一致 / Entries agree with LLMeta resolution"""
+        for entry in build_catalog()[:40]:
+            model = LLMeta(entry.qualified_name)
+            assert model.provider == entry.provider
+            assert model.version == entry.version
+            assert model.variant == entry.variant
+            assert model.capabilities == entry.capabilities
+
+    def test_family_defaults(self):
+        """家族默认条目每个配置一个 / One family default entry per config"""
+        defaults = [entry for entry in build_catalog(include_family_defaults=True) if entry.is_family_default]
+        assert len(defaults) == len(_FAMILY_CONFIGS)
+
+
+class TestCapabilityIndex:
+    """能力索引测试类 / Capability index test class"""
+
+    def test_combined_query_matches_brute_force(self):
+        """组合查询与逐条过滤结果一致 / Combined query agrees with brute-force filtering"""
+        index = get_capability_index()
+        expected = _brute_force(
+            index.entries,
+            lambda caps: (
+                caps.supports_vision
+                and caps.supports_function_calling
+                and (caps.context_window or 0) >= 200_000
+                and (caps.max_tokens or 0) >= 64_000
+            ),
+        )
+        result = query_models(
+            supports_vision=True,
+            supports_function_calling=True,
+            min_context_window=200_000,
+            min_max_tokens=64_000,
+        )
+        assert result == expected
+        assert result
+
+    def test_negation_and_upper_bound(self):
+        """False 条件与 max_ 上界 / False criteria and max_ upper bounds"""
+        index = get_capability_index()
+        expected = _brute_force(
+            index.entries,
+            lambda caps: not caps.supports_thinking and caps.max_tokens is not None and caps.max_tokens <= 8192,
+        )
+        assert index.query(supports_thinking=False, max_max_tokens=8192) == expected
+
+    def test_none_values_never_match_ranges(self):
+        """数值为 None 的条目不命中任何范围条件 / Entries with None never match range criteria"""
+        index = get_capability_index()
+        for entry in index.query(min_max_video_duration_seconds=0):
+            assert entry.capabilities.max_video_duration_seconds is not None
+
+    def test_provider_and_family_filters(self):
+        """Provider 与家族过滤，支持集合 / Provider and family filters, collections supported"""
+        index = get_capability_index()
+        openai = index.query(provider=Provider.OPENAI)
+        assert openai
+        assert all(entry.provider == Provider.OPENAI for entry in openai)
+        both = index.count(provider={Provider.OPENAI, Provider.ANTHROPIC})
+        assert both == len(openai) + index.count(provider=Provider.ANTHROPIC)
+        assert all(entry.family == ModelFamily.CLAUDE for entry in index.query(family=ModelFamily.CLAUDE))
+
+    def test_unknown_criterion(self):
+        """未知条件抛出 ValueError / Unknown criteria raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown query criterion"):
+            query_models(supports_teleportation=True)
+
+    def test_rebuilt_after_registration(self):
+        """注册新的家族配置后索引自动重建 / The index is rebuilt after registering a new family config"""
+        before = get_capability_index()
+        assert get_capability_index() is before
+
+        ModelFamily.add_member("_TEST_CATALOG", "_test-catalog")
+        try:
+            ModelFamilyConfig(
+                family=ModelFamily._TEST_CATALOG,
+                provider=Provider.OPENAI,
+                patterns=["_test-catalog-{variant:variant}"],
+                specific_models={
+                    "_test-catalog-huge": SpecificModelConfig(
+                        version_default="1.0",
+                        variant_default="huge",
+                        capabilities=ModelCapabilities(context_window=987_654_321),
+                    ),
+                },
+            )
+            after = get_capability_index()
+            assert after is not before
+            assert [entry.name for entry in query_models(min_context_window=987_654_321)] == ["_test-catalog-huge"]
+        finally:
+            _FAMILY_CONFIGS.pop((ModelFamily._TEST_CATALOG, Provider.OPENAI), None)
+            # 直接移除配置不会递增代数，手动清空缓存 / Popping a config does not bump the generation
+            _INDEX_CACHE.clear()
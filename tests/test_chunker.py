@@ -0,0 +1,99 @@
+# filename: test_chunker.py
+# @Time    : 2026/10/19 23:00
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+流式分块器测试 / Streaming chunker tests
+"""
+
+from itertools import pairwise
+
+import pytest
+
+from whosellm import LLMeta
+from whosellm.tokens import TextChunker, chunk_budget, chunk_text, context_budget, get_estimator
+
+
+def _words(text: str) -> int:
+    """按字符计数的简单计数器 / Simple character-count counter"""
+    return len(text)
+
+
+class TestTextChunker:
+    """流式分块器测试类 / Streaming chunker test class"""
+
+    def test_chunks_fit_and_reassemble(self):
+        """每块不超预算，无重叠时可以拼回原文 / Chunks fit the budget and reassemble without overlap"""
+        text = "".join(f"Sentence {i} ends here. 第{i}句。\n" for i in range(300))
+        stream = (text[i : i + 37] for i in range(0, len(text), 37))
+        chunks = list(TextChunker(200, _words).chunks(stream))
+        assert len(chunks) > 1
+        assert all(chunk.tokens <= 200 and len(chunk.text) <= 200 for chunk in chunks)
+        assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+        assert "".join(chunk.text for chunk in chunks) == text
+
+    def test_overlap(self):
+        """相邻块按完整片段重叠 / Adjacent chunks overlap by whole segments"""
+        sentences = [f"s{i:03d}. " for i in range(100)]
+        chunks = list(TextChunker(60, _words, overlap_tokens=14).chunks(sentences))
+        for previous, current in pairwise(chunks):
+            assert current.text.startswith(previous.text[-12:])
+            assert len(current.text) <= 60
+        assert chunks[-1].text.endswith("s099. ")
+
+    def test_oversized_segments(self):
+        """没有分隔符的长文本按空白、再按字符切分 / Long text without delimiters splits at whitespace, then characters"""
+        words = "word " * 100
+        assert all(len(chunk.text) <= 32 for chunk in TextChunker(32, _words).chunks([words]))
+        blob = "x" * 1000
+        chunks = list(TextChunker(64, _words).chunks([blob]))
+        assert "".join(chunk.text for chunk in chunks) == blob
+        assert max(len(chunk.text) for chunk in chunks) <= 64
+
+    def test_streams_lazily(self):
+        """在消费完流之前就产出第一块 / The first chunk is yielded before the stream is exhausted"""
+        consumed = []
+
+        def stream():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"line {i}\n"
+
+        first = next(iter(TextChunker(50, _words).chunks(stream())))
+        assert first.index == 0
+        assert len(consumed) < 20
+
+
+class TestModelChunking:
+    """按模型限制分块测试类 / Model-limit chunking test class"""
+
+    def test_budget_from_model(self):
+        """预算取自 context_window - max_tokens - 提示词开销 / Budget is context_window - max_tokens - prompt overhead"""
+        assert chunk_budget("gpt-4o", prompt_tokens=1000) == context_budget("gpt-4o") - 1000
+        budget = chunk_budget("gpt-4o", max_tokens=0, prompt_tokens=0)
+        estimator = get_estimator("gpt-4o")
+        document = ("The quick brown fox jumps over the lazy dog. " * 30_000).splitlines(keepends=True)
+        chunks = list(chunk_text("gpt-4o", document, max_tokens=0))
+        assert len(chunks) > 1
+        assert all(estimator.count(chunk.text) <= chunk.tokens <= budget for chunk in chunks)
+
+    def test_output_reservation_capped(self):
+        """max_tokens 不小于上下文窗口时默认预留窗口的一半 / Half the window is reserved when max_tokens fills it"""
+        capabilities = LLMeta("glm-4v-plus").capabilities
+        assert capabilities.max_tokens is not None and capabilities.context_window is not None
+        assert capabilities.max_tokens >= capabilities.context_window
+        assert chunk_budget("glm-4v-plus") == context_budget("glm-4v-plus", max_tokens=capabilities.context_window // 2)
+        assert [chunk.text for chunk in chunk_text("glm-4v-plus", "Hello. World.")] == ["Hello. World."]
+        # 显式传入的预留不受限制 / An explicit reservation is not capped
+        with pytest.raises(ValueError, match="No context budget"):
+            chunk_budget("glm-4v-plus", max_tokens=capabilities.max_tokens)
+
+    def test_errors(self):
+        """上下文窗口未知或预算不足 / Unknown context window or insufficient budget"""
+        with pytest.raises(ValueError, match="context window is unknown"):
+            chunk_text("mystery-dragon-9000", "text")
+        with pytest.raises(ValueError, match="No context budget"):
+            chunk_text("gpt-4o", "text", prompt_tokens=10_000_000)
+        with pytest.raises(ValueError, match="overlap_tokens"):
+            TextChunker(10, _words, overlap_tokens=10)
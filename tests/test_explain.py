@@ -0,0 +1,84 @@
+# filename: test_explain.py
+# @Time    : 2026/10/19 13:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+解析解释测试 / Resolution explain tests
+"""
+
+from whosellm import LLMeta, ModelFamily, Provider
+from whosellm.models import explain
+from whosellm.models.base import (
+    CAPABILITY_TIER_FAMILY,
+    CAPABILITY_TIER_SPECIFIC,
+    CAPABILITY_TIER_VERSION,
+    MODEL_REGISTRY,
+)
+
+
+class TestExplain:
+    """解析解释测试类 / Resolution explain test class"""
+
+    def test_sub_pattern_winner_and_failed_attempts(self):
+        """子 pattern 命中前的尝试全部记录为失败 / Attempts before the sub-pattern win are recorded as failures"""
+        explanation = explain("claude-opus-4-5@20251101")
+
+        winner = explanation.winner
+        assert winner is not None
+        assert winner.stage == "specific_patterns"
+        assert winner.specific_model == "claude-opus-4-5"
+        assert winner.pattern == "claude-opus-4-5@{snapshot:snapshot}"
+        # 获胜的尝试是最后一个 / The winning attempt is the last one
+        assert explanation.attempts[-1] is winner
+        assert len(explanation.failed_attempts) == len(explanation.attempts) - 1
+        assert {a.stage for a in explanation.failed_attempts} == {"specific_exact", "specific_patterns"}
+        assert explanation.capability_tier == CAPABILITY_TIER_SPECIFIC
+        assert explanation.match is not None
+        assert explanation.match["_from_specific_model"] == "claude-opus-4-5"
+
+    def test_matches_llmeta_resolution(self):
+        """解释结果与 LLMeta 解析一致 / Explanation agrees with LLMeta resolution"""
+        for name in ("claude-opus-4-5@20251101", "gpt-6-turbo", "glm-4.6", "gpt-4o-mini"):
+            explanation = explain(name)
+            model = LLMeta(name)
+
+            assert explanation.model_info is not None
+            assert explanation.model_info.family == model.family
+            assert explanation.model_info.version == model.version
+            assert explanation.model_info.variant == model.variant
+            assert explanation.model_info.capabilities == model.capabilities
+
+    def test_capability_tiers(self):
+        """三级继承的层级 / Three-level inheritance tiers"""
+        # gpt-5.2 的 specific model 未声明 capabilities，继承版本级能力
+        # gpt-5.2's specific model declares no capabilities, inheriting version-level capabilities
+        assert explain("gpt-5.2").capability_tier == CAPABILITY_TIER_VERSION
+        # 未注册的新版本回退到家族默认 / Unregistered new versions fall back to family default
+        assert explain("gpt-6-turbo").capability_tier == CAPABILITY_TIER_FAMILY
+
+    def test_type_conversion_reason(self):
+        """类型转换失败时给出原因 / Type conversion failures carry a reason"""
+        reasons = {a.reason for a in explain("gpt-4o-1").failed_attempts}
+
+        assert "type conversion failed: variant must start with a letter" in reasons
+        assert "pattern did not match" in reasons
+
+    def test_provider_prefix_limits_configs(self):
+        """Provider 前缀只尝试该 Provider 的配置 / Provider prefix only tries that provider's configs"""
+        explanation = explain("Tencent::deepseek-v3")
+
+        assert explanation.specified_provider == Provider.TENCENT
+        assert {a.provider for a in explanation.attempts} == {Provider.TENCENT}
+        assert explanation.model_info is not None
+        assert explanation.model_info.family == ModelFamily.DEEPSEEK
+
+    def test_unknown_name_does_not_register(self):
+        """未知名称无匹配且不写入注册表 / Unknown names do not match and are not registered"""
+        explanation = explain("mystery-dragon-9000")
+
+        assert explanation.winner is None
+        assert explanation.model_info is None
+        assert explanation.capability_tier is None
+        assert "mystery-dragon-9000" not in MODEL_REGISTRY
+        assert "no match" in explanation.format(show_failed=False)
@@ -0,0 +1,95 @@
+# filename: test_fallbacks.py
+# @Time    : 2026/10/19 18:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+降级链测试 / Fallback chain tests
+"""
+
+from whosellm import LLMeta
+from whosellm.capabilities import ModelCapabilities
+from whosellm.routing import FallbackPlanner, Requirements, covers
+
+
+class TestCovers:
+    """能力覆盖测试类 / Capability cover test class"""
+
+    def test_bool_and_numeric(self):
+        """布尔能力与数值限制 / Boolean capabilities and numeric limits"""
+        required = ModelCapabilities(supports_vision=True, context_window=100_000)
+        assert covers(ModelCapabilities(supports_vision=True, context_window=200_000), required)
+        assert not covers(ModelCapabilities(supports_vision=False, context_window=200_000), required)
+        assert not covers(ModelCapabilities(supports_vision=True, context_window=50_000), required)
+        # 未知的数值限制不算覆盖 / An unknown numeric limit does not cover
+        assert not covers(ModelCapabilities(supports_vision=True), required)
+
+    def test_mime_types_only_when_modality_required(self):
+        """只有需要该模态时才比较媒体类型 / MIME types only matter when the modality is required"""
+        webp = ModelCapabilities(supports_vision=True, supported_image_mime_type=["image/webp"])
+        assert not covers(ModelCapabilities(supports_vision=True), webp)
+        assert covers(ModelCapabilities(), ModelCapabilities(supported_image_mime_type=["image/webp"]))
+
+
+class TestFallbackPlanner:
+    """降级链规划器测试类 / Fallback planner test class"""
+
+    def test_same_family_first_nearest_first(self):
+        """同一家族在前，且按 LLMeta 顺序由近到远 / Same family first, nearest by LLMeta order first"""
+        planner = FallbackPlanner()
+        model = LLMeta("claude-opus-4-5")
+        chain = planner.fallbacks("claude-opus-4-5")
+        families = [entry.family for entry in chain]
+        same = families.count(model.family)
+        assert same > 0
+        assert all(family == model.family for family in families[:same])
+        assert all(entry.name != "claude-opus-4-5" for entry in chain)
+
+        # 距离单调不减 / Distance never decreases
+        ordered = sorted([LLMeta(entry.qualified_name) for entry in chain[:same]] + [model])
+        position = ordered.index(model)
+        distances = [abs(ordered.index(LLMeta(entry.qualified_name)) - position) for entry in chain[:same]]
+        assert distances == sorted(distances)
+
+    def test_other_families_cover_model(self):
+        """其他家族的候选覆盖模型自身的能力 / Other-family candidates cover the model's own capabilities"""
+        model = LLMeta("claude-opus-4-5")
+        for entry in FallbackPlanner().fallbacks("claude-opus-4-5"):
+            if entry.family != model.family:
+                assert covers(entry.capabilities, model.capabilities)
+
+    def test_requirements(self):
+        """给定需求时所有候选都满足需求 / With requirements every candidate satisfies them"""
+        needs = Requirements(capabilities=frozenset({"supports_pdf"}), input_tokens=500_000)
+        chain = FallbackPlanner().fallbacks("claude-opus-4-5", needs)
+        assert chain
+        for entry in chain:
+            assert entry.capabilities.supports_pdf
+            assert entry.capabilities.context_window is not None and entry.capabilities.context_window >= 500_000
+
+    def test_cached(self):
+        """结果按 (模型, 需求) 缓存 / Results are cached per (model, requirements)"""
+        planner = FallbackPlanner()
+        first = planner.fallbacks("gpt-4o")
+        assert planner.fallbacks("GPT-4o") is first
+        assert len(planner) == 1
+        planner.fallbacks("gpt-4o", Requirements(capabilities=frozenset({"supports_vision"})))
+        assert len(planner) == 2
+
+    def test_token_counts_bucketed_and_bounded(self):
+        """token 数分桶共享缓存，缓存按 LRU 限制容量 / Token counts share bucketed entries, the cache is bounded LRU"""
+        planner = FallbackPlanner(max_size=2)
+        for input_tokens in range(300_000, 400_000, 5_000):
+            needs = Requirements(capabilities=frozenset({"supports_pdf"}), input_tokens=input_tokens)
+            chain = planner.fallbacks("claude-opus-4-5", needs)
+            assert chain
+            for entry in chain:
+                assert entry.capabilities.context_window is not None
+                assert entry.capabilities.context_window >= input_tokens
+        # 全部落在同一个桶 / All fall into one bucket
+        assert len(planner) == 1
+
+        planner.fallbacks("gpt-4o")
+        planner.fallbacks("gpt-4o-mini")
+        planner.fallbacks("glm-4.6")
+        assert len(planner) == 2
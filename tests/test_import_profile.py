@@ -0,0 +1,70 @@
+# filename: test_import_profile.py
+# @Time    : 2026/10/19 10:12
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+导入耗时分析测试 / Import profiling tests
+"""
+
+import pytest
+
+from whosellm.__main__ import main
+from whosellm.diagnostics import ImportBudgetExceededError, check_import_budget, profile_import
+from whosellm.diagnostics.import_profile import collect_registry_stats, parse_importtime
+
+
+class TestImportProfile:
+    """导入耗时分析测试类 / Import profiling test class"""
+
+    def test_parse_importtime_merges_repeated_modules(self):
+        """循环导入导致的重复行应合并 / Lines repeated by circular imports are merged"""
+        output = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       100 |        100 |   json",
+                "import time:      3400 |       4713 |     whosellm.models.base",
+                "import time:       500 |        500 |       whosellm.models.families.vidu",
+                "import time:        24 |      88311 |     whosellm.models.base",
+            ],
+        )
+        modules = {m.module: m for m in parse_importtime(output)}
+
+        assert set(modules) == {"whosellm.models.base", "whosellm.models.families.vidu"}
+        assert modules["whosellm.models.base"].self_seconds == pytest.approx(0.003424)
+        assert modules["whosellm.models.base"].cumulative_seconds == pytest.approx(0.088311)
+
+    def test_collect_registry_stats(self):
+        """注册表统计应覆盖全部家族配置 / Registry stats cover all family configs"""
+        stats = collect_registry_stats()
+
+        assert stats["family_configs"] >= 19
+        assert stats["specific_models"] > 100
+        assert stats["patterns"] > stats["family_configs"]
+        assert "claude/anthropic" in stats["validation_by_family"]
+        assert stats["validation_seconds"] > 0
+
+    def test_profile_import_reports_family_modules(self):
+        """子进程分析应报告各家族模块耗时 / Child process profiling reports family module times"""
+        profile = profile_import()
+
+        family_modules = {m.module for m in profile.family_modules}
+        assert "whosellm.models.families.zhipu" in family_modules
+        assert "whosellm.models.families.openai.openai_gpt_5" in family_modules
+        assert profile.total_seconds > 0
+        assert profile.specific_models > 100
+        assert not profile.over_budget
+        assert "family module" in profile.format(top=3)
+
+    def test_check_import_budget_raises_when_exceeded(self):
+        """超出预算应抛出异常 / Exceeding the budget raises"""
+        with pytest.raises(ImportBudgetExceededError) as exc_info:
+            check_import_budget(budget_seconds=0.0)
+
+        assert exc_info.value.profile.over_budget
+
+    def test_cli_exit_code_reflects_budget(self, capsys):
+        """命令行超出预算时返回非零退出码 / CLI returns non-zero exit code when over budget"""
+        assert main(["import-profile", "--budget-ms", "0", "--json"]) == 1
+        assert '"over_budget": true' in capsys.readouterr().out
+        assert main(["import-profile", "--budget-ms", "60000"]) == 0
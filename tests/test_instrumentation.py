@@ -0,0 +1,104 @@
+# filename: test_instrumentation.py
+# @Time    : 2026/10/19 11:05
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+分阶段计时测试 / Per-stage timing tests
+"""
+
+import pytest
+
+from whosellm import ModelFamily, Provider
+from whosellm.models import instrumentation
+from whosellm.models.base import MODEL_REGISTRY, get_model_info
+from whosellm.models.instrumentation import ResolutionTiming, StageHistogram
+
+
+@pytest.fixture()
+def timings():
+    """开启计时并收集结果，测试结束后恢复 / Enable timing and collect results, restore afterwards"""
+    collected: list[ResolutionTiming] = []
+    instrumentation.reset_stage_histograms()
+    instrumentation.enable_instrumentation()
+    instrumentation.add_timing_hook(collected.append)
+
+    yield collected
+
+    instrumentation.remove_timing_hook(collected.append)
+    instrumentation.disable_instrumentation()
+    instrumentation.reset_stage_histograms()
+
+
+class TestInstrumentation:
+    """分阶段计时测试类 / Per-stage timing test class"""
+
+    def test_disabled_by_default_records_nothing(self):
+        """关闭时不记录任何数据 / Nothing is recorded when disabled"""
+        assert not instrumentation.is_instrumentation_enabled()
+        get_model_info("gpt-4o")
+        assert instrumentation.get_stage_histograms() == {}
+
+    def test_sub_pattern_winner(self, timings):
+        """子 pattern 命中时记录获胜配置与 pattern / Sub-pattern win records config and pattern"""
+        MODEL_REGISTRY.pop("claude-opus-4-5@20251101", None)
+
+        info = get_model_info("claude-opus-4-5@20251101")
+
+        assert info.family == ModelFamily.CLAUDE
+        timing = timings[-1]
+        assert timing.model_name == "claude-opus-4-5@20251101"
+        assert set(timing.stages) == {"registry", "specific_exact", "specific_patterns"}
+        assert timing.winner is not None
+        assert timing.winner["stage"] == "specific_patterns"
+        assert timing.winner["specific_model"] == "claude-opus-4-5"
+        assert timing.winner["pattern"] == "claude-opus-4-5@{snapshot:snapshot}"
+        assert timing.total_seconds >= sum(timing.stages.values())
+
+    def test_registry_hit_attributes_nested_match_to_date_parsing(self, timings):
+        """注册表命中时，日期解析内部的模式匹配不单独计入 / Nested match inside date parsing is not double counted"""
+        get_model_info("gpt-4o")
+
+        timing = timings[-1]
+        assert set(timing.stages) == {"registry", "date_parsing"}
+        assert timing.winner == {"stage": "registry", "key": "gpt-4o"}
+
+    def test_unknown_name_reaches_provider_fallback(self, timings):
+        """未知名称经过全部匹配阶段并落到 Provider 兜底 / Unknown names go through all stages to the fallback"""
+        get_model_info("mystery-dragon-9000")
+
+        timing = timings[-1]
+        assert {"parent_patterns", "provider_fallback", "date_parsing"} <= set(timing.stages)
+        assert timing.winner == {"stage": "provider_fallback", "provider": Provider.UNKNOWN}
+
+    def test_provider_prefix_registry_stage(self, timings):
+        """带 Provider 前缀时记录前缀注册表查找阶段 / Provider prefix records the prefixed registry stage"""
+        get_model_info("Tencent::deepseek-chat")
+
+        assert "provider_registry" in timings[-1].stages
+
+    def test_histograms_aggregate_per_stage(self, timings):
+        """直方图按阶段聚合 / Histograms aggregate per stage"""
+        for _ in range(3):
+            get_model_info("gpt-4o")
+
+        histograms = instrumentation.get_stage_histograms()
+        assert histograms["registry"].count == 3
+        assert histograms["total"].count == 3
+        assert histograms["date_parsing"].mean_seconds > 0
+
+
+class TestStageHistogram:
+    """直方图测试类 / Histogram test class"""
+
+    def test_observe_and_quantile(self):
+        """分位数返回所在桶上界 / Quantile returns the bucket upper bound"""
+        histogram = StageHistogram()
+        for seconds in (2e-6, 3e-6, 2e-4, 0.5):
+            histogram.observe(seconds)
+
+        assert histogram.count == 4
+        assert histogram.max_seconds == 0.5
+        assert histogram.quantile(0.5) == 5e-6
+        assert histogram.quantile(1.0) == 0.5
+        assert histogram.mean_seconds == pytest.approx((2e-6 + 3e-6 + 2e-4 + 0.5) / 4)
@@ -0,0 +1,124 @@
+# filename: test_media_container.py
+# @Time    : 2026/10/19 22:00
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+音视频容器时长探测测试 / Audio and video container duration probing tests
+"""
+
+import base64
+import io
+import struct
+
+import pytest
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.media import check_audio, check_inline, check_video, probe_container, validate_video
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    """MP4 box / MP4 box"""
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _mp4(seconds: float, brand: bytes = b"isom", mdat_bytes: int = 1000, version: int = 0) -> bytes:
+    """ftyp + mdat + moov/mvhd（moov 在文件末尾） / ftyp + mdat + moov/mvhd (moov at the end)"""
+    timescale = 1000
+    if version == 1:
+        mvhd = struct.pack(">B3xQQIQ", 1, 0, 0, timescale, int(seconds * timescale))
+    else:
+        mvhd = struct.pack(">B3xIIII", 0, 0, 0, timescale, int(seconds * timescale))
+    moov = _box(b"moov", _box(b"mvhd", mvhd + b"\x00" * 80))
+    return _box(b"ftyp", brand + b"\x00\x00\x02\x00") + _box(b"mdat", b"\x00" * mdat_bytes) + moov
+
+
+def _wav(seconds: float, byte_rate: int = 32_000) -> bytes:
+    """PCM WAV / PCM WAV"""
+    data = b"\x00" * int(seconds * byte_rate)
+    fmt = struct.pack("<HHIIHH", 1, 1, byte_rate // 2, byte_rate, 2, 16)
+    body = b"WAVE" + struct.pack("<4sI", b"fmt ", len(fmt)) + fmt + struct.pack("<4sI", b"data", len(data)) + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, 立体声 / stereo
+_MP3_FRAME_HEADER = b"\xff\xfb\x90\x00"
+
+
+class TestContainerProbe:
+    """容器探测测试类 / Container probing test class"""
+
+    def test_mp4_and_quicktime(self):
+        """MP4 / MOV 的 mvhd 时长（v0 与 v1） / MP4 / MOV mvhd durations (v0 and v1)"""
+        for data, expected in (
+            (_mp4(12.5), ("mp4", 12.5)),
+            (_mp4(3.0, version=1), ("mp4", 3.0)),
+            (_mp4(7.0, brand=b"qt  "), ("quicktime", 7.0)),
+        ):
+            assert probe_container(io.BytesIO(data), len(data)) == expected
+
+    def test_mp4_skips_mdat(self):
+        """mdat 被跳过而不读取 / mdat is skipped rather than read"""
+
+        class CountingStream(io.BytesIO):
+            read_bytes = 0
+
+            def read(self, size=-1):
+                data = super().read(size)
+                self.read_bytes += len(data)
+                return data
+
+        data = _mp4(60.0, mdat_bytes=5_000_000)
+        stream = CountingStream(data)
+        assert probe_container(stream, len(data)) == ("mp4", 60.0)
+        assert stream.read_bytes < 200
+
+    def test_audio_formats(self):
+        """WAV、MP3（CBR 与 Xing）与 AVI / WAV, MP3 (CBR and Xing) and AVI"""
+        wav = _wav(2.0)
+        assert probe_container(io.BytesIO(wav), len(wav)) == ("wav", 2.0)
+
+        # 带 ID3v2 标签的 CBR：1 秒 = 16000 字节 / CBR with an ID3v2 tag: 1 second = 16000 bytes
+        id3 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+        cbr = id3 + (_MP3_FRAME_HEADER + b"\x00" * 413) * 40
+        fmt, duration = probe_container(io.BytesIO(cbr), len(cbr))
+        assert fmt == "mp3"
+        assert duration == pytest.approx(40 * 417 / 16_000)
+
+        xing = _MP3_FRAME_HEADER + b"\x00" * 32 + b"Xing" + struct.pack(">II", 1, 1000) + b"\x00" * 400
+        assert probe_container(io.BytesIO(xing), len(xing)) == ("mp3", pytest.approx(1000 * 1152 / 44100))
+
+        avih = struct.pack("<IIIII", 40_000, 0, 0, 0, 250) + b"\x00" * 36
+        hdrl = b"hdrl" + b"avih" + struct.pack("<I", len(avih)) + avih
+        avi = b"RIFF\x00\x00\x00\x00AVI " + b"LIST" + struct.pack("<I", len(hdrl)) + hdrl
+        assert probe_container(io.BytesIO(avi), len(avi)) == ("avi", 10.0)
+        assert probe_container(io.BytesIO(b"not media at all"), 16) is None
+
+
+class TestContainerCheck:
+    """容器限制检查测试类 / Container limit check test class"""
+
+    def test_video_limits(self):
+        """Vidu 的视频时长限制 / Vidu video duration limits"""
+        check = validate_video("viduq1", _mp4(12.5))
+        assert check.info.duration_seconds == 12.5
+        assert [v.code for v in check.violations] == ["video_duration"]
+        assert validate_video("viduq1", _mp4(4.0)).ok
+
+        capabilities = ModelCapabilities(max_video_size_mb=0.001)
+        assert [v.code for v in check_video(_mp4(1.0, mdat_bytes=5000), capabilities).violations] == ["video_size"]
+        assert [v.code for v in check_video(_wav(1.0), ModelCapabilities()).violations] == ["video_format"]
+
+    def test_audio_limits(self, tmp_path):
+        """音频时长与 MIME，包括内联 base64 / Audio duration and MIME, including inline base64"""
+        path = tmp_path / "speech.wav"
+        path.write_bytes(_wav(3.0))
+        capabilities = ModelCapabilities(max_audio_duration_seconds=2)
+        check = check_audio(path, capabilities)
+        assert (check.info.mime_type, check.info.duration_seconds) == ("audio/wav", 3.0)
+        assert [v.code for v in check.violations] == ["audio_duration"]
+
+        inline = check_inline(base64.b64encode(_wav(3.0)).decode(), capabilities, kind="audio")
+        assert inline.info.duration_seconds == 3.0
+        assert [v.code for v in inline.violations] == ["audio_duration"]
+        assert check_audio(_mp4(1.0, brand=b"M4A "), capabilities).info.mime_type == "audio/mp4"
@@ -0,0 +1,99 @@
+# filename: test_media_image.py
+# @Time    : 2026/10/19 21:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+只读头部的图片检查测试 / Header-only image check tests
+"""
+
+import io
+import struct
+
+import pytest
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.media import MediaValidationError, check_image, probe_image, validate_image
+
+
+def _png(width: int, height: int) -> bytes:
+    """最小 PNG 头部 / Minimal PNG header"""
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I4sII", 13, b"IHDR", width, height) + b"\x08\x02\x00\x00\x00"
+
+
+def _jpeg(width: int, height: int, exif_bytes: int = 0) -> bytes:
+    """带 APP1 分段与 SOF0 的 JPEG 头部 / JPEG header with an APP1 segment and a SOF0"""
+    app1 = b"\xff\xe1" + struct.pack(">H", exif_bytes + 2) + b"\x00" * exif_bytes
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + app1 + b"\xff\xff" + sof0 + b"\xff\xda"
+
+
+class TestImageProbe:
+    """图片头部探测测试类 / Image header probing test class"""
+
+    def test_formats(self):
+        """识别 PNG / JPEG / GIF / WebP 的尺寸 / Dimensions of PNG / JPEG / GIF / WebP"""
+        vp8 = b"RIFF\x00\x00\x00\x00WEBPVP8 \x00\x00\x00\x00\x00\x00\x00\x9d\x01\x2a" + struct.pack("<HH", 640, 480)
+        vp8l_bits = (800 - 1) | ((600 - 1) << 14)
+        vp8l = b"RIFF\x00\x00\x00\x00WEBPVP8L\x00\x00\x00\x00\x2f" + struct.pack("<I", vp8l_bits) + b"\x00" * 5
+        vp8x = (
+            b"RIFF\x00\x00\x00\x00WEBPVP8X" + b"\x00" * 8 + (1919).to_bytes(3, "little") + (1079).to_bytes(3, "little")
+        )
+        cases = {
+            _png(1024, 768): ("image/png", 1024, 768),
+            _jpeg(4032, 3024, exif_bytes=60_000): ("image/jpeg", 4032, 3024),
+            b"GIF89a" + struct.pack("<HH", 320, 200) + b"\x00" * 20: ("image/gif", 320, 200),
+            vp8: ("image/webp", 640, 480),
+            vp8l: ("image/webp", 800, 600),
+            vp8x: ("image/webp", 1920, 1080),
+        }
+        for data, expected in cases.items():
+            assert probe_image(io.BytesIO(data)) == expected
+        assert probe_image(io.BytesIO(b"not an image")) is None
+        assert probe_image(io.BytesIO(b"\xff\xd8\xff\xda")) == ("image/jpeg", None, None)
+
+    def test_jpeg_reads_only_headers(self):
+        """JPEG 跳过大分段而不读取 / JPEG skips large segments without reading them"""
+
+        class CountingStream(io.BytesIO):
+            read_bytes = 0
+
+            def read(self, size=-1):
+                data = super().read(size)
+                self.read_bytes += len(data)
+                return data
+
+        stream = CountingStream(_jpeg(100, 50, exif_bytes=60_000) + b"\x00" * 1_000_000)
+        assert probe_image(stream) == ("image/jpeg", 100, 50)
+        assert stream.read_bytes < 100
+
+
+class TestImageCheck:
+    """图片限制检查测试类 / Image limit check test class"""
+
+    def test_limits(self):
+        """大小、像素与 MIME 限制 / Size, pixel and MIME limits"""
+        capabilities = ModelCapabilities(max_image_size_mb=0.001, max_image_pixels=(1000, 1000))
+        check = check_image(_png(2000, 500) + b"\x00" * 2000, capabilities)
+        assert check.info.size_bytes == 2029
+        assert [v.code for v in check.violations] == ["image_size", "image_pixels"]
+
+        gif = b"GIF89a" + struct.pack("<HH", 10, 10)
+        assert [v.code for v in check_image(gif, capabilities).violations] == ["image_mime_type"]
+        assert [v.code for v in check_image(b"garbage", capabilities).violations] == ["image_format"]
+        assert check_image(_jpeg(1000, 1000), capabilities).ok
+
+    def test_sources(self, tmp_path):
+        """路径与文件对象来源 / Path and file object sources"""
+        path = tmp_path / "photo.jpg"
+        path.write_bytes(_jpeg(7000, 100))
+        check = validate_image("glm-4v-plus", path)
+        assert (check.info.width, check.info.height) == (7000, 100)
+        assert [v.capability for v in check.violations] == ["max_image_pixels"]
+        with pytest.raises(MediaValidationError, match="7000x100"):
+            check.raise_for_violation()
+
+        with open(path, "rb") as stream:
+            stream.seek(5)
+            assert check_image(stream, ModelCapabilities()).info.mime_type == "image/jpeg"
+            assert stream.tell() == 5
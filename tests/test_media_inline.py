@@ -0,0 +1,107 @@
+# filename: test_media_inline.py
+# @Time    : 2026/10/19 21:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+内联 base64 媒体检查测试 / Inline base64 media check tests
+"""
+
+import base64
+import os
+import struct
+
+import pytest
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.media import Base64Reader, base64_decoded_size, check_inline, sniff_audio, split_data_url, validate_inline
+
+
+def _png(width: int, height: int, extra: int = 0) -> bytes:
+    """最小 PNG 头部加填充 / Minimal PNG header plus filler"""
+    header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I4sII", 13, b"IHDR", width, height)
+    return header + b"\x00" * extra
+
+
+def _wav(data_bytes: int) -> bytes:
+    """最小 WAV 头部加数据 / Minimal WAV header plus data"""
+    return b"RIFF" + struct.pack("<I", 36 + data_bytes) + b"WAVEfmt " + b"\x00" * 20 + b"\x00" * data_bytes
+
+
+class TestBase64Math:
+    """base64 大小计算测试类 / Base64 size math test class"""
+
+    def test_decoded_size(self):
+        """带 / 不带填充的解码大小 / Decoded size with and without padding"""
+        for length in range(40):
+            encoded = base64.b64encode(os.urandom(length))
+            assert base64_decoded_size(encoded) == length
+            assert base64_decoded_size(encoded.decode().rstrip("=")) == length
+        assert base64_decoded_size("data:image/png;base64,AAAA", start=22) == 3
+
+    def test_random_access_reader(self):
+        """按需解码任意位置 / Decode any position on demand"""
+        raw = os.urandom(10_000)
+        reader = Base64Reader(base64.b64encode(raw).decode())
+        assert reader.size == len(raw)
+        for position in (0, 1, 2, 3, 4097, 9_998):
+            reader.seek(position)
+            assert reader.read(7) == raw[position : position + 7]
+        assert reader.decoded_bytes < 100
+        reader.seek(-3, os.SEEK_END)
+        assert reader.read() == raw[-3:]
+
+    def test_split_data_url(self):
+        """data URL 拆分 / Data URL splitting"""
+        assert split_data_url("data:image/PNG;base64,AAAA") == ("image/png", 22)
+        assert split_data_url("AAAA") == (None, 0)
+        with pytest.raises(ValueError, match="base64"):
+            split_data_url("data:text/plain,hello")
+
+
+class TestInlineCheck:
+    """内联媒体检查测试类 / Inline media check test class"""
+
+    def test_image_without_decoding(self):
+        """只解码头部即可检查图片 / Images are checked by decoding only the header"""
+        url = "data:image/png;base64," + base64.b64encode(_png(7000, 10, extra=3_000_000)).decode()
+        check = validate_inline("glm-4v-plus", url)
+        assert check.info.size_bytes == 3_000_024
+        assert (check.info.mime_type, check.info.width) == ("image/png", 7000)
+        assert [v.code for v in check.violations] == ["image_pixels"]
+
+        no_base64 = ModelCapabilities(supports_image_base64=False, max_image_size_mb=1)
+        assert [v.code for v in check_inline(url, no_base64).violations] == ["image_base64", "image_size"]
+
+    def test_audio(self):
+        """音频嗅探与大小限制 / Audio sniffing and size limits"""
+        clip = base64.b64encode(_wav(2 * 1024 * 1024)).decode()
+        capabilities = ModelCapabilities(max_audio_size_mb=1)
+        check = check_inline(clip, capabilities)
+        assert check.info.kind == "audio"
+        assert check.info.mime_type == "audio/wav"
+        assert [v.code for v in check.violations] == ["audio_size"]
+
+        assert sniff_audio(b"ID3\x04\x00") == "audio/mpeg"
+        assert sniff_audio(b"\xff\xfb\x90\x00") == "audio/mpeg"
+        assert sniff_audio(b"OggS\x00") == "audio/ogg"
+        ogg = "data:audio/ogg;base64," + base64.b64encode(b"OggS" + b"\x00" * 20).decode()
+        assert [v.code for v in check_inline(ogg, ModelCapabilities()).violations] == ["audio_mime_type"]
+
+    def test_mime_line_breaks_and_invalid(self):
+        """带换行的 base64 与无效 base64 / Base64 with line breaks and invalid base64"""
+        wrapped = base64.encodebytes(_png(10, 10, extra=200)).decode()
+        assert check_inline(wrapped, ModelCapabilities(), kind="image").info.width == 10
+        assert [v.code for v in check_inline("!!!!", ModelCapabilities(), kind="image").violations] == ["image_format"]
+        with pytest.raises(ValueError, match="Unsupported inline media kind"):
+            check_inline("data:application/pdf;base64,AAAA", ModelCapabilities())
+
+    def test_trailing_whitespace(self):
+        """结尾的换行与末行中的空白不计入大小 / Trailing newlines and whitespace in the last line do not count"""
+        for extra in (1033 - 24, 1031 - 24):  # 无填充 / 两个 "=" 填充 / no padding / two "=" of padding
+            payload = base64.b64encode(_png(10, 10, extra=extra)).decode()
+            url = "data:image/png;base64," + payload
+            assert check_inline(url + "\n", ModelCapabilities()).info.size_bytes == extra + 24
+            assert check_inline(url + " \r\n", ModelCapabilities()).info.size_bytes == extra + 24
+            tail_space = url[:-10] + " " + url[-10:]
+            assert check_inline(tail_space, ModelCapabilities()).info.size_bytes == extra + 24
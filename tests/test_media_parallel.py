@@ -0,0 +1,92 @@
+# filename: test_media_parallel.py
+# @Time    : 2026/10/19 22:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+并行媒体检查测试 / Parallel media check tests
+"""
+
+import asyncio
+import base64
+import struct
+
+import pytest
+
+from whosellm.media import Attachment, MediaValidationError, validate_media_many, validate_media_many_async
+
+
+def _png(width: int, height: int) -> bytes:
+    """最小 PNG 头部 / Minimal PNG header"""
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I4sII", 13, b"IHDR", width, height) + b"\x00" * 5
+
+
+def _mp4(seconds: int) -> bytes:
+    """ftyp + moov/mvhd / ftyp + moov/mvhd"""
+    mvhd = struct.pack(">B3xIIII", 0, 0, 0, 1000, seconds * 1000)
+    moov = struct.pack(">I4s", 8 + 8 + len(mvhd), b"moov") + struct.pack(">I4s", 8 + len(mvhd), b"mvhd") + mvhd
+    return struct.pack(">I4s", 16, b"ftyp") + b"isom\x00\x00\x02\x00" + moov
+
+
+@pytest.fixture
+def attachments(tmp_path):
+    """混合附件：文件、data URL、字节串 / Mixed attachments: files, data URLs and bytes"""
+    sources = []
+    for index in range(20):
+        path = tmp_path / f"frame-{index}.png"
+        path.write_bytes(_png(1000 + index, 1000))
+        sources.append(path)
+    sources.append("data:image/png;base64," + base64.b64encode(_png(7000, 10)).decode())
+    sources.append(Attachment(_mp4(40)))
+    sources.append("data:video/mp4;base64," + base64.b64encode(_mp4(5)).decode())
+    return sources
+
+
+class TestParallelMedia:
+    """并行媒体检查测试类 / Parallel media check test class"""
+
+    def test_results_aligned(self, attachments):
+        """结果与输入对齐，种类自动识别 / Results align with the input, kinds are detected"""
+        checks = validate_media_many("glm-4v-plus", attachments, max_workers=4)
+        assert len(checks) == len(attachments)
+        assert [check.info.width for check in checks[:20]] == [1000 + index for index in range(20)]
+        assert all(check.ok for check in checks[:20])
+        assert [v.code for v in checks[20].violations] == ["image_pixels"]
+        assert checks[21].info.kind == "video"
+        assert [v.code for v in checks[21].violations] == ["video_duration"]
+        # 内联视频按 data URL 声明的类型检查 / Inline video is checked by the data URL's declared type
+        assert (checks[22].info.kind, checks[22].info.duration_seconds) == ("video", 5)
+        assert checks[22].ok
+
+    def test_fail_fast(self, attachments):
+        """第一个违规即抛出 / The first violation raises"""
+        with pytest.raises(MediaValidationError, match="7000x10"):
+            validate_media_many("glm-4v-plus", attachments, fail_fast=True)
+        assert all(check.ok for check in validate_media_many("glm-4v-plus", attachments[:20], fail_fast=True))
+
+    def test_async(self, attachments, tmp_path):
+        """asyncio 版本 / asyncio variant"""
+        checks = asyncio.run(validate_media_many_async("glm-4v-plus", attachments, concurrency=3))
+        assert [check.ok for check in checks] == [True] * 20 + [False, False, True]
+
+        oversized = tmp_path / "huge.png"
+        oversized.write_bytes(_png(9000, 9000))
+        with pytest.raises(MediaValidationError, match="9000x9000"):
+            asyncio.run(validate_media_many_async("glm-4v-plus", [*attachments[:20], oversized], fail_fast=True))
+        with pytest.raises(FileNotFoundError):
+            validate_media_many("glm-4v-plus", [tmp_path / "missing.png"])
+
+    def test_async_fail_fast_leaves_no_pending_tasks(self, attachments, tmp_path):
+        """fail_fast 抛出时剩余任务已取消并完成 / On fail_fast the remaining tasks are cancelled and finished"""
+        oversized = tmp_path / "huge.png"
+        oversized.write_bytes(_png(9000, 9000))
+
+        async def main() -> set[asyncio.Task]:
+            with pytest.raises(MediaValidationError, match="9000x9000"):
+                await validate_media_many_async(
+                    "glm-4v-plus", [oversized, *attachments[:20]], concurrency=1, fail_fast=True
+                )
+            # 不让出事件循环，直接检查 / Checked without yielding to the event loop
+            return {task for task in asyncio.all_tasks() if task is not asyncio.current_task()}
+
+        assert asyncio.run(main()) == set()
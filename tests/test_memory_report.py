@@ -0,0 +1,112 @@
+# filename: test_memory_report.py
+# @Time    : 2026/10/19 15:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+注册表内存占用报告测试 / Registry memory footprint report tests
+"""
+
+import sys
+from dataclasses import replace
+
+from whosellm import LLMeta
+from whosellm.__main__ import main
+from whosellm.capabilities import ModelCapabilities
+from whosellm.diagnostics import registry_memory_report
+from whosellm.diagnostics.memory import deep_sizeof
+from whosellm.models.base import MODEL_REGISTRY, ModelFamily, ModelInfo, register_model
+from whosellm.models.registry import _FAMILY_CONFIGS
+from whosellm.provider import Provider
+
+
+class TestDeepSizeof:
+    """深度大小计算测试类 / Deep size test class"""
+
+    def test_counts_nested_containers(self):
+        """嵌套容器大于外层容器本身 / Nested containers count more than the outer container"""
+        data = {"a": [1, 2, 3], "b": {"c": "x" * 100}}
+        assert deep_sizeof(data) > sys.getsizeof(data)
+
+    def test_shared_seen_counts_once(self):
+        """共享 seen 集合时同一对象只统计一次 / With a shared seen set an object is counted once"""
+        shared = ["x" * 1000]
+        seen: set[int] = set()
+        first = deep_sizeof(shared, seen)
+        assert first > 1000
+        assert deep_sizeof(shared, seen) == 0
+
+
+class TestRegistryMemoryReport:
+    """注册表内存报告测试类 / Registry memory report test class"""
+
+    def test_covers_all_family_configs(self):
+        """每个家族配置都出现在报告中 / Every family config appears in the report"""
+        report = registry_memory_report()
+        for family, provider in _FAMILY_CONFIGS:
+            assert report.by_family[f"{family.value}/{provider.value}"] > 0
+        assert report.configured_entries == sum(len(c.specific_models) for c in _FAMILY_CONFIGS.values())
+        # 各 Provider 之和不含 MODEL_REGISTRY 容器本身 / Provider totals exclude the MODEL_REGISTRY container itself
+        assert sum(report.by_provider.values()) == (
+            report.family_config_bytes + report.model_registry_bytes - sys.getsizeof(MODEL_REGISTRY)
+        )
+        assert report.enum_bytes["ModelFamily"] > 0
+        assert report.enum_bytes["Provider"] > 0
+        assert report.total_bytes == (
+            report.family_config_bytes + report.model_registry_bytes + sum(report.enum_bytes.values())
+        )
+
+    def test_auto_registered_entries(self):
+        """自动注册条目被单独统计，手动注册不计入 / Auto-registered entries are reported separately, manual ones excluded"""
+        LLMeta("gpt-4.1-mini")
+        before = registry_memory_report()
+        assert before.registry_entries == len(MODEL_REGISTRY)
+        assert 1 <= before.auto_registered_entries <= before.registry_entries
+
+        register_model(
+            "_test-memory-manual",
+            ModelInfo(
+                provider=Provider.OPENAI,
+                family=ModelFamily.GPT,
+                version="0.1",
+                variant="manual",
+                capabilities=ModelCapabilities(),
+                version_tuple=(0, 1),
+            ),
+        )
+        try:
+            after = registry_memory_report()
+            assert after.registry_entries == before.registry_entries + 1
+            assert after.auto_registered_entries == before.auto_registered_entries
+            assert f"{after.registry_entries} registered ({after.auto_registered_entries} auto-registered)" in (
+                after.format()
+            )
+        finally:
+            MODEL_REGISTRY.pop("_test-memory-manual", None)
+
+    def test_duplicate_capabilities(self):
+        """值相同但对象不同的能力对象被计为重复 / Equal-but-distinct capabilities count as duplicates"""
+        report = registry_memory_report()
+        assert report.capability_instances >= report.unique_capabilities
+        assert report.duplicate_capabilities == report.capability_instances - report.unique_capabilities
+
+        MODEL_REGISTRY.pop("gpt-4.1-mini", None)
+        LLMeta("gpt-4.1-mini")
+        info = MODEL_REGISTRY["gpt-4.1-mini"]
+        # 构造一个值相同的新对象 / Build a new object with the same value
+        info.capabilities = replace(info.capabilities)
+        try:
+            after = registry_memory_report()
+            assert after.duplicate_capabilities == report.duplicate_capabilities + 1
+            assert after.duplicate_capability_bytes > report.duplicate_capability_bytes
+        finally:
+            MODEL_REGISTRY.pop("gpt-4.1-mini", None)
+
+    def test_format_and_cli(self, capsys):
+        """文本报告与命令行子命令 / Text report and CLI subcommand"""
+        text = registry_memory_report().format(top=3)
+        assert "configured" in text
+        assert len([line for line in text.splitlines() if "KiB  " in line]) == 3
+
+        assert main(["memory", "--json"]) == 0
+        assert '"duplicate_capabilities"' in capsys.readouterr().out
@@ -0,0 +1,127 @@
+# filename: test_metrics.py
+# @Time    : 2026/10/19 14:30
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+指标导出测试 / Metrics exporter tests
+"""
+
+import pytest
+
+from whosellm import LLMeta, ModelFamily
+from whosellm.capabilities import ModelCapabilities
+from whosellm.diagnostics import metrics_snapshot, render_prometheus, reset_metrics
+from whosellm.models import instrumentation
+from whosellm.models.base import MODEL_REGISTRY, ModelInfo, register_model
+from whosellm.models.config import ModelFamilyConfig
+from whosellm.models.registry import _FAMILY_CONFIGS, get_registry_generation
+from whosellm.provider import Provider
+
+
+@pytest.fixture()
+def _fresh_counters():
+    """每个测试前清零计数器 / Reset counters before each test"""
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+@pytest.mark.usefixtures("_fresh_counters")
+class TestMetrics:
+    """指标导出测试类 / Metrics exporter test class"""
+
+    def test_resolution_counters(self):
+        """解析计数、命中、未命中与未知名称 / Resolution, hit, miss and unknown counters"""
+        MODEL_REGISTRY.pop("gpt-4.1-mini", None)
+
+        LLMeta("gpt-4.1-mini")  # miss → 自动注册 / miss → auto-register
+        LLMeta("gpt-4.1-mini")  # hit
+        LLMeta("mystery-dragon-9000")  # miss → unknown
+
+        snapshot = metrics_snapshot()
+        assert snapshot["resolutions_total"] == 3
+        assert snapshot["cache_hits_total"] == 1
+        assert snapshot["cache_misses_total"] == 2
+        assert snapshot["unknown_resolutions_total"] == 1
+        assert snapshot["unknown_ratio"] == pytest.approx(1 / 3)
+        assert snapshot["cache_evictions_total"] == 0
+        assert snapshot["registry_entries"] == len(MODEL_REGISTRY)
+
+    def test_auto_registered_entries_exclude_manual(self):
+        """手动注册的模型只计入 registry_entries / Manually registered models only count towards registry_entries"""
+        MODEL_REGISTRY.pop("gpt-4.1-mini", None)
+        LLMeta("gpt-4.1-mini")
+        before = metrics_snapshot()
+        assert 1 <= before["auto_registered_entries"] <= before["registry_entries"]
+
+        register_model(
+            "_test-metrics-manual",
+            ModelInfo(
+                provider=Provider.OPENAI,
+                family=ModelFamily.GPT,
+                version="0.1",
+                variant="manual",
+                capabilities=ModelCapabilities(),
+                version_tuple=(0, 1),
+            ),
+        )
+        try:
+            after = metrics_snapshot()
+            assert after["registry_entries"] == before["registry_entries"] + 1
+            assert after["auto_registered_entries"] == before["auto_registered_entries"]
+
+            # 覆盖自动注册条目后不再计为自动注册 / An overwritten auto-registered entry no longer counts
+            register_model("gpt-4.1-mini", MODEL_REGISTRY["gpt-4.1-mini"])
+            assert metrics_snapshot()["auto_registered_entries"] == before["auto_registered_entries"] - 1
+        finally:
+            MODEL_REGISTRY.pop("_test-metrics-manual", None)
+            MODEL_REGISTRY.pop("gpt-4.1-mini", None)
+
+    def test_registry_generation_and_dynamic_members(self):
+        """注册家族配置递增代数，动态枚举成员被统计 / Registration bumps generation, dynamic members are counted"""
+        ModelFamily.add_member("_TEST_METRICS", "_test-metrics")
+        Provider.add_member("_TEST_METRICS_PROVIDER", "_test-metrics-provider")
+        before = get_registry_generation()
+
+        ModelFamilyConfig(
+            family=ModelFamily._TEST_METRICS,
+            provider=Provider._TEST_METRICS_PROVIDER,
+            patterns=["_test-metrics-{variant:variant}"],
+            capabilities=ModelCapabilities(),
+        )
+        try:
+            snapshot = metrics_snapshot()
+            assert snapshot["registry_generation"] == before + 1
+            assert snapshot["dynamic_enum_members"]["ModelFamily"] >= 1
+            assert snapshot["dynamic_enum_members"]["Provider"] >= 1
+            assert "_TEST_METRICS" in ModelFamily.dynamic_members()
+        finally:
+            _FAMILY_CONFIGS.pop((ModelFamily._TEST_METRICS, Provider._TEST_METRICS_PROVIDER), None)
+
+    def test_render_prometheus(self):
+        """Prometheus 文本格式包含 HELP/TYPE 与取值 / Prometheus text contains HELP/TYPE and values"""
+        LLMeta("gpt-4o")
+
+        text = render_prometheus()
+        assert "# TYPE whosellm_resolutions_total counter" in text
+        assert "whosellm_resolutions_total 1\n" in text
+        assert "# TYPE whosellm_registry_generation gauge" in text
+        assert 'whosellm_dynamic_enum_members{enum="ModelFamily"}' in text
+        assert "whosellm_resolution_stage_seconds" not in text
+        assert text.endswith("\n")
+
+    def test_render_prometheus_with_stage_histograms(self):
+        """开启 instrumentation 后附带阶段直方图 / Stage histograms are included when instrumentation has data"""
+        instrumentation.reset_stage_histograms()
+        instrumentation.enable_instrumentation()
+        try:
+            LLMeta("gpt-4o")
+        finally:
+            instrumentation.disable_instrumentation()
+
+        text = render_prometheus()
+        instrumentation.reset_stage_histograms()
+        assert "# TYPE whosellm_resolution_stage_seconds histogram" in text
+        assert 'whosellm_resolution_stage_seconds_bucket{stage="registry",le="+Inf"} 1' in text
+        assert 'whosellm_resolution_stage_seconds_count{stage="total"} 1' in text
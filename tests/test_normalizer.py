@@ -0,0 +1,89 @@
+# filename: test_normalizer.py
+# @Time    : 2026/10/19 21:00
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+请求整改计划测试 / Request normalization plan tests
+"""
+
+from whosellm import LLMeta
+from whosellm.capabilities import ModelCapabilities
+from whosellm.validation import RequestNormalizer, compile_plan, normalize_params, validate_params
+
+
+class TestRequestNormalizer:
+    """请求整改测试类 / Request normalizer test class"""
+
+    def test_in_place_without_copy(self):
+        """原地修改，不复制消息 / Modified in place, messages are not copied"""
+        messages = [{"role": "user", "content": [{"type": "image_url", "image_url": {"url": "data:;base64,AA"}}]}]
+        payload = {"max_tokens": 100_000, "reasoning_effort": "high", "messages": messages}
+        assert normalize_params("gpt-4o", payload) is payload
+        assert payload["messages"] is messages
+        assert payload == {"max_tokens": LLMeta("gpt-4o").capabilities.max_tokens, "messages": messages}
+
+    def test_response_format(self):
+        """JSON Schema 降级与删除 / JSON schema downgrade and removal"""
+        schema = {"type": "json_schema", "json_schema": {"name": "x", "schema": {}}}
+        json_mode = ModelCapabilities(supports_structured_outputs=False, supports_json_outputs=True)
+        assert compile_plan(json_mode).apply({"response_format": schema}) == {
+            "response_format": {"type": "json_object"}
+        }
+
+        no_json = ModelCapabilities(supports_structured_outputs=False, supports_json_outputs=False)
+        assert compile_plan(no_json).apply({"response_format": schema}) == {}
+        assert compile_plan(no_json).apply({"response_format": {"type": "json_object"}}) == {}
+        assert compile_plan(no_json).apply({"response_format": {"type": "text"}}) == {
+            "response_format": {"type": "text"}
+        }
+
+        assert compile_plan(ModelCapabilities()).apply({"response_format": schema}) == {"response_format": schema}
+
+    def test_plan_rules(self):
+        """删除不支持的参数并截断 max_tokens / Unsupported params are dropped and max_tokens clamped"""
+        plan = compile_plan(ModelCapabilities(supports_thinking=False, supports_function_calling=True, max_tokens=100))
+        assert "thinking" in plan.drop
+        assert "tools" not in plan.drop
+        assert not plan.is_noop
+        payload = {"thinking": {"type": "enabled"}, "tools": [], "max_tokens": 500, "max_completion_tokens": 50}
+        assert plan.apply(payload) == {"tools": [], "max_tokens": 100, "max_completion_tokens": 50}
+
+        full = ModelCapabilities(
+            supports_thinking=True, supports_function_calling=True, supports_predicted_outputs=True
+        )
+        assert compile_plan(full).is_noop
+
+    def test_matches_vrl_validator(self):
+        """与 VRL 验证器结果一致 / Agrees with the VRL validator"""
+        payload = {
+            "max_tokens": 1_000_000,
+            "reasoning_effort": "high",
+            "tools": [{"type": "function"}],
+            "stream": True,
+            "response_format": {"type": "json_schema"},
+        }
+        for model in ("gpt-4o", "deepseek-chat", "viduq1", "glm-4v-plus"):
+            assert normalize_params(model, dict(payload)) == validate_params(model, payload)
+
+    def test_plan_cached_per_identity(self):
+        """计划按模型身份只编译一次 / Plans are compiled once per model identity"""
+        normalizer = RequestNormalizer()
+        plan = normalizer.plan("gpt-4o")
+        assert normalizer.plan(LLMeta("gpt-4o")) is plan
+        assert normalizer.compilations == 1
+        normalizer.clear()
+        normalizer.plan("gpt-4o")
+        assert normalizer.compilations == 2
+
+    def test_same_identity_different_capabilities(self):
+        """身份相同但能力不同的模型各用各的计划 / Models sharing an identity but not capabilities get their own plan"""
+        schema = {"type": "json_schema", "json_schema": {"name": "x", "schema": {}}}
+        preview, stable = "gemini-3-pro-image-preview", "gemini-3-pro-image"
+        for order in ((preview, stable), (stable, preview)):
+            normalizer = RequestNormalizer()
+            results = {model: normalizer.normalize(model, {"response_format": dict(schema)}) for model in order}
+            assert results[preview] == {"response_format": schema}
+            assert results[stable] == {}
+            assert normalizer.plan(preview) != normalizer.plan(stable)
+            assert normalizer.compilations == 2
@@ -0,0 +1,84 @@
+# filename: test_preflight.py
+# @Time    : 2026/10/19 20:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+请求载荷预检测试 / Request payload pre-flight tests
+"""
+
+import pytest
+
+from whosellm import LLMeta
+from whosellm.capabilities import ModelCapabilities
+from whosellm.validation import ParamValidationError, PreflightRejectedError, check_payload, preflight
+
+
+def _user(*parts: dict) -> dict:
+    """构造用户消息 / Build a user message"""
+    return {"role": "user", "content": list(parts)}
+
+
+class TestPreflight:
+    """载荷预检测试类 / Payload pre-flight test class"""
+
+    def test_plain_text_passes(self):
+        """纯文本请求通过 / Plain text requests pass"""
+        result = preflight("deepseek-chat", {"messages": [{"role": "user", "content": "hi"}]})
+        assert result.ok
+        result.raise_for_rejection()
+
+    def test_image_to_non_vision_model(self):
+        """给非视觉模型发图片被拒绝 / Images to a non-vision model are rejected"""
+        payload = {
+            "messages": [_user({"type": "text", "text": "hi"}, {"type": "image_url", "image_url": {"url": "x"}})]
+        }
+        result = preflight("deepseek-chat", payload)
+        assert not result.ok
+        (rejection,) = result.rejections
+        assert rejection.code == "image_input"
+        assert rejection.capability == "supports_vision"
+        assert rejection.path == "messages[0].content[1]"
+        assert preflight("gpt-4o", payload).ok
+
+    def test_pdf_and_mime_types(self):
+        """PDF 与图片媒体类型 / PDFs and image media types"""
+        pdf = {"type": "file", "file": {"filename": "report.pdf", "file_data": "data:application/pdf;base64,AA"}}
+        anthropic_pdf = {"type": "document", "source": {"type": "base64", "media_type": "application/pdf"}}
+        text_doc = {"type": "document", "source": {"type": "text", "data": "plain"}}
+        webp = {"type": "image", "source": {"type": "base64", "media_type": "image/webp", "data": "AA"}}
+
+        capabilities = ModelCapabilities(supports_vision=True, supports_pdf=False)
+        result = check_payload(capabilities, {"messages": [_user(pdf, anthropic_pdf, text_doc, webp)]})
+        assert [r.code for r in result.rejections] == ["pdf_input", "pdf_input", "image_mime_type"]
+
+        capabilities = ModelCapabilities(
+            supports_vision=True, supports_pdf=True, supported_image_mime_type=["image/png", "image/webp"]
+        )
+        assert check_payload(capabilities, {"messages": [_user(pdf, anthropic_pdf, text_doc, webp)]}).ok
+
+    def test_top_level_params(self):
+        """tools、stream、response_format 等顶层参数 / Top-level params such as tools, stream, response_format"""
+        payload = {
+            "stream": True,
+            "tools": [{"type": "function", "function": {"name": "f"}}],
+            "response_format": {"type": "json_schema"},
+            "messages": [{"role": "assistant", "tool_calls": [{"id": "1"}]}, {"role": "tool", "content": "ok"}],
+        }
+        capabilities = ModelCapabilities(
+            supports_streaming=False, supports_function_calling=False, supports_structured_outputs=False
+        )
+        codes = [r.code for r in check_payload(capabilities, payload).rejections]
+        assert codes == ["tools", "streaming", "structured_output", "tools", "tools"]
+
+        # Vidu 模型不支持流式 / Vidu models do not stream
+        vidu = preflight(LLMeta("viduq1"), {"stream": True, "messages": []})
+        assert [r.code for r in vidu.rejections] == ["streaming"]
+
+    def test_raise_for_rejection(self):
+        """raise_for_rejection 抛出 ParamValidationError 子类 / raise_for_rejection raises a ParamValidationError"""
+        result = preflight("deepseek-chat", {"messages": [_user({"type": "input_audio", "input_audio": {}})]})
+        with pytest.raises(PreflightRejectedError, match="requires supports_audio") as excinfo:
+            result.raise_for_rejection()
+        assert isinstance(excinfo.value, ParamValidationError)
+        assert excinfo.value.result is result
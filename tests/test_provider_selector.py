@@ -0,0 +1,110 @@
+# filename: test_provider_selector.py
+# @Time    : 2026/10/19 17:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+Provider 选择器测试 / Provider selector tests
+"""
+
+import threading
+
+import pytest
+
+from whosellm import ModelFamily
+from whosellm.provider import Provider
+from whosellm.routing import ProviderSelector
+
+
+class TestProviderSelector:
+    """Provider 选择器测试类 / Provider selector test class"""
+
+    def test_candidates_for_family_and_model(self):
+        """家族返回所有 Provider，模型名只保留能匹配的 / Families list all providers, names only matching ones"""
+        selector = ProviderSelector()
+        family, providers = selector.candidates(ModelFamily.DEEPSEEK)
+        assert family == ModelFamily.DEEPSEEK
+        assert set(providers) == {Provider.DEEPSEEK, Provider.TENCENT}
+
+        # deepseek-v3 两家都能提供，deepseek-chat 只有官方 / Both serve deepseek-v3, only the official API serves deepseek-chat
+        assert set(selector.candidates("deepseek-v3")[1]) == {Provider.DEEPSEEK, Provider.TENCENT}
+        assert selector.candidates("deepseek-chat")[1] == (Provider.DEEPSEEK,)
+        assert selector.candidates("mystery-dragon-9000") == (None, ())
+        assert selector.select("mystery-dragon-9000") is None
+
+    def test_default_provider_without_samples(self):
+        """没有样本时选择默认 Provider / Without samples the default provider is selected"""
+        assert ProviderSelector().select("deepseek-v3") == Provider.DEEPSEEK
+
+    def test_shifts_to_faster_provider(self):
+        """流量切到更快的 Provider / Traffic shifts to the faster provider"""
+        selector = ProviderSelector(alpha=0.5)
+        for _ in range(5):
+            selector.record(ModelFamily.DEEPSEEK, Provider.DEEPSEEK, latency_seconds=1.5)
+            selector.record(ModelFamily.DEEPSEEK, Provider.TENCENT, latency_seconds=0.3)
+        assert selector.select("deepseek-v3") == Provider.TENCENT
+
+        # 官方变快后切回 / Switch back once the official API gets faster
+        for _ in range(10):
+            selector.record(ModelFamily.DEEPSEEK, Provider.DEEPSEEK, latency_seconds=0.1)
+        assert selector.select(ModelFamily.DEEPSEEK) == Provider.DEEPSEEK
+
+    def test_errors_are_penalized(self):
+        """错误率折算为延迟惩罚 / The error rate is converted to a latency penalty"""
+        selector = ProviderSelector(alpha=0.5, error_penalty_seconds=10.0)
+        selector.record(ModelFamily.DEEPSEEK, Provider.DEEPSEEK, latency_seconds=0.2)
+        selector.record(ModelFamily.DEEPSEEK, Provider.DEEPSEEK, error=True)
+        selector.record(ModelFamily.DEEPSEEK, Provider.TENCENT, latency_seconds=0.8)
+
+        stats = selector.stats(ModelFamily.DEEPSEEK, Provider.DEEPSEEK)
+        assert stats.latency_seconds == pytest.approx(0.2)
+        assert stats.error_rate == pytest.approx(0.5)
+        assert stats.samples == 2
+        assert selector.ranked(ModelFamily.DEEPSEEK) == [Provider.TENCENT, Provider.DEEPSEEK]
+
+    def test_failures_shift_to_untried_provider(self):
+        """持续失败的 Provider 输给尚未尝试的 Provider / A failing provider loses to one never tried"""
+        selector = ProviderSelector()
+        for _ in range(50):
+            selector.record(ModelFamily.DEEPSEEK, Provider.DEEPSEEK, error=True)
+        assert selector.stats(ModelFamily.DEEPSEEK, Provider.TENCENT).samples == 0
+        assert selector.select("deepseek-v3") == Provider.TENCENT
+
+        # 健康的 Provider 不会让位给未尝试的 / A healthy provider is not displaced by an untried one
+        healthy = ProviderSelector()
+        healthy.record(ModelFamily.DEEPSEEK, Provider.DEEPSEEK, latency_seconds=0.5)
+        assert healthy.select("deepseek-v3") == Provider.DEEPSEEK
+
+    def test_candidate_cache_bounded(self):
+        """按名称的候选缓存是有界 LRU，未知名称不会无限增长 / The per-name cache is a bounded LRU, unknown names cannot grow it"""
+        selector = ProviderSelector(max_size=4)
+        selector.candidates("deepseek-v3")
+        for index in range(50):
+            assert selector.candidates(f"mystery-dragon-{index}") == (None, ())
+            selector.candidates("deepseek-v3")  # 常用名称保持最近使用 / A hot name stays most recently used
+        assert len(selector._model_candidates) == 4
+        assert "deepseek-v3" in selector._model_candidates
+        assert set(selector.candidates("deepseek-v3")[1]) == {Provider.DEEPSEEK, Provider.TENCENT}
+
+    def test_concurrent_updates(self):
+        """并发上报不会破坏统计 / Concurrent reporting keeps stats consistent"""
+        selector = ProviderSelector()
+
+        def report() -> None:
+            for _ in range(500):
+                selector.record(ModelFamily.DEEPSEEK, Provider.TENCENT, latency_seconds=0.5)
+
+        threads = [threading.Thread(target=report) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = selector.stats(ModelFamily.DEEPSEEK, Provider.TENCENT)
+        assert stats.latency_seconds == pytest.approx(0.5)
+        assert 0 < stats.samples <= 2000
+
+    def test_invalid_alpha(self):
+        """alpha 超出范围抛出 ValueError / Out-of-range alpha raises ValueError"""
+        with pytest.raises(ValueError, match="alpha must be in"):
+            ProviderSelector(alpha=0)
@@ -0,0 +1,229 @@
+# filename: test_rate_limit.py
+# @Time    : 2026/10/19 17:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+客户端限流测试 / Client-side rate limiting tests
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from whosellm import ModelFamily
+from whosellm.capabilities import ModelCapabilities
+from whosellm.models.base import MODEL_REGISTRY, ModelInfo, register_model
+from whosellm.provider import Provider
+from whosellm.routing import ModelRateLimiter, RateLimit, TokenBucket
+
+
+class FakeClock:
+    """可手动推进的时钟 / Manually advanced clock"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    """令牌桶测试类 / Token bucket test class"""
+
+    def test_refill(self):
+        """令牌按时间补充且不超过容量 / Tokens refill over time up to capacity"""
+        clock = FakeClock()
+        bucket = TokenBucket.per_minute(60, clock=clock)
+        assert bucket.try_acquire(60)
+        assert not bucket.try_acquire(1)
+        assert bucket.time_until_available(2) == pytest.approx(2.0)
+
+        clock.now = 1.5
+        assert bucket.available == pytest.approx(1.5)
+        clock.now = 1000
+        assert bucket.available == pytest.approx(60)
+
+    def test_refund_and_validation(self):
+        """归还令牌，以及非法参数 / Refunds and invalid arguments"""
+        bucket = TokenBucket(capacity=10, refill_per_second=1, clock=FakeClock())
+        assert bucket.try_acquire(10)
+        bucket.refund(4)
+        assert bucket.available == pytest.approx(4)
+        with pytest.raises(ValueError, match="exceeds bucket capacity"):
+            bucket.try_acquire(11)
+        with pytest.raises(ValueError, match="must be positive"):
+            TokenBucket(capacity=0, refill_per_second=1)
+
+    def test_acquire_timeout(self):
+        """等待超过超时时直接失败 / Fails fast when the wait exceeds the timeout"""
+        bucket = TokenBucket(capacity=1, refill_per_second=0.01)
+        assert bucket.acquire(timeout=0)
+        assert not bucket.acquire(timeout=0.01)
+        assert not asyncio.run(bucket.acquire_async(timeout=0.01))
+
+    def test_acquire_waits_for_refill(self):
+        """阻塞等待补充 / Blocks until refilled"""
+        bucket = TokenBucket(capacity=1, refill_per_second=100)
+        assert bucket.try_acquire()
+        assert bucket.acquire(timeout=1)
+        assert asyncio.run(bucket.acquire_async(timeout=1))
+
+
+class TestModelRateLimiter:
+    """模型限流器测试类 / Model rate limiter test class"""
+
+    def test_aliases_share_identity(self):
+        """别名解析为同一身份 / Aliases resolve to the same identity"""
+        limiter = ModelRateLimiter()
+        plain, _ = limiter.resolve("gpt-4o")
+        prefixed, _ = limiter.resolve("openai::gpt-4o")
+        assert plain == prefixed
+        assert plain.provider == Provider.OPENAI
+
+    def test_model_limits_shared_across_aliases(self):
+        """别名共享模型级 RPM / Aliases share the model-level RPM"""
+        limiter = ModelRateLimiter(model_limits={"gpt-4o": RateLimit(requests_per_minute=2)}, clock=FakeClock())
+        assert limiter.try_acquire("gpt-4o")
+        assert limiter.try_acquire("openai::gpt-4o")
+        assert not limiter.try_acquire("gpt-4o")
+        # 其他模型不受影响 / Other models are unaffected
+        assert limiter.try_acquire("gpt-4.1-mini")
+
+    def test_provider_and_token_limits(self):
+        """Provider 级 RPM 与 TPM 同时生效，失败时不扣额度 / Provider RPM and TPM both apply, nothing taken on failure"""
+        limiter = ModelRateLimiter(
+            provider_limits={Provider.OPENAI: RateLimit(requests_per_minute=10, tokens_per_minute=1000)},
+            clock=FakeClock(),
+        )
+        assert limiter.try_acquire("gpt-4o", tokens=800)
+        assert not limiter.try_acquire("gpt-4.1-mini", tokens=300)
+        # TPM 失败时 RPM 未被扣除 / The RPM was not consumed by the failed TPM attempt
+        for _ in range(9):
+            assert limiter.try_acquire("gpt-4.1-mini")
+        assert not limiter.try_acquire("gpt-4.1-mini")
+        # 其他 Provider 不受影响 / Other providers are unaffected
+        assert limiter.try_acquire("claude-opus-4-5", tokens=5000)
+
+    def test_capability_limits(self):
+        """模型级限额默认取自 ModelCapabilities / Model-level limits default to ModelCapabilities"""
+        register_model(
+            "_test-capped-model",
+            ModelInfo(
+                provider=Provider.OPENAI,
+                family=ModelFamily.GPT,
+                version="0.1",
+                variant="capped",
+                capabilities=ModelCapabilities(max_requests_per_minute=1, max_tokens_per_minute=100),
+                version_tuple=(0, 1),
+            ),
+        )
+        try:
+            limiter = ModelRateLimiter(clock=FakeClock())
+            assert limiter.resolve("_test-capped-model")[1] == RateLimit(requests_per_minute=1, tokens_per_minute=100)
+            assert limiter.try_acquire("_test-capped-model", tokens=50)
+            assert not limiter.try_acquire("_test-capped-model", tokens=50)
+            assert ModelRateLimiter(use_capability_limits=False).resolve("_test-capped-model")[1] == RateLimit()
+        finally:
+            MODEL_REGISTRY.pop("_test-capped-model", None)
+
+    def test_concurrency_limit(self):
+        """并发上限 / Concurrency cap"""
+        limiter = ModelRateLimiter(provider_limits={Provider.OPENAI: RateLimit(max_concurrency=1)})
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold() -> None:
+            with limiter.limit("gpt-4o"):
+                entered.set()
+                release.wait(2)
+
+        worker = threading.Thread(target=hold)
+        worker.start()
+        assert entered.wait(2)
+        with pytest.raises(TimeoutError, match="concurrency slot"), limiter.limit("openai::gpt-4o", timeout=0.01):
+            pass
+        release.set()
+        worker.join()
+        with limiter.limit("gpt-4o") as identity:
+            assert identity.provider == Provider.OPENAI
+
+    def test_oversized_tokens_fail_fast(self):
+        """超过 TPM 限额的请求立即失败，不等待并发槽位 / Requests above the TPM limit fail without waiting for a slot"""
+        limiter = ModelRateLimiter(
+            provider_limits={Provider.OPENAI: RateLimit(tokens_per_minute=1000, max_concurrency=1)},
+            clock=FakeClock(),
+        )
+        with limiter.limit("gpt-4o"):
+            start = time.monotonic()
+            with (
+                pytest.raises(ValueError, match="exceeds the TPM limit"),
+                limiter.limit("gpt-4o", tokens=1001, timeout=1),
+            ):
+                pass
+            assert time.monotonic() - start < 0.1
+        with pytest.raises(ValueError, match="exceeds the TPM limit"):
+            limiter.try_acquire("gpt-4o", tokens=1001)
+
+    def test_timeout_shared_by_slot_and_budget(self):
+        """并发槽位与令牌桶共用一个截止时间 / The slot wait and the budget wait share one deadline"""
+        # RPM=150 时补充一个请求需 0.4 秒；时钟不推进，桶只会按建议时长等待
+        # At RPM=150 one request takes 0.4s to refill; the clock is frozen so the bucket only waits as suggested
+        limiter = ModelRateLimiter(
+            provider_limits={Provider.OPENAI: RateLimit(requests_per_minute=150, max_concurrency=1)},
+            clock=FakeClock(),
+        )
+        entered = threading.Event()
+
+        def hold() -> None:
+            with limiter.limit("gpt-4o"):
+                entered.set()
+                time.sleep(0.2)
+
+        worker = threading.Thread(target=hold)
+        worker.start()
+        assert entered.wait(2)
+        # 占住槽位的调用已用掉 1 个请求，耗尽其余额度 / The slot holder used 1 request, drain the rest
+        for _ in range(149):
+            assert limiter.try_acquire("gpt-4o")
+        start = time.monotonic()
+        # 等待槽位约 0.2 秒后只剩约 0.3 秒，不足以等待 0.4 秒的补充 /
+        # After ~0.2s waiting for the slot only ~0.3s remain, not enough for the 0.4s refill
+        with pytest.raises(TimeoutError, match="rate limit budget"), limiter.limit("gpt-4o", timeout=0.5):
+            pass
+        assert time.monotonic() - start < 0.45
+        worker.join()
+
+    def test_async_limit(self):
+        """asyncio 版本的并发上限 / asyncio concurrency cap"""
+        limiter = ModelRateLimiter(provider_limits={Provider.OPENAI: RateLimit(max_concurrency=2)})
+        active = 0
+        peak = 0
+
+        async def call() -> None:
+            nonlocal active, peak
+            async with limiter.limit_async("gpt-4o"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        async def main() -> None:
+            await asyncio.gather(*(call() for _ in range(6)))
+
+        asyncio.run(main())
+        assert peak == 2
+
+    def test_async_slot_timeout(self):
+        """asyncio 并发槽位超时抛出限流器自己的错误 / asyncio slot timeouts raise the limiter's own error"""
+        limiter = ModelRateLimiter(provider_limits={Provider.OPENAI: RateLimit(max_concurrency=1)})
+
+        async def main() -> None:
+            async with limiter.limit_async("gpt-4o"):
+                with pytest.raises(TimeoutError, match="concurrency slot"):
+                    async with limiter.limit_async("gpt-4o", timeout=0.01):
+                        pass
+
+        asyncio.run(main())
@@ -0,0 +1,134 @@
+# filename: test_router.py
+# @Time    : 2026/10/19 16:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+模型路由测试 / Model router tests
+"""
+
+from itertools import pairwise
+
+import pytest
+
+from whosellm import LLMeta, ModelFamily
+from whosellm.capabilities import ModelCapabilities
+from whosellm.catalog.index import get_capability_index
+from whosellm.models import registry
+from whosellm.models.config import ModelFamilyConfig, SpecificModelConfig
+from whosellm.models.registry import _FAMILY_CONFIGS
+from whosellm.provider import Provider
+from whosellm.routing import ModelRouter, Requirements, route
+
+
+class TestRequirements:
+    """需求测试类 / Requirements test class"""
+
+    def test_hashable_and_normalized(self):
+        """集合字段被规范化为 frozenset，可作为键 / Collections are normalized to frozenset and hashable"""
+        first = Requirements(capabilities={"supports_vision"}, providers={Provider.OPENAI})
+        second = Requirements(capabilities=frozenset({"supports_vision"}), providers=frozenset({Provider.OPENAI}))
+        assert first == second
+        assert hash(first) == hash(second)
+
+    def test_validation(self):
+        """未知能力与负数 token 抛出 ValueError / Unknown capabilities and negative tokens raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown capability fields"):
+            Requirements(capabilities=frozenset({"supports_telepathy"}))
+        with pytest.raises(ValueError, match="must not be negative"):
+            Requirements(input_tokens=-1)
+
+    def test_context_window_includes_output(self):
+        """上下文窗口需同时容纳输入与输出 / The context window must hold both input and output"""
+        assert Requirements(input_tokens=150_000, output_tokens=8_000).min_context_window == 158_000
+        assert Requirements().min_context_window is None
+
+
+class TestModelRouter:
+    """路由器测试类 / Router test class"""
+
+    def test_candidates_satisfy_requirements(self):
+        """候选均满足需求 / Every candidate satisfies the requirements"""
+        needs = Requirements(
+            capabilities=frozenset({"supports_vision", "supports_structured_outputs", "supports_streaming"}),
+            input_tokens=150_000,
+        )
+        candidates = route(needs)
+        assert candidates
+        for entry in candidates:
+            caps = entry.capabilities
+            assert caps.supports_vision and caps.supports_structured_outputs and caps.supports_streaming
+            assert caps.context_window is not None and caps.context_window >= 150_000
+
+    def test_ranked_by_llmeta_order(self):
+        """同一家族内按 LLMeta 顺序从高到低 / Best first by LLMeta order within a family"""
+        candidates = route(Requirements(families=frozenset({ModelFamily.GPT}), providers=frozenset({Provider.OPENAI})))
+        models = [LLMeta(entry.qualified_name) for entry in candidates]
+        assert len(models) > 2
+        for higher, lower in pairwise(models):
+            assert higher >= lower
+
+    def test_memoized_per_signature(self):
+        """相同签名命中缓存 / Identical signatures hit the cache"""
+        router = ModelRouter()
+        needs = Requirements(capabilities=frozenset({"supports_pdf"}))
+        first = router.route(needs)
+        second = router.route(Requirements(capabilities=frozenset({"supports_pdf"})))
+        assert first is second
+        assert (router.hits, router.misses) == (1, 1)
+
+    def test_token_counts_bucketed(self):
+        """token 数分桶后命中缓存，结果仍按精确值过滤 / Token counts share bucketed entries, results stay exact"""
+        router = ModelRouter()
+        index = get_capability_index()
+        for input_tokens in range(120_000, 140_000, 1_000):
+            needs = Requirements(input_tokens=input_tokens, output_tokens=input_tokens // 10)
+            expected = {entry.qualified_name for entry in index.query(**needs.to_criteria())}
+            assert {entry.qualified_name for entry in router.route(needs)} == expected
+        assert len(router) <= 2
+        assert router.hits >= 18
+
+    def test_cache_bounded(self):
+        """缓存按 LRU 限制容量 / The cache is bounded LRU"""
+        router = ModelRouter(max_size=2)
+        pdf, vision, audio = (
+            Requirements(capabilities=frozenset({name}))
+            for name in ("supports_pdf", "supports_vision", "supports_audio")
+        )
+        router.route(pdf)
+        router.route(vision)
+        router.route(pdf)
+        router.route(audio)
+        assert len(router) == 2
+        router.route(pdf)
+        assert router.hits == 2
+        router.route(vision)
+        assert router.misses == 4
+
+    def test_invalidated_on_registry_change(self):
+        """注册新配置后缓存失效 / The cache is dropped after a new config is registered"""
+        router = ModelRouter()
+        needs = Requirements(input_tokens=900_000_000)
+        assert router.route(needs) == ()
+
+        ModelFamily.add_member("_TEST_ROUTER", "_test-router")
+        try:
+            ModelFamilyConfig(
+                family=ModelFamily._TEST_ROUTER,
+                provider=Provider.OPENAI,
+                patterns=["_test-router-{variant:variant}"],
+                specific_models={
+                    "_test-router-galactic": SpecificModelConfig(
+                        version_default="1.0",
+                        variant_default="galactic",
+                        capabilities=ModelCapabilities(context_window=1_000_000_000),
+                    ),
+                },
+            )
+            assert [entry.name for entry in router.route(needs)] == ["_test-router-galactic"]
+            assert router.misses == 2
+        finally:
+            _FAMILY_CONFIGS.pop((ModelFamily._TEST_ROUTER, Provider.OPENAI), None)
+            # 直接移除配置不会递增代数，手动递增使派生缓存失效 / Popping a config does not bump the generation
+            registry._REGISTRY_GENERATION += 1
+        assert router.route(needs) == ()
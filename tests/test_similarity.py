@@ -0,0 +1,79 @@
+# filename: test_similarity.py
+# @Time    : 2026/10/19 18:50
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+能力相似度检索测试 / Capability similarity search tests
+"""
+
+import pytest
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.catalog import SimilarityIndex, SimilarityWeights, build_catalog, get_similarity_index, nearest_models
+from whosellm.models.base import get_model_info
+
+
+class TestSimilarityIndex:
+    """相似度索引测试类 / Similarity index test class"""
+
+    def test_encode_bits_and_normalization(self):
+        """布尔字段编码为位，数值归一化到 [0, 1] / Bools become bits, numerics are normalized to [0, 1]"""
+        index = get_similarity_index()
+        plain = index.encode(ModelCapabilities())
+        vector = index.encode(ModelCapabilities(supports_thinking=True, supports_vision=True))
+        assert (vector.bits ^ plain.bits).bit_count() == 2
+        assert all(value is None or 0.0 <= value <= 1.0 for value in vector.numeric)
+        assert all(0.0 <= value <= 1.0 for vec in index.vectors for value in vec.numeric if value is not None)
+
+    def test_distance(self):
+        """Hamming 加数值 L1，None 与非 None 记为 1 / Hamming plus numeric L1, None vs value counts as 1"""
+        index = SimilarityIndex(build_catalog())
+        plain = index.encode(ModelCapabilities())
+        thinking_vision = index.encode(ModelCapabilities(supports_thinking=True, supports_vision=True))
+        assert index.distance(plain, plain) == 0.0
+        assert index.distance(plain, thinking_vision) == 2.0
+
+        weights = SimilarityWeights(bool_weights={"supports_vision": 5.0})
+        assert index.distance(plain, thinking_vision, weights) == 6.0
+
+        with_context = index.encode(ModelCapabilities(context_window=128000))
+        assert index.distance(plain, with_context) == 1.0
+        assert index.distance(plain, with_context, SimilarityWeights(numeric_weights={"context_window": 0.5})) == 0.5
+
+    def test_unknown_weight_field(self):
+        """未知字段抛出 ValueError / Unknown fields raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown capability fields"):
+            SimilarityWeights(bool_weights={"supports_telepathy": 1.0})
+
+    def test_nearest_matches_brute_force(self):
+        """结果与暴力计算一致且升序 / Results match brute force in ascending order"""
+        index = get_similarity_index()
+        info = get_model_info("gemini-3-pro-preview")
+        results = index.nearest("gemini-3-pro-preview", k=8)
+        assert len(results) == 8
+        distances = [distance for _entry, distance in results]
+        assert distances == sorted(distances)
+
+        query = index.encode(info.capabilities)
+        expected = sorted(
+            index.distance(query, vector)
+            for entry, vector in zip(index.entries, index.vectors, strict=True)
+            if (entry.provider, entry.family, entry.version, entry.variant)
+            != (info.provider, info.family, info.version, info.variant)
+        )[:8]
+        assert distances == expected
+
+        # 模型本身被排除 / The model itself is excluded
+        assert all(entry.name != "gemini-3-pro-preview" for entry, _distance in results)
+
+    def test_nearest_by_capabilities(self):
+        """可以直接用能力查询 / Capabilities can be queried directly"""
+        capabilities = get_model_info("gpt-4o-mini").capabilities
+        entry, distance = nearest_models(capabilities, k=1)[0]
+        assert distance == 0.0
+        assert entry.capabilities == capabilities
+
+    def test_index_is_cached(self):
+        """索引按注册表代数缓存 / The index is cached per registry generation"""
+        assert get_similarity_index() is get_similarity_index()
@@ -0,0 +1,91 @@
+# filename: test_specifiers.py
+# @Time    : 2026/10/19 19:50
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+模型约束测试 / Model specifier tests
+"""
+
+from datetime import date
+
+import pytest
+
+from whosellm import LLMeta, ModelFamily
+from whosellm.catalog import compile_specifier, query_models
+from whosellm.catalog.specifiers import SpecifierFields
+from whosellm.models.base import get_model_info
+from whosellm.provider import Provider
+
+
+class TestModelSpecifier:
+    """模型约束测试类 / Model specifier test class"""
+
+    def test_family_version_and_variant_set(self):
+        """家族 + 版本 + 型号集合 / Family + version + variant set"""
+        spec = compile_specifier("gpt >= 5.2, variant in {mini, nano}")
+        assert spec("gpt-5.2-mini")
+        assert not spec("gpt-5-mini")
+        assert not spec("gpt-5.2")
+        assert not spec("claude-opus-4-5")
+
+    def test_family_variant_head(self):
+        """``claude-opus`` 拆分为家族与型号 / ``claude-opus`` splits into family and variant"""
+        spec = compile_specifier("claude-opus >= 4.5")
+        assert spec(LLMeta("claude-opus-4-5"))
+        assert not spec("claude-sonnet-4-6")
+        assert not spec("claude-opus-4-1")
+        # gpt-4o 本身是家族名，优先于 gpt + 型号 4o / gpt-4o is a family itself, preferred over gpt + variant 4o
+        assert compile_specifier("gpt-4o-mini").clauses[0].value == ModelFamily.GPT_4O
+
+    def test_version_semantics(self):
+        """版本比较沿用 parse_version 且忽略尾随零 / Versions follow parse_version and ignore trailing zeros"""
+        assert compile_specifier("gpt == 5")("gpt-5")
+        assert compile_specifier("version == 5.0.0, family == gpt")("gpt-5")
+        assert compile_specifier("gpt < 5.1")("gpt-5")
+        assert not compile_specifier("gpt != 5")("gpt-5")
+
+    def test_provider_and_release_date(self):
+        """Provider 与发布日期条件 / Provider and release date clauses"""
+        spec = compile_specifier("provider == openai, variant not in {mini, nano}")
+        assert spec("gpt-5")
+        assert not spec("gpt-5-mini")
+        assert not spec("claude-opus-4-5")
+
+        fields = SpecifierFields.of(get_model_info("gpt-5"))
+        dated = SpecifierFields(fields.family, fields.provider, fields.version, fields.variant, date(2025, 8, 7))
+        assert compile_specifier("release_date >= 2025-01-01").matches(dated)
+        assert not compile_specifier("release_date < 2025-01-01").matches(dated)
+        assert not compile_specifier("release_date >= 2025-01-01").matches(fields)
+
+    def test_bulk_filter(self):
+        """批量过滤与逐个求值一致 / Bulk filtering agrees with evaluating one by one"""
+        spec = compile_specifier("claude-opus >= 4.5")
+        expected = [entry for entry in query_models() if spec(entry.qualified_name)]
+        assert spec.filter() == expected
+        assert {entry.variant for entry in expected} == {"opus"}
+
+        deepseek = compile_specifier("provider in {tencent}").filter()
+        assert deepseek
+        assert all(entry.provider == Provider.TENCENT for entry in deepseek)
+
+    def test_compiled_once(self):
+        """相同文本只编译一次 / The same text is compiled once"""
+        assert compile_specifier("gpt >= 5") is compile_specifier("gpt >= 5")
+
+    @pytest.mark.parametrize(
+        ("text", "message"),
+        [
+            ("", "Empty specifier"),
+            ("dragon >= 1", "Unknown model family"),
+            ("provider == nowhere", "Unknown provider"),
+            ("variant >= mini", "only supports == and !="),
+            ("version in {1, 2}", "only supports"),
+            ("release_date > yesterday", "YYYY-MM-DD"),
+            ("gpt >=", "Invalid specifier clause"),
+        ],
+    )
+    def test_invalid(self, text, message):
+        """非法约束抛出 ValueError / Invalid specifiers raise ValueError"""
+        with pytest.raises(ValueError, match=message):
+            compile_specifier(text)
@@ -0,0 +1,98 @@
+# filename: test_timeline.py
+# @Time    : 2026/10/19 19:30
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+模型时间线测试 / Model timeline tests
+"""
+
+from itertools import pairwise
+
+import pytest
+
+from whosellm import LLMeta, ModelFamily
+from whosellm.capabilities import ModelCapabilities
+from whosellm.catalog import ModelTimeline, get_timeline
+from whosellm.models.config import ModelFamilyConfig, SpecificModelConfig
+from whosellm.models.registry import _FAMILY_CONFIGS, get_family_generation
+from whosellm.provider import Provider
+
+
+class TestModelTimeline:
+    """模型时间线测试类 / Model timeline test class"""
+
+    def test_family_order_matches_llmeta(self):
+        """时间线顺序与 LLMeta 比较一致 / Timeline order agrees with LLMeta comparison"""
+        timeline = get_timeline()
+        for family in (ModelFamily.CLAUDE, ModelFamily.GLM, ModelFamily.GPT):
+            entries = timeline.entries(family)
+            assert entries
+            for older, newer in pairwise(entries):
+                assert not LLMeta(newer.qualified_name) < LLMeta(older.qualified_name)
+
+    def test_newest_and_oldest(self):
+        """最新 / 最旧模型 / Newest and oldest models"""
+        timeline = get_timeline()
+        newest = timeline.newest(ModelFamily.CLAUDE)
+        assert newest is not None
+        assert all(
+            not LLMeta(newest.qualified_name) < LLMeta(e.qualified_name) for e in timeline.entries(ModelFamily.CLAUDE)
+        )
+        assert timeline.oldest(ModelFamily.GLM).name == "glm-3"
+
+    def test_range_queries(self):
+        """更新 / 更旧 / 区间查询 / Newer, older and range queries"""
+        timeline = get_timeline()
+        base = LLMeta("claude-sonnet-4-5")
+        newer = timeline.newer_than("claude-sonnet-4-5")
+        assert newer
+        assert all(base < LLMeta(entry.qualified_name) for entry in newer)
+        assert "claude-sonnet-4-5" not in [entry.name for entry in newer]
+        assert "claude-sonnet-4-5" in [entry.name for entry in timeline.newer_than("claude-sonnet-4-5", inclusive=True)]
+
+        older = timeline.older_than("claude-sonnet-4-5")
+        assert all(LLMeta(entry.qualified_name) < base for entry in older)
+        assert len(older) + len(newer) + 1 == len(timeline.entries(ModelFamily.CLAUDE))
+
+        assert [entry.name for entry in timeline.between("glm-4.5", "glm-4.6")] == ["glm-4.5", "glm-4.5-x", "glm-4.6"]
+        with pytest.raises(ValueError, match="same family"):
+            timeline.between("glm-4.5", "gpt-5")
+
+    def test_successor_and_predecessor(self):
+        """后继 / 前驱 / Successor and predecessor"""
+        timeline = get_timeline()
+        assert timeline.successor("glm-4.6").name == "glm-4.7-flash"
+        assert timeline.predecessor("glm-4.6").name == "glm-4.5-x"
+        newest = timeline.newest(ModelFamily.GLM)
+        assert timeline.successor(newest.name) is None
+
+    def test_incremental_rebuild(self):
+        """只重建注册表中变化的家族 / Only families that changed in the registry are rebuilt"""
+        timeline = ModelTimeline()
+        timeline.entries(ModelFamily.GPT)
+        initial = timeline.rebuilds
+        timeline.entries(ModelFamily.CLAUDE)
+        assert timeline.rebuilds == initial
+
+        ModelFamily.add_member("_TEST_TIMELINE", "_test-timeline")
+        try:
+            ModelFamilyConfig(
+                family=ModelFamily._TEST_TIMELINE,
+                provider=Provider.OPENAI,
+                patterns=["_test-timeline-{version}"],
+                specific_models={
+                    "_test-timeline-2": SpecificModelConfig(
+                        version_default="2.0", variant_default="base", capabilities=ModelCapabilities()
+                    ),
+                    "_test-timeline-1": SpecificModelConfig(
+                        version_default="1.0", variant_default="base", capabilities=ModelCapabilities()
+                    ),
+                },
+            )
+            assert get_family_generation(ModelFamily._TEST_TIMELINE) > 0
+            names = [entry.name for entry in timeline.entries(ModelFamily._TEST_TIMELINE)]
+            assert names == ["_test-timeline-1", "_test-timeline-2"]
+            assert timeline.rebuilds == initial + 1
+        finally:
+            _FAMILY_CONFIGS.pop((ModelFamily._TEST_TIMELINE, Provider.OPENAI), None)
@@ -0,0 +1,97 @@
+# filename: test_token_estimator.py
+# @Time    : 2026/10/19 22:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+token 估算测试 / Token estimation tests
+"""
+
+from whosellm import LLMeta, ModelFamily
+from whosellm.tokens import (
+    Calibration,
+    context_budget,
+    estimate_tokens,
+    estimate_tokens_many,
+    get_estimator,
+    register_tokenizer,
+    unregister_tokenizer,
+)
+from whosellm.tokens.estimator import REPLY_PRIMING_TOKENS, TOKENS_PER_MESSAGE, HeuristicCounter
+
+
+class TestHeuristic:
+    """启发式估算测试类 / Heuristic estimation test class"""
+
+    def test_calibration(self):
+        """ASCII 与 CJK 分别按校准折算 / ASCII and CJK use their own calibration"""
+        counter = HeuristicCounter(Calibration(chars_per_token=4.0, tokens_per_non_ascii=0.5))
+        assert counter("") == 0
+        assert counter("a" * 40) == 10
+        assert counter("你" * 40) == 20
+        assert counter("a" * 40 + "你" * 40) == 30
+
+    def test_non_ascii_width_independent(self):
+        """2 字节与 4 字节字符与 CJK 一样按字符计数 / 2-byte and 4-byte characters count per character like CJK"""
+        counter = HeuristicCounter(Calibration(chars_per_token=4.0, tokens_per_non_ascii=0.5))
+        assert counter("é" * 100) == 50
+        assert counter("Привет" * 10) == 30
+        assert counter("\U0001f600" * 40) == 20
+        assert counter("a" * 40 + "é" * 40) == 30
+
+    def test_family_calibration(self):
+        """中文优化的家族对 CJK 估算更少 / Families tuned for Chinese estimate fewer CJK tokens"""
+        text = "大语言模型的上下文窗口" * 100
+        assert estimate_tokens("glm-4.6", text) < estimate_tokens("claude-sonnet-4-5", text)
+        assert get_estimator(LLMeta("gpt-4o")) is get_estimator(ModelFamily.GPT_4O)
+        assert estimate_tokens_many("gpt-4o", ["a" * 42, "", "b" * 84]) == [10, 0, 20]
+
+
+class TestExactTokenizer:
+    """注册精确分词器测试类 / Registered exact tokenizer test class"""
+
+    def test_register_and_batch(self):
+        """注册的分词器替换启发式估算，消息只批量调用一次 / Registered tokenizers replace the heuristic, messages batch once"""
+        batches = []
+
+        def count_many(texts):
+            batches.append(list(texts))
+            return [len(text.split()) for text in texts]
+
+        register_tokenizer(ModelFamily.QWEN, lambda text: len(text.split()), count_many)
+        try:
+            estimator = get_estimator("qwen-max")
+            assert estimator.exact
+            assert estimate_tokens("qwen-max", "one two three") == 3
+            messages = [
+                {"role": "system", "content": "be brief"},
+                {"role": "user", "name": "jqq", "content": [{"type": "text", "text": "a b c"}, {"type": "image_url"}]},
+            ]
+            assert estimator.count_messages(iter(messages)) == 2 + 3 + 2 * TOKENS_PER_MESSAGE + 1 + REPLY_PRIMING_TOKENS
+            assert batches[-1] == ["be brief", "a b c"]
+        finally:
+            unregister_tokenizer(ModelFamily.QWEN)
+        assert not get_estimator("qwen-max").exact
+
+    def test_incremental_counter(self):
+        """增量计数与一次性计数一致 / Incremental counting agrees with one-shot counting"""
+        estimator = get_estimator("gpt-4o")
+        messages = [{"role": "user", "content": "hello " * 50}, {"role": "assistant", "content": "你好" * 30}]
+        counter = estimator.message_counter()
+        for message in messages:
+            counter.add(message)
+        assert counter.total == estimator.count_messages(messages)
+        assert counter.messages == 2
+        before = counter.total
+        assert counter.add_text("more streamed text") > before
+        assert counter.fits(counter.total)
+        assert not counter.fits(counter.total - 1)
+
+    def test_context_budget(self):
+        """上下文预算 / Context budget"""
+        capabilities = LLMeta("gpt-4o").capabilities
+        messages = [{"role": "user", "content": "hi"}]
+        prompt = get_estimator("gpt-4o").count_messages(messages)
+        assert context_budget("gpt-4o", messages) == capabilities.context_window - capabilities.max_tokens - prompt
+        assert context_budget("gpt-4o", messages, max_tokens=0) == capabilities.context_window - prompt
+        assert context_budget("mystery-dragon-9000") is None
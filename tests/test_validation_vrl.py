@@ -0,0 +1,196 @@
+# filename: test_validation_vrl.py
+# @Time    : 2026/10/19 20:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+VRL 参数验证测试 / VRL parameter validation tests
+"""
+
+import pytest
+
+from whosellm import LLMeta, ModelFamily
+from whosellm.capabilities import ModelCapabilities
+from whosellm.validation import (
+    ParamValidationError,
+    ParamValidator,
+    build_validation_program,
+    clear_validation_scripts,
+    register_validation_script,
+    validate_params_many,
+)
+
+
+class TestVRLValidation:
+    """VRL 参数验证测试类 / VRL parameter validation test class"""
+
+    def test_clamps_max_tokens(self):
+        """max_tokens 截断到模型上限 / max_tokens is clamped to the model limit"""
+        model = LLMeta("gpt-4o")
+        params = {"max_tokens": 1_000_000, "messages": [{"role": "user", "content": "hi"}]}
+        validated = model.validate_params(params)
+        assert validated["max_tokens"] == model.capabilities.max_tokens
+        assert validated["messages"] == params["messages"]
+        # 原始参数不被修改 / The original params are untouched
+        assert params["max_tokens"] == 1_000_000
+
+        assert model.validate_params({"max_tokens": 10}) == {"max_tokens": 10}
+
+    def test_drops_unsupported_params(self):
+        """删除模型不支持的参数 / Params the model does not support are dropped"""
+        validator = ParamValidator()
+        capabilities = ModelCapabilities(supports_function_calling=False, supports_thinking=False)
+        source = build_validation_program(capabilities)
+        assert "del(.tools)" in source
+        assert "del(.reasoning_effort)" in source
+
+        validated = validator.validate("gpt-4o", {"reasoning_effort": "high", "tools": [], "stream": True})
+        assert "reasoning_effort" not in validated
+        assert validated["tools"] == []
+        assert validated["stream"] is True
+
+    def test_response_format_downgrade(self):
+        """不支持结构化输出时降级为 JSON 模式 / json_schema is downgraded to JSON mode when unsupported"""
+        source = build_validation_program(
+            ModelCapabilities(supports_structured_outputs=False, supports_json_outputs=True)
+        )
+        validator = ParamValidator()
+        result = validator._runtime.execute(source + "\n.", {"response_format": {"type": "json_schema"}})
+        assert result.processed_event == {"response_format": {"type": "json_object"}}
+
+    def test_invalid_params(self):
+        """非法参数抛出 ParamValidationError / Invalid params raise ParamValidationError"""
+        validator = ParamValidator()
+        with pytest.raises(ParamValidationError, match="temperature must be a number") as excinfo:
+            validator.validate("gpt-4o", {"temperature": "hot"})
+        assert excinfo.value.model == "gpt-4o"
+        assert excinfo.value.reason == "temperature must be a number"
+        assert "abort" in excinfo.value.diagnostic
+
+        with pytest.raises(ValueError, match="max_tokens must be a positive integer"):
+            validator.validate("gpt-4o", {"max_tokens": 0})
+
+    def test_null_max_tokens_allowed(self):
+        """SDK 风格的 None 视为未设置 / SDK-style None is treated as unset"""
+        validator = ParamValidator()
+        assert validator.validate("gpt-4o", {"max_tokens": None}) == {"max_tokens": None}
+        assert validator.validate("gpt-4o", {"max_completion_tokens": None, "temperature": None}) == {
+            "max_completion_tokens": None,
+            "temperature": None,
+        }
+
+    def test_unconvertible_values(self):
+        """元组转为列表，bytes / NaN 报告为 ParamValidationError / Tuples become lists, bytes / NaN raise ParamValidationError"""
+        validator = ParamValidator()
+        params = {"stop": ("a", "b"), "metadata": {"tags": [("x", 1)]}}
+        assert validator.validate("gpt-4o", params) == {"stop": ["a", "b"], "metadata": {"tags": [["x", 1]]}}
+        assert params["stop"] == ("a", "b")
+
+        with pytest.raises(ParamValidationError, match="Unsupported parameter value") as excinfo:
+            validator.validate("gpt-4o", {"user": b"raw"})
+        assert excinfo.value.model == "gpt-4o"
+        with pytest.raises(ParamValidationError, match="Unsupported parameter value"):
+            validator.validate("gpt-4o", {"metadata": {1: "x"}})
+        with pytest.raises(ParamValidationError, match="finite numbers"):
+            validator.validate("gpt-4o", {"temperature": float("nan")})
+        with pytest.raises(ParamValidationError, match="finite numbers"):
+            validator.validate("gpt-4o", {"logit_bias": {"50256": float("-inf")}})
+
+    def test_compiled_once_per_identity(self):
+        """同一身份只编译一次 / Compiled once per identity"""
+        validator = ParamValidator()
+        validator.validate("gpt-4o", {"max_tokens": 1})
+        validator.validate("openai::gpt-4o", {"max_tokens": 2})
+        validator.validate(LLMeta("gpt-4o"), {"max_tokens": 3})
+        assert validator.compilations == 1
+        validator.validate("gpt-4o-mini", {"max_tokens": 3})
+        assert validator.compilations == 2
+
+    def test_same_identity_different_capabilities(self):
+        """身份相同但能力不同的模型各用各的程序 / Models sharing an identity but not capabilities get their own program"""
+        schema = {"response_format": {"type": "json_schema", "json_schema": {"name": "x", "schema": {}}}}
+        preview, stable = "gemini-3-pro-image-preview", "gemini-3-pro-image"
+        assert LLMeta(preview).capabilities.supports_structured_outputs
+        assert not LLMeta(stable).capabilities.supports_structured_outputs
+        for order in ((preview, stable), (stable, preview)):
+            validator = ParamValidator()
+            results = {model: validator.validate(model, schema) for model in order}
+            assert results[preview] == schema
+            assert results[stable] == {}
+            assert validator.compilations == 2
+
+    def test_custom_scripts(self):
+        """自定义脚本按家族 / 型号生效并使缓存失效 / Custom scripts apply per family / variant and invalidate caches"""
+        validator = ParamValidator()
+        validator.validate("glm-4.5", {})
+        try:
+            register_validation_script(
+                ModelFamily.GLM,
+                "if exists(.temperature) && to_float!(.temperature) > 1.0 { .temperature = 1.0 }",
+            )
+            register_validation_script(ModelFamily.GLM, '.variant_tag = "air"', variant="air")
+            assert validator.validate("glm-4.5", {"temperature": 1.7}) == {"temperature": 1.0}
+            assert validator.validate("glm-4.5-air", {}) == {"variant_tag": "air"}
+            assert validator.validate("gpt-4o", {"temperature": 1.7}) == {"temperature": 1.7}
+        finally:
+            clear_validation_scripts()
+        assert validator.validate("glm-4.5", {"temperature": 1.7}) == {"temperature": 1.7}
+
+        with pytest.raises(ValueError, match="Invalid VRL script"):
+            register_validation_script(ModelFamily.GLM, ".x = ")
+
+
+class TestBatchValidation:
+    """批量参数验证测试类 / Batch parameter validation test class"""
+
+    def test_validate_many_aligned(self):
+        """结果与输入对齐，失败不影响其他请求 / Results align with inputs, failures do not affect others"""
+        validator = ParamValidator()
+        params_list = [{"max_tokens": 10**6}, {"temperature": "hot"}, {"max_tokens": 5}]
+        results = validator.validate_many("gpt-4o", params_list)
+        assert results[0] == {"max_tokens": LLMeta("gpt-4o").capabilities.max_tokens}
+        assert isinstance(results[1], ParamValidationError)
+        assert results[1].reason == "temperature must be a number"
+        assert results[2] == {"max_tokens": 5}
+        assert validator.compilations == 1
+
+    def test_validate_many_unconvertible_item(self):
+        """无法转换的请求只影响自己的位置 / An unconvertible request only fails its own slot"""
+        results = validate_params_many(
+            "gpt-4o", [{"max_tokens": 5}, {"x": b"raw"}, {"temperature": float("nan")}, {"stop": ("a",)}]
+        )
+        assert results[0] == {"max_tokens": 5}
+        assert isinstance(results[1], ParamValidationError)
+        assert isinstance(results[2], ParamValidationError)
+        assert results[3] == {"stop": ["a"]}
+
+    def test_validate_mixed_groups_by_identity(self):
+        """不同模型按解析后的身份分组 / Mixed models are grouped by resolved identity"""
+        validator = ParamValidator()
+        requests = [
+            ("gpt-4o", {"max_tokens": 10**6}),
+            ("glm-4.5", {"max_tokens": 10**6}),
+            ("openai::gpt-4o", {"max_tokens": 10**6}),
+            (LLMeta("glm-4.5"), {"max_tokens": 0}),
+        ]
+        results = validator.validate_mixed(requests)
+        assert results[0] == results[2] == {"max_tokens": LLMeta("gpt-4o").capabilities.max_tokens}
+        assert results[1] == {"max_tokens": LLMeta("glm-4.5").capabilities.max_tokens}
+        assert isinstance(results[3], ParamValidationError)
+        assert results[3].model == "glm-4.5"
+        assert validator.compilations == 2
+
+        # 与逐个验证一致 / Agrees with validating one by one
+        assert validator.validate("glm-4.5", {"max_tokens": 10**6}) == results[1]
+        assert validator.validate_mixed([]) == []
+
+    def test_validate_mixed_separates_capabilities(self):
+        """身份相同但能力不同的模型不合并为一组 / Models sharing an identity but not capabilities are not grouped"""
+        schema = {"response_format": {"type": "json_schema", "json_schema": {"name": "x", "schema": {}}}}
+        preview, stable = "gemini-3-pro-image-preview", "gemini-3-pro-image"
+        for order in ((preview, stable), (stable, preview)):
+            validator = ParamValidator()
+            results = validator.validate_mixed([(order[0], schema), (order[1], schema), (LLMeta(order[0]), schema)])
+            expected = {preview: schema, stable: {}}
+            assert results == [expected[order[0]], expected[order[1]], expected[order[0]]]
+            assert validator.compilations == 2
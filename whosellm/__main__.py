@@ -0,0 +1,85 @@
+# filename: __main__.py
+# @Time    : 2026/10/19 10:12
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+whosellm 命令行入口 / whosellm command line entry
+
+用法 / Usage:
+    python -m whosellm import-profile [--budget-ms 200] [--json]
+    python -m whosellm memory [--top 10] [--json]
+"""
+
+import argparse
+import json
+import sys
+
+
+def _cmd_import_profile(args: argparse.Namespace) -> int:
+    """导入耗时分析子命令 / Import profiling subcommand"""
+    from whosellm.diagnostics.import_profile import profile_import
+
+    budget_seconds = args.budget_ms / 1000 if args.budget_ms is not None else None
+    profile = profile_import(budget_seconds=budget_seconds)
+    if args.json:
+        print(json.dumps(profile.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(profile.format(top=args.top))
+    return 1 if profile.over_budget else 0
+
+
+def _cmd_memory(args: argparse.Namespace) -> int:
+    """注册表内存占用子命令 / Registry memory footprint subcommand"""
+    from dataclasses import asdict
+
+    from whosellm.diagnostics.memory import registry_memory_report
+
+    report = registry_memory_report()
+    if args.json:
+        print(json.dumps(asdict(report), ensure_ascii=False, indent=2))
+    else:
+        print(report.format(top=args.top))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    构建命令行解析器 / Build the command line parser
+
+    Returns:
+        argparse.ArgumentParser: 解析器 / Parser
+    """
+    parser = argparse.ArgumentParser(prog="whosellm", description="whosellm command line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_profile = subparsers.add_parser("import-profile", help="profile `import whosellm` in a fresh interpreter")
+    import_profile.add_argument("--budget-ms", type=float, default=None, help="fail (exit 1) if import exceeds budget")
+    import_profile.add_argument("--top", type=int, default=None, help="only show the N slowest family modules")
+    import_profile.add_argument("--json", action="store_true", help="output JSON instead of a text report")
+    import_profile.set_defaults(func=_cmd_import_profile)
+
+    memory = subparsers.add_parser("memory", help="report the deep memory footprint of the registry")
+    memory.add_argument("--top", type=int, default=None, help="only show the N largest families")
+    memory.add_argument("--json", action="store_true", help="output JSON instead of a text report")
+    memory.set_defaults(func=_cmd_memory)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    命令行主函数 / Command line main function
+
+    Args:
+        argv: 命令行参数（可选） / Command line arguments (optional)
+
+    Returns:
+        int: 退出码 / Exit code
+    """
+    args = build_parser().parse_args(argv)
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -64,3 +64,7 @@ class ModelCapabilities:
     supported_audio_mime_type: list[str] = field(
         default_factory=lambda: ["audio/mpeg", "audio/wav", "audio/mp4"]
     )  # 支持的音频MIME类型 / Supported audio MIME types
+
+    # 吞吐限制（客户端限流使用，可选） / Throughput limits (used by client-side rate limiting, optional)
+    max_requests_per_minute: int | None = None  # 每分钟最大请求数(RPM) / Maximum requests per minute
+    max_tokens_per_minute: int | None = None  # 每分钟最大token数(TPM) / Maximum tokens per minute
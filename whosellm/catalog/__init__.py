@@ -0,0 +1,47 @@
+# filename: __init__.py
+# @Time    : 2026/10/19 15:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+模型目录 / Model catalog
+
+把所有家族配置中的 specific_models（可选包含家族默认）展开为目录条目，并提供按能力查询的预计算索引，
+无需为每个名称实例化 LLMeta。
+Expands the specific_models of every family config (optionally plus family defaults) into catalog entries
+and provides precomputed indexes for capability queries, without instantiating LLMeta for every name.
+"""
+
+from whosellm.catalog.entries import (
+    BOOL_CAPABILITY_FIELDS,
+    NUMERIC_CAPABILITY_FIELDS,
+    CatalogEntry,
+    build_catalog,
+    build_family_catalog,
+    order_key,
+)
+from whosellm.catalog.index import CapabilityIndex, get_capability_index, query_models
+from whosellm.catalog.similarity import SimilarityIndex, SimilarityWeights, get_similarity_index, nearest_models
+from whosellm.catalog.specifiers import ModelSpecifier, compile_specifier
+from whosellm.catalog.timeline import FamilyTimeline, ModelTimeline, get_timeline
+
+__all__ = [
+    "BOOL_CAPABILITY_FIELDS",
+    "NUMERIC_CAPABILITY_FIELDS",
+    "CapabilityIndex",
+    "CatalogEntry",
+    "FamilyTimeline",
+    "ModelSpecifier",
+    "ModelTimeline",
+    "SimilarityIndex",
+    "SimilarityWeights",
+    "build_catalog",
+    "build_family_catalog",
+    "compile_specifier",
+    "get_capability_index",
+    "get_similarity_index",
+    "get_timeline",
+    "nearest_models",
+    "order_key",
+    "query_models",
+]
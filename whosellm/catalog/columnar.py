@@ -0,0 +1,305 @@
+# filename: columnar.py
+# @Time    : 2026/10/19 16:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+列式目录导出（NumPy） / Columnar catalog export (NumPy)
+
+把目录导出为并行的 NumPy 数组：provider / family 编码、版本元组、型号优先级、发布日期序数、能力位掩码与数值限制，
+用于离线分析和批量路由中的向量化过滤，一次计算上千个 (模型, 请求) 组合。
+Exports the catalog as parallel NumPy arrays: provider / family codes, version tuples, variant priority,
+release date ordinals, a capability bitmask and numeric limits, for vectorized filtering in offline analysis
+and batch routing, scoring thousands of (model, request) pairs at once.
+
+NumPy 为可选依赖：``pip install whosellm[numpy]``。本模块不会被 ``whosellm.catalog`` 自动导入。
+NumPy is an optional dependency: ``pip install whosellm[numpy]``. This module is not imported by
+``whosellm.catalog`` automatically.
+
+Example:
+    >>> from whosellm.catalog.columnar import capability_mask, get_columnar_catalog
+    >>> catalog = get_columnar_catalog()
+    >>> required = np.array([capability_mask("supports_vision"), capability_mask("supports_pdf")], dtype=np.uint64)
+    >>> fits = catalog.match_matrix(required, min_context_window=np.array([128_000, 1_000_000]))  # (2, n)
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 取决于安装环境 / depends on the environment
+    np = None  # type: ignore[assignment]
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.catalog.entries import BOOL_CAPABILITY_FIELDS, NUMERIC_CAPABILITY_FIELDS, CatalogEntry, build_catalog
+from whosellm.models.base import ModelFamily
+from whosellm.models.registry import get_registry_generation
+from whosellm.provider import Provider
+
+# 元组列的填充值：小于任何真实分量，保持与元组比较一致的字典序
+# Padding for tuple columns: below any real component, keeping lexicographic order identical to tuple comparison
+TUPLE_PADDING = -1
+
+# 无发布日期视为最新（与 LLMeta 比较规则一致） / A missing release date counts as newest (same as LLMeta ordering)
+NO_DATE_ORDINAL = date.max.toordinal()
+
+
+def _require_numpy() -> None:
+    """NumPy 未安装时给出明确的安装提示 / Raise a clear install hint when NumPy is missing"""
+    if np is None:
+        msg = (
+            "列式目录需要 NumPy，请安装 whosellm[numpy] / "
+            "The columnar catalog requires NumPy, install it with `pip install whosellm[numpy]`"
+        )
+        raise ImportError(msg)
+
+
+def capability_mask(*names: str) -> int:
+    """
+    把 supports_* 字段名编码为位掩码 / Encode supports_* field names as a bitmask
+
+    Args:
+        *names: 布尔能力字段名 / Boolean capability field names
+
+    Returns:
+        int: 位掩码，第 j 位对应 BOOL_CAPABILITY_FIELDS[j] / Bitmask, bit j is BOOL_CAPABILITY_FIELDS[j]
+
+    Raises:
+        ValueError: 未知的能力字段 / Unknown capability field
+    """
+    mask = 0
+    for name in names:
+        if name not in BOOL_CAPABILITY_FIELDS:
+            msg = f"未知的布尔能力字段 / Unknown boolean capability field: {name!r}"
+            raise ValueError(msg)
+        mask |= 1 << BOOL_CAPABILITY_FIELDS.index(name)
+    return mask
+
+
+def encode_capabilities(
+    capabilities: Sequence[ModelCapabilities],
+) -> tuple["np.ndarray", dict[str, "np.ndarray"]]:
+    """
+    把能力列表编码为位掩码列与数值列 / Encode a list of capabilities as a bitmask column and numeric columns
+
+    Args:
+        capabilities: 模型能力列表 / Model capabilities
+
+    Returns:
+        tuple: (uint64 (n,) 位掩码, {数值字段: float64 (n,)，None 为 NaN}) /
+            (uint64 (n,) bitmask, {numeric field: float64 (n,), NaN for None})
+
+    Raises:
+        ImportError: 未安装 NumPy / NumPy is not installed
+    """
+    _require_numpy()
+    count = len(capabilities)
+    bits = np.zeros(count, dtype=np.uint64)
+    for bit, name in enumerate(BOOL_CAPABILITY_FIELDS):
+        flags = np.fromiter((getattr(caps, name) for caps in capabilities), dtype=bool, count=count)
+        bits[flags] |= np.uint64(1 << bit)
+    numeric = {
+        name: np.array(
+            [np.nan if (value := getattr(caps, name)) is None else value for caps in capabilities],
+            dtype=np.float64,
+        )
+        for name in NUMERIC_CAPABILITY_FIELDS
+    }
+    return bits, numeric
+
+
+def _tuple_column(values: list[tuple[int, ...]]) -> "np.ndarray":
+    """把变长元组填充为二维数组 / Pad variable-length tuples into a 2-D array"""
+    width = max((len(value) for value in values), default=1)
+    column = np.full((len(values), width), TUPLE_PADDING, dtype=np.int32)
+    for row, value in enumerate(values):
+        column[row, : len(value)] = value
+    return column
+
+
+@dataclass(frozen=True)
+class ColumnarCatalog:
+    """
+    列式目录，所有数组按 entries 顺序对齐 / Columnar catalog, every array aligned with entries
+    """
+
+    entries: tuple[CatalogEntry, ...]
+    providers: tuple[Provider, ...]  # provider_code → Provider
+    families: tuple[ModelFamily, ...]  # family_code → ModelFamily
+    provider_code: "np.ndarray"  # int16, (n,)
+    family_code: "np.ndarray"  # int16, (n,)
+    version: "np.ndarray"  # int32, (n, w)，以 TUPLE_PADDING 填充 / padded with TUPLE_PADDING
+    variant_priority: "np.ndarray"  # int32, (n, w)，以 TUPLE_PADDING 填充 / padded with TUPLE_PADDING
+    release_ordinal: "np.ndarray"  # int32, (n,)，无日期为 NO_DATE_ORDINAL / NO_DATE_ORDINAL when missing
+    capability_bits: "np.ndarray"  # uint64, (n,)，见 capability_mask / see capability_mask
+    numeric: dict[str, "np.ndarray"]  # {field: float64 (n,)}，None 为 NaN / NaN for None
+    is_family_default: "np.ndarray"  # bool, (n,)
+    generation: int = -1
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def provider_codes(self, *providers: Provider) -> list[int]:
+        """Provider 对应的编码（不存在的忽略） / Codes of the providers (missing ones are skipped)"""
+        return [self.providers.index(provider) for provider in providers if provider in self.providers]
+
+    def family_codes(self, *families: ModelFamily) -> list[int]:
+        """家族对应的编码（不存在的忽略） / Codes of the families (missing ones are skipped)"""
+        return [self.families.index(family) for family in families if family in self.families]
+
+    def mask(self, **criteria: Any) -> "np.ndarray":
+        """
+        计算满足条件的布尔掩码，条件语法与 CapabilityIndex 相同 /
+        Compute a boolean mask of matching entries, same criteria syntax as CapabilityIndex
+
+        Args:
+            **criteria: ``supports_<x>=bool``、``min_<field>=N``、``max_<field>=N``、``provider=``、``family=``
+
+        Returns:
+            np.ndarray: bool, (n,)
+
+        Raises:
+            ValueError: 未知的查询条件 / Unknown criterion
+        """
+        result = np.ones(len(self.entries), dtype=bool)
+        for key, value in criteria.items():
+            if key in BOOL_CAPABILITY_FIELDS:
+                has = (self.capability_bits & np.uint64(capability_mask(key))) != 0
+                result &= has if value else ~has
+            elif key.startswith("min_") and key[4:] in self.numeric:
+                # NaN 与任何值比较均为 False / NaN compares False against anything
+                result &= self.numeric[key[4:]] >= value
+            elif key.startswith("max_") and key[4:] in self.numeric:
+                result &= self.numeric[key[4:]] <= value
+            elif key == "provider":
+                providers = (value,) if isinstance(value, Provider) else tuple(value)
+                result &= np.isin(self.provider_code, self.provider_codes(*providers))
+            elif key == "family":
+                families = (value,) if isinstance(value, ModelFamily) else tuple(value)
+                result &= np.isin(self.family_code, self.family_codes(*families))
+            else:
+                msg = f"未知的查询条件 / Unknown query criterion: {key!r}"
+                raise ValueError(msg)
+        return result
+
+    def match_matrix(self, required_bits: "np.ndarray", **minimums: "np.ndarray") -> "np.ndarray":
+        """
+        一次计算 m 个请求 × n 个模型的可用矩阵 / Compute the m-requests × n-models fit matrix at once
+
+        Args:
+            required_bits: uint64, (m,)，每个请求所需的能力位掩码 / Required capability bitmask per request
+            **minimums: ``min_<field>=array (m,)``，每个请求的数值下限，NaN 表示不限制 /
+                Per-request numeric lower bounds, NaN means unconstrained
+
+        Returns:
+            np.ndarray: bool, (m, n)
+
+        Raises:
+            ValueError: 未知的数值字段 / Unknown numeric field
+        """
+        required = np.asarray(required_bits, dtype=np.uint64)[:, None]
+        fits: np.ndarray = (self.capability_bits[None, :] & required) == required
+        for key, values in minimums.items():
+            name = key[4:] if key.startswith("min_") else key
+            if name not in self.numeric:
+                msg = f"未知的数值字段 / Unknown numeric field: {key!r}"
+                raise ValueError(msg)
+            lower = np.asarray(values, dtype=np.float64)[:, None]
+            fits &= np.isnan(lower) | (self.numeric[name][None, :] >= lower)
+        return fits
+
+    def ordering(self) -> "np.ndarray":
+        """
+        按 LLMeta 排序规则（版本 → 型号优先级 → 日期）的升序索引 /
+        Ascending indices in LLMeta order (version → variant priority → date)
+
+        LLMeta 只比较同一家族；这里对全部条目给出全序，需要时可先按 family_code 过滤。
+        LLMeta only compares within a family; this gives a total order over all entries, filter by
+        family_code first when needed.
+
+        Returns:
+            np.ndarray: int, (n,)
+        """
+        # np.lexsort 以最后一个键为主键 / np.lexsort uses the last key as the primary key
+        keys = [self.release_ordinal]
+        keys.extend(self.variant_priority[:, col] for col in range(self.variant_priority.shape[1] - 1, -1, -1))
+        keys.extend(self.version[:, col] for col in range(self.version.shape[1] - 1, -1, -1))
+        return np.asarray(np.lexsort(keys))
+
+
+def build_columnar_catalog(include_family_defaults: bool = True, generation: int = -1) -> ColumnarCatalog:
+    """
+    构造列式目录 / Build the columnar catalog
+
+    Args:
+        include_family_defaults: 是否包含家族默认条目 / Whether to include family default entries
+        generation: 记录的注册表代数 / Registry generation to record
+
+    Returns:
+        ColumnarCatalog: 列式目录 / Columnar catalog
+
+    Raises:
+        ImportError: 未安装 NumPy / NumPy is not installed
+    """
+    _require_numpy()
+    entries = build_catalog(include_family_defaults)
+    providers = tuple(dict.fromkeys(entry.provider for entry in entries))
+    families = tuple(dict.fromkeys(entry.family for entry in entries))
+    provider_index = {provider: code for code, provider in enumerate(providers)}
+    family_index = {family: code for code, family in enumerate(families)}
+
+    capability_bits, numeric = encode_capabilities([entry.capabilities for entry in entries])
+
+    return ColumnarCatalog(
+        entries=tuple(entries),
+        providers=providers,
+        families=families,
+        provider_code=np.array([provider_index[entry.provider] for entry in entries], dtype=np.int16),
+        family_code=np.array([family_index[entry.family] for entry in entries], dtype=np.int16),
+        version=_tuple_column([entry.version_tuple for entry in entries]),
+        variant_priority=_tuple_column([entry.variant_priority for entry in entries]),
+        release_ordinal=np.array(
+            [entry.release_date.toordinal() if entry.release_date else NO_DATE_ORDINAL for entry in entries],
+            dtype=np.int32,
+        ),
+        capability_bits=capability_bits,
+        numeric=numeric,
+        is_family_default=np.array([entry.is_family_default for entry in entries], dtype=bool),
+        generation=generation,
+    )
+
+
+# 格式: {include_family_defaults: ColumnarCatalog}
+_COLUMNAR_CACHE: dict[bool, ColumnarCatalog] = {}
+
+
+def get_columnar_catalog(include_family_defaults: bool = True) -> ColumnarCatalog:
+    """
+    获取（必要时重建）列式目录 / Get the columnar catalog, rebuilding it if stale
+
+    Args:
+        include_family_defaults: 是否包含家族默认条目 / Whether to include family default entries
+
+    Returns:
+        ColumnarCatalog: 列式目录 / Columnar catalog
+    """
+    generation = get_registry_generation()
+    catalog = _COLUMNAR_CACHE.get(include_family_defaults)
+    if catalog is None or catalog.generation != generation:
+        catalog = build_columnar_catalog(include_family_defaults, generation)
+        _COLUMNAR_CACHE[include_family_defaults] = catalog
+    return catalog
+
+
+__all__ = [
+    "NO_DATE_ORDINAL",
+    "TUPLE_PADDING",
+    "ColumnarCatalog",
+    "build_columnar_catalog",
+    "capability_mask",
+    "encode_capabilities",
+    "get_columnar_catalog",
+]
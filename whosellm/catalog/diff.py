@@ -0,0 +1,292 @@
+# filename: diff.py
+# @Time    : 2026/10/19 19:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+批量能力差异矩阵（NumPy） / Bulk capability diff matrix (NumPy)
+
+审阅新的家族配置时需要横向比较大量模型的能力。``diff_matrix(models)`` 先用列式编码
+（能力位掩码 + 数值列，见 ``whosellm.catalog.columnar``）表示这些模型，再一次性广播出所有模型对的
+变化位（按位异或）与数值差（context_window、max_tokens、媒体限制等），而不是在 Python 中逐对比较
+``ModelCapabilities`` 数据类。图片像素上限按元组比较，支持的媒体类型列表按集合比较：每个不同取值先编码为
+整数，再同样广播比较，具体新增 / 移除的类型可按模型对查询。
+Reviewing a new family config means comparing capabilities across many models. ``diff_matrix(models)``
+encodes the models with the columnar representation (capability bitmask + numeric columns, see
+``whosellm.catalog.columnar``) and broadcasts every pair at once: changed bits (XOR) and numeric deltas
+(context_window, max_tokens, media limits, ...), instead of comparing ``ModelCapabilities`` dataclasses pair
+by pair in Python. The image pixel limit is compared as a tuple and the supported MIME type lists as sets:
+every distinct value is encoded as an integer and broadcast the same way, and the added / removed types can
+be looked up per pair.
+
+NumPy 为可选依赖：``pip install whosellm[numpy]``。
+NumPy is an optional dependency: ``pip install whosellm[numpy]``.
+
+Example:
+    >>> from whosellm import ModelFamily
+    >>> from whosellm.catalog import query_models
+    >>> from whosellm.catalog.diff import diff_matrix
+    >>> matrix = diff_matrix(["gpt-5", "gpt-5-mini", "gpt-5-nano"])
+    >>> matrix.differing_fields("gpt-5", "gpt-5-nano")
+    >>> print(matrix.format())
+    >>> print(diff_matrix(query_models(family=ModelFamily.GEMINI)).format())
+    >>> matrix.mime_changes("supported_image_mime_type", "gpt-5", "gpt-5-nano")
+"""
+
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.catalog.columnar import encode_capabilities, get_columnar_catalog, np
+from whosellm.catalog.entries import BOOL_CAPABILITY_FIELDS, NUMERIC_CAPABILITY_FIELDS, CatalogEntry
+from whosellm.models.base import get_model_info
+
+# 按元组比较的像素上限字段 / Pixel limit fields compared as tuples
+PIXEL_CAPABILITY_FIELDS: tuple[str, ...] = ("max_image_pixels",)
+
+# 按集合比较的媒体类型列表字段 / MIME type list fields compared as sets
+MIME_CAPABILITY_FIELDS: tuple[str, ...] = (
+    "supported_image_mime_type",
+    "supported_video_mime_type",
+    "supported_audio_mime_type",
+)
+
+# 按取值编码比较的字段 / Fields compared by encoded value
+VALUE_CAPABILITY_FIELDS: tuple[str, ...] = PIXEL_CAPABILITY_FIELDS + MIME_CAPABILITY_FIELDS
+
+# 参与比较的全部字段，按报告顺序 / Every compared field, in reporting order
+DIFF_FIELDS: tuple[str, ...] = BOOL_CAPABILITY_FIELDS + NUMERIC_CAPABILITY_FIELDS + VALUE_CAPABILITY_FIELDS
+
+
+def _comparable(name: str, value: Any) -> Hashable:
+    """字段取值转为可比较的形式（列表按集合比较） / Comparable form of a field value (lists compare as sets)"""
+    return frozenset(value) if name in MIME_CAPABILITY_FIELDS else value
+
+
+def _value_codes(name: str, capabilities: Sequence[ModelCapabilities]) -> "np.ndarray":
+    """把每个不同取值编码为整数 / Encode every distinct value as an integer"""
+    codes: dict[Hashable, int] = {}
+    return np.fromiter(
+        (codes.setdefault(_comparable(name, getattr(caps, name)), len(codes)) for caps in capabilities),
+        dtype=np.int64,
+        count=len(capabilities),
+    )
+
+
+def _format_value(value: Any) -> str:
+    """表格单元格 / Table cell"""
+    if value is None:
+        return "-"
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, tuple):
+        return "x".join(str(part) for part in value)
+    if isinstance(value, list):
+        return ",".join(value) or "-"
+    # 整数与整值浮点原样输出，避免 1048576 显示为 1.04858e+06 / Whole numbers print exactly, not as 1.04858e+06
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return f"{value:g}"
+
+
+@dataclass(frozen=True)
+class DiffMatrix:
+    """
+    m 个模型两两之间的能力差异，所有数组为 (m, m) 且按 labels 顺序对齐 /
+    Pairwise capability differences of m models, every array is (m, m) and aligned with labels
+    """
+
+    labels: tuple[str, ...]
+    capabilities: tuple[ModelCapabilities, ...]
+    capability_bits: "np.ndarray"  # uint64, (m,)，见 capability_mask / see capability_mask
+    numeric: dict[str, "np.ndarray"]  # {field: float64 (m,)}，None 为 NaN / NaN for None
+    changed_bits: "np.ndarray"  # uint64, (m, m)，capability_bits[i] ^ capability_bits[j]
+    # {field: float64 (m, m)}，numeric[j] - numeric[i]，任一方为 None 时为 NaN / NaN when either side is None
+    numeric_delta: dict[str, "np.ndarray"]
+    # {field: bool (m, m)}，值不同（含一方为 None）/ values differ (including None vs a value)
+    numeric_changed: dict[str, "np.ndarray"]
+    # {field: bool (m, m)}，像素上限 / 媒体类型集合不同 / pixel limit or MIME type set differs
+    value_changed: dict[str, "np.ndarray"]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _position(self, model: int | str) -> int:
+        """标签或下标转为下标 / Convert a label or position to a position"""
+        if isinstance(model, int):
+            return model
+        try:
+            return self.labels.index(model)
+        except ValueError:
+            msg = f"模型不在差异矩阵中 / Model is not in the diff matrix: {model!r}"
+            raise KeyError(msg) from None
+
+    def _changed(self, name: str) -> "np.ndarray":
+        """非布尔字段的变化矩阵 / Change matrix of a non-boolean field"""
+        return self.numeric_changed[name] if name in self.numeric_changed else self.value_changed[name]
+
+    def bool_changed(self, field: str) -> "np.ndarray":
+        """
+        某个布尔字段在各模型对之间是否不同 / Whether a boolean field differs between each pair
+
+        Args:
+            field: supports_* 字段名 / supports_* field name
+
+        Returns:
+            np.ndarray: bool, (m, m)
+        """
+        bit = np.uint64(BOOL_CAPABILITY_FIELDS.index(field))
+        result: np.ndarray = ((self.changed_bits >> bit) & np.uint64(1)).astype(bool)
+        return result
+
+    def mime_changes(self, field: str, a: int | str, b: int | str) -> tuple[set[str], set[str]]:
+        """
+        从模型 a 到模型 b 新增与移除的媒体类型 / MIME types added and removed going from model a to model b
+
+        Args:
+            field: supported_*_mime_type 字段名 / supported_*_mime_type field name
+            a: 模型标签或下标 / Model label or position
+            b: 模型标签或下标 / Model label or position
+
+        Returns:
+            tuple: (新增, 移除) / (added, removed)
+
+        Raises:
+            ValueError: 不是媒体类型列表字段 / Not a MIME type list field
+        """
+        if field not in MIME_CAPABILITY_FIELDS:
+            msg = f"不是媒体类型列表字段 / Not a MIME type list field: {field!r}"
+            raise ValueError(msg)
+        before = set(getattr(self.capabilities[self._position(a)], field))
+        after = set(getattr(self.capabilities[self._position(b)], field))
+        return after - before, before - after
+
+    def difference_count(self) -> "np.ndarray":
+        """
+        每对模型不同的字段数 / Number of differing fields for every pair
+
+        Returns:
+            np.ndarray: int64, (m, m)
+        """
+        counts = np.zeros(self.changed_bits.shape, dtype=np.int64)
+        for bit in range(len(BOOL_CAPABILITY_FIELDS)):
+            counts += ((self.changed_bits >> np.uint64(bit)) & np.uint64(1)).astype(np.int64)
+        for changed in (*self.numeric_changed.values(), *self.value_changed.values()):
+            counts += changed
+        return counts
+
+    def differing_fields(self, a: int | str, b: int | str) -> list[str]:
+        """
+        两个模型之间不同的字段 / Fields that differ between two models
+
+        Args:
+            a: 模型标签或下标 / Model label or position
+            b: 模型标签或下标 / Model label or position
+
+        Returns:
+            list[str]: 字段名，按 DIFF_FIELDS 顺序 / Field names, in DIFF_FIELDS order
+        """
+        i, j = self._position(a), self._position(b)
+        changed = int(self.changed_bits[i, j])
+        fields = [name for bit, name in enumerate(BOOL_CAPABILITY_FIELDS) if changed >> bit & 1]
+        fields.extend(name for name in NUMERIC_CAPABILITY_FIELDS + VALUE_CAPABILITY_FIELDS if self._changed(name)[i, j])
+        return fields
+
+    def varying_fields(self) -> list[str]:
+        """
+        至少在一对模型之间不同的字段 / Fields that differ for at least one pair
+
+        Returns:
+            list[str]: 字段名，按 DIFF_FIELDS 顺序 / Field names, in DIFF_FIELDS order
+        """
+        any_changed = int(np.bitwise_or.reduce(self.changed_bits, axis=None)) if len(self) else 0
+        fields = [name for bit, name in enumerate(BOOL_CAPABILITY_FIELDS) if any_changed >> bit & 1]
+        fields.extend(name for name in NUMERIC_CAPABILITY_FIELDS + VALUE_CAPABILITY_FIELDS if self._changed(name).any())
+        return fields
+
+    def format(self, all_fields: bool = False) -> str:
+        """
+        生成紧凑的对比表：每行一个字段，每列一个模型 / Render a compact table: one row per field, one column per model
+
+        Args:
+            all_fields: 是否包含所有模型取值相同的字段 / Whether to include fields that are identical everywhere
+
+        Returns:
+            str: 文本表格 / Text table
+        """
+        fields = list(DIFF_FIELDS) if all_fields else self.varying_fields()
+        rows = [["field", *self.labels]]
+        for name in fields:
+            rows.append([name, *(_format_value(getattr(caps, name)) for caps in self.capabilities)])
+
+        widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(cell.ljust(width) for cell, width in zip(row, widths, strict=True)).rstrip() for row in rows
+        )
+
+
+def diff_matrix(models: Sequence[str | CatalogEntry] | None = None) -> DiffMatrix:
+    """
+    计算模型之间两两的能力差异 / Compute pairwise capability differences between models
+
+    Args:
+        models: 模型名称（按 get_model_info 解析）或目录条目；为 None 时使用全部 specific models /
+            Model names (resolved with get_model_info) or catalog entries; all specific models when None
+
+    Returns:
+        DiffMatrix: 差异矩阵 / Diff matrix
+
+    Raises:
+        ImportError: 未安装 NumPy / NumPy is not installed
+    """
+    if models is None:
+        # 直接复用缓存的列式目录，不重新编码 / Reuse the cached columnar catalog without re-encoding
+        catalog = get_columnar_catalog(include_family_defaults=False)
+        labels = tuple(entry.qualified_name for entry in catalog.entries)
+        capabilities = tuple(entry.capabilities for entry in catalog.entries)
+        bits, numeric = catalog.capability_bits, catalog.numeric
+    else:
+        labels = tuple(model.qualified_name if isinstance(model, CatalogEntry) else model for model in models)
+        capabilities = tuple(
+            model.capabilities if isinstance(model, CatalogEntry) else get_model_info(model).capabilities
+            for model in models
+        )
+        bits, numeric = encode_capabilities(capabilities)
+
+    numeric_delta = {}
+    numeric_changed = {}
+    for name, column in numeric.items():
+        left, right = column[:, None], column[None, :]
+        numeric_delta[name] = right - left
+        missing = np.isnan(left)
+        # NaN != NaN 为 True，两边都缺失时视为相同 / NaN != NaN is True, both missing counts as equal
+        numeric_changed[name] = (left != right) & ~(missing & np.isnan(right))
+
+    value_changed = {}
+    for name in VALUE_CAPABILITY_FIELDS:
+        codes = _value_codes(name, capabilities)
+        value_changed[name] = codes[:, None] != codes[None, :]
+
+    return DiffMatrix(
+        labels=labels,
+        capabilities=capabilities,
+        capability_bits=bits,
+        numeric=numeric,
+        changed_bits=bits[:, None] ^ bits[None, :],
+        numeric_delta=numeric_delta,
+        numeric_changed=numeric_changed,
+        value_changed=value_changed,
+    )
+
+
+__all__ = [
+    "DIFF_FIELDS",
+    "MIME_CAPABILITY_FIELDS",
+    "PIXEL_CAPABILITY_FIELDS",
+    "VALUE_CAPABILITY_FIELDS",
+    "DiffMatrix",
+    "diff_matrix",
+]
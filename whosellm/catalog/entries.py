@@ -0,0 +1,193 @@
+# filename: entries.py
+# @Time    : 2026/10/19 15:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+目录条目 / Catalog entries
+
+每个条目对应一个 (provider, specific model)，其版本、型号、优先级和能力与 ``LLMeta(name)`` 解析结果一致，
+但构造时不写入 MODEL_REGISTRY。
+Each entry is one (provider, specific model); its version, variant, priority and capabilities match what
+``LLMeta(name)`` resolves to, but building it never writes to MODEL_REGISTRY.
+"""
+
+import types
+from dataclasses import dataclass, fields
+from datetime import date
+from typing import TYPE_CHECKING, get_args
+
+import parse  # type: ignore[import-untyped]
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.models.base import ModelFamily, ModelInfo, build_model_info
+from whosellm.models.patterns import DEFAULT_EXTRA_TYPES, parse_date_from_match
+from whosellm.models.registry import _FAMILY_CONFIGS, build_specific_exact_match
+from whosellm.provider import Provider
+
+if TYPE_CHECKING:
+    from whosellm.models.config import ModelFamilyConfig
+
+# 布尔能力字段（supports_*） / Boolean capability fields (supports_*)
+BOOL_CAPABILITY_FIELDS: tuple[str, ...] = tuple(
+    f.name for f in fields(ModelCapabilities) if f.name.startswith("supports_") and isinstance(f.default, bool)
+)
+
+# 数值限制字段（int / float，可为 None） / Numeric limit fields (int / float, may be None)
+NUMERIC_CAPABILITY_FIELDS: tuple[str, ...] = tuple(
+    f.name
+    for f in fields(ModelCapabilities)
+    if isinstance(f.type, types.UnionType) and set(get_args(f.type)) <= {int, float, type(None)}
+)
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """
+    目录条目 / Catalog entry
+    """
+
+    name: str  # specific model 名称；家族默认条目为家族名 / Specific model name; family name for family defaults
+    family: ModelFamily
+    provider: Provider
+    version: str
+    variant: str
+    version_tuple: tuple[int, ...]
+    variant_priority: tuple[int, ...]
+    release_date: date | None
+    capabilities: ModelCapabilities
+    is_family_default: bool = False
+
+    @property
+    def qualified_name(self) -> str:
+        """带 Provider 前缀的名称，可直接传给 LLMeta / Provider-prefixed name, can be passed to LLMeta"""
+        return f"{self.provider.value}::{self.name}"
+
+
+def _release_date(spec_patterns: list[str], name: str) -> date | None:
+    """
+    用 specific model 自身的子 patterns 从名称中解析发布日期 / Parse the release date with the model's own sub-patterns
+
+    精确匹配不会提取日期字段，这里补充解析，便于按日期排序。
+    An exact match extracts no date fields, so parse them here to allow ordering by date.
+    """
+    for pattern in spec_patterns:
+        try:
+            result = parse.parse(pattern, name, extra_types=DEFAULT_EXTRA_TYPES)
+        except ValueError:
+            continue
+        if result is not None:
+            parsed_date = parse_date_from_match(result.named)
+            if parsed_date is not None:
+                return parsed_date
+    return None
+
+
+def _config_entries(config: "ModelFamilyConfig", include_family_defaults: bool) -> list[CatalogEntry]:
+    """展开单个家族配置 / Expand one family config"""
+    entries: list[CatalogEntry] = []
+    for name, spec in config.specific_models.items():
+        info, _tier = build_model_info(build_specific_exact_match(config, name), config.provider)
+        entries.append(
+            CatalogEntry(
+                name=name,
+                family=info.family,
+                provider=info.provider,
+                version=info.version,
+                variant=info.variant,
+                version_tuple=info.version_tuple,
+                variant_priority=info.variant_priority,
+                release_date=info.release_date or _release_date(spec.patterns, name),
+                capabilities=info.capabilities,
+            ),
+        )
+
+    if include_family_defaults:
+        info, _tier = build_model_info(
+            {
+                "family": config.family,
+                "provider": config.provider,
+                "version": config.version_default,
+                "variant": config.variant_default,
+                "variant_priority": config.variant_priority_default,
+                "capabilities": None,
+            },
+            config.provider,
+        )
+        entries.append(
+            CatalogEntry(
+                name=config.family.value,
+                family=info.family,
+                provider=info.provider,
+                version=info.version,
+                variant=info.variant,
+                version_tuple=info.version_tuple,
+                variant_priority=info.variant_priority,
+                release_date=None,
+                capabilities=info.capabilities,
+                is_family_default=True,
+            ),
+        )
+    return entries
+
+
+def build_catalog(include_family_defaults: bool = False) -> list[CatalogEntry]:
+    """
+    展开所有家族配置为目录条目 / Expand all family configs into catalog entries
+
+    顺序与注册顺序一致：先按家族配置，再按 specific_models 的声明顺序。
+    Ordered by registration: family configs first, then specific_models in declaration order.
+
+    Args:
+        include_family_defaults: 是否为每个家族配置追加一个默认条目（version_default + 家族默认能力） /
+            Whether to append one default entry per family config (version_default + family default capabilities)
+
+    Returns:
+        list[CatalogEntry]: 目录条目 / Catalog entries
+    """
+    entries: list[CatalogEntry] = []
+    for config in _FAMILY_CONFIGS.values():
+        entries.extend(_config_entries(config, include_family_defaults))
+    return entries
+
+
+def build_family_catalog(family: ModelFamily, include_family_defaults: bool = False) -> list[CatalogEntry]:
+    """
+    只展开某个家族（所有 Provider）的配置 / Expand the configs of one family only (every provider)
+
+    Args:
+        family: 模型家族 / Model family
+        include_family_defaults: 是否追加家族默认条目 / Whether to append family default entries
+
+    Returns:
+        list[CatalogEntry]: 目录条目，顺序与 build_catalog 一致 / Catalog entries, same order as build_catalog
+    """
+    entries: list[CatalogEntry] = []
+    for (config_family, _provider), config in _FAMILY_CONFIGS.items():
+        if config_family == family:
+            entries.extend(_config_entries(config, include_family_defaults))
+    return entries
+
+
+def order_key(entry: CatalogEntry | ModelInfo) -> tuple[tuple[int, ...], tuple[int, ...], date]:
+    """
+    LLMeta 排序键：版本 → 型号优先级 → 日期（无日期视为最新） /
+    LLMeta ordering key: version → variant priority → date (missing date counts as newest)
+
+    Args:
+        entry: 目录条目或解析结果 / Catalog entry or resolved model info
+
+    Returns:
+        tuple: 排序键 / Sort key
+    """
+    return entry.version_tuple, entry.variant_priority, entry.release_date or date.max
+
+
+__all__ = [
+    "BOOL_CAPABILITY_FIELDS",
+    "NUMERIC_CAPABILITY_FIELDS",
+    "CatalogEntry",
+    "build_catalog",
+    "build_family_catalog",
+    "order_key",
+]
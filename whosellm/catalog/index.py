@@ -0,0 +1,222 @@
+# filename: index.py
+# @Time    : 2026/10/19 15:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+能力查询索引 / Capability query index
+
+为目录预计算按能力的索引：每个 supports_* 字段一个位集（Python int，第 i 位对应第 i 个条目），
+每个数值字段一个有序数组及其前缀 / 后缀位集。一次查询只需若干次 bisect 和按位与。
+Precomputes per-capability indexes over the catalog: one bitset per supports_* field (a Python int whose
+bit i is entry i), and for every numeric field a sorted array plus prefix / suffix bitsets. A query is a
+handful of bisects and bitwise ANDs.
+
+索引按注册表代数缓存，注册新的家族配置后自动重建。
+The index is cached per registry generation and rebuilt automatically after a new family config is registered.
+
+Example:
+    >>> from whosellm.catalog import query_models
+    >>> query_models(supports_vision=True, supports_function_calling=True,
+    ...              min_context_window=200_000, min_max_tokens=64_000)
+"""
+
+import bisect
+from collections.abc import Iterator
+from typing import Any
+
+from whosellm.catalog.entries import BOOL_CAPABILITY_FIELDS, NUMERIC_CAPABILITY_FIELDS, CatalogEntry, build_catalog
+from whosellm.models.base import ModelFamily
+from whosellm.models.registry import get_registry_generation
+from whosellm.provider import Provider
+
+
+class _NumericColumn:
+    """
+    单个数值字段的有序索引 / Sorted index of one numeric field
+
+    None 值不参与排序，任何范围条件都不会命中它们。
+    None values are left out, no range condition ever matches them.
+    """
+
+    __slots__ = ("prefix_masks", "suffix_masks", "values")
+
+    def __init__(self, values: list[float | int | None]) -> None:
+        ordered = sorted((value, position) for position, value in enumerate(values) if value is not None)
+        self.values = [value for value, _ in ordered]
+        # suffix_masks[k]: 排序后第 k 个及之后的条目 / entries at sorted position k and after
+        # prefix_masks[k]: 排序后前 k 个条目 / the first k entries in sorted order
+        self.suffix_masks = [0] * (len(ordered) + 1)
+        for k in range(len(ordered) - 1, -1, -1):
+            self.suffix_masks[k] = self.suffix_masks[k + 1] | (1 << ordered[k][1])
+        self.prefix_masks = [0] * (len(ordered) + 1)
+        for k, (_, position) in enumerate(ordered):
+            self.prefix_masks[k + 1] = self.prefix_masks[k] | (1 << position)
+
+    def at_least(self, threshold: float) -> int:
+        """值 >= threshold 的条目位集 / Bitset of entries with value >= threshold"""
+        return self.suffix_masks[bisect.bisect_left(self.values, threshold)]
+
+    def at_most(self, threshold: float) -> int:
+        """值 <= threshold 的条目位集 / Bitset of entries with value <= threshold"""
+        return self.prefix_masks[bisect.bisect_right(self.values, threshold)]
+
+
+class CapabilityIndex:
+    """
+    目录的能力查询索引 / Capability query index over the catalog
+
+    查询条件（均为关键字参数，全部取交集） / Query criteria (keyword arguments, all ANDed):
+        - ``supports_<x>=True/False``: 布尔能力 / Boolean capability
+        - ``min_<field>=N`` / ``max_<field>=N``: 数值字段的闭区间，值为 None 的条目不命中 /
+          Inclusive bounds on a numeric field, entries whose value is None never match
+        - ``provider=`` / ``family=``: 单个值或集合 / A single value or a collection
+    """
+
+    def __init__(self, entries: list[CatalogEntry], generation: int = -1) -> None:
+        self.entries: tuple[CatalogEntry, ...] = tuple(entries)
+        self.generation = generation
+        self.all_mask = (1 << len(self.entries)) - 1
+
+        self._bool_masks: dict[str, int] = dict.fromkeys(BOOL_CAPABILITY_FIELDS, 0)
+        self._provider_masks: dict[Provider, int] = {}
+        self._family_masks: dict[ModelFamily, int] = {}
+        for position, entry in enumerate(self.entries):
+            bit = 1 << position
+            for name in BOOL_CAPABILITY_FIELDS:
+                if getattr(entry.capabilities, name):
+                    self._bool_masks[name] |= bit
+            self._provider_masks[entry.provider] = self._provider_masks.get(entry.provider, 0) | bit
+            self._family_masks[entry.family] = self._family_masks.get(entry.family, 0) | bit
+
+        self._numeric: dict[str, _NumericColumn] = {
+            name: _NumericColumn([getattr(entry.capabilities, name) for entry in self.entries])
+            for name in NUMERIC_CAPABILITY_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def mask(self, **criteria: Any) -> int:
+        """
+        计算满足条件的条目位集 / Compute the bitset of entries matching the criteria
+
+        Args:
+            **criteria: 查询条件，见类文档 / Query criteria, see the class docstring
+
+        Returns:
+            int: 位集，第 i 位对应 entries[i] / Bitset, bit i is entries[i]
+
+        Raises:
+            ValueError: 未知的查询条件 / Unknown criterion
+        """
+        result = self.all_mask
+        for key, value in criteria.items():
+            if key in self._bool_masks:
+                result &= self._bool_masks[key] if value else self.all_mask & ~self._bool_masks[key]
+            elif key.startswith("min_") and key[4:] in self._numeric:
+                result &= self._numeric[key[4:]].at_least(value)
+            elif key.startswith("max_") and key[4:] in self._numeric:
+                result &= self._numeric[key[4:]].at_most(value)
+            elif key == "provider":
+                result &= self._union(self._provider_masks, value)
+            elif key == "family":
+                result &= self._union(self._family_masks, value)
+            else:
+                msg = f"未知的查询条件 / Unknown query criterion: {key!r}"
+                raise ValueError(msg)
+            if not result:
+                break
+        return result
+
+    @staticmethod
+    def _union(masks: dict[Any, int], value: Any) -> int:
+        """单个值或集合对应位集的并集 / Union of the bitsets of a single value or a collection"""
+        if isinstance(value, (str, Provider, ModelFamily)):
+            return masks.get(value, 0)
+        combined = 0
+        for item in value:
+            combined |= masks.get(item, 0)
+        return combined
+
+    def iter_mask(self, mask: int) -> Iterator[CatalogEntry]:
+        """
+        按目录顺序遍历位集中的条目 / Iterate the entries of a bitset in catalog order
+
+        Args:
+            mask: 位集 / Bitset
+
+        Yields:
+            CatalogEntry: 目录条目 / Catalog entry
+        """
+        while mask:
+            low = mask & -mask
+            yield self.entries[low.bit_length() - 1]
+            mask ^= low
+
+    def query(self, **criteria: Any) -> list[CatalogEntry]:
+        """
+        查询满足条件的条目 / Query entries matching the criteria
+
+        Args:
+            **criteria: 查询条件，见类文档 / Query criteria, see the class docstring
+
+        Returns:
+            list[CatalogEntry]: 按目录顺序排列的条目 / Entries in catalog order
+        """
+        return list(self.iter_mask(self.mask(**criteria)))
+
+    def count(self, **criteria: Any) -> int:
+        """
+        统计满足条件的条目数 / Count entries matching the criteria
+
+        Args:
+            **criteria: 查询条件，见类文档 / Query criteria, see the class docstring
+
+        Returns:
+            int: 条目数 / Number of entries
+        """
+        return self.mask(**criteria).bit_count()
+
+
+# 格式: {include_family_defaults: CapabilityIndex}
+_INDEX_CACHE: dict[bool, CapabilityIndex] = {}
+
+
+def get_capability_index(include_family_defaults: bool = False) -> CapabilityIndex:
+    """
+    获取（必要时重建）目录的能力索引 / Get the catalog capability index, rebuilding it if stale
+
+    Args:
+        include_family_defaults: 是否包含家族默认条目 / Whether to include family default entries
+
+    Returns:
+        CapabilityIndex: 能力索引 / Capability index
+    """
+    generation = get_registry_generation()
+    index = _INDEX_CACHE.get(include_family_defaults)
+    if index is None or index.generation != generation:
+        index = CapabilityIndex(build_catalog(include_family_defaults), generation)
+        _INDEX_CACHE[include_family_defaults] = index
+    return index
+
+
+def query_models(include_family_defaults: bool = False, **criteria: Any) -> list[CatalogEntry]:
+    """
+    按能力查询已注册的模型 / Query registered models by capability
+
+    Args:
+        include_family_defaults: 是否包含家族默认条目 / Whether to include family default entries
+        **criteria: 查询条件，见 CapabilityIndex / Query criteria, see CapabilityIndex
+
+    Returns:
+        list[CatalogEntry]: 按目录顺序排列的条目 / Entries in catalog order
+    """
+    return get_capability_index(include_family_defaults).query(**criteria)
+
+
+__all__ = [
+    "CapabilityIndex",
+    "get_capability_index",
+    "query_models",
+]
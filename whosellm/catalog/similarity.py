@@ -0,0 +1,219 @@
+# filename: similarity.py
+# @Time    : 2026/10/19 18:50
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+能力相似度检索 / Capability similarity search
+
+把每个条目编码为能力位向量（supports_*）加归一化的数值限制，支持 Hamming / 加权最近邻查询，
+用于模型下线迁移时推荐替代模型（例如 families/gemini.py 中提到的 Gemini 3 Pro preview 下线）。
+Encodes every entry as a capability bit vector (supports_*) plus normalized numeric limits and answers
+Hamming / weighted nearest-neighbour queries, to suggest replacements when a model is retired (e.g. the
+Gemini 3 Pro preview shutdown noted in families/gemini.py).
+
+数值限制跨越多个数量级（如 4K~2M 的上下文窗口），按 log1p(value) / log1p(max) 归一化到 [0, 1]；
+一方为 None 另一方不为 None 时该维距离记为 1。
+Numeric limits span orders of magnitude (e.g. 4K~2M context windows), so they are normalized to [0, 1] by
+log1p(value) / log1p(max); when exactly one side is None the dimension contributes a distance of 1.
+
+Example:
+    >>> from whosellm.catalog.similarity import nearest_models
+    >>> [(entry.qualified_name, round(distance, 2)) for entry, distance in nearest_models("gemini-3-pro-preview", k=3)]
+"""
+
+import heapq
+import math
+from dataclasses import dataclass, field
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.catalog.entries import BOOL_CAPABILITY_FIELDS, NUMERIC_CAPABILITY_FIELDS, CatalogEntry, build_catalog
+from whosellm.models.base import get_model_info
+from whosellm.models.registry import get_registry_generation
+
+
+@dataclass(frozen=True)
+class CapabilityVector:
+    """
+    能力向量 / Capability vector
+    """
+
+    bits: int  # 第 j 位对应 BOOL_CAPABILITY_FIELDS[j] / Bit j is BOOL_CAPABILITY_FIELDS[j]
+    numeric: tuple[float | None, ...]  # 按 NUMERIC_CAPABILITY_FIELDS 顺序，已归一化 / Normalized, in field order
+
+
+@dataclass
+class SimilarityWeights:
+    """
+    距离权重 / Distance weights
+
+    默认所有布尔位权重为 1（即 Hamming 距离），每个数值维度权重为 1。
+    By default every boolean bit weighs 1 (plain Hamming distance) and every numeric dimension weighs 1.
+    """
+
+    # 格式: {supports_* 字段: 权重}，未列出的为 1 / Format: {supports_* field: weight}, unlisted fields weigh 1
+    bool_weights: dict[str, float] = field(default_factory=dict)
+    # 格式: {数值字段: 权重}，未列出的为 1 / Format: {numeric field: weight}, unlisted fields weigh 1
+    numeric_weights: dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """校验字段名 / Validate field names"""
+        unknown = sorted(set(self.bool_weights) - set(BOOL_CAPABILITY_FIELDS))
+        unknown += sorted(set(self.numeric_weights) - set(NUMERIC_CAPABILITY_FIELDS))
+        if unknown:
+            msg = f"未知的能力字段 / Unknown capability fields: {unknown}"
+            raise ValueError(msg)
+
+
+class SimilarityIndex:
+    """
+    能力相似度索引 / Capability similarity index
+    """
+
+    def __init__(self, entries: list[CatalogEntry], generation: int = -1) -> None:
+        self.entries: tuple[CatalogEntry, ...] = tuple(entries)
+        self.generation = generation
+        # 各数值字段的归一化分母 / Normalization denominator of each numeric field
+        self._scales: tuple[float, ...] = tuple(
+            math.log1p(max((value for entry in entries if (value := getattr(entry.capabilities, name))), default=1))
+            or 1.0
+            for name in NUMERIC_CAPABILITY_FIELDS
+        )
+        self.vectors: tuple[CapabilityVector, ...] = tuple(self.encode(entry.capabilities) for entry in entries)
+
+    def encode(self, capabilities: ModelCapabilities) -> CapabilityVector:
+        """
+        把能力编码为向量 / Encode capabilities as a vector
+
+        Args:
+            capabilities: 模型能力 / Model capabilities
+
+        Returns:
+            CapabilityVector: 能力向量 / Capability vector
+        """
+        bits = 0
+        for position, name in enumerate(BOOL_CAPABILITY_FIELDS):
+            if getattr(capabilities, name):
+                bits |= 1 << position
+        numeric = tuple(
+            None if (value := getattr(capabilities, name)) is None else min(math.log1p(value) / scale, 1.0)
+            for name, scale in zip(NUMERIC_CAPABILITY_FIELDS, self._scales, strict=True)
+        )
+        return CapabilityVector(bits=bits, numeric=numeric)
+
+    @staticmethod
+    def distance(a: CapabilityVector, b: CapabilityVector, weights: SimilarityWeights | None = None) -> float:
+        """
+        两个向量的距离 / Distance between two vectors
+
+        Args:
+            a: 向量 a / Vector a
+            b: 向量 b / Vector b
+            weights: 权重（可选），默认为 Hamming + 数值 L1 / Weights (optional), defaults to Hamming + numeric L1
+
+        Returns:
+            float: 距离，越小越相似 / Distance, smaller is more similar
+        """
+        differing = a.bits ^ b.bits
+        if weights is None or not weights.bool_weights:
+            total = float(differing.bit_count())
+        else:
+            total = 0.0
+            while differing:
+                low = differing & -differing
+                total += weights.bool_weights.get(BOOL_CAPABILITY_FIELDS[low.bit_length() - 1], 1.0)
+                differing ^= low
+
+        for name, x, y in zip(NUMERIC_CAPABILITY_FIELDS, a.numeric, b.numeric, strict=True):
+            if x is None and y is None:
+                continue
+            gap = 1.0 if x is None or y is None else abs(x - y)
+            total += gap * (weights.numeric_weights.get(name, 1.0) if weights is not None else 1.0)
+        return total
+
+    def nearest(
+        self,
+        target: str | ModelCapabilities,
+        k: int = 5,
+        weights: SimilarityWeights | None = None,
+        exclude_self: bool = True,
+    ) -> list[tuple[CatalogEntry, float]]:
+        """
+        查找能力最接近的 k 个条目 / Find the k entries with the closest capabilities
+
+        Args:
+            target: 模型名称或能力 / Model name or capabilities
+            k: 返回数量 / Number of results
+            weights: 距离权重（可选） / Distance weights (optional)
+            exclude_self: 目标为模型名称时是否排除其本身 / Whether to exclude the model itself when target is a name
+
+        Returns:
+            list[tuple[CatalogEntry, float]]: (条目, 距离)，距离升序，同距离时保持目录顺序 /
+                (entry, distance) by ascending distance, catalog order on ties
+        """
+        excluded: tuple[object, ...] | None = None
+        if isinstance(target, str):
+            info = get_model_info(target)
+            capabilities = info.capabilities
+            if exclude_self:
+                excluded = (info.provider, info.family, info.version, info.variant)
+        else:
+            capabilities = target
+
+        query = self.encode(capabilities)
+        scored = (
+            (self.distance(query, vector, weights), position)
+            for position, (entry, vector) in enumerate(zip(self.entries, self.vectors, strict=True))
+            if excluded is None or (entry.provider, entry.family, entry.version, entry.variant) != excluded
+        )
+        return [(self.entries[position], distance) for distance, position in heapq.nsmallest(k, scored)]
+
+
+# 格式: {include_family_defaults: SimilarityIndex}
+_SIMILARITY_CACHE: dict[bool, SimilarityIndex] = {}
+
+
+def get_similarity_index(include_family_defaults: bool = False) -> SimilarityIndex:
+    """
+    获取（必要时重建）相似度索引 / Get the similarity index, rebuilding it if stale
+
+    Args:
+        include_family_defaults: 是否包含家族默认条目 / Whether to include family default entries
+
+    Returns:
+        SimilarityIndex: 相似度索引 / Similarity index
+    """
+    generation = get_registry_generation()
+    index = _SIMILARITY_CACHE.get(include_family_defaults)
+    if index is None or index.generation != generation:
+        index = SimilarityIndex(build_catalog(include_family_defaults), generation)
+        _SIMILARITY_CACHE[include_family_defaults] = index
+    return index
+
+
+def nearest_models(
+    target: str | ModelCapabilities,
+    k: int = 5,
+    weights: SimilarityWeights | None = None,
+) -> list[tuple[CatalogEntry, float]]:
+    """
+    使用默认索引查找能力最接近的模型 / Find the models with the closest capabilities using the default index
+
+    Args:
+        target: 模型名称或能力 / Model name or capabilities
+        k: 返回数量 / Number of results
+        weights: 距离权重（可选） / Distance weights (optional)
+
+    Returns:
+        list[tuple[CatalogEntry, float]]: (条目, 距离)，距离升序 / (entry, distance) by ascending distance
+    """
+    return get_similarity_index().nearest(target, k=k, weights=weights)
+
+
+__all__ = [
+    "CapabilityVector",
+    "SimilarityIndex",
+    "SimilarityWeights",
+    "get_similarity_index",
+    "nearest_models",
+]
@@ -0,0 +1,307 @@
+# filename: specifiers.py
+# @Time    : 2026/10/19 19:50
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+编译后的模型约束 / Compiled model specifiers
+
+策略配置常写作 ``"gpt >= 5.2, variant in {mini, nano}"`` 或 ``"claude-opus >= 4.5"``。规约语言作用于 LLMeta 的
+字段（家族、版本元组、型号、Provider、发布日期），只解析一次得到编译后的谓词，可对单个模型求值，也可批量过滤
+所有已注册的 specific models。版本比较沿用 ``parse_version`` 的语义。
+Policy configs say things like ``"gpt >= 5.2, variant in {mini, nano}"`` or ``"claude-opus >= 4.5"``. The
+specifier language works on LLMeta fields (family, version tuple, variant, provider, release date); it is parsed
+once into a compiled predicate that can be evaluated against single models or used to filter every registered
+specific model in bulk. Versions are compared with ``parse_version`` semantics.
+
+语法 / Grammar（逗号分隔，全部满足 / comma separated, all must hold）:
+    - ``<family>[-<variant>] [op <version>]``：如 ``gpt``、``gpt >= 5.2``、``claude-opus >= 4.5``
+    - ``version op <version>``、``release_date op YYYY-MM-DD``
+    - ``family|provider|variant op <value>``（op 为 ``==`` / ``!=``）
+    - ``family|provider|variant in {a, b}``、``... not in {a, b}``
+    其中 op 为 ``==``、``!=``、``>=``、``<=``、``>``、``<`` / where op is one of ``==``, ``!=``, ``>=``, ``<=``, ``>``, ``<``
+
+Example:
+    >>> from whosellm.catalog.specifiers import compile_specifier
+    >>> spec = compile_specifier("gpt >= 5.2, variant in {mini, nano}")
+    >>> spec("gpt-5.2-mini"), spec("gpt-5-mini")
+    (True, False)
+    >>> [entry.name for entry in compile_specifier("claude-opus >= 4.5").filter()]
+"""
+
+import operator
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from whosellm.catalog.entries import CatalogEntry
+from whosellm.catalog.index import get_capability_index
+from whosellm.model_version import LLMeta
+from whosellm.models.base import ModelFamily, ModelInfo, get_model_info, parse_version
+from whosellm.provider import Provider
+
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+# 可排序字段与仅支持相等比较的字段 / Ordered fields and equality-only fields
+_ORDERED_FIELDS = ("version", "release_date")
+_NAMED_FIELDS = ("family", "provider", "variant")
+
+_SET_CLAUSE = re.compile(r"^(?P<field>\w+)\s+(?P<op>not\s+in|in)\s*\{(?P<items>[^{}]*)\}$", re.IGNORECASE)
+_COMPARE_CLAUSE = re.compile(r"^(?P<name>[\w.\-]+?)\s*(?P<op>==|!=|>=|<=|>|<)\s*(?P<value>[\w.\-]+)$")
+_BARE_CLAUSE = re.compile(r"^[\w.\-]+$")
+
+
+@dataclass(frozen=True)
+class SpecifierFields:
+    """
+    参与求值的模型字段 / Model fields a specifier is evaluated against
+    """
+
+    family: ModelFamily
+    provider: Provider
+    version: tuple[int, ...]
+    variant: str
+    release_date: date | None
+
+    @classmethod
+    def of(cls, model: "str | LLMeta | ModelInfo | CatalogEntry") -> "SpecifierFields":
+        """
+        从模型名称、LLMeta、ModelInfo 或目录条目提取字段 / Extract fields from a name, LLMeta, ModelInfo or entry
+
+        Args:
+            model: 模型 / Model
+
+        Returns:
+            SpecifierFields: 字段 / Fields
+        """
+        if isinstance(model, str):
+            model = get_model_info(model)
+        version = model._version_tuple if isinstance(model, LLMeta) else model.version_tuple
+        return cls(
+            family=model.family,
+            provider=model.provider,
+            version=version,
+            variant=model.variant,
+            release_date=model.release_date,
+        )
+
+
+def _pad(a: tuple[int, ...], b: tuple[int, ...]) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """补零到相同长度，使 (5, 0) 与 (5, 0, 0) 相等 / Zero-pad to equal length so (5, 0) equals (5, 0, 0)"""
+    width = max(len(a), len(b))
+    return a + (0,) * (width - len(a)), b + (0,) * (width - len(b))
+
+
+@dataclass(frozen=True)
+class Clause:
+    """
+    单个条件 / A single clause
+    """
+
+    field: str  # family / provider / version / variant / release_date
+    op: str  # ==, !=, >=, <=, >, <, in, not in
+    value: Any  # 已转换的值；in / not in 为 frozenset / Converted value; frozenset for in / not in
+
+    def __call__(self, fields: SpecifierFields) -> bool:
+        actual = getattr(fields, self.field)
+        if self.op == "in":
+            return actual in self.value
+        if self.op == "not in":
+            return actual not in self.value
+        if actual is None:
+            # 未知的发布日期不满足任何比较 / An unknown release date satisfies no comparison
+            return False
+        if self.field == "version":
+            actual, expected = _pad(actual, self.value)
+            return _OPERATORS[self.op](actual, expected)
+        return _OPERATORS[self.op](actual, self.value)
+
+
+def _family(value: str) -> ModelFamily:
+    """按值查找家族（不创建动态成员） / Look up a family by value (without creating dynamic members)"""
+    family = ModelFamily._value2member_map_.get(value.lower())
+    if not isinstance(family, ModelFamily):
+        msg = f"未知的模型家族 / Unknown model family: {value!r}"
+        raise ValueError(msg)
+    return family
+
+
+def _provider(value: str) -> Provider:
+    """按值查找 Provider（不创建动态成员） / Look up a provider by value (without creating dynamic members)"""
+    provider = Provider._value2member_map_.get(value.lower())
+    if not isinstance(provider, Provider):
+        msg = f"未知的 Provider / Unknown provider: {value!r}"
+        raise ValueError(msg)
+    return provider
+
+
+def _convert(field: str, value: str) -> Any:
+    """把文本值转换为字段类型 / Convert a text value to the field's type"""
+    if field == "family":
+        return _family(value)
+    if field == "provider":
+        return _provider(value)
+    if field == "version":
+        return parse_version(value)
+    if field == "release_date":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            msg = f"发布日期必须为 YYYY-MM-DD / Release date must be YYYY-MM-DD: {value!r}"
+            raise ValueError(msg) from None
+    return value.lower()
+
+
+def _split_head(name: str) -> tuple[ModelFamily, str | None]:
+    """
+    把 ``claude-opus`` 拆分为家族与型号，优先匹配最长的家族名 /
+    Split ``claude-opus`` into family and variant, preferring the longest family name
+    """
+    lowered = name.lower()
+    if lowered in ModelFamily._value2member_map_:
+        return _family(lowered), None
+    parts = lowered.split("-")
+    for cut in range(len(parts) - 1, 0, -1):
+        prefix = "-".join(parts[:cut])
+        if prefix in ModelFamily._value2member_map_:
+            return _family(prefix), "-".join(parts[cut:])
+    msg = f"未知的模型家族 / Unknown model family: {name!r}"
+    raise ValueError(msg)
+
+
+def _split_clauses(text: str) -> list[str]:
+    """按顶层逗号拆分（忽略花括号内的逗号） / Split on top-level commas (ignoring commas inside braces)"""
+    clauses, depth, start = [], 0, 0
+    for position, char in enumerate(text):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            clauses.append(text[start:position].strip())
+            start = position + 1
+    clauses.append(text[start:].strip())
+    return clauses
+
+
+def _parse_clause(text: str) -> list[Clause]:
+    """解析单个条件，家族头可能展开为多个条件 / Parse one clause, a family head may expand to several"""
+    if match := _SET_CLAUSE.match(text):
+        field = match["field"].lower()
+        if field not in _NAMED_FIELDS:
+            msg = f"in / not in 只支持 {_NAMED_FIELDS} / in / not in only supports {_NAMED_FIELDS}: {text!r}"
+            raise ValueError(msg)
+        items = frozenset(_convert(field, item.strip()) for item in match["items"].split(",") if item.strip())
+        return [Clause(field, " ".join(match["op"].lower().split()), items)]
+
+    if match := _COMPARE_CLAUSE.match(text):
+        name, op, value = match["name"], match["op"], match["value"]
+        field = name.lower()
+        if field in _NAMED_FIELDS:
+            if op not in ("==", "!="):
+                msg = f"{field} 只支持 == / != / {field} only supports == and !=: {text!r}"
+                raise ValueError(msg)
+            return [Clause(field, op, _convert(field, value))]
+        if field in _ORDERED_FIELDS:
+            return [Clause(field, op, _convert(field, value))]
+        family, variant = _split_head(name)
+        clauses = [Clause("family", "==", family), Clause("version", op, parse_version(value))]
+        if variant is not None:
+            clauses.insert(1, Clause("variant", "==", variant))
+        return clauses
+
+    if _BARE_CLAUSE.match(text):
+        family, variant = _split_head(text)
+        return [Clause("family", "==", family)] + ([Clause("variant", "==", variant)] if variant is not None else [])
+
+    msg = f"无法解析的条件 / Invalid specifier clause: {text!r}"
+    raise ValueError(msg)
+
+
+@dataclass(frozen=True)
+class ModelSpecifier:
+    """
+    编译后的模型约束 / Compiled model specifier
+    """
+
+    source: str
+    clauses: tuple[Clause, ...]
+
+    def matches(self, model: "str | LLMeta | ModelInfo | CatalogEntry | SpecifierFields") -> bool:
+        """
+        判断模型是否满足约束 / Whether a model satisfies the specifier
+
+        Args:
+            model: 模型名称、LLMeta、ModelInfo、目录条目或已提取的字段 /
+                Model name, LLMeta, ModelInfo, catalog entry or extracted fields
+
+        Returns:
+            bool: 是否满足 / Whether it matches
+        """
+        fields = model if isinstance(model, SpecifierFields) else SpecifierFields.of(model)
+        return all(clause(fields) for clause in self.clauses)
+
+    __call__ = matches
+
+    def filter(self, entries: Iterable[CatalogEntry] | None = None) -> list[CatalogEntry]:
+        """
+        批量过滤目录条目 / Filter catalog entries in bulk
+
+        Args:
+            entries: 待过滤的条目；为 None 时使用所有已注册的 specific models（先按家族条件用位集索引缩小范围） /
+                Entries to filter; all registered specific models when None (narrowed by family clauses with
+                the bitset index first)
+
+        Returns:
+            list[CatalogEntry]: 满足约束的条目，保持原顺序 / Matching entries in their original order
+        """
+        if entries is None:
+            index = get_capability_index()
+            families = [clause.value for clause in self.clauses if clause.field == "family" and clause.op == "=="]
+            entries = index.query(family=families[0]) if families else index.entries
+        return [entry for entry in entries if self.matches(entry)]
+
+
+# 格式: {specifier text: ModelSpecifier}
+_SPECIFIER_CACHE: dict[str, ModelSpecifier] = {}
+
+
+def compile_specifier(text: str) -> ModelSpecifier:
+    """
+    解析并编译模型约束，相同文本只解析一次 / Parse and compile a specifier, each text is parsed only once
+
+    Args:
+        text: 约束文本，如 ``"gpt >= 5.2, variant in {mini, nano}"`` / Specifier text
+
+    Returns:
+        ModelSpecifier: 编译后的约束 / Compiled specifier
+
+    Raises:
+        ValueError: 语法错误或未知的家族 / Provider / Syntax error or unknown family / provider
+    """
+    specifier = _SPECIFIER_CACHE.get(text)
+    if specifier is None:
+        clauses = [clause for part in _split_clauses(text) if part for clause in _parse_clause(part)]
+        if not clauses:
+            msg = f"空的约束 / Empty specifier: {text!r}"
+            raise ValueError(msg)
+        specifier = ModelSpecifier(source=text, clauses=tuple(clauses))
+        _SPECIFIER_CACHE[text] = specifier
+    return specifier
+
+
+__all__ = [
+    "Clause",
+    "ModelSpecifier",
+    "SpecifierFields",
+    "compile_specifier",
+]
@@ -0,0 +1,241 @@
+# filename: timeline.py
+# @Time    : 2026/10/19 19:30
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+按家族排序的模型时间线 / Per-family ordered model timeline
+
+``LLMeta.__lt__`` 只能比较两个模型。时间线为每个家族维护一份按 LLMeta 排序键（版本 → 型号优先级 → 日期）
+排好序的 specific models，用 bisect 回答"最新的 GPT 模型"、"比 claude-sonnet-4-5 更新的 Claude 模型"、
+"glm-4.6 的后继"等范围查询。注册表变化时只重建家族代数发生变化的家族。
+``LLMeta.__lt__`` compares two models only. The timeline keeps, per family, the specific models sorted by
+the LLMeta key (version → variant priority → date) and answers range queries such as "the newest GPT model",
+"Claude models newer than claude-sonnet-4-5" or "the successor of glm-4.6" with bisect. When the registry
+changes only families whose family generation moved are rebuilt.
+
+Example:
+    >>> from whosellm.catalog.timeline import get_timeline
+    >>> timeline = get_timeline()
+    >>> timeline.newest(ModelFamily.GPT).name
+    >>> [entry.name for entry in timeline.newer_than("claude-sonnet-4-5")]
+    >>> timeline.successor("glm-4.6")
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from whosellm.catalog.entries import CatalogEntry, build_family_catalog, order_key
+from whosellm.models.base import ModelFamily, get_model_info
+from whosellm.models.registry import _FAMILY_CONFIGS, get_family_generation, get_registry_generation
+
+OrderKey = tuple[tuple[int, ...], tuple[int, ...], date]
+
+
+class FamilyTimeline:
+    """
+    单个家族的有序条目 / Ordered entries of one family
+
+    排序键相同的条目（如多个 Provider 提供的同一模型）保持注册顺序。
+    Entries with equal keys (e.g. one model served by several providers) keep registration order.
+    """
+
+    def __init__(self, family: ModelFamily, entries: list[CatalogEntry], generation: int = 0) -> None:
+        self.family = family
+        self.generation = generation
+        self.entries: tuple[CatalogEntry, ...] = tuple(sorted(entries, key=order_key))
+        self.keys: tuple[OrderKey, ...] = tuple(order_key(entry) for entry in self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def newer_than(self, key: OrderKey, inclusive: bool = False) -> tuple[CatalogEntry, ...]:
+        """排序键大于（或等于）key 的条目，升序 / Entries with a key above (or equal to) key, ascending"""
+        position = bisect_left(self.keys, key) if inclusive else bisect_right(self.keys, key)
+        return self.entries[position:]
+
+    def older_than(self, key: OrderKey, inclusive: bool = False) -> tuple[CatalogEntry, ...]:
+        """排序键小于（或等于）key 的条目，升序 / Entries with a key below (or equal to) key, ascending"""
+        position = bisect_right(self.keys, key) if inclusive else bisect_left(self.keys, key)
+        return self.entries[:position]
+
+    def between(self, low: OrderKey, high: OrderKey) -> tuple[CatalogEntry, ...]:
+        """排序键在 [low, high] 内的条目，升序 / Entries with a key in [low, high], ascending"""
+        return self.entries[bisect_left(self.keys, low) : bisect_right(self.keys, high)]
+
+
+class ModelTimeline:
+    """
+    所有家族的时间线，按家族代数增量重建 / Timelines of every family, rebuilt incrementally by family generation
+    """
+
+    def __init__(self) -> None:
+        self._families: dict[ModelFamily, FamilyTimeline] = {}
+        self._generation = -1
+        self.rebuilds = 0  # 累计重建的家族数 / Number of family rebuilds so far
+
+    def _refresh(self) -> None:
+        """只重建家族代数变化的家族 / Rebuild only families whose family generation changed"""
+        generation = get_registry_generation()
+        if generation == self._generation:
+            return
+        for family in dict.fromkeys(family for family, _provider in _FAMILY_CONFIGS):
+            family_generation = get_family_generation(family)
+            current = self._families.get(family)
+            if current is None or current.generation != family_generation:
+                self._families[family] = FamilyTimeline(family, build_family_catalog(family), family_generation)
+                self.rebuilds += 1
+        self._generation = generation
+
+    def family(self, family: ModelFamily) -> FamilyTimeline:
+        """
+        获取某个家族的时间线 / Get the timeline of one family
+
+        Args:
+            family: 模型家族 / Model family
+
+        Returns:
+            FamilyTimeline: 家族时间线（未注册的家族为空） / Family timeline (empty for unregistered families)
+        """
+        self._refresh()
+        timeline = self._families.get(family)
+        return timeline if timeline is not None else FamilyTimeline(family, [])
+
+    def _locate(self, model: str) -> tuple[FamilyTimeline, OrderKey]:
+        """解析模型名称，返回其家族时间线与排序键 / Resolve a model name into its family timeline and key"""
+        info = get_model_info(model)
+        return self.family(info.family), order_key(info)
+
+    def entries(self, family: ModelFamily) -> tuple[CatalogEntry, ...]:
+        """
+        家族的全部条目，从旧到新 / All entries of a family, oldest first
+
+        Args:
+            family: 模型家族 / Model family
+
+        Returns:
+            tuple[CatalogEntry, ...]: 条目 / Entries
+        """
+        return self.family(family).entries
+
+    def newest(self, family: ModelFamily) -> CatalogEntry | None:
+        """
+        家族中最新的模型 / Newest model of a family
+
+        Args:
+            family: 模型家族 / Model family
+
+        Returns:
+            CatalogEntry | None: 条目，家族为空时为 None / Entry, None for an empty family
+        """
+        entries = self.entries(family)
+        return entries[-1] if entries else None
+
+    def oldest(self, family: ModelFamily) -> CatalogEntry | None:
+        """
+        家族中最旧的模型 / Oldest model of a family
+
+        Args:
+            family: 模型家族 / Model family
+
+        Returns:
+            CatalogEntry | None: 条目，家族为空时为 None / Entry, None for an empty family
+        """
+        entries = self.entries(family)
+        return entries[0] if entries else None
+
+    def newer_than(self, model: str, inclusive: bool = False) -> tuple[CatalogEntry, ...]:
+        """
+        同一家族中比该模型更新的模型，从旧到新 / Models of the same family newer than this one, oldest first
+
+        Args:
+            model: 模型名称，支持 ``Provider::ModelName`` / Model name, ``Provider::ModelName`` supported
+            inclusive: 是否包含排序键相同的模型（含其本身） / Whether to include models with an equal key (itself too)
+
+        Returns:
+            tuple[CatalogEntry, ...]: 条目 / Entries
+        """
+        timeline, key = self._locate(model)
+        return timeline.newer_than(key, inclusive)
+
+    def older_than(self, model: str, inclusive: bool = False) -> tuple[CatalogEntry, ...]:
+        """
+        同一家族中比该模型更旧的模型，从旧到新 / Models of the same family older than this one, oldest first
+
+        Args:
+            model: 模型名称 / Model name
+            inclusive: 是否包含排序键相同的模型（含其本身） / Whether to include models with an equal key (itself too)
+
+        Returns:
+            tuple[CatalogEntry, ...]: 条目 / Entries
+        """
+        timeline, key = self._locate(model)
+        return timeline.older_than(key, inclusive)
+
+    def between(self, low: str, high: str) -> tuple[CatalogEntry, ...]:
+        """
+        同一家族中排序键在两个模型之间（含两端）的模型 / Models of one family between two models (inclusive)
+
+        Args:
+            low: 下界模型名称 / Lower bound model name
+            high: 上界模型名称 / Upper bound model name
+
+        Returns:
+            tuple[CatalogEntry, ...]: 条目，从旧到新 / Entries, oldest first
+
+        Raises:
+            ValueError: 两个模型不属于同一家族 / The models belong to different families
+        """
+        low_timeline, low_key = self._locate(low)
+        high_timeline, high_key = self._locate(high)
+        if low_timeline.family != high_timeline.family:
+            msg = f"只能在同一家族内查询 / Both models must belong to the same family: {low!r}, {high!r}"
+            raise ValueError(msg)
+        return low_timeline.between(low_key, high_key)
+
+    def successor(self, model: str) -> CatalogEntry | None:
+        """
+        同一家族中紧随其后的模型 / The next newer model of the same family
+
+        Args:
+            model: 模型名称 / Model name
+
+        Returns:
+            CatalogEntry | None: 条目，已是最新时为 None / Entry, None when it is already the newest
+        """
+        newer = self.newer_than(model)
+        return newer[0] if newer else None
+
+    def predecessor(self, model: str) -> CatalogEntry | None:
+        """
+        同一家族中紧挨着的更旧模型 / The next older model of the same family
+
+        Args:
+            model: 模型名称 / Model name
+
+        Returns:
+            CatalogEntry | None: 条目，已是最旧时为 None / Entry, None when it is already the oldest
+        """
+        older = self.older_than(model)
+        return older[-1] if older else None
+
+
+# 默认时间线 / Default timeline
+_DEFAULT_TIMELINE = ModelTimeline()
+
+
+def get_timeline() -> ModelTimeline:
+    """
+    获取默认时间线 / Get the default timeline
+
+    Returns:
+        ModelTimeline: 默认时间线 / Default timeline
+    """
+    return _DEFAULT_TIMELINE
+
+
+__all__ = [
+    "FamilyTimeline",
+    "ModelTimeline",
+    "get_timeline",
+]
@@ -0,0 +1,34 @@
+# filename: __init__.py
+# @Time    : 2026/10/19 10:12
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+诊断工具 / Diagnostics tools
+
+用于观测 whosellm 自身的启动耗时、运行状态等
+Tools for observing whosellm's own startup cost, runtime state, etc.
+"""
+
+from whosellm.diagnostics.import_profile import (
+    ImportBudgetExceededError,
+    ImportProfile,
+    ModuleImportTime,
+    check_import_budget,
+    profile_import,
+)
+from whosellm.diagnostics.memory import MemoryReport, registry_memory_report
+from whosellm.diagnostics.metrics import metrics_snapshot, render_prometheus, reset_metrics
+
+__all__ = [
+    "ImportBudgetExceededError",
+    "ImportProfile",
+    "MemoryReport",
+    "ModuleImportTime",
+    "check_import_budget",
+    "metrics_snapshot",
+    "profile_import",
+    "registry_memory_report",
+    "render_prometheus",
+    "reset_metrics",
+]
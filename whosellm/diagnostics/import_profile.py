@@ -0,0 +1,289 @@
+# filename: import_profile.py
+# @Time    : 2026/10/19 10:12
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+导入耗时分析 / Import-time profiling
+
+在全新的子解释器中执行 ``import whosellm``，借助 ``-X importtime`` 统计每个模块（尤其是
+families 下各家族配置模块）的导入耗时，并汇总注册表规模与子 pattern 校验耗时。
+Run ``import whosellm`` in a fresh child interpreter, use ``-X importtime`` to collect the import cost of
+every module (especially the family config modules under ``families``), and summarize registry size and
+sub-pattern validation cost.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# 家族配置模块前缀 / Family config module prefix
+FAMILY_MODULE_PREFIX = "whosellm.models.families."
+
+# 子进程脚本：只测量 whosellm 本身的导入，统计信息在计时结束后再采集
+# Child script: only time the whosellm import itself, collect stats after timing stops
+_CHILD_SCRIPT = """
+import json, time
+_started = time.perf_counter()
+import whosellm
+_elapsed = time.perf_counter() - _started
+from whosellm.diagnostics.import_profile import collect_registry_stats
+print(json.dumps({"total_seconds": _elapsed, **collect_registry_stats()}))
+"""
+
+
+class ImportBudgetExceededError(RuntimeError):
+    """
+    导入耗时超出预算 / Import time exceeded the configured budget
+    """
+
+    def __init__(self, profile: "ImportProfile") -> None:
+        self.profile = profile
+        super().__init__(
+            f"whosellm 导入耗时 {profile.total_seconds * 1000:.1f}ms 超出预算 {profile.budget_ms:.1f}ms / "
+            f"whosellm import took {profile.total_seconds * 1000:.1f}ms, exceeding budget of {profile.budget_ms:.1f}ms",
+        )
+
+
+@dataclass(frozen=True)
+class ModuleImportTime:
+    """
+    单个模块的导入耗时 / Import time of a single module
+    """
+
+    module: str
+    self_seconds: float  # 模块自身耗时 / Time spent in the module itself
+    cumulative_seconds: float  # 含子模块的累计耗时 / Cumulative time including submodules
+
+
+@dataclass
+class ImportProfile:
+    """
+    导入耗时分析结果 / Import profiling result
+    """
+
+    total_seconds: float
+    modules: list[ModuleImportTime] = field(default_factory=list)
+    family_configs: int = 0
+    specific_models: int = 0
+    patterns: int = 0
+    validation_seconds: float = 0.0
+    # 格式: {"family/provider": seconds}
+    validation_by_family: dict[str, float] = field(default_factory=dict)
+    budget_seconds: float | None = None
+
+    @property
+    def budget_ms(self) -> float:
+        """预算（毫秒） / Budget in milliseconds"""
+        return (self.budget_seconds or 0.0) * 1000
+
+    @property
+    def over_budget(self) -> bool:
+        """是否超出预算 / Whether the budget is exceeded"""
+        return self.budget_seconds is not None and self.total_seconds > self.budget_seconds
+
+    @property
+    def family_modules(self) -> list[ModuleImportTime]:
+        """家族配置模块的导入耗时，按累计耗时降序 / Family module import times, sorted by cumulative time desc"""
+        family_modules = [m for m in self.modules if m.module.startswith(FAMILY_MODULE_PREFIX)]
+        return sorted(family_modules, key=lambda m: m.cumulative_seconds, reverse=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        转换为可 JSON 序列化的字典 / Convert to a JSON-serializable dict
+
+        Returns:
+            dict: 分析结果 / Profiling result
+        """
+        return {
+            "total_seconds": self.total_seconds,
+            "budget_seconds": self.budget_seconds,
+            "over_budget": self.over_budget,
+            "family_configs": self.family_configs,
+            "specific_models": self.specific_models,
+            "patterns": self.patterns,
+            "validation_seconds": self.validation_seconds,
+            "validation_by_family": dict(self.validation_by_family),
+            "modules": [
+                {"module": m.module, "self_seconds": m.self_seconds, "cumulative_seconds": m.cumulative_seconds}
+                for m in self.modules
+            ],
+        }
+
+    def format(self, top: int | None = None) -> str:
+        """
+        生成可读的文本报告 / Render a human-readable text report
+
+        Args:
+            top: 只显示耗时最高的前 N 个家族模块（可选） / Only show the N slowest family modules (optional)
+
+        Returns:
+            str: 文本报告 / Text report
+        """
+        lines = [
+            f"import whosellm: {self.total_seconds * 1000:.1f}ms",
+            f"family configs: {self.family_configs}, specific models: {self.specific_models}, patterns: {self.patterns}",
+            f"sub-pattern validation: {self.validation_seconds * 1000:.2f}ms",
+            "",
+            f"{'cumulative':>12} {'self':>10}  family module",
+        ]
+        family_modules = self.family_modules if top is None else self.family_modules[:top]
+        for m in family_modules:
+            lines.append(
+                f"{m.cumulative_seconds * 1000:>10.2f}ms {m.self_seconds * 1000:>8.2f}ms  "
+                f"{m.module[len(FAMILY_MODULE_PREFIX) :]}",
+            )
+        if self.budget_seconds is not None:
+            status = "EXCEEDED" if self.over_budget else "ok"
+            lines.append("")
+            lines.append(f"budget: {self.budget_ms:.1f}ms ({status})")
+        return "\n".join(lines)
+
+
+def collect_registry_stats() -> dict[str, Any]:
+    """
+    采集当前进程中注册表的规模和校验耗时 / Collect registry size and validation cost of the current process
+
+    Returns:
+        dict: family_configs / specific_models / patterns / validation_seconds / validation_by_family
+    """
+    from whosellm.models.config import _VALIDATION_COST
+    from whosellm.models.registry import _FAMILY_CONFIGS
+
+    specific_models = 0
+    patterns = 0
+    for config in _FAMILY_CONFIGS.values():
+        specific_models += len(config.specific_models)
+        patterns += len(config.patterns)
+        patterns += sum(len(spec.patterns) for spec in config.specific_models.values())
+
+    validation_by_family = {
+        f"{family.value}/{provider.value}": seconds for (family, provider), seconds in _VALIDATION_COST.items()
+    }
+    return {
+        "family_configs": len(_FAMILY_CONFIGS),
+        "specific_models": specific_models,
+        "patterns": patterns,
+        "validation_seconds": sum(validation_by_family.values()),
+        "validation_by_family": validation_by_family,
+    }
+
+
+def parse_importtime(output: str) -> list[ModuleImportTime]:
+    """
+    解析 ``-X importtime`` 输出中 whosellm 相关的行 / Parse whosellm lines from ``-X importtime`` output
+
+    同一模块可能因循环导入出现多次，此时累加 self 耗时、取最大 cumulative。
+    A module may appear several times due to circular imports; self times are summed and the largest
+    cumulative time is kept.
+
+    Args:
+        output: 子进程的 stderr / stderr of the child process
+
+    Returns:
+        list[ModuleImportTime]: 按首次出现顺序排列的模块耗时 / Module times in order of first appearance
+    """
+    merged: dict[str, tuple[int, int]] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        module = parts[2].strip()
+        if not module.startswith("whosellm") or module.startswith("whosellm.diagnostics"):
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            # 表头行 / Header line
+            continue
+        prev_self, prev_cumulative = merged.get(module, (0, 0))
+        merged[module] = (prev_self + self_us, max(prev_cumulative, cumulative_us))
+
+    return [
+        ModuleImportTime(module=module, self_seconds=self_us / 1e6, cumulative_seconds=cumulative_us / 1e6)
+        for module, (self_us, cumulative_us) in merged.items()
+    ]
+
+
+def profile_import(budget_seconds: float | None = None, python: str | None = None) -> ImportProfile:
+    """
+    在全新的子进程中分析 ``import whosellm`` 的耗时 / Profile ``import whosellm`` in a fresh child process
+
+    必须使用子进程：当前进程中 whosellm 已被导入，无法测量冷启动。
+    A child process is required: whosellm is already imported in the current process, so cold start
+    cannot be measured here.
+
+    Args:
+        budget_seconds: 导入耗时预算（秒，可选） / Import time budget in seconds (optional)
+        python: 解释器路径，默认当前解释器 / Interpreter path, defaults to the current interpreter
+
+    Returns:
+        ImportProfile: 分析结果 / Profiling result
+    """
+    # 确保子进程导入的是同一份 whosellm / Make sure the child imports the same whosellm
+    package_root = str(Path(__file__).resolve().parents[2])
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (package_root, env.get("PYTHONPATH")) if p)
+
+    completed = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", _CHILD_SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    if completed.returncode != 0:
+        msg = (
+            f"导入分析子进程失败 / Import profiling child process failed "
+            f"(exit {completed.returncode}): {completed.stderr.strip()[-500:]}"
+        )
+        raise RuntimeError(msg)
+
+    stats = json.loads(completed.stdout.strip().splitlines()[-1])
+    return ImportProfile(
+        total_seconds=stats["total_seconds"],
+        modules=parse_importtime(completed.stderr),
+        family_configs=stats["family_configs"],
+        specific_models=stats["specific_models"],
+        patterns=stats["patterns"],
+        validation_seconds=stats["validation_seconds"],
+        validation_by_family=stats["validation_by_family"],
+        budget_seconds=budget_seconds,
+    )
+
+
+def check_import_budget(budget_seconds: float, python: str | None = None) -> ImportProfile:
+    """
+    分析导入耗时，超出预算时抛出异常 / Profile import time and raise if the budget is exceeded
+
+    Args:
+        budget_seconds: 导入耗时预算（秒） / Import time budget in seconds
+        python: 解释器路径（可选） / Interpreter path (optional)
+
+    Returns:
+        ImportProfile: 未超出预算时的分析结果 / Profiling result when within budget
+
+    Raises:
+        ImportBudgetExceededError: 导入耗时超出预算 / Import time exceeded the budget
+    """
+    profile = profile_import(budget_seconds=budget_seconds, python=python)
+    if profile.over_budget:
+        raise ImportBudgetExceededError(profile)
+    return profile
+
+
+__all__ = [
+    "ImportBudgetExceededError",
+    "ImportProfile",
+    "ModuleImportTime",
+    "check_import_budget",
+    "collect_registry_stats",
+    "parse_importtime",
+    "profile_import",
+]
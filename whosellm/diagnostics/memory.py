@@ -0,0 +1,204 @@
+# filename: memory.py
+# @Time    : 2026/10/19 15:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+注册表内存占用报告 / Registry memory footprint report
+
+遍历 _FAMILY_CONFIGS、MODEL_REGISTRY、枚举成员映射以及所有 ModelCapabilities 实例，
+按家族 / Provider 统计深度内存占用，并找出值相同但对象不同的能力对象（可通过驻留消除的重复）。
+Walks _FAMILY_CONFIGS, MODEL_REGISTRY, the enum member maps and all ModelCapabilities instances,
+reports deep size by family / provider, and finds capability objects that are equal in value but
+distinct in identity (duplicates that interning would remove).
+
+共享对象只统计一次，归属于最先遍历到它的条目（家族配置先于 MODEL_REGISTRY）。
+Shared objects are counted once and attributed to the first owner walked (family configs before MODEL_REGISTRY).
+"""
+
+import sys
+from dataclasses import dataclass, field, fields, is_dataclass
+from enum import Enum
+from types import FunctionType, ModuleType
+from typing import Any
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.models.base import MODEL_REGISTRY, ModelFamily, count_auto_registered
+from whosellm.models.registry import _FAMILY_CONFIGS
+from whosellm.provider import Provider
+
+
+@dataclass
+class MemoryReport:
+    """
+    注册表内存占用报告 / Registry memory footprint report
+    """
+
+    total_bytes: int = 0
+    # 格式: {"family/provider": bytes}，包含家族配置及其注册表条目 / Family configs plus their registry entries
+    by_family: dict[str, int] = field(default_factory=dict)
+    # 格式: {provider: bytes}
+    by_provider: dict[str, int] = field(default_factory=dict)
+    family_config_bytes: int = 0
+    model_registry_bytes: int = 0
+    # 格式: {enum_name: bytes}
+    enum_bytes: dict[str, int] = field(default_factory=dict)
+    capability_instances: int = 0  # 不同对象的数量 / Number of distinct objects
+    unique_capabilities: int = 0  # 不同取值的数量 / Number of distinct values
+    duplicate_capabilities: int = 0  # 可被驻留消除的对象数 / Objects that interning would remove
+    duplicate_capability_bytes: int = 0  # 驻留可节省的字节数 / Bytes interning would save
+    configured_entries: int = 0  # specific_models 条目数 / Number of specific_models entries
+    registry_entries: int = (
+        0  # MODEL_REGISTRY 条目数（含手动注册） / Number of MODEL_REGISTRY entries (manual included)
+    )
+    auto_registered_entries: int = 0  # 其中自动注册的条目数 / Of which auto-registered
+
+    def format(self, top: int | None = None) -> str:
+        """
+        生成可读的文本报告 / Render a human-readable text report
+
+        Args:
+            top: 只显示占用最高的前 N 个家族（可选） / Only show the N largest families (optional)
+
+        Returns:
+            str: 文本报告 / Text report
+        """
+        lines = [
+            f"total: {self.total_bytes / 1024:.1f} KiB "
+            f"(family configs {self.family_config_bytes / 1024:.1f} KiB, "
+            f"MODEL_REGISTRY {self.model_registry_bytes / 1024:.1f} KiB, "
+            f"enums {sum(self.enum_bytes.values()) / 1024:.1f} KiB)",
+            f"entries: {self.configured_entries} configured, {self.registry_entries} registered "
+            f"({self.auto_registered_entries} auto-registered)",
+            f"capabilities: {self.capability_instances} objects, {self.unique_capabilities} unique values, "
+            f"{self.duplicate_capabilities} duplicates ({self.duplicate_capability_bytes / 1024:.1f} KiB)",
+            "",
+        ]
+        families = sorted(self.by_family.items(), key=lambda item: item[1], reverse=True)
+        for name, size in families if top is None else families[:top]:
+            lines.append(f"{size / 1024:>10.1f} KiB  {name}")
+        return "\n".join(lines)
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """
+    计算对象的深度内存占用 / Compute the deep memory footprint of an object
+
+    枚举成员、类型、模块和函数视为共享的全局对象，不计入。
+    Enum members, types, modules and functions are treated as shared globals and not counted.
+
+    Args:
+        obj: 目标对象 / Target object
+        seen: 已统计对象的 id 集合，跨多次调用共享以避免重复统计 /
+            ids of already counted objects, shared across calls to avoid double counting
+
+    Returns:
+        int: 字节数 / Size in bytes
+    """
+    if seen is None:
+        seen = set()
+
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, (Enum, type, ModuleType, FunctionType)) or id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif is_dataclass(current):
+            stack.extend(getattr(current, f.name) for f in fields(current))
+            if hasattr(current, "__dict__"):
+                total += sys.getsizeof(current.__dict__)
+                seen.add(id(current.__dict__))
+        elif hasattr(current, "__dict__"):
+            stack.append(current.__dict__)
+    return total
+
+
+def _capability_key(capabilities: ModelCapabilities) -> tuple[Any, ...]:
+    """能力对象的取值键（列表转为元组） / Value key of a capabilities object (lists become tuples)"""
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (getattr(capabilities, f.name) for f in fields(capabilities))
+    )
+
+
+def _collect_capabilities() -> list[ModelCapabilities]:
+    """收集所有可达的 ModelCapabilities 对象（按 id 去重） / Collect all reachable ModelCapabilities (deduped by id)"""
+    found: dict[int, ModelCapabilities] = {}
+    for config in _FAMILY_CONFIGS.values():
+        candidates = [config.capabilities, *config._version_capabilities.values()]
+        candidates.extend(spec.capabilities for spec in config.specific_models.values() if spec.capabilities)
+        for capabilities in candidates:
+            found.setdefault(id(capabilities), capabilities)
+    for info in MODEL_REGISTRY.values():
+        found.setdefault(id(info.capabilities), info.capabilities)
+    return list(found.values())
+
+
+def registry_memory_report() -> MemoryReport:
+    """
+    生成注册表内存占用报告 / Build the registry memory footprint report
+
+    Returns:
+        MemoryReport: 内存占用报告 / Memory footprint report
+    """
+    report = MemoryReport()
+    seen: set[int] = set()
+
+    # 家族配置 / Family configs
+    for (family, provider), config in _FAMILY_CONFIGS.items():
+        size = deep_sizeof(config, seen)
+        key = f"{family.value}/{provider.value}"
+        report.by_family[key] = report.by_family.get(key, 0) + size
+        report.by_provider[provider.value] = report.by_provider.get(provider.value, 0) + size
+        report.family_config_bytes += size
+        report.configured_entries += len(config.specific_models)
+
+    # 注册表条目（与配置共享的能力对象不会重复统计） / Registry entries (shared capabilities not recounted)
+    report.model_registry_bytes += sys.getsizeof(MODEL_REGISTRY)
+    for name, info in MODEL_REGISTRY.items():
+        size = deep_sizeof(name, seen) + deep_sizeof(info, seen)
+        key = f"{info.family.value}/{info.provider.value}"
+        report.by_family[key] = report.by_family.get(key, 0) + size
+        report.by_provider[info.provider.value] = report.by_provider.get(info.provider.value, 0) + size
+        report.model_registry_bytes += size
+    report.registry_entries = len(MODEL_REGISTRY)
+    report.auto_registered_entries = count_auto_registered()
+
+    # 枚举成员映射 / Enum member maps
+    for enum_cls in (ModelFamily, Provider):
+        enum_seen: set[int] = set()
+        size = deep_sizeof(enum_cls._member_map_, enum_seen) + deep_sizeof(enum_cls._value2member_map_, enum_seen)
+        # 枚举成员本身在 deep_sizeof 中被视为共享对象，这里单独计入 / Enum members are counted separately here
+        size += sum(sys.getsizeof(member) for member in enum_cls._member_map_.values())
+        report.enum_bytes[enum_cls.__name__] = size
+
+    # 能力对象去重分析 / Capability duplicate analysis
+    capabilities = _collect_capabilities()
+    by_value: dict[tuple[Any, ...], list[ModelCapabilities]] = {}
+    for item in capabilities:
+        by_value.setdefault(_capability_key(item), []).append(item)
+    report.capability_instances = len(capabilities)
+    report.unique_capabilities = len(by_value)
+    report.duplicate_capabilities = report.capability_instances - report.unique_capabilities
+    report.duplicate_capability_bytes = sum(
+        deep_sizeof(duplicate) for group in by_value.values() for duplicate in group[1:]
+    )
+
+    report.total_bytes = report.family_config_bytes + report.model_registry_bytes + sum(report.enum_bytes.values())
+    return report
+
+
+__all__ = [
+    "MemoryReport",
+    "deep_sizeof",
+    "registry_memory_report",
+]
@@ -0,0 +1,138 @@
+# filename: metrics.py
+# @Time    : 2026/10/19 14:30
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+解析与注册表健康指标 / Resolution and registry health metrics
+
+以普通字典快照或 Prometheus 文本暴露格式导出计数器和仪表值，不依赖任何网络组件，
+由调用方（如 sidecar 的 HTTP handler）自行决定如何暴露。
+Export counters and gauges as a plain dict snapshot or in the Prometheus text exposition format, with no
+network dependency; the caller (e.g. a sidecar HTTP handler) decides how to serve them.
+
+Example:
+    >>> from whosellm.diagnostics.metrics import metrics_snapshot, render_prometheus
+    >>> metrics_snapshot()["resolutions_total"]
+    >>> print(render_prometheus())
+"""
+
+import math
+from typing import Any
+
+from whosellm.models import instrumentation
+from whosellm.models.base import _RESOLUTION_COUNTERS, MODEL_REGISTRY, ModelFamily, count_auto_registered
+from whosellm.models.registry import _FAMILY_CONFIGS, get_registry_generation
+from whosellm.provider import Provider
+
+# 指标前缀 / Metric name prefix
+METRIC_PREFIX = "whosellm"
+
+# (快照键, Prometheus 类型, 说明) / (snapshot key, Prometheus type, help text)
+_SCALAR_METRICS: tuple[tuple[str, str, str], ...] = (
+    ("resolutions_total", "counter", "Total number of get_model_info calls."),
+    ("cache_hits_total", "counter", "Resolutions served from MODEL_REGISTRY."),
+    ("cache_misses_total", "counter", "Resolutions that fell through to pattern matching."),
+    ("cache_evictions_total", "counter", "Entries evicted from MODEL_REGISTRY."),
+    ("unknown_resolutions_total", "counter", "Resolutions that ended as ModelFamily.UNKNOWN."),
+    ("unknown_ratio", "gauge", "Share of resolutions that ended as ModelFamily.UNKNOWN."),
+    ("cache_hit_ratio", "gauge", "Share of resolutions served from MODEL_REGISTRY."),
+    ("registry_entries", "gauge", "Number of entries in MODEL_REGISTRY (manual and auto-registered)."),
+    ("auto_registered_entries", "gauge", "Number of MODEL_REGISTRY entries written by auto-registration."),
+    ("family_configs", "gauge", "Number of registered (family, provider) configs."),
+    ("registry_generation", "gauge", "Registry generation, incremented on every family config registration."),
+)
+
+
+def metrics_snapshot() -> dict[str, Any]:
+    """
+    获取当前指标快照 / Get a snapshot of the current metrics
+
+    Returns:
+        dict: 指标字典；dynamic_enum_members 为 {枚举名: 数量} / Metrics dict; dynamic_enum_members is {enum: count}
+    """
+    resolutions = _RESOLUTION_COUNTERS["resolutions"]
+    hits = _RESOLUTION_COUNTERS["cache_hits"]
+    unknown = _RESOLUTION_COUNTERS["unknown"]
+    return {
+        "resolutions_total": resolutions,
+        "cache_hits_total": hits,
+        "cache_misses_total": _RESOLUTION_COUNTERS["cache_misses"],
+        "cache_evictions_total": _RESOLUTION_COUNTERS["cache_evictions"],
+        "unknown_resolutions_total": unknown,
+        "unknown_ratio": unknown / resolutions if resolutions else 0.0,
+        "cache_hit_ratio": hits / resolutions if resolutions else 0.0,
+        "registry_entries": len(MODEL_REGISTRY),
+        "auto_registered_entries": count_auto_registered(),
+        "family_configs": len(_FAMILY_CONFIGS),
+        "registry_generation": get_registry_generation(),
+        "dynamic_enum_members": {
+            "ModelFamily": len(ModelFamily.dynamic_members()),
+            "Provider": len(Provider.dynamic_members()),
+        },
+    }
+
+
+def reset_metrics() -> None:
+    """清零解析计数器（仪表值反映当前状态，不受影响） / Reset resolution counters (gauges reflect live state)"""
+    for key in _RESOLUTION_COUNTERS:
+        _RESOLUTION_COUNTERS[key] = 0
+
+
+def _format_value(value: float) -> str:
+    """按 Prometheus 文本格式输出数值 / Format a number for the Prometheus text format"""
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def render_prometheus(include_stage_histograms: bool = True) -> str:
+    """
+    以 Prometheus 文本暴露格式输出指标 / Render metrics in the Prometheus text exposition format
+
+    Args:
+        include_stage_histograms: 开启 instrumentation 时是否附带各阶段耗时直方图 /
+            Whether to include per-stage duration histograms when instrumentation has data
+
+    Returns:
+        str: 文本暴露格式 / Text exposition format
+    """
+    snapshot = metrics_snapshot()
+    lines: list[str] = []
+
+    for key, metric_type, help_text in _SCALAR_METRICS:
+        name = f"{METRIC_PREFIX}_{key}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.append(f"{name} {_format_value(snapshot[key])}")
+
+    name = f"{METRIC_PREFIX}_dynamic_enum_members"
+    lines.append(f"# HELP {name} Enum members added at runtime via DynamicEnumMeta.")
+    lines.append(f"# TYPE {name} gauge")
+    for enum_name, count in snapshot["dynamic_enum_members"].items():
+        lines.append(f'{name}{{enum="{enum_name}"}} {count}')
+
+    histograms = instrumentation.get_stage_histograms() if include_stage_histograms else {}
+    if histograms:
+        name = f"{METRIC_PREFIX}_resolution_stage_seconds"
+        lines.append(f"# HELP {name} Duration of get_model_info stages (requires instrumentation).")
+        lines.append(f"# TYPE {name} histogram")
+        for stage, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.counts, strict=True):
+                cumulative += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{_format_value(bound)}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {_format_value(histogram.total_seconds)}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "METRIC_PREFIX",
+    "metrics_snapshot",
+    "render_prometheus",
+    "reset_metrics",
+]
@@ -0,0 +1,57 @@
+# filename: __init__.py
+# @Time    : 2026/10/19 21:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+媒体检查 / Media checks
+
+只读取头部即可对照 ``ModelCapabilities`` 的媒体限制检查附件，在上传前拦截超限的媒体。
+Checks attachments against the media limits in ``ModelCapabilities`` by reading headers only, rejecting
+oversize media before it is uploaded.
+"""
+
+from whosellm.media.base import MediaCheck, MediaInfo, MediaSource, MediaValidationError, MediaViolation
+from whosellm.media.container import (
+    check_audio,
+    check_video,
+    probe_container,
+    validate_audio,
+    validate_video,
+)
+from whosellm.media.image import check_image, probe_image, validate_image
+from whosellm.media.inline import (
+    Base64Reader,
+    base64_decoded_size,
+    check_inline,
+    sniff_audio,
+    split_data_url,
+    validate_inline,
+)
+from whosellm.media.parallel import Attachment, check_media, validate_media_many, validate_media_many_async
+
+__all__ = [
+    "Attachment",
+    "Base64Reader",
+    "MediaCheck",
+    "MediaInfo",
+    "MediaSource",
+    "MediaValidationError",
+    "MediaViolation",
+    "base64_decoded_size",
+    "check_audio",
+    "check_image",
+    "check_inline",
+    "check_media",
+    "check_video",
+    "probe_container",
+    "probe_image",
+    "sniff_audio",
+    "split_data_url",
+    "validate_audio",
+    "validate_image",
+    "validate_inline",
+    "validate_media_many",
+    "validate_media_many_async",
+    "validate_video",
+]
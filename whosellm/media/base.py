@@ -0,0 +1,219 @@
+# filename: base.py
+# @Time    : 2026/10/19 21:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+媒体检查基础类型 / Media check building blocks
+
+媒体来源可以是文件路径、字节串或可 seek 的二进制文件对象。探测器只读取头部（以及跳过的分段长度），
+不解码、不把文件完整读入内存。检查结果以结构化的 ``MediaViolation`` 列表返回，风格与请求预检一致。
+A media source is a file path, a bytes-like object or a seekable binary file object. Probers only read
+headers (and the lengths of segments they skip); nothing is decoded or fully loaded into memory. Check
+results are returned as structured ``MediaViolation`` lists, in the same style as the request pre-flight.
+"""
+
+import io
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO
+
+# 文件路径、字节串或二进制文件对象 / A file path, bytes-like object or binary file object
+MediaSource = str | os.PathLike[str] | bytes | bytearray | memoryview | BinaryIO
+
+# 能力中的 *_size_mb 以 MiB 计 / *_size_mb capabilities are in MiB
+MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """
+    从头部探测到的媒体信息 / Media information probed from headers
+    """
+
+    kind: str  # image / video / audio
+    mime_type: str | None = None
+    size_bytes: int | None = None
+    width: int | None = None
+    height: int | None = None
+    duration_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class MediaViolation:
+    """
+    单条媒体限制违规 / A single media limit violation
+    """
+
+    code: str  # 如 image_size / image_pixels / image_mime_type / e.g. image_size / image_pixels / image_mime_type
+    capability: str  # 违反的能力字段 / The capability field that is violated
+    message: str
+
+
+class MediaValidationError(ValueError):
+    """
+    媒体未通过检查 / Media failed the check
+    """
+
+    def __init__(self, check: "MediaCheck") -> None:
+        self.check = check
+        super().__init__("; ".join(violation.message for violation in check.violations))
+
+
+@dataclass(frozen=True)
+class MediaCheck:
+    """
+    媒体检查结果 / Media check result
+    """
+
+    info: MediaInfo
+    violations: tuple[MediaViolation, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        """是否满足所有限制 / Whether every limit is satisfied"""
+        return not self.violations
+
+    def raise_for_violation(self) -> None:
+        """
+        有违规时抛出 / Raise when there are violations
+
+        Raises:
+            MediaValidationError: 媒体未通过检查 / The media failed the check
+        """
+        if self.violations:
+            raise MediaValidationError(self)
+
+
+@contextmanager
+def open_source(source: MediaSource) -> Iterator[tuple[BinaryIO, int]]:
+    """
+    以可 seek 的流打开媒体来源，并给出总字节数 / Open a media source as a seekable stream with its total size
+
+    路径由这里打开和关闭；调用方传入的文件对象不会被关闭，读取位置会被恢复。
+    Paths are opened and closed here; file objects passed by the caller are not closed and their position is
+    restored.
+
+    Args:
+        source: 媒体来源 / Media source
+
+    Yields:
+        tuple[BinaryIO, int]: (位于开头的流, 总字节数) / (stream positioned at the start, total size in bytes)
+    """
+    if isinstance(source, str | os.PathLike):
+        with open(source, "rb") as stream:
+            yield stream, os.fstat(stream.fileno()).st_size
+        return
+    if isinstance(source, bytes | bytearray | memoryview):
+        # BytesIO 在未写入前与原对象共享缓冲区 / BytesIO shares the buffer until it is written to
+        yield io.BytesIO(source), memoryview(source).nbytes
+        return
+
+    position = source.tell()
+    size = source.seek(0, io.SEEK_END)
+    source.seek(0)
+    try:
+        yield source, size
+    finally:
+        source.seek(position)
+
+
+def check_size(
+    violations: list[MediaViolation],
+    kind: str,
+    size_bytes: int,
+    limit_mb: float | None,
+) -> None:
+    """
+    检查大小限制，违规时追加到列表 / Check a size limit, appending to the list on violation
+
+    Args:
+        violations: 违规列表 / Violation list
+        kind: image / video / audio
+        size_bytes: 实际字节数 / Actual size in bytes
+        limit_mb: 上限（MiB），None 表示不限制 / Limit in MiB, None means unlimited
+    """
+    if limit_mb is not None and size_bytes > limit_mb * MB:
+        violations.append(
+            MediaViolation(
+                f"{kind}_size",
+                f"max_{kind}_size_mb",
+                f"{kind} 大小 {size_bytes / MB:.2f} MB 超过上限 {limit_mb} MB / "
+                f"{kind} size {size_bytes / MB:.2f} MB exceeds the {limit_mb} MB limit",
+            ),
+        )
+
+
+def check_duration(
+    violations: list[MediaViolation],
+    kind: str,
+    duration_seconds: float | None,
+    limit_seconds: int | None,
+) -> None:
+    """
+    检查时长限制，违规时追加到列表 / Check a duration limit, appending to the list on violation
+
+    Args:
+        violations: 违规列表 / Violation list
+        kind: video / audio
+        duration_seconds: 探测到的时长，None 表示未知（不判定违规） / Probed duration, None when unknown (not a violation)
+        limit_seconds: 上限（秒），None 表示不限制 / Limit in seconds, None means unlimited
+    """
+    if limit_seconds is not None and duration_seconds is not None and duration_seconds > limit_seconds:
+        violations.append(
+            MediaViolation(
+                f"{kind}_duration",
+                f"max_{kind}_duration_seconds",
+                f"{kind} 时长 {duration_seconds:.1f}s 超过上限 {limit_seconds}s / "
+                f"{kind} duration {duration_seconds:.1f}s exceeds the {limit_seconds}s limit",
+            ),
+        )
+
+
+def check_mime_type(
+    violations: list[MediaViolation],
+    kind: str,
+    mime_type: str | None,
+    supported: list[str],
+) -> None:
+    """
+    检查 MIME 类型，违规时追加到列表 / Check a MIME type, appending to the list on violation
+
+    Args:
+        violations: 违规列表 / Violation list
+        kind: image / video / audio
+        mime_type: 探测到的 MIME 类型，None 表示无法识别 / Probed MIME type, None when unrecognized
+        supported: 支持的 MIME 类型 / Supported MIME types
+    """
+    if mime_type is None:
+        violations.append(
+            MediaViolation(
+                f"{kind}_format",
+                f"supported_{kind}_mime_type",
+                f"无法识别的 {kind} 格式 / Unrecognized {kind} format",
+            ),
+        )
+    elif mime_type not in supported:
+        violations.append(
+            MediaViolation(
+                f"{kind}_mime_type",
+                f"supported_{kind}_mime_type",
+                f"不支持的 {kind} 类型 / Unsupported {kind} type: {mime_type}",
+            ),
+        )
+
+
+__all__ = [
+    "MB",
+    "MediaCheck",
+    "MediaInfo",
+    "MediaSource",
+    "MediaValidationError",
+    "MediaViolation",
+    "check_duration",
+    "check_mime_type",
+    "check_size",
+    "open_source",
+]
@@ -0,0 +1,385 @@
+# filename: container.py
+# @Time    : 2026/10/19 22:00
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+音视频容器时长探测 / Audio and video container duration probing
+
+纯 Python 实现，不依赖 ffmpeg：MP4 / MOV 逐个 box 读取 8 字节头并 seek 跳过（``mdat`` 不读取），只解析
+``moov/mvhd``；WAV 读取 ``fmt `` 的字节率与 ``data`` 的长度；MP3 跳过 ID3v2 后解析首帧，优先用 Xing / Info /
+VBRI 头的帧数，否则按 CBR 码率估算；AVI 读取 ``avih`` 的帧间隔与总帧数。对照 ``max_*_size_mb``、
+``max_*_duration_seconds`` 与 MIME 列表检查，在上传前拦截超限的媒体。
+Pure Python, no ffmpeg: MP4 / MOV reads 8-byte box headers and seeks past the payloads (``mdat`` is never
+read), parsing only ``moov/mvhd``; WAV reads the byte rate from ``fmt `` and the length of ``data``; MP3
+skips ID3v2 and parses the first frame, using the Xing / Info / VBRI frame count when present and the CBR
+bitrate otherwise; AVI reads the frame interval and total frames from ``avih``. Media is checked against
+``max_*_size_mb``, ``max_*_duration_seconds`` and the MIME lists before it is uploaded.
+
+Example:
+    >>> from whosellm.media import validate_video
+    >>> check = validate_video("viduq1", "clip.mp4")
+    >>> check.info.duration_seconds, check.ok
+    (12.5, False)
+"""
+
+import struct
+from typing import BinaryIO
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.media.base import (
+    MediaCheck,
+    MediaInfo,
+    MediaSource,
+    MediaViolation,
+    check_duration,
+    check_mime_type,
+    check_size,
+    open_source,
+)
+from whosellm.model_version import LLMeta
+from whosellm.validation.vrl import resolve_model
+
+# 容器格式 → MIME 类型 / Container format → MIME type
+VIDEO_MIME_TYPES = {"mp4": "video/mp4", "quicktime": "video/quicktime", "avi": "video/x-msvideo"}
+AUDIO_MIME_TYPES = {
+    "mp4": "audio/mp4",
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "ogg": "audio/ogg",
+    "flac": "audio/flac",
+    "webm": "audio/webm",
+}
+
+# MP3 首帧的搜索范围 / How far to search for the first MP3 frame
+_MP3_SEARCH_BYTES = 8192
+
+# MPEG 音频码率表（kbps），键为 (MPEG-1, layer) / MPEG audio bitrate tables in kbps, keyed by (MPEG-1, layer)
+_MP3_BITRATES: dict[tuple[bool, int], tuple[int, ...]] = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# 采样率表，键为版本位 / Sample rate tables keyed by the version bits
+_MP3_SAMPLE_RATES = {0b11: (44100, 48000, 32000), 0b10: (22050, 24000, 16000), 0b00: (11025, 12000, 8000)}
+
+
+def sniff_audio(header: bytes) -> str | None:
+    """
+    从头部嗅探音频 MIME 类型 / Sniff an audio MIME type from its header
+
+    Args:
+        header: 前若干字节 / Leading bytes
+
+    Returns:
+        str | None: MIME 类型，无法识别时为 None / MIME type, None when unrecognized
+    """
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "audio/wav"
+    if header[:3] == b"ID3" or (len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return "audio/mpeg"
+    if header[4:8] == b"ftyp":
+        return "audio/mp4"
+    if header[:4] == b"OggS":
+        return "audio/ogg"
+    if header[:4] == b"fLaC":
+        return "audio/flac"
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return "audio/webm"
+    return None
+
+
+def _iter_boxes(stream: BinaryIO, start: int, end: int) -> list[tuple[bytes, int, int]]:
+    """
+    列出 [start, end) 内的 MP4 box，只读取头部 / List MP4 boxes within [start, end), reading headers only
+
+    Returns:
+        list: (类型, 内容起始位置, box 结束位置) / (type, payload start, box end)
+    """
+    boxes: list[tuple[bytes, int, int]] = []
+    position = start
+    while position + 8 <= end:
+        stream.seek(position)
+        header = stream.read(8)
+        if len(header) < 8:
+            break
+        size, box_type = struct.unpack(">I4s", header)
+        payload = position + 8
+        if size == 1:
+            large = stream.read(8)
+            if len(large) < 8:
+                break
+            (size,) = struct.unpack(">Q", large)
+            payload += 8
+        elif size == 0:
+            size = end - position
+        if size < payload - position:
+            break
+        boxes.append((box_type, payload, position + size))
+        position += size
+    return boxes
+
+
+def _probe_mp4(stream: BinaryIO, size_bytes: int) -> tuple[str, float | None]:
+    """从 moov/mvhd 读取时长 / Read the duration from moov/mvhd"""
+    stream.seek(8)
+    brand = stream.read(4)
+    container = "quicktime" if brand == b"qt  " else "mp4"
+    for box_type, payload, box_end in _iter_boxes(stream, 0, size_bytes):
+        if box_type != b"moov":
+            continue
+        for child_type, child_payload, _child_end in _iter_boxes(stream, payload, box_end):
+            if child_type != b"mvhd":
+                continue
+            stream.seek(child_payload)
+            version = stream.read(4)[:1]
+            if version == b"\x01":
+                data = stream.read(28)
+                if len(data) < 28:
+                    break
+                _created, _modified, timescale, duration = struct.unpack(">QQIQ", data)
+            else:
+                data = stream.read(16)
+                if len(data) < 16:
+                    break
+                _created, _modified, timescale, duration = struct.unpack(">IIII", data)
+            return container, duration / timescale if timescale else None
+        break
+    return container, None
+
+
+def _probe_wav(stream: BinaryIO, size_bytes: int) -> float | None:
+    """由字节率与 data 长度计算时长 / Compute the duration from the byte rate and the data length"""
+    byte_rate = None
+    position = 12
+    while position + 8 <= size_bytes:
+        stream.seek(position)
+        chunk_id, chunk_size = struct.unpack("<4sI", stream.read(8))
+        if chunk_id == b"fmt ":
+            fmt = stream.read(12)
+            if len(fmt) == 12:
+                (byte_rate,) = struct.unpack("<I", fmt[8:12])
+        elif chunk_id == b"data":
+            # 流式写入的 WAV 可能把长度记为 0 或 0xFFFFFFFF / Streamed WAVs may record 0 or 0xFFFFFFFF
+            available = size_bytes - position - 8
+            data_size = chunk_size if 0 < chunk_size <= available else available
+            return data_size / byte_rate if byte_rate else None
+        position += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+def _probe_mp3(stream: BinaryIO, size_bytes: int) -> float | None:
+    """由 Xing / VBRI 帧数或 CBR 码率计算时长 / Compute the duration from a Xing / VBRI frame count or the CBR bitrate"""
+    stream.seek(0)
+    audio_start = 0
+    header = stream.read(10)
+    if header[:3] == b"ID3" and len(header) == 10:
+        # ID3v2 长度为 syncsafe 整数 / ID3v2 sizes are syncsafe integers
+        tag_size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        audio_start = 10 + tag_size + (10 if header[5] & 0x10 else 0)
+
+    stream.seek(audio_start)
+    window = stream.read(_MP3_SEARCH_BYTES)
+    offset = window.find(b"\xff")
+    word = 0
+    while 0 <= offset <= len(window) - 4:
+        word = int.from_bytes(window[offset : offset + 4], "big")
+        version_bits = (word >> 19) & 0b11
+        layer = 4 - ((word >> 17) & 0b11)
+        bitrate_index = (word >> 12) & 0xF
+        rate_index = (word >> 10) & 0b11
+        if (
+            word >> 21 == 0x7FF
+            and version_bits != 0b01
+            and layer != 4
+            and bitrate_index not in (0, 0xF)
+            and rate_index != 0b11
+        ):
+            break
+        offset = window.find(b"\xff", offset + 1)
+    else:
+        return None
+
+    mpeg1 = version_bits == 0b11
+    sample_rate = _MP3_SAMPLE_RATES[version_bits][rate_index]
+    samples_per_frame = 384 if layer == 1 else (1152 if mpeg1 or layer == 2 else 576)
+    mono = (word >> 6) & 0b11 == 0b11
+
+    # Xing / Info 头位于 side info 之后，VBRI 头固定在帧头后 32 字节
+    # The Xing / Info header follows the side info, the VBRI header sits 32 bytes after the frame header
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    xing = offset + 4 + side_info
+    if window[xing : xing + 4] in (b"Xing", b"Info") and len(window) >= xing + 12:
+        (flags,) = struct.unpack(">I", window[xing + 4 : xing + 8])
+        if flags & 0x1:
+            frames = int.from_bytes(window[xing + 8 : xing + 12], "big")
+            return frames * samples_per_frame / sample_rate
+    vbri = offset + 4 + 32
+    if window[vbri : vbri + 4] == b"VBRI" and len(window) >= vbri + 18:
+        frames = int.from_bytes(window[vbri + 14 : vbri + 18], "big")
+        return frames * samples_per_frame / sample_rate
+
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    return (size_bytes - audio_start - offset) * 8 / bitrate
+
+
+def _probe_avi(stream: BinaryIO) -> float | None:
+    """由 avih 的帧间隔与总帧数计算时长 / Compute the duration from avih's frame interval and total frames"""
+    stream.seek(12)
+    header = stream.read(40)
+    if len(header) < 40 or header[0:4] != b"LIST" or header[8:12] != b"hdrl" or header[12:16] != b"avih":
+        return None
+    microseconds_per_frame = int.from_bytes(header[20:24], "little")
+    total_frames = int.from_bytes(header[36:40], "little")
+    return microseconds_per_frame * total_frames / 1_000_000
+
+
+def probe_container(stream: BinaryIO, size_bytes: int) -> tuple[str, float | None] | None:
+    """
+    探测容器格式与时长 / Probe a container's format and duration
+
+    Args:
+        stream: 可 seek 的二进制流 / Seekable binary stream
+        size_bytes: 总字节数 / Total size in bytes
+
+    Returns:
+        tuple | None: (格式, 时长秒数)，时长读取失败时为 None；无法识别时返回 None /
+            (format, duration in seconds) with None duration when it cannot be read; None when unrecognized
+    """
+    stream.seek(0)
+    header = stream.read(12)
+    if header[4:8] == b"ftyp":
+        return _probe_mp4(stream, size_bytes)
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav", _probe_wav(stream, size_bytes)
+    if header[:4] == b"RIFF" and header[8:12] == b"AVI ":
+        return "avi", _probe_avi(stream)
+    if header[:3] == b"ID3" or (len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return "mp3", _probe_mp3(stream, size_bytes)
+    mime_type = sniff_audio(header)
+    if mime_type is not None:
+        # 其他音频格式只识别类型 / Other audio formats are only recognized, not timed
+        return mime_type.split("/", 1)[1], None
+    return None
+
+
+def _check_stream(kind: str, stream: BinaryIO, size_bytes: int, capabilities: ModelCapabilities) -> MediaCheck:
+    """按种类检查已打开的流 / Check an opened stream for a media kind"""
+    probed = probe_container(stream, size_bytes)
+    mime_types = VIDEO_MIME_TYPES if kind == "video" else AUDIO_MIME_TYPES
+    mime_type = mime_types.get(probed[0]) if probed is not None else None
+    duration = probed[1] if probed is not None and mime_type is not None else None
+    info = MediaInfo(kind=kind, mime_type=mime_type, size_bytes=size_bytes, duration_seconds=duration)
+
+    violations: list[MediaViolation] = []
+    check_size(violations, kind, size_bytes, getattr(capabilities, f"max_{kind}_size_mb"))
+    check_mime_type(violations, kind, mime_type, getattr(capabilities, f"supported_{kind}_mime_type"))
+    check_duration(violations, kind, duration, getattr(capabilities, f"max_{kind}_duration_seconds"))
+    return MediaCheck(info=info, violations=tuple(violations))
+
+
+def check_video_stream(stream: BinaryIO, size_bytes: int, capabilities: ModelCapabilities) -> MediaCheck:
+    """
+    对照能力检查已打开的视频流 / Check an opened video stream against capabilities
+
+    Args:
+        stream: 可 seek 的二进制流 / Seekable binary stream
+        size_bytes: 总字节数 / Total size in bytes
+        capabilities: 模型能力 / Model capabilities
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    return _check_stream("video", stream, size_bytes, capabilities)
+
+
+def check_audio_stream(stream: BinaryIO, size_bytes: int, capabilities: ModelCapabilities) -> MediaCheck:
+    """
+    对照能力检查已打开的音频流 / Check an opened audio stream against capabilities
+
+    Args:
+        stream: 可 seek 的二进制流 / Seekable binary stream
+        size_bytes: 总字节数 / Total size in bytes
+        capabilities: 模型能力 / Model capabilities
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    return _check_stream("audio", stream, size_bytes, capabilities)
+
+
+def check_video(source: MediaSource, capabilities: ModelCapabilities) -> MediaCheck:
+    """
+    对照能力检查视频 / Check a video against capabilities
+
+    Args:
+        source: 文件路径、字节串或二进制文件对象 / File path, bytes-like object or binary file object
+        capabilities: 模型能力 / Model capabilities
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    with open_source(source) as (stream, size_bytes):
+        return check_video_stream(stream, size_bytes, capabilities)
+
+
+def check_audio(source: MediaSource, capabilities: ModelCapabilities) -> MediaCheck:
+    """
+    对照能力检查音频 / Check an audio clip against capabilities
+
+    Args:
+        source: 文件路径、字节串或二进制文件对象 / File path, bytes-like object or binary file object
+        capabilities: 模型能力 / Model capabilities
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    with open_source(source) as (stream, size_bytes):
+        return check_audio_stream(stream, size_bytes, capabilities)
+
+
+def validate_video(model: str | LLMeta, source: MediaSource) -> MediaCheck:
+    """
+    按模型能力检查视频 / Check a video against a model's capabilities
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        source: 文件路径、字节串或二进制文件对象 / File path, bytes-like object or binary file object
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    _name, _identity, capabilities = resolve_model(model)
+    return check_video(source, capabilities)
+
+
+def validate_audio(model: str | LLMeta, source: MediaSource) -> MediaCheck:
+    """
+    按模型能力检查音频 / Check an audio clip against a model's capabilities
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        source: 文件路径、字节串或二进制文件对象 / File path, bytes-like object or binary file object
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    _name, _identity, capabilities = resolve_model(model)
+    return check_audio(source, capabilities)
+
+
+__all__ = [
+    "AUDIO_MIME_TYPES",
+    "VIDEO_MIME_TYPES",
+    "check_audio",
+    "check_audio_stream",
+    "check_video",
+    "check_video_stream",
+    "probe_container",
+    "sniff_audio",
+    "validate_audio",
+    "validate_video",
+]
@@ -0,0 +1,199 @@
+# filename: image.py
+# @Time    : 2026/10/19 21:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+只读头部的图片检查 / Header-only image checks
+
+从 PNG IHDR、JPEG SOF、WebP（VP8 / VP8L / VP8X）与 GIF 逻辑屏幕描述符中读取格式与尺寸，对照
+``max_image_size_mb``、``max_image_pixels`` 与 ``supported_image_mime_type`` 检查。JPEG 只读取各分段的标记与
+长度并 seek 跳过内容，其余格式只读前 30 字节，不解码像素。
+Reads the format and dimensions from the PNG IHDR, JPEG SOF, WebP (VP8 / VP8L / VP8X) and GIF logical screen
+descriptor and checks them against ``max_image_size_mb``, ``max_image_pixels`` and
+``supported_image_mime_type``. For JPEG only segment markers and lengths are read and the payloads are
+skipped with seek; other formats read just the first 30 bytes. No pixels are decoded.
+
+Example:
+    >>> from whosellm.media import validate_image
+    >>> check = validate_image("glm-4v-plus", "photo.jpg")
+    >>> check.info.width, check.info.height, check.ok
+    (4032, 3024, True)
+"""
+
+import io
+import struct
+from typing import BinaryIO
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.media.base import (
+    MediaCheck,
+    MediaInfo,
+    MediaSource,
+    MediaViolation,
+    check_mime_type,
+    check_size,
+    open_source,
+)
+from whosellm.model_version import LLMeta
+from whosellm.validation.vrl import resolve_model
+
+# 识别格式所需的头部长度 / Header length needed to recognize a format
+HEADER_BYTES = 30
+
+# 带尺寸的 JPEG 帧起始标记（排除 DHT / JPG / DAC） / JPEG start-of-frame markers carrying dimensions
+# (excluding DHT / JPG / DAC)
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# 没有长度字段的 JPEG 标记 / JPEG markers without a length field
+_JPEG_STANDALONE = frozenset(range(0xD0, 0xD8)) | {0x01, 0xD8}
+
+
+def _probe_jpeg(stream: BinaryIO) -> tuple[int, int] | None:
+    """逐个分段跳过直到 SOF / Skip segment by segment until a SOF"""
+    stream.seek(2)
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = stream.read(1)
+        while marker == b"\xff":  # 填充字节 / Fill bytes
+            marker = stream.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code in _JPEG_STANDALONE:
+            continue
+        if code in (0xD9, 0xDA):
+            # 图像结束或扫描开始前都没有 SOF / End of image or start of scan without a SOF
+            return None
+        length_bytes = stream.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if code in _JPEG_SOF:
+            frame = stream.read(5)
+            if len(frame) < 5:
+                return None
+            _precision, height, width = struct.unpack(">BHH", frame)
+            return width, height
+        stream.seek(length - 2, io.SEEK_CUR)
+
+
+def probe_image(stream: BinaryIO) -> tuple[str, int | None, int | None] | None:
+    """
+    从头部探测图片格式与尺寸 / Probe an image's format and dimensions from its header
+
+    Args:
+        stream: 位于开头、可 seek 的二进制流 / Seekable binary stream positioned at the start
+
+    Returns:
+        tuple | None: (MIME 类型, 宽, 高)，尺寸读取失败时为 None；无法识别时返回 None /
+            (MIME type, width, height) with None dimensions when they cannot be read; None when unrecognized
+    """
+    header = stream.read(HEADER_BYTES)
+
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        if len(header) >= 24 and header[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", header[16:24])
+            return "image/png", width, height
+        return "image/png", None, None
+
+    if header.startswith(b"\xff\xd8"):
+        size = _probe_jpeg(stream)
+        return ("image/jpeg", *size) if size is not None else ("image/jpeg", None, None)
+
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        if len(header) >= 10:
+            width, height = struct.unpack("<HH", header[6:10])
+            return "image/gif", width, height
+        return "image/gif", None, None
+
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        chunk = header[12:16]
+        if chunk == b"VP8 " and len(header) >= 30 and header[23:26] == b"\x9d\x01\x2a":
+            width, height = struct.unpack("<HH", header[26:30])
+            return "image/webp", width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L" and len(header) >= 25 and header[20] == 0x2F:
+            (bits,) = struct.unpack("<I", header[21:25])
+            return "image/webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X" and len(header) >= 30:
+            width = int.from_bytes(header[24:27], "little") + 1
+            height = int.from_bytes(header[27:30], "little") + 1
+            return "image/webp", width, height
+        return "image/webp", None, None
+
+    return None
+
+
+def check_image_stream(stream: BinaryIO, size_bytes: int, capabilities: ModelCapabilities) -> MediaCheck:
+    """
+    对照能力检查已打开的图片流 / Check an opened image stream against capabilities
+
+    Args:
+        stream: 位于开头、可 seek 的二进制流 / Seekable binary stream positioned at the start
+        size_bytes: 图片总字节数 / Total image size in bytes
+        capabilities: 模型能力 / Model capabilities
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    probed = probe_image(stream)
+    mime_type, width, height = probed if probed is not None else (None, None, None)
+    info = MediaInfo(kind="image", mime_type=mime_type, size_bytes=size_bytes, width=width, height=height)
+
+    violations: list[MediaViolation] = []
+    check_size(violations, "image", size_bytes, capabilities.max_image_size_mb)
+    check_mime_type(violations, "image", mime_type, capabilities.supported_image_mime_type)
+    if capabilities.max_image_pixels is not None and width is not None and height is not None:
+        max_width, max_height = capabilities.max_image_pixels
+        if width > max_width or height > max_height:
+            violations.append(
+                MediaViolation(
+                    "image_pixels",
+                    "max_image_pixels",
+                    f"图片尺寸 {width}x{height} 超过上限 {max_width}x{max_height} / "
+                    f"Image dimensions {width}x{height} exceed the {max_width}x{max_height} limit",
+                ),
+            )
+    return MediaCheck(info=info, violations=tuple(violations))
+
+
+def check_image(source: MediaSource, capabilities: ModelCapabilities) -> MediaCheck:
+    """
+    对照能力检查图片 / Check an image against capabilities
+
+    Args:
+        source: 文件路径、字节串或二进制文件对象 / File path, bytes-like object or binary file object
+        capabilities: 模型能力 / Model capabilities
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    with open_source(source) as (stream, size_bytes):
+        return check_image_stream(stream, size_bytes, capabilities)
+
+
+def validate_image(model: str | LLMeta, source: MediaSource) -> MediaCheck:
+    """
+    按模型能力检查图片 / Check an image against a model's capabilities
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        source: 文件路径、字节串或二进制文件对象 / File path, bytes-like object or binary file object
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    _name, _identity, capabilities = resolve_model(model)
+    return check_image(source, capabilities)
+
+
+__all__ = [
+    "HEADER_BYTES",
+    "check_image",
+    "check_image_stream",
+    "probe_image",
+    "validate_image",
+]
@@ -0,0 +1,294 @@
+# filename: inline.py
+# @Time    : 2026/10/19 21:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+不解码的内联 base64 媒体检查 / Inline base64 media checks without decoding
+
+解码后的大小由 base64 长度与填充直接算出；格式与尺寸通过 ``Base64Reader`` 探测，它把解码后的偏移映射回
+4 字符一组的 base64 块，只解码探测器实际读取（或 seek 到）的几个 KB，整个载荷既不解码也不复制。
+The decoded size is computed from the base64 length and padding; format and dimensions are probed through a
+``Base64Reader`` that maps decoded offsets back to 4-character base64 blocks and only decodes the few KB a
+prober actually reads (or seeks to), so the payload is neither decoded nor copied as a whole.
+
+Example:
+    >>> from whosellm.media import validate_inline
+    >>> check = validate_inline("gpt-4o", "data:image/png;base64,iVBORw0KGgo...")
+    >>> check.info.size_bytes, check.ok
+    (48213, True)
+"""
+
+import base64
+import io
+from typing import BinaryIO
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.media.base import MediaCheck, MediaInfo, MediaViolation
+from whosellm.media.container import check_audio_stream, check_video_stream, sniff_audio
+from whosellm.media.image import check_image_stream
+from whosellm.model_version import LLMeta
+from whosellm.validation.vrl import resolve_model
+
+# 嗅探音频格式所需的头部长度 / Header length needed to sniff an audio format
+AUDIO_HEADER_BYTES = 12
+
+# 读取缓冲区大小，探测通常只需要第一块 / Read buffer size, probing usually needs only the first block
+_BUFFER_SIZE = 4096
+
+
+def split_data_url(data: str) -> tuple[str | None, int]:
+    """
+    拆分 data URL，返回声明的媒体类型与 base64 载荷的起始位置 /
+    Split a data URL into its declared media type and the start of the base64 payload
+
+    不是 data URL 时视为裸 base64。/ Anything that is not a data URL is treated as bare base64.
+
+    Args:
+        data: data URL 或裸 base64 / Data URL or bare base64
+
+    Returns:
+        tuple[str | None, int]: (媒体类型, 载荷起始位置) / (media type, payload start offset)
+
+    Raises:
+        ValueError: data URL 不是 base64 编码 / The data URL is not base64 encoded
+    """
+    if not data.startswith("data:"):
+        return None, 0
+    comma = data.find(",", 0, 256)
+    if comma < 0 or not data[:comma].endswith(";base64"):
+        msg = "只支持 base64 编码的 data URL / Only base64 data URLs are supported"
+        raise ValueError(msg)
+    media_type = data[5:comma].split(";", 1)[0].lower()
+    return media_type or None, comma + 1
+
+
+def base64_decoded_size(data: str | bytes, start: int = 0) -> int:
+    """
+    由长度与填充计算 base64 解码后的字节数 / Compute the decoded size of base64 from its length and padding
+
+    Args:
+        data: base64 文本（不含空白） / Base64 text (without whitespace)
+        start: 载荷起始位置 / Payload start offset
+
+    Returns:
+        int: 解码后的字节数 / Decoded size in bytes
+    """
+    length = len(data) - start
+    if length <= 0:
+        return 0
+    tail = data[-2:] if isinstance(data, str) else data[-2:].decode("ascii", "replace")
+    padding = min(tail.count("="), length)
+    full, remainder = divmod(length, 4)
+    # 未填充的尾块：2 个字符 → 1 字节，3 个字符 → 2 字节 / Unpadded tail: 2 chars → 1 byte, 3 chars → 2 bytes
+    return full * 3 - padding + max(remainder - 1, 0)
+
+
+class Base64Reader(io.RawIOBase):
+    """
+    按需解码的 base64 只读流 / Read-only stream decoding base64 on demand
+    """
+
+    def __init__(self, data: str | bytes, start: int = 0) -> None:
+        """
+        Args:
+            data: base64 文本（不含空白） / Base64 text (without whitespace)
+            start: 载荷起始位置，用于跳过 data URL 前缀 / Payload start offset, skips a data URL prefix
+        """
+        super().__init__()
+        self._data = data
+        self._start = start
+        self._position = 0
+        self.size = base64_decoded_size(data, start)
+        self.decoded_bytes = 0  # 累计解码的字节数 / Number of bytes decoded so far
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._position = max(offset, 0)
+        return self._position
+
+    def readinto(self, buffer: "bytearray | memoryview") -> int:  # type: ignore[override]
+        count = min(len(buffer), self.size - self._position)
+        if count <= 0:
+            return 0
+        first_block, skip = divmod(self._position, 3)
+        last_block = -(-(self._position + count) // 3)
+        chunk = self._data[self._start + first_block * 4 : self._start + last_block * 4]
+        padding = -len(chunk) % 4
+        if isinstance(chunk, str):
+            decoded = base64.b64decode(chunk + "=" * padding)
+        else:
+            decoded = base64.b64decode(chunk + b"=" * padding)
+        self.decoded_bytes += len(decoded)
+        buffer[:count] = decoded[skip : skip + count]
+        self._position += count
+        return count
+
+
+def open_base64(data: str | bytes, start: int = 0) -> BinaryIO:
+    """
+    以带缓冲的二进制流打开 base64 / Open base64 as a buffered binary stream
+
+    Args:
+        data: base64 文本（不含空白） / Base64 text (without whitespace)
+        start: 载荷起始位置 / Payload start offset
+
+    Returns:
+        BinaryIO: 可 seek 的二进制流 / Seekable binary stream
+    """
+    return io.BufferedReader(Base64Reader(data, start), buffer_size=_BUFFER_SIZE)
+
+
+def _invalid_base64(kind: str, size_bytes: int) -> MediaCheck:
+    """base64 无法解码时的结果 / Result when the base64 cannot be decoded"""
+    violation = MediaViolation(f"{kind}_format", f"supported_{kind}_mime_type", "无效的 base64 / Invalid base64")
+    return MediaCheck(info=MediaInfo(kind=kind, size_bytes=size_bytes), violations=(violation,))
+
+
+def check_inline_image(data: str | bytes, capabilities: ModelCapabilities, start: int = 0) -> MediaCheck:
+    """
+    检查内联 base64 图片 / Check an inline base64 image
+
+    Args:
+        data: base64 文本（不含空白） / Base64 text (without whitespace)
+        capabilities: 模型能力 / Model capabilities
+        start: 载荷起始位置 / Payload start offset
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    stream = open_base64(data, start)
+    size_bytes = base64_decoded_size(data, start)
+    try:
+        check = check_image_stream(stream, size_bytes, capabilities)
+    except ValueError:  # binascii.Error
+        return _invalid_base64("image", size_bytes)
+    if capabilities.supports_image_base64:
+        return check
+    violation = MediaViolation(
+        "image_base64",
+        "supports_image_base64",
+        "模型不支持 base64 图片 / The model does not accept base64 images",
+    )
+    return MediaCheck(info=check.info, violations=(violation, *check.violations))
+
+
+def check_inline_audio(data: str | bytes, capabilities: ModelCapabilities, start: int = 0) -> MediaCheck:
+    """
+    检查内联 base64 音频 / Check an inline base64 audio clip
+
+    Args:
+        data: base64 文本（不含空白） / Base64 text (without whitespace)
+        capabilities: 模型能力 / Model capabilities
+        start: 载荷起始位置 / Payload start offset
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    size_bytes = base64_decoded_size(data, start)
+    try:
+        return check_audio_stream(open_base64(data, start), size_bytes, capabilities)
+    except ValueError:  # binascii.Error
+        return _invalid_base64("audio", size_bytes)
+
+
+def check_inline_video(data: str | bytes, capabilities: ModelCapabilities, start: int = 0) -> MediaCheck:
+    """
+    检查内联 base64 视频 / Check an inline base64 video
+
+    Args:
+        data: base64 文本（不含空白） / Base64 text (without whitespace)
+        capabilities: 模型能力 / Model capabilities
+        start: 载荷起始位置 / Payload start offset
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    size_bytes = base64_decoded_size(data, start)
+    try:
+        return check_video_stream(open_base64(data, start), size_bytes, capabilities)
+    except ValueError:  # binascii.Error
+        return _invalid_base64("video", size_bytes)
+
+
+def check_inline(data: str, capabilities: ModelCapabilities, kind: str | None = None) -> MediaCheck:
+    """
+    检查 data URL 或裸 base64 媒体 / Check a data URL or bare base64 media
+
+    Args:
+        data: data URL 或裸 base64 / Data URL or bare base64
+        capabilities: 模型能力 / Model capabilities
+        kind: image / video / audio；为 None 时取 data URL 声明的类型，再退回到音频嗅探 /
+            image / video / audio; taken from the data URL's declared type when None, falling back to audio sniffing
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+
+    Raises:
+        ValueError: 不是 base64 data URL，或无法确定媒体种类 / Not a base64 data URL, or the kind cannot be determined
+    """
+    media_type, start = split_data_url(data)
+    # 结尾的换行 / 空格不计入大小与填充（无尾随空白时 rstrip 不复制） /
+    # Trailing newlines / spaces must not count towards size and padding (rstrip does not copy when there are none)
+    data = data.rstrip()
+    # MIME 风格的 base64 每 76 个字符换行，检查首尾各一行即可 / MIME style base64 breaks every 76 chars,
+    # checking one line at each end is enough
+    head, tail = data[start : start + 80], data[max(start, len(data) - 80) :]
+    if any(char in head or char in tail for char in "\r\n\t "):
+        data, start = "".join(data[start:].split()), 0
+
+    if kind is None and media_type is not None:
+        kind = media_type.split("/", 1)[0]
+    if kind is None:
+        kind = "audio" if sniff_audio(open_base64(data, start).read(AUDIO_HEADER_BYTES)) else "image"
+    if kind == "image":
+        return check_inline_image(data, capabilities, start)
+    if kind == "video":
+        return check_inline_video(data, capabilities, start)
+    if kind == "audio":
+        return check_inline_audio(data, capabilities, start)
+    msg = f"不支持的内联媒体种类 / Unsupported inline media kind: {kind!r}"
+    raise ValueError(msg)
+
+
+def validate_inline(model: str | LLMeta, data: str, kind: str | None = None) -> MediaCheck:
+    """
+    按模型能力检查 data URL 或裸 base64 媒体 / Check a data URL or bare base64 media against a model's capabilities
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        data: data URL 或裸 base64 / Data URL or bare base64
+        kind: image / video / audio（可选） / image / video / audio (optional)
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+    """
+    _name, _identity, capabilities = resolve_model(model)
+    return check_inline(data, capabilities, kind)
+
+
+__all__ = [
+    "AUDIO_HEADER_BYTES",
+    "Base64Reader",
+    "base64_decoded_size",
+    "check_inline",
+    "check_inline_audio",
+    "check_inline_image",
+    "check_inline_video",
+    "open_base64",
+    "sniff_audio",
+    "split_data_url",
+    "validate_inline",
+]
@@ -0,0 +1,233 @@
+# filename: parallel.py
+# @Time    : 2026/10/19 22:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+多附件请求的并行媒体检查 / Parallel media checks for multi-attachment requests
+
+模型只解析一次；内存中的附件（data URL、字节串）只做 CPU 计算，直接在调用线程中检查；文件附件的头部
+读取是 I/O 密集的，分发到有界线程池（或 asyncio 变体中的 ``asyncio.to_thread``，由信号量限制并发）。
+``fail_fast=True`` 时遇到第一个违规即取消尚未开始的检查并抛出 ``MediaValidationError``。
+The model is resolved once. In-memory attachments (data URLs, bytes) are CPU-only and checked
+on the calling thread; header reads for file attachments are I/O bound and fan out to a bounded thread pool
+(or ``asyncio.to_thread`` under a semaphore in the asyncio variant). With ``fail_fast=True`` the first
+violation cancels checks that have not started yet and raises ``MediaValidationError``.
+
+Example:
+    >>> from whosellm.media import Attachment, validate_media_many
+    >>> checks = validate_media_many("glm-4v-plus", ["a.jpg", "b.png", Attachment("clip.mp4", kind="video")])
+    >>> [check.ok for check in checks]
+    [True, True, False]
+"""
+
+import asyncio
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.media.base import MediaCheck, MediaSource, MediaValidationError, open_source
+from whosellm.media.container import VIDEO_MIME_TYPES, check_audio_stream, check_video_stream, probe_container
+from whosellm.media.image import check_image_stream, probe_image
+from whosellm.media.inline import check_inline
+from whosellm.model_version import LLMeta
+from whosellm.validation.vrl import resolve_model
+
+# 默认并发数 / Default concurrency
+DEFAULT_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class Attachment:
+    """
+    待检查的附件 / An attachment to check
+    """
+
+    source: MediaSource
+    kind: str | None = None  # image / video / audio；为 None 时按头部识别 / Detected from headers when None
+
+
+def check_media(source: MediaSource, capabilities: ModelCapabilities, kind: str | None = None) -> MediaCheck:
+    """
+    检查任意种类的媒体 / Check media of any kind
+
+    字符串若是 data URL 则按内联 base64 检查，否则视为文件路径。
+    A string is checked as inline base64 when it is a data URL and treated as a file path otherwise.
+
+    Args:
+        source: 媒体来源 / Media source
+        capabilities: 模型能力 / Model capabilities
+        kind: image / video / audio；为 None 时按头部识别（MP4 视为视频） /
+            image / video / audio; detected from headers when None (MP4 counts as video)
+
+    Returns:
+        MediaCheck: 检查结果 / Check result
+
+    Raises:
+        ValueError: 不支持的媒体种类 / Unsupported media kind
+    """
+    if isinstance(source, str) and source.startswith("data:"):
+        return check_inline(source, capabilities, kind)
+
+    with open_source(source) as (stream, size_bytes):
+        if kind is None:
+            if probe_image(stream) is not None:
+                kind = "image"
+            else:
+                probed = probe_container(stream, size_bytes)
+                kind = "video" if probed is not None and probed[0] in VIDEO_MIME_TYPES else "audio"
+            stream.seek(0)
+        if kind == "image":
+            return check_image_stream(stream, size_bytes, capabilities)
+        if kind == "video":
+            return check_video_stream(stream, size_bytes, capabilities)
+        if kind == "audio":
+            return check_audio_stream(stream, size_bytes, capabilities)
+    msg = f"不支持的媒体种类 / Unsupported media kind: {kind!r}"
+    raise ValueError(msg)
+
+
+def _normalize(attachments: Sequence[Attachment | MediaSource]) -> list[Attachment]:
+    """统一为 Attachment / Normalize to Attachment"""
+    return [item if isinstance(item, Attachment) else Attachment(item) for item in attachments]
+
+
+def _needs_io(attachment: Attachment) -> bool:
+    """是否需要读取文件（否则在调用线程中检查） / Whether a file is read (otherwise checked on the calling thread)"""
+    source = attachment.source
+    if isinstance(source, str):
+        return not source.startswith("data:")
+    return not isinstance(source, bytes | bytearray | memoryview)
+
+
+def _partition(attachments: list[Attachment]) -> tuple[list[int], list[int]]:
+    """按是否需要 I/O 拆分下标 / Split indices by whether they need I/O"""
+    in_memory: list[int] = []
+    io_bound: list[int] = []
+    for index, attachment in enumerate(attachments):
+        (io_bound if _needs_io(attachment) else in_memory).append(index)
+    return in_memory, io_bound
+
+
+def validate_media_many(
+    model: str | LLMeta,
+    attachments: Sequence[Attachment | MediaSource],
+    *,
+    max_workers: int = DEFAULT_WORKERS,
+    fail_fast: bool = False,
+) -> list[MediaCheck]:
+    """
+    按模型能力并行检查多个附件 / Check many attachments against a model's capabilities in parallel
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        attachments: 附件或媒体来源 / Attachments or media sources
+        max_workers: 文件读取的最大线程数 / Maximum threads for file reads
+        fail_fast: 遇到第一个违规即停止并抛出 / Stop and raise on the first violation
+
+    Returns:
+        list[MediaCheck]: 与输入对齐的检查结果 / Check results aligned with the input
+
+    Raises:
+        MediaValidationError: ``fail_fast`` 且存在违规 / ``fail_fast`` and a violation was found
+        OSError: 文件无法读取 / A file cannot be read
+    """
+    _name, _identity, capabilities = resolve_model(model)
+    items = _normalize(attachments)
+    results: list[MediaCheck | None] = [None] * len(items)
+    in_memory, io_bound = _partition(items)
+
+    for index in in_memory:
+        check = check_media(items[index].source, capabilities, items[index].kind)
+        if fail_fast and not check.ok:
+            raise MediaValidationError(check)
+        results[index] = check
+
+    if io_bound:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(io_bound)))) as executor:
+            futures: dict[Future[MediaCheck], int] = {
+                executor.submit(check_media, items[index].source, capabilities, items[index].kind): index
+                for index in io_bound
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    check = future.result()
+                    if fail_fast and not check.ok:
+                        for other in pending:
+                            other.cancel()
+                        raise MediaValidationError(check)
+                    results[futures[future]] = check
+
+    return [check for check in results if check is not None]
+
+
+async def validate_media_many_async(
+    model: str | LLMeta,
+    attachments: Sequence[Attachment | MediaSource],
+    *,
+    concurrency: int = DEFAULT_WORKERS,
+    fail_fast: bool = False,
+) -> list[MediaCheck]:
+    """
+    ``validate_media_many`` 的 asyncio 版本 / asyncio variant of ``validate_media_many``
+
+    文件读取通过 ``asyncio.to_thread`` 执行，同时进行的读取数不超过 ``concurrency``。
+    File reads run through ``asyncio.to_thread`` with at most ``concurrency`` in flight.
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        attachments: 附件或媒体来源 / Attachments or media sources
+        concurrency: 同时进行的文件读取数上限 / Maximum concurrent file reads
+        fail_fast: 遇到第一个违规即取消其余检查并抛出 / Cancel the remaining checks and raise on the first violation
+
+    Returns:
+        list[MediaCheck]: 与输入对齐的检查结果 / Check results aligned with the input
+
+    Raises:
+        MediaValidationError: ``fail_fast`` 且存在违规 / ``fail_fast`` and a violation was found
+        OSError: 文件无法读取 / A file cannot be read
+    """
+    _name, _identity, capabilities = resolve_model(model)
+    items = _normalize(attachments)
+    results: list[MediaCheck | None] = [None] * len(items)
+    in_memory, io_bound = _partition(items)
+
+    for index in in_memory:
+        check = check_media(items[index].source, capabilities, items[index].kind)
+        if fail_fast and not check.ok:
+            raise MediaValidationError(check)
+        results[index] = check
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(index: int) -> tuple[int, MediaCheck]:
+        async with semaphore:
+            attachment = items[index]
+            return index, await asyncio.to_thread(check_media, attachment.source, capabilities, attachment.kind)
+
+    tasks = [asyncio.ensure_future(run(index)) for index in io_bound]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, check = await next_done
+            if fail_fast and not check.ok:
+                raise MediaValidationError(check)
+            results[index] = check
+    finally:
+        for task in tasks:
+            task.cancel()
+        # 等待取消完成，避免抛出后仍留下未被 await 的任务 / Wait for the cancellations so no task is left un-awaited
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [check for check in results if check is not None]
+
+
+__all__ = [
+    "DEFAULT_WORKERS",
+    "Attachment",
+    "check_media",
+    "validate_media_many",
+    "validate_media_many_async",
+]
@@ -154,18 +154,24 @@ class LLMeta:
         """
         验证并调整参数 / Validate and adjust parameters
 
-        使用 VRL 脚本进行参数验证和调整
-        Use VRL script for parameter validation and adjustment
+        使用 VRL 脚本进行参数验证和调整：按模型能力截断 ``max_tokens``、删除不支持的参数，
+        程序按模型身份与注册表代数编译一次并缓存（见 ``whosellm.validation``）
+        Use VRL script for parameter validation and adjustment: clamp ``max_tokens`` and drop unsupported
+        params according to the capabilities; the program is compiled once per model identity and registry
+        generation (see ``whosellm.validation``)
 
         Args:
-            params: 原始参数 / Original parameters
+            params: 原始参数（不会被修改） / Original parameters (left untouched)
 
         Returns:
             dict: 验证后的参数 / Validated parameters
+
+        Raises:
+            ParamValidationError: 参数不合法（ValueError 子类） / Invalid parameters (a ValueError subclass)
         """
-        # TODO: 实现基于 VRL 的参数验证
-        # TODO: Implement VRL-based parameter validation
-        return params
+        from whosellm.validation.vrl import validate_params
+
+        return validate_params(self, params)
 
     @property
     def supports_multimodal(self) -> bool:
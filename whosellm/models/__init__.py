@@ -17,10 +17,13 @@ from whosellm.models.base import (
     infer_model_family,
     register_model,
 )
+from whosellm.models.explain import ResolutionExplanation, explain
 
 __all__ = [
     "ModelInfo",
+    "ResolutionExplanation",
     "auto_register_model",
+    "explain",
     "families",
     "get_model_info",
     "infer_model_family",
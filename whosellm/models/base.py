@@ -11,8 +11,10 @@ import re
 from dataclasses import dataclass
 from datetime import date
 from enum import Enum
+from typing import Any
 
 from whosellm.capabilities import ModelCapabilities
+from whosellm.models import instrumentation
 from whosellm.models.dynamic_enum import DynamicEnumMeta
 from whosellm.provider import Provider
 
@@ -121,6 +123,27 @@ class ModelInfo:
 # Format: {"model_name": ModelInfo} or {"Provider::ModelName": ModelInfo}
 MODEL_REGISTRY: dict[str, ModelInfo] = {}
 
+# auto_register_model 写入的条目，用于区分手动注册 / Entries written by auto_register_model, to tell them from manual ones
+# 格式: {"model_name": ModelInfo}；只有 MODEL_REGISTRY 中仍是同一对象时才计数
+# Format: {"model_name": ModelInfo}; only counted while MODEL_REGISTRY still holds the same object
+_AUTO_REGISTERED: dict[str, ModelInfo] = {}
+
+# 解析计数器，供 diagnostics.metrics 导出 / Resolution counters, exported by diagnostics.metrics
+# cache_* 以 MODEL_REGISTRY 作为解析缓存统计；MODEL_REGISTRY 目前没有容量上限，evictions 保持为 0
+# cache_* treat MODEL_REGISTRY as the resolution cache; it is currently unbounded, so evictions stay 0
+_RESOLUTION_COUNTERS: dict[str, int] = {
+    "resolutions": 0,
+    "cache_hits": 0,
+    "cache_misses": 0,
+    "cache_evictions": 0,
+    "unknown": 0,
+}
+
+# 能力继承层级 / Capability inheritance tiers
+CAPABILITY_TIER_SPECIFIC = "specific"  # SpecificModelConfig.capabilities
+CAPABILITY_TIER_VERSION = "version"  # ModelFamilyConfig._version_capabilities[version]
+CAPABILITY_TIER_FAMILY = "family"  # ModelFamilyConfig.capabilities（家族默认 / family default）
+
 
 # 注意：以下函数已迁移到 registry.py，这里保留是为了向后兼容
 # Note: The following functions have been moved to registry.py, kept here for backward compatibility
@@ -154,6 +177,23 @@ def register_model(model_name: str, info: ModelInfo) -> None:
         info: 模型信息 / Model information
     """
     MODEL_REGISTRY[model_name.lower()] = info
+    # 手动注册覆盖自动注册的标记 / A manual registration clears the auto-registered mark
+    _AUTO_REGISTERED.pop(model_name.lower(), None)
+
+
+def count_auto_registered() -> int:
+    """
+    统计 MODEL_REGISTRY 中由自动注册写入的条目数 / Count MODEL_REGISTRY entries written by auto-registration
+
+    手动注册或被覆盖、移除的条目不计入 / Entries registered manually, overwritten or removed are not counted
+
+    Returns:
+        int: 自动注册条目数 / Number of auto-registered entries
+    """
+    stale = [name for name, info in _AUTO_REGISTERED.items() if MODEL_REGISTRY.get(name) is not info]
+    for name in stale:
+        _AUTO_REGISTERED.pop(name, None)
+    return len(_AUTO_REGISTERED)
 
 
 def parse_version(version_str: str) -> tuple[int, ...]:
@@ -389,23 +429,50 @@ def auto_register_model(
     Raises:
         ValueError: 如果无法推断模型家族且未提供能力 / If cannot infer model family and no capabilities provided
     """
-    from whosellm.models.patterns import normalize_variant, parse_date_from_match
     from whosellm.models.registry import match_model_pattern
 
     # 使用模式匹配解析模型名称 / Use pattern matching to parse model name
     matched = match_model_pattern(model_name, specified_provider)
 
-    if not matched:
+    if not matched and capabilities is None:
         # 无法匹配任何模式 / Cannot match any pattern
-        if capabilities is None:
-            msg = (
-                f"无法自动注册模型 '{model_name}'：无法推断模型家族，且未提供能力配置。"
-                f"请手动注册或提供能力配置。 / "
-                f"Cannot auto-register model '{model_name}': cannot infer model family and no capabilities provided. "
-                f"Please register manually or provide capabilities."
-            )
-            raise ValueError(msg)
+        msg = (
+            f"无法自动注册模型 '{model_name}'：无法推断模型家族，且未提供能力配置。"
+            f"请手动注册或提供能力配置。 / "
+            f"Cannot auto-register model '{model_name}': cannot infer model family and no capabilities provided. "
+            f"Please register manually or provide capabilities."
+        )
+        raise ValueError(msg)
+
+    model_info, _tier = build_model_info(matched, specified_provider, capabilities)
+
+    # 注册到全局注册表 / Register to global registry
+    register_model(model_name, model_info)
+    _AUTO_REGISTERED[model_name.lower()] = model_info
+
+    return model_info
+
+
+def build_model_info(
+    matched: dict[str, Any] | None,
+    specified_provider: Provider | None = None,
+    capabilities: ModelCapabilities | None = None,
+) -> tuple[ModelInfo, str]:
+    """
+    根据模式匹配结果构造模型信息（不注册） / Build model information from a pattern match result (without registering)
+
+    Args:
+        matched: match_model_pattern 的结果，None 表示未匹配 / Result of match_model_pattern, None if unmatched
+        specified_provider: 指定的Provider（可选） / Specified provider (optional)
+        capabilities: 未匹配时使用的能力（可选） / Capabilities used when unmatched (optional)
+
+    Returns:
+        tuple: (模型信息, 能力继承层级) / (model information, capability inheritance tier)
+    """
+    from whosellm.models.patterns import normalize_variant, parse_date_from_match
 
+    variant_priority: tuple[int, ...] | None
+    if not matched:
         # 使用默认值 / Use default values
         family = ModelFamily.UNKNOWN
         provider = specified_provider or Provider.UNKNOWN
@@ -425,13 +492,7 @@ def auto_register_model(
 
     # 获取或继承能力（三级继承：specific_model → version → family）
     # Get or inherit capabilities (three-level: specific_model → version → family)
-    if capabilities:
-        model_capabilities = capabilities
-    else:
-        from whosellm.models.registry import get_default_capabilities, get_version_capabilities
-
-        version_caps = get_version_capabilities(family, version, provider)
-        model_capabilities = version_caps if version_caps else get_default_capabilities(family, provider)
+    model_capabilities, tier = inherit_capabilities(family, version, provider, capabilities)
 
     # 获取或推断型号优先级 / Get or infer variant priority
     # 优先使用配置中的 variant_priority，如果没有则推断
@@ -452,11 +513,38 @@ def auto_register_model(
         variant_priority=variant_priority,
         release_date=release_date,
     )
+    return model_info, tier
 
-    # 注册到全局注册表 / Register to global registry
-    register_model(model_name, model_info)
 
-    return model_info
+def inherit_capabilities(
+    family: ModelFamily,
+    version: str,
+    provider: Provider,
+    capabilities: ModelCapabilities | None = None,
+) -> tuple[ModelCapabilities, str]:
+    """
+    按三级继承获取能力 / Resolve capabilities through three-level inheritance
+
+    specific_model.capabilities → _version_capabilities[version] → family default
+
+    Args:
+        family: 模型家族 / Model family
+        version: 版本字符串 / Version string
+        provider: Provider
+        capabilities: specific_model 的能力（可选） / Capabilities of the specific model (optional)
+
+    Returns:
+        tuple: (能力, 继承层级) / (capabilities, inheritance tier)
+    """
+    if capabilities:
+        return capabilities, CAPABILITY_TIER_SPECIFIC
+
+    from whosellm.models.registry import get_default_capabilities, get_version_capabilities
+
+    version_caps = get_version_capabilities(family, version, provider)
+    if version_caps:
+        return version_caps, CAPABILITY_TIER_VERSION
+    return get_default_capabilities(family, provider), CAPABILITY_TIER_FAMILY
 
 
 def get_model_info(model_name: str, auto_register: bool = True) -> ModelInfo:
@@ -480,6 +568,28 @@ def get_model_info(model_name: str, auto_register: bool = True) -> ModelInfo:
     Returns:
         ModelInfo: 模型信息 / Model information
     """
+    _RESOLUTION_COUNTERS["resolutions"] += 1
+    recorder = instrumentation.begin_resolution(model_name)
+    if recorder is None:
+        return _resolve_model_info(model_name, auto_register, None)
+
+    try:
+        return _resolve_model_info(model_name, auto_register, recorder)
+    finally:
+        instrumentation.finish_resolution(recorder)
+
+
+def _resolve_model_info(
+    model_name: str,
+    auto_register: bool,
+    recorder: "instrumentation.ResolutionRecorder | None",
+) -> ModelInfo:
+    """
+    get_model_info 的实现，recorder 不为空时记录各阶段耗时
+    Implementation of get_model_info, records per-stage durations when recorder is not None
+    """
+    stage = instrumentation.stage
+
     # 解析模型名称 / Parse model name
     specified_provider, actual_name = parse_model_name(model_name)
     model_lower = actual_name.lower()
@@ -488,14 +598,21 @@ def get_model_info(model_name: str, auto_register: bool = True) -> ModelInfo:
     # [Priority 1] If Provider is specified, prioritize "Provider::ModelName" format registration
     if specified_provider:
         provider_key = f"{specified_provider.value}::{model_lower}"
-        if provider_key in MODEL_REGISTRY:
-            return MODEL_REGISTRY[provider_key]
+        with stage(recorder, instrumentation.STAGE_PROVIDER_REGISTRY):
+            provider_info = MODEL_REGISTRY.get(provider_key)
+            if provider_info is not None and recorder is not None:
+                recorder.win(instrumentation.STAGE_PROVIDER_REGISTRY, key=provider_key)
+        if provider_info is not None:
+            _RESOLUTION_COUNTERS["cache_hits"] += 1
+            return provider_info
 
     # 【优先级2】检查注册表中是否有精确匹配 / [Priority 2] Check if there's an exact match in the registry
-    if model_lower in MODEL_REGISTRY:
-        info = MODEL_REGISTRY[model_lower]
+    with stage(recorder, instrumentation.STAGE_REGISTRY):
+        info = MODEL_REGISTRY.get(model_lower)
+    if info is not None:
         # 尝试从模型名称解析日期 / Try to parse date from model name
-        parsed_date = parse_date_from_model_name(actual_name)
+        with stage(recorder, instrumentation.STAGE_DATE_PARSING):
+            parsed_date = parse_date_from_model_name(actual_name)
 
         # 如果指定了Provider且与注册的不同，需要重新进行模式匹配
         # If Provider is specified and different from registered, need to re-match pattern
@@ -506,6 +623,9 @@ def get_model_info(model_name: str, auto_register: bool = True) -> ModelInfo:
         elif parsed_date:
             # 只有日期不同，可以复用配置
             # Only date is different, can reuse config
+            if recorder is not None:
+                recorder.timing.winner = {"stage": instrumentation.STAGE_REGISTRY, "key": model_lower}
+            _RESOLUTION_COUNTERS["cache_hits"] += 1
             return ModelInfo(
                 provider=info.provider,
                 family=info.family,
@@ -519,8 +639,13 @@ def get_model_info(model_name: str, auto_register: bool = True) -> ModelInfo:
         else:
             # 完全匹配，直接返回
             # Exact match, return directly
+            if recorder is not None:
+                recorder.timing.winner = {"stage": instrumentation.STAGE_REGISTRY, "key": model_lower}
+            _RESOLUTION_COUNTERS["cache_hits"] += 1
             return info
 
+    _RESOLUTION_COUNTERS["cache_misses"] += 1
+
     # 【优先级3】如果没有找到且启用自动注册，尝试自动注册
     # [Priority 3] If not found and auto-register enabled, try auto-registration
     # auto_register_model 内部会调用 match_model_pattern 进行模式匹配
@@ -533,9 +658,14 @@ def get_model_info(model_name: str, auto_register: bool = True) -> ModelInfo:
             pass
 
     # 【兜底】如果没有找到，返回默认信息 / [Fallback] If not found, return default information
-    provider = specified_provider or Provider.from_model_name(actual_name)
-    parsed_date = parse_date_from_model_name(actual_name)
+    with stage(recorder, instrumentation.STAGE_PROVIDER_FALLBACK):
+        provider = specified_provider or Provider.from_model_name(actual_name)
+        if recorder is not None:
+            recorder.win(instrumentation.STAGE_PROVIDER_FALLBACK, provider=provider)
+    with stage(recorder, instrumentation.STAGE_DATE_PARSING):
+        parsed_date = parse_date_from_model_name(actual_name)
 
+    _RESOLUTION_COUNTERS["unknown"] += 1
     return ModelInfo(
         provider=provider,
         family=ModelFamily.UNKNOWN,
@@ -10,6 +10,7 @@
 Centrally manage all configuration for model families, including naming patterns, default capabilities, etc.
 """
 
+import time
 from dataclasses import dataclass, field
 
 from whosellm.capabilities import ModelCapabilities
@@ -17,6 +18,10 @@ from whosellm.models.base import ModelFamily
 from whosellm.models.patterns import parse_pattern
 from whosellm.provider import Provider
 
+# 子 pattern 校验累计耗时（秒），供导入耗时分析使用 / Accumulated sub-pattern validation cost (seconds), used by import profiling
+# 格式: {(family, provider): seconds}
+_VALIDATION_COST: dict[tuple[ModelFamily, Provider], float] = {}
+
 
 @dataclass
 class SpecificModelConfig:
@@ -101,7 +106,10 @@ class ModelFamilyConfig:
         # Store current config's capabilities in version-level cache
         self._version_capabilities[self.version_default] = self.capabilities
 
+        started = time.perf_counter()
         self._validate_specific_models()
+        key = (self.family, self.provider)
+        _VALIDATION_COST[key] = _VALIDATION_COST.get(key, 0.0) + time.perf_counter() - started
 
         from whosellm.models.registry import register_family_config
 
@@ -13,6 +13,10 @@ Allows dynamically adding enum members at runtime while maintaining type safety
 from enum import EnumMeta
 from typing import Any
 
+# 运行时动态添加的成员名称 / Names of members added at runtime
+# 格式: {enum_class: [member_name, ...]}
+_DYNAMIC_MEMBER_NAMES: dict[type, list[str]] = {}
+
 
 class DynamicEnumMeta(EnumMeta):
     """
@@ -91,6 +95,7 @@ class DynamicEnumMeta(EnumMeta):
         setattr(cls, enum_name, new_member)
         cls._member_map_[enum_name] = new_member  # type: ignore[assignment]
         cls._value2member_map_[name] = new_member  # type: ignore[assignment]
+        _DYNAMIC_MEMBER_NAMES.setdefault(cls, []).append(enum_name)
         return new_member
 
     def add_member(cls, name: str, value: str | None = None) -> Any:
@@ -126,4 +131,14 @@ class DynamicEnumMeta(EnumMeta):
         setattr(cls, name, new_member)
         cls._member_map_[name] = new_member  # type: ignore[assignment]
         cls._value2member_map_[value] = new_member  # type: ignore[assignment]
+        _DYNAMIC_MEMBER_NAMES.setdefault(cls, []).append(name)
         return None
+
+    def dynamic_members(cls) -> list[str]:
+        """
+        获取运行时动态添加的成员名称 / Get names of members added at runtime
+
+        Returns:
+            list[str]: 成员名称列表，按添加顺序 / Member names in insertion order
+        """
+        return list(_DYNAMIC_MEMBER_NAMES.get(cls, []))
@@ -0,0 +1,257 @@
+# filename: explain.py
+# @Time    : 2026/10/19 13:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+单次解析的解释与追踪 / Explain and trace a single resolution
+
+按 match_model_pattern 的顺序逐个尝试配置和 pattern，记录每次尝试的结果、失败原因与耗时，
+并给出获胜的匹配结果和能力继承层级。不会写入 MODEL_REGISTRY。
+Tries configs and patterns in the same order as match_model_pattern, recording the outcome, failure
+reason and duration of every attempt, plus the winning match and capability inheritance tier.
+Never writes to MODEL_REGISTRY.
+
+Example:
+    >>> from whosellm.models.explain import explain
+    >>> print(explain("claude-opus-4-5@20251101").format())
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import parse  # type: ignore[import-untyped]
+
+from whosellm.models import instrumentation
+from whosellm.models.base import MODEL_REGISTRY, ModelFamily, ModelInfo, build_model_info, parse_model_name
+from whosellm.models.patterns import DEFAULT_EXTRA_TYPES
+from whosellm.models.registry import (
+    build_parent_pattern_match,
+    build_specific_exact_match,
+    build_specific_pattern_match,
+    get_configs_to_check,
+)
+from whosellm.provider import Provider
+
+if TYPE_CHECKING:
+    from whosellm.models.config import ModelFamilyConfig
+
+
+@dataclass(frozen=True)
+class PatternAttempt:
+    """
+    一次匹配尝试 / A single match attempt
+    """
+
+    stage: str  # specific_exact / specific_patterns / parent_patterns
+    family: ModelFamily
+    provider: Provider
+    pattern: str | None  # 精确匹配阶段为 None / None for the exact match stage
+    specific_model: str | None
+    matched: bool
+    reason: str
+    seconds: float
+
+
+@dataclass
+class ResolutionExplanation:
+    """
+    单次解析的解释 / Explanation of a single resolution
+    """
+
+    model_name: str
+    specified_provider: Provider | None
+    # MODEL_REGISTRY 中是否已有该名称（get_model_info 会直接命中） / Whether get_model_info would hit MODEL_REGISTRY
+    registered: bool
+    attempts: list[PatternAttempt] = field(default_factory=list)
+    match: dict[str, Any] | None = None
+    capability_tier: str | None = None
+    model_info: ModelInfo | None = None
+    total_seconds: float = 0.0
+
+    @property
+    def winner(self) -> PatternAttempt | None:
+        """获胜的尝试 / The winning attempt"""
+        for attempt in self.attempts:
+            if attempt.matched:
+                return attempt
+        return None
+
+    @property
+    def failed_attempts(self) -> list[PatternAttempt]:
+        """失败的尝试 / Failed attempts"""
+        return [attempt for attempt in self.attempts if not attempt.matched]
+
+    def format(self, show_failed: bool = True) -> str:
+        """
+        生成可读的文本报告 / Render a human-readable text report
+
+        Args:
+            show_failed: 是否列出失败的尝试 / Whether to list failed attempts
+
+        Returns:
+            str: 文本报告 / Text report
+        """
+        lines = [f"explain {self.model_name!r}: {len(self.attempts)} attempts, {self.total_seconds * 1e3:.3f}ms"]
+        if self.registered:
+            lines.append("  (already in MODEL_REGISTRY)")
+        for index, attempt in enumerate(self.attempts):
+            if not attempt.matched and not show_failed:
+                continue
+            target = attempt.pattern if attempt.pattern is not None else attempt.specific_model or "-"
+            mark = "✓" if attempt.matched else "✗"
+            lines.append(
+                f"  {index:>4} {mark} {attempt.seconds * 1e6:>8.1f}us {attempt.stage:<17} "
+                f"{attempt.family.value}/{attempt.provider.value} {target} ({attempt.reason})",
+            )
+        if self.model_info is not None:
+            info = self.model_info
+            lines.append(
+                f"  => {info.family.value}/{info.provider.value} version={info.version} variant={info.variant} "
+                f"capabilities from {self.capability_tier}",
+            )
+        else:
+            lines.append("  => no match")
+        return "\n".join(lines)
+
+
+def _try_pattern(pattern: str, text: str) -> tuple[parse.Result | None, str]:
+    """
+    尝试用 pattern 解析名称，并给出失败原因 / Parse the name with a pattern and report why it failed
+
+    Returns:
+        tuple: (parse 结果或 None, 原因) / (parse result or None, reason)
+    """
+    try:
+        result = parse.parse(pattern, text, extra_types=DEFAULT_EXTRA_TYPES)
+    except ValueError as exc:
+        return None, f"type conversion failed: {exc}"
+    if result is None:
+        return None, "pattern did not match"
+    return result, "matched"
+
+
+def _explain_specific_exact(
+    configs: list["ModelFamilyConfig"], model_lower: str, attempts: list[PatternAttempt]
+) -> dict[str, Any] | None:
+    """【最高优先级】精确匹配 specific_models 的名称 / [Highest Priority] Exact match in specific_models"""
+    for config in configs:
+        attempt_started = time.perf_counter()
+        found = model_lower in config.specific_models
+        matched = build_specific_exact_match(config, model_lower) if found else None
+        attempts.append(
+            PatternAttempt(
+                stage=instrumentation.STAGE_SPECIFIC_EXACT,
+                family=config.family,
+                provider=config.provider,
+                pattern=None,
+                specific_model=model_lower if found else None,
+                matched=found,
+                reason="matched" if found else "name not in specific_models",
+                seconds=time.perf_counter() - attempt_started,
+            ),
+        )
+        if matched is not None:
+            return matched
+    return None
+
+
+def _explain_specific_patterns(
+    configs: list["ModelFamilyConfig"], model_lower: str, attempts: list[PatternAttempt]
+) -> dict[str, Any] | None:
+    """【次优先级】specific_models 的子 patterns / [Secondary Priority] specific_models sub-patterns"""
+    for config in configs:
+        for spec_model_name, spec_config in config.specific_models.items():
+            for pattern in spec_config.patterns:
+                attempt_started = time.perf_counter()
+                result, reason = _try_pattern(pattern, model_lower)
+                matched = build_specific_pattern_match(config, spec_model_name, result) if result is not None else None
+                attempts.append(
+                    PatternAttempt(
+                        stage=instrumentation.STAGE_SPECIFIC_PATTERNS,
+                        family=config.family,
+                        provider=config.provider,
+                        pattern=pattern,
+                        specific_model=spec_model_name,
+                        matched=matched is not None,
+                        reason=reason,
+                        seconds=time.perf_counter() - attempt_started,
+                    ),
+                )
+                if matched is not None:
+                    return matched
+    return None
+
+
+def _explain_parent_patterns(
+    configs: list["ModelFamilyConfig"], model_lower: str, attempts: list[PatternAttempt]
+) -> dict[str, Any] | None:
+    """【最低优先级】家族的父 patterns / [Lowest Priority] Family parent patterns"""
+    for config in configs:
+        for pattern in config.patterns:
+            attempt_started = time.perf_counter()
+            result, reason = _try_pattern(pattern, model_lower)
+            matched = build_parent_pattern_match(config, result) if result is not None else None
+            attempts.append(
+                PatternAttempt(
+                    stage=instrumentation.STAGE_PARENT_PATTERNS,
+                    family=config.family,
+                    provider=config.provider,
+                    pattern=pattern,
+                    specific_model=None,
+                    matched=matched is not None,
+                    reason=reason,
+                    seconds=time.perf_counter() - attempt_started,
+                ),
+            )
+            if matched is not None:
+                return matched
+    return None
+
+
+def explain(model_name: str) -> ResolutionExplanation:
+    """
+    解释一个模型名称是如何被解析的 / Explain how a model name is resolved
+
+    支持 ``Provider::ModelName`` 语法，此时只尝试该 Provider 的配置。
+    Supports the ``Provider::ModelName`` syntax, in which case only that provider's configs are tried.
+
+    Args:
+        model_name: 模型名称 / Model name
+
+    Returns:
+        ResolutionExplanation: 解析过程 / Resolution trace
+    """
+    started = time.perf_counter()
+    specified_provider, actual_name = parse_model_name(model_name)
+    model_lower = actual_name.lower()
+    registered = model_lower in MODEL_REGISTRY or (
+        specified_provider is not None and f"{specified_provider.value}::{model_lower}" in MODEL_REGISTRY
+    )
+    explanation = ResolutionExplanation(
+        model_name=model_name,
+        specified_provider=specified_provider,
+        registered=registered,
+    )
+    configs = get_configs_to_check(specified_provider)
+
+    matched = (
+        _explain_specific_exact(configs, model_lower, explanation.attempts)
+        or _explain_specific_patterns(configs, model_lower, explanation.attempts)
+        or _explain_parent_patterns(configs, model_lower, explanation.attempts)
+    )
+
+    if matched is not None:
+        explanation.match = matched
+        explanation.model_info, explanation.capability_tier = build_model_info(matched, specified_provider)
+
+    explanation.total_seconds = time.perf_counter() - started
+    return explanation
+
+
+__all__ = [
+    "PatternAttempt",
+    "ResolutionExplanation",
+    "explain",
+]
@@ -0,0 +1,355 @@
+# filename: instrumentation.py
+# @Time    : 2026/10/19 11:05
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+模型解析分阶段计时 / Per-stage timing of model resolution
+
+记录 ``get_model_info`` 每个阶段的耗时以及最终命中的配置 / pattern，通过回调和进程内直方图暴露。
+默认关闭；关闭时每个阶段只多一次布尔判断和一次空上下文管理器调用。
+Records the duration of each ``get_model_info`` stage and the config / pattern that won, exposed via
+callbacks and in-process histograms. Disabled by default; when off each stage only costs one boolean
+check and one no-op context manager.
+
+Example:
+    >>> from whosellm.models import instrumentation
+    >>> instrumentation.enable_instrumentation()
+    >>> instrumentation.add_timing_hook(lambda timing: print(timing.stages, timing.winner))
+    >>> LLMeta("claude-opus-4-5@20251101")
+    >>> instrumentation.get_stage_histograms()["parent_patterns"].mean
+"""
+
+import bisect
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Any
+
+# 阶段名称 / Stage names
+STAGE_PROVIDER_REGISTRY = "provider_registry"  # "Provider::ModelName" 注册表查找 / Provider-prefixed registry lookup
+STAGE_REGISTRY = "registry"  # 注册表精确匹配 / Exact registry lookup
+STAGE_SPECIFIC_EXACT = "specific_exact"  # specific_models 名称精确匹配 / Exact specific_models name match
+STAGE_SPECIFIC_PATTERNS = "specific_patterns"  # specific_models 子 patterns 扫描 / Sub-pattern scanning
+STAGE_PARENT_PATTERNS = "parent_patterns"  # 家族父 patterns 扫描 / Parent pattern scanning
+STAGE_DATE_PARSING = "date_parsing"  # 从名称解析发布日期 / Release date parsing
+STAGE_PROVIDER_FALLBACK = "provider_fallback"  # Provider.from_model_name 兜底 / Provider fallback
+
+STAGES = (
+    STAGE_PROVIDER_REGISTRY,
+    STAGE_REGISTRY,
+    STAGE_SPECIFIC_EXACT,
+    STAGE_SPECIFIC_PATTERNS,
+    STAGE_PARENT_PATTERNS,
+    STAGE_DATE_PARSING,
+    STAGE_PROVIDER_FALLBACK,
+)
+
+# 直方图桶上界（秒） / Histogram bucket upper bounds (seconds)
+DEFAULT_BUCKETS: tuple[float, ...] = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, float("inf"))
+
+
+@dataclass
+class StageHistogram:
+    """
+    单个阶段的耗时直方图 / Duration histogram of a single stage
+    """
+
+    bounds: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=lambda: [0] * len(DEFAULT_BUCKETS))
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        记录一次耗时 / Record one duration
+
+        Args:
+            seconds: 耗时（秒） / Duration in seconds
+        """
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    @property
+    def mean_seconds(self) -> float:
+        """平均耗时（秒） / Mean duration in seconds"""
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        按桶估算分位数（返回所在桶上界） / Estimate a quantile from buckets (returns the bucket upper bound)
+
+        Args:
+            q: 分位点，0~1 / Quantile in 0~1
+
+        Returns:
+            float: 估算值（秒），最后一个桶返回观测到的最大值 / Estimate in seconds, max observed for the last bucket
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.bounds, self.counts, strict=True):
+            seen += bucket_count
+            if seen >= target and bucket_count:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+
+@dataclass
+class ResolutionTiming:
+    """
+    单次解析的计时结果 / Timing result of a single resolution
+    """
+
+    model_name: str
+    # 格式: {stage: seconds}，只包含实际执行的阶段 / Only stages that actually ran
+    stages: dict[str, float] = field(default_factory=dict)
+    # 命中信息，如 {"stage": "parent_patterns", "family": ..., "provider": ..., "pattern": ...}
+    winner: dict[str, Any] | None = None
+    total_seconds: float = 0.0
+
+
+class _NullStage:
+    """关闭时使用的空阶段 / No-op stage used when instrumentation is off"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _StageTimer:
+    """计时中的阶段 / A stage being timed"""
+
+    __slots__ = ("_name", "_recorder", "_started")
+
+    def __init__(self, recorder: "ResolutionRecorder", name: str) -> None:
+        self._recorder = recorder
+        self._name = name
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._recorder.active_stage = self._name
+        self._started = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        elapsed = time.perf_counter() - self._started
+        stages = self._recorder.timing.stages
+        stages[self._name] = stages.get(self._name, 0.0) + elapsed
+        self._recorder.active_stage = None
+
+
+class ResolutionRecorder:
+    """
+    单次解析的记录器 / Recorder of a single resolution
+
+    嵌套阶段（例如日期解析内部再次执行的模式匹配）计入外层阶段，不重复统计。
+    Nested stages (e.g. the pattern match run inside date parsing) are attributed to the outer stage and
+    not counted twice.
+    """
+
+    __slots__ = ("_started", "active_stage", "timing")
+
+    def __init__(self, model_name: str) -> None:
+        self.timing = ResolutionTiming(model_name=model_name)
+        self.active_stage: str | None = None
+        self._started = time.perf_counter()
+
+    def stage(self, name: str) -> "_StageTimer | _NullStage":
+        """
+        开始一个阶段 / Start a stage
+
+        Args:
+            name: 阶段名称 / Stage name
+
+        Returns:
+            上下文管理器 / Context manager
+        """
+        if self.active_stage is not None:
+            return _NULL_STAGE
+        return _StageTimer(self, name)
+
+    def win(self, stage: str, **info: Any) -> None:
+        """
+        记录命中的阶段和配置 / Record the winning stage and config
+
+        只接受当前正在计时的顶层阶段，嵌套匹配不会覆盖结果。
+        Only accepted for the top-level stage currently being timed, nested matches do not override.
+
+        Args:
+            stage: 阶段名称 / Stage name
+            **info: 命中信息 / Winner details
+        """
+        if self.active_stage == stage and self.timing.winner is None:
+            self.timing.winner = {"stage": stage, **info}
+
+
+_enabled = False
+_hooks: list[Callable[[ResolutionTiming], None]] = []
+_histograms: dict[str, StageHistogram] = {}
+_current: ContextVar[ResolutionRecorder | None] = ContextVar("whosellm_resolution_recorder", default=None)
+
+
+def enable_instrumentation() -> None:
+    """开启分阶段计时 / Enable per-stage timing"""
+    global _enabled
+    _enabled = True
+
+
+def disable_instrumentation() -> None:
+    """关闭分阶段计时 / Disable per-stage timing"""
+    global _enabled
+    _enabled = False
+
+
+def is_instrumentation_enabled() -> bool:
+    """
+    是否已开启分阶段计时 / Whether per-stage timing is enabled
+
+    Returns:
+        bool: 是否开启 / Whether enabled
+    """
+    return _enabled
+
+
+def add_timing_hook(hook: Callable[[ResolutionTiming], None]) -> None:
+    """
+    添加计时回调，每次解析结束后调用 / Add a timing callback, called after every resolution
+
+    Args:
+        hook: 回调函数 / Callback
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_timing_hook(hook: Callable[[ResolutionTiming], None]) -> None:
+    """
+    移除计时回调 / Remove a timing callback
+
+    Args:
+        hook: 回调函数 / Callback
+    """
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def get_stage_histograms() -> dict[str, StageHistogram]:
+    """
+    获取各阶段的耗时直方图 / Get per-stage duration histograms
+
+    Returns:
+        dict[str, StageHistogram]: {stage: histogram}，包含 "total" 表示整次解析 / includes "total" for the whole resolution
+    """
+    return dict(_histograms)
+
+
+def reset_stage_histograms() -> None:
+    """清空各阶段的耗时直方图 / Clear per-stage duration histograms"""
+    _histograms.clear()
+
+
+def begin_resolution(model_name: str) -> ResolutionRecorder | None:
+    """
+    开始记录一次解析 / Start recording one resolution
+
+    Args:
+        model_name: 模型名称 / Model name
+
+    Returns:
+        ResolutionRecorder | None: 关闭或已处于记录中（嵌套解析）时返回 None / None when off or already recording
+    """
+    if not _enabled or _current.get() is not None:
+        return None
+    recorder = ResolutionRecorder(model_name)
+    _current.set(recorder)
+    return recorder
+
+
+def finish_resolution(recorder: ResolutionRecorder) -> None:
+    """
+    结束记录，更新直方图并调用回调 / Finish recording, update histograms and call hooks
+
+    Args:
+        recorder: 记录器 / Recorder
+    """
+    _current.set(None)
+    timing = recorder.timing
+    timing.total_seconds = time.perf_counter() - recorder._started
+
+    for stage, seconds in timing.stages.items():
+        _histograms.setdefault(stage, StageHistogram()).observe(seconds)
+    _histograms.setdefault("total", StageHistogram()).observe(timing.total_seconds)
+
+    for hook in list(_hooks):
+        hook(timing)
+
+
+def current_recorder() -> ResolutionRecorder | None:
+    """
+    获取当前解析的记录器 / Get the recorder of the current resolution
+
+    Returns:
+        ResolutionRecorder | None: 关闭时返回 None / None when off
+    """
+    if not _enabled:
+        return None
+    return _current.get()
+
+
+def stage(recorder: ResolutionRecorder | None, name: str) -> "_StageTimer | _NullStage":
+    """
+    为可能为空的记录器开始一个阶段 / Start a stage on a possibly-None recorder
+
+    Args:
+        recorder: 记录器（可为 None） / Recorder (may be None)
+        name: 阶段名称 / Stage name
+
+    Returns:
+        上下文管理器 / Context manager
+    """
+    if recorder is None:
+        return _NULL_STAGE
+    return recorder.stage(name)
+
+
+__all__ = [
+    "STAGES",
+    "ResolutionRecorder",
+    "ResolutionTiming",
+    "StageHistogram",
+    "add_timing_hook",
+    "begin_resolution",
+    "current_recorder",
+    "disable_instrumentation",
+    "enable_instrumentation",
+    "finish_resolution",
+    "get_stage_histograms",
+    "is_instrumentation_enabled",
+    "remove_timing_hook",
+    "reset_stage_histograms",
+    "stage",
+]
@@ -14,11 +14,14 @@ Provides registration and query interfaces for model family configurations
 from typing import TYPE_CHECKING, Any
 
 from whosellm.capabilities import ModelCapabilities
+from whosellm.models import instrumentation
 from whosellm.models.base import MODEL_REGISTRY, ModelFamily, ModelInfo, register_model
 from whosellm.models.patterns import parse_pattern
 from whosellm.provider import Provider
 
 if TYPE_CHECKING:
+    import parse  # type: ignore[import-untyped]
+
     from whosellm.models.config import ModelFamilyConfig
 
 # 核心注册表：所有模型家族配置 / Core registry: all model family configs
@@ -31,6 +34,15 @@ _DEFAULT_PROVIDER: dict[ModelFamily, Provider] = {}
 # 缓存：模型名称 -> ModelInfo / Cache: model_name -> ModelInfo
 _MODEL_CACHE: dict[str, ModelInfo] = {}
 
+# 注册表代数：每次注册家族配置时递增，派生缓存据此判断是否失效
+# Registry generation: incremented on every family config registration, derived caches use it for invalidation
+_REGISTRY_GENERATION = 0
+
+# 家族代数：该家族最近一次注册时的注册表代数，用于只重建变化的家族
+# Family generation: registry generation of the family's latest registration, used to rebuild only changed families
+# 格式: {family: generation}
+_FAMILY_GENERATIONS: dict[ModelFamily, int] = {}
+
 
 def register_family_config(config: "ModelFamilyConfig") -> None:
     """
@@ -58,6 +70,8 @@ def register_family_config(config: "ModelFamilyConfig") -> None:
     Args:
         config: 模型家族配置 / Model family configuration
     """
+    global _REGISTRY_GENERATION
+
     key = (config.family, config.provider)
     existing = _FAMILY_CONFIGS.get(key)
 
@@ -86,6 +100,39 @@ def register_family_config(config: "ModelFamilyConfig") -> None:
     if config.family not in _DEFAULT_PROVIDER:
         _DEFAULT_PROVIDER[config.family] = config.provider
 
+    _REGISTRY_GENERATION += 1
+    _FAMILY_GENERATIONS[config.family] = _REGISTRY_GENERATION
+
+
+def get_registry_generation() -> int:
+    """
+    获取注册表代数 / Get the registry generation
+
+    每次注册（或合并）家族配置后递增，可用于判断基于注册表的派生缓存是否过期
+    Incremented after every family config registration (or merge), usable to tell whether caches derived
+    from the registry are stale
+
+    Returns:
+        int: 注册表代数 / Registry generation
+    """
+    return _REGISTRY_GENERATION
+
+
+def get_family_generation(family: ModelFamily) -> int:
+    """
+    获取家族代数 / Get the family generation
+
+    该家族最近一次注册（或合并）配置时的注册表代数；未注册的家族为 0
+    Registry generation of the family's latest config registration (or merge); 0 for unregistered families
+
+    Args:
+        family: 模型家族 / Model family
+
+    Returns:
+        int: 家族代数 / Family generation
+    """
+    return _FAMILY_GENERATIONS.get(family, 0)
+
 
 def get_family_config(family: ModelFamily, provider: Provider | None = None) -> "ModelFamilyConfig | None":
     """
@@ -193,95 +240,178 @@ def match_model_pattern(model_name: str, provider: Provider | None = None) -> di
         dict | None: 匹配结果或None / Match result or None
     """
     model_lower = model_name.lower()
-    matched: dict[str, Any]
+    configs_to_check = get_configs_to_check(provider)
 
-    # 如果指定了 Provider，只匹配该 Provider 的配置
-    # If provider is specified, only match configs from that provider
-    configs_to_check = (
-        [config for config in _FAMILY_CONFIGS.values() if config.provider == provider]
-        if provider
-        else list(_FAMILY_CONFIGS.values())
-    )
+    recorder = instrumentation.current_recorder()
+    stage = instrumentation.stage
 
     # 【最高优先级】精确匹配 specific_models 的名称
     # [Highest Priority] Exact match in specific_models
-    for config in configs_to_check:
-        if model_lower in config.specific_models:
-            spec_config = config.specific_models[model_lower]
-            return {
-                "version": spec_config.version_default,
-                "variant": spec_config.variant_default,
-                "family": config.family,
-                "provider": config.provider,
-                "capabilities": spec_config.capabilities,
-                "variant_priority": spec_config.variant_priority,
-                "_from_specific_model": model_lower,
-            }
+    with stage(recorder, instrumentation.STAGE_SPECIFIC_EXACT):
+        for config in configs_to_check:
+            if model_lower in config.specific_models:
+                if recorder is not None:
+                    recorder.win(
+                        instrumentation.STAGE_SPECIFIC_EXACT,
+                        family=config.family,
+                        provider=config.provider,
+                        specific_model=model_lower,
+                    )
+                return build_specific_exact_match(config, model_lower)
 
     # 【次优先级】遍历所有家族配置的 specific_models 的子 patterns
     # [Secondary Priority] Iterate all specific_models sub-patterns in family configs
-    for config in configs_to_check:
-        for _spec_model_name, spec_config in config.specific_models.items():
-            if not spec_config.patterns:
-                continue
-
-            for pattern in spec_config.patterns:
-                result = parse_pattern(pattern, model_lower)
-                if result:
-                    # 转换为字典并添加默认值 / Convert to dict and add defaults
-                    matched = dict(result.named)
-                    if not matched.get("version"):
-                        matched["version"] = spec_config.version_default
-                    matched["family"] = config.family
-                    matched["provider"] = config.provider
-                    if not matched.get("variant"):
-                        matched["variant"] = spec_config.variant_default
-                        # 只有当使用默认 variant 时，才使用 variant_priority_default
-                        matched["variant_priority"] = spec_config.variant_priority
-                    else:
-                        # 如果从 pattern 提取到了 variant，不设置 variant_priority
-                        # 让后续逻辑根据 variant 推断
-                        matched["variant_priority"] = None
-                    matched["capabilities"] = spec_config.capabilities
-                    # 标记这是从 specific_model 匹配的 / Mark this as matched from specific_model
-                    matched["_from_specific_model"] = _spec_model_name
-                    return matched
+    with stage(recorder, instrumentation.STAGE_SPECIFIC_PATTERNS):
+        for config in configs_to_check:
+            for spec_model_name, spec_config in config.specific_models.items():
+                if not spec_config.patterns:
+                    continue
+
+                for pattern in spec_config.patterns:
+                    result = parse_pattern(pattern, model_lower)
+                    if result:
+                        if recorder is not None:
+                            recorder.win(
+                                instrumentation.STAGE_SPECIFIC_PATTERNS,
+                                family=config.family,
+                                provider=config.provider,
+                                specific_model=spec_model_name,
+                                pattern=pattern,
+                            )
+                        return build_specific_pattern_match(config, spec_model_name, result)
 
     # 【最低优先级】遍历所有家族配置的父 patterns
     # [Lowest Priority] Iterate all parent patterns in family configs
-    for config in configs_to_check:
-        for pattern in config.patterns:
-            result = parse_pattern(pattern, model_lower)
-            if result:
-                # 转换为字典并添加默认值 / Convert to dict and add defaults
-                matched = dict(result.named)
-                # 从 major/minor 构造 version / Construct version from major/minor
-                if not matched.get("version") and "major" in matched:
-                    if "minor" in matched:
-                        matched["version"] = f"{matched['major']}.{matched['minor']}"
-                    else:
-                        matched["version"] = f"{matched['major']}.0"
-                if not matched.get("version"):
-                    matched["version"] = config.version_default
-                if not matched.get("variant"):
-                    matched["variant"] = config.variant_default
-                    # 只有当使用默认 variant 时，才使用 variant_priority_default
-                    # Only use variant_priority_default when using default variant
-                    matched["variant_priority"] = config.variant_priority_default
-                else:
-                    # 如果从 pattern 提取到了 variant，不设置 variant_priority
-                    # 让后续逻辑根据 variant 推断
-                    # If variant is extracted from pattern, don't set variant_priority
-                    # Let subsequent logic infer from variant
-                    matched["variant_priority"] = None
-                matched["family"] = config.family
-                matched["provider"] = config.provider
-                matched["capabilities"] = None
-                return matched
+    with stage(recorder, instrumentation.STAGE_PARENT_PATTERNS):
+        for config in configs_to_check:
+            for pattern in config.patterns:
+                result = parse_pattern(pattern, model_lower)
+                if result:
+                    if recorder is not None:
+                        recorder.win(
+                            instrumentation.STAGE_PARENT_PATTERNS,
+                            family=config.family,
+                            provider=config.provider,
+                            pattern=pattern,
+                        )
+                    return build_parent_pattern_match(config, result)
 
     return None
 
 
+def get_configs_to_check(provider: Provider | None = None) -> list["ModelFamilyConfig"]:
+    """
+    获取参与匹配的家族配置（按注册顺序） / Get family configs taking part in matching (in registration order)
+
+    Args:
+        provider: 指定 Provider 进行过滤（可选） / Specify provider for filtering (optional)
+
+    Returns:
+        list[ModelFamilyConfig]: 家族配置列表 / Family configs
+    """
+    # 如果指定了 Provider，只匹配该 Provider 的配置
+    # If provider is specified, only match configs from that provider
+    if provider:
+        return [config for config in _FAMILY_CONFIGS.values() if config.provider == provider]
+    return list(_FAMILY_CONFIGS.values())
+
+
+def build_specific_exact_match(config: "ModelFamilyConfig", spec_model_name: str) -> dict[str, Any]:
+    """
+    构造 specific_models 精确匹配的结果 / Build the match result of an exact specific_models match
+
+    Args:
+        config: 家族配置 / Family config
+        spec_model_name: specific_models 中的名称（小写） / Name in specific_models (lowercase)
+
+    Returns:
+        dict: 匹配结果 / Match result
+    """
+    spec_config = config.specific_models[spec_model_name]
+    return {
+        "version": spec_config.version_default,
+        "variant": spec_config.variant_default,
+        "family": config.family,
+        "provider": config.provider,
+        "capabilities": spec_config.capabilities,
+        "variant_priority": spec_config.variant_priority,
+        "_from_specific_model": spec_model_name,
+    }
+
+
+def build_specific_pattern_match(
+    config: "ModelFamilyConfig", spec_model_name: str, result: "parse.Result"
+) -> dict[str, Any]:
+    """
+    构造 specific_models 子 pattern 匹配的结果 / Build the match result of a specific_models sub-pattern
+
+    Args:
+        config: 家族配置 / Family config
+        spec_model_name: specific_models 中的名称 / Name in specific_models
+        result: parse 结果 / parse result
+
+    Returns:
+        dict: 匹配结果 / Match result
+    """
+    spec_config = config.specific_models[spec_model_name]
+    # 转换为字典并添加默认值 / Convert to dict and add defaults
+    matched = dict(result.named)
+    if not matched.get("version"):
+        matched["version"] = spec_config.version_default
+    matched["family"] = config.family
+    matched["provider"] = config.provider
+    if not matched.get("variant"):
+        matched["variant"] = spec_config.variant_default
+        # 只有当使用默认 variant 时，才使用 variant_priority_default
+        matched["variant_priority"] = spec_config.variant_priority
+    else:
+        # 如果从 pattern 提取到了 variant，不设置 variant_priority
+        # 让后续逻辑根据 variant 推断
+        matched["variant_priority"] = None
+    matched["capabilities"] = spec_config.capabilities
+    # 标记这是从 specific_model 匹配的 / Mark this as matched from specific_model
+    matched["_from_specific_model"] = spec_model_name
+    return matched
+
+
+def build_parent_pattern_match(config: "ModelFamilyConfig", result: "parse.Result") -> dict[str, Any]:
+    """
+    构造家族父 pattern 匹配的结果 / Build the match result of a family parent pattern
+
+    Args:
+        config: 家族配置 / Family config
+        result: parse 结果 / parse result
+
+    Returns:
+        dict: 匹配结果 / Match result
+    """
+    # 转换为字典并添加默认值 / Convert to dict and add defaults
+    matched = dict(result.named)
+    # 从 major/minor 构造 version / Construct version from major/minor
+    if not matched.get("version") and "major" in matched:
+        if "minor" in matched:
+            matched["version"] = f"{matched['major']}.{matched['minor']}"
+        else:
+            matched["version"] = f"{matched['major']}.0"
+    if not matched.get("version"):
+        matched["version"] = config.version_default
+    if not matched.get("variant"):
+        matched["variant"] = config.variant_default
+        # 只有当使用默认 variant 时，才使用 variant_priority_default
+        # Only use variant_priority_default when using default variant
+        matched["variant_priority"] = config.variant_priority_default
+    else:
+        # 如果从 pattern 提取到了 variant，不设置 variant_priority
+        # 让后续逻辑根据 variant 推断
+        # If variant is extracted from pattern, don't set variant_priority
+        # Let subsequent logic infer from variant
+        matched["variant_priority"] = None
+    matched["family"] = config.family
+    matched["provider"] = config.provider
+    matched["capabilities"] = None
+    return matched
+
+
 def list_all_families() -> list[ModelFamily]:
     """
     列出所有已注册的模型家族 / List all registered model families
@@ -388,11 +518,16 @@ def register_family(config: "ModelFamilyConfig") -> None:
 
 __all__ = [
     "MODEL_REGISTRY",
+    "build_parent_pattern_match",
+    "build_specific_exact_match",
+    "build_specific_pattern_match",
     "get_all_patterns",
+    "get_configs_to_check",
     "get_default_capabilities",
     "get_default_provider",
     "get_family_config",
     "get_family_info",
+    "get_registry_generation",
     "get_specific_model_config",
     "get_version_capabilities",
     "list_all_families",
@@ -0,0 +1,31 @@
+# filename: __init__.py
+# @Time    : 2026/10/19 16:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+模型路由 / Model routing
+
+根据请求需求从目录中挑选可用模型，供网关在请求路径上直接调用。
+Picks usable models from the catalog for a request's requirements, for gateways to call on the request path.
+"""
+
+from whosellm.routing.fallbacks import FallbackPlanner, covers, fallbacks
+from whosellm.routing.ratelimit import ModelIdentity, ModelRateLimiter, RateLimit, TokenBucket
+from whosellm.routing.router import ModelRouter, Requirements, route
+from whosellm.routing.selector import ProviderSelector, ProviderStats
+
+__all__ = [
+    "FallbackPlanner",
+    "ModelIdentity",
+    "ModelRateLimiter",
+    "ModelRouter",
+    "ProviderSelector",
+    "ProviderStats",
+    "RateLimit",
+    "Requirements",
+    "TokenBucket",
+    "covers",
+    "fallbacks",
+    "route",
+]
@@ -0,0 +1,194 @@
+# filename: fallbacks.py
+# @Time    : 2026/10/19 18:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+预计算的降级链 / Precomputed fallback chains
+
+模型过载时立即给出备选列表：先是同一家族中相邻的型号（按 LLMeta 顺序由近到远，同距离时高者优先），
+再是能力覆盖所需能力的其他家族。结果按 (模型, 需求) 缓存，请求路径上的故障切换只是一次字典查找。与路由器相同，
+缓存键中的 token 需求向下取整到 2 的幂，命中后再按精确值过滤；缓存按 LRU 限制容量。
+When a model is overloaded, return an immediate list of alternatives: first neighbouring variants of the
+same family (by LLMeta order, nearest first, higher first on ties), then other families whose capabilities
+cover the required ones. Results are cached per (model, requirements), so failover on the request path is
+a single dict lookup. As in the router, token counts in the key are rounded down to a power of two and the
+cached chain is filtered by the exact counts; the cache is bounded LRU.
+
+Example:
+    >>> from whosellm.routing.fallbacks import fallbacks
+    >>> [entry.qualified_name for entry in fallbacks("claude-opus-4-5")][:3]
+"""
+
+import threading
+from collections import OrderedDict
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.catalog.entries import BOOL_CAPABILITY_FIELDS, NUMERIC_CAPABILITY_FIELDS, CatalogEntry, order_key
+from whosellm.catalog.index import get_capability_index
+from whosellm.models.base import ModelInfo, get_model_info
+from whosellm.models.registry import get_registry_generation
+from whosellm.routing.router import DEFAULT_CACHE_SIZE, Requirements
+
+# 媒体类型列表字段与其对应的能力开关 / MIME list fields and the capability flag they belong to
+_MIME_FIELDS: dict[str, str] = {
+    "supported_image_mime_type": "supports_vision",
+    "supported_video_mime_type": "supports_video",
+    "supported_audio_mime_type": "supports_audio",
+}
+
+
+def covers(candidate: ModelCapabilities, required: ModelCapabilities) -> bool:
+    """
+    判断 candidate 的能力是否覆盖 required / Whether candidate's capabilities cover required
+
+    - required 为 True 的 supports_* 在 candidate 中也必须为 True
+    - required 中非 None 的数值限制，candidate 必须给出且不小于它（None 视为未知，不覆盖）
+    - 所需模态开启时，candidate 支持的媒体类型必须包含 required 的媒体类型
+    - Every supports_* that is True in required must be True in candidate
+    - Every non-None numeric limit in required must be present in candidate and not smaller (None is unknown)
+    - When a modality is required, candidate's MIME types must include required's
+
+    Args:
+        candidate: 候选能力 / Candidate capabilities
+        required: 所需能力 / Required capabilities
+
+    Returns:
+        bool: 是否覆盖 / Whether it covers
+    """
+    for name in BOOL_CAPABILITY_FIELDS:
+        if getattr(required, name) and not getattr(candidate, name):
+            return False
+    for name in NUMERIC_CAPABILITY_FIELDS:
+        needed = getattr(required, name)
+        if needed is None:
+            continue
+        offered = getattr(candidate, name)
+        if offered is None or offered < needed:
+            return False
+    for name, flag in _MIME_FIELDS.items():
+        if getattr(required, flag) and not set(getattr(required, name)) <= set(getattr(candidate, name)):
+            return False
+    return True
+
+
+def _same_identity(entry: CatalogEntry, info: ModelInfo) -> bool:
+    """条目是否就是该模型本身 / Whether the entry is the model itself"""
+    return (entry.provider, entry.family, entry.version, entry.variant) == (
+        info.provider,
+        info.family,
+        info.version,
+        info.variant,
+    )
+
+
+class FallbackPlanner:
+    """
+    带缓存的降级链规划器 / Fallback chain planner with a cache
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        Args:
+            max_size: 缓存的最大 (模型, 需求) 数（LRU） / Maximum number of cached (model, requirements) (LRU)
+        """
+        # 格式: {(model_lower, bucketed requirements): chain}
+        self._cache: OrderedDict[tuple[str, Requirements | None], tuple[CatalogEntry, ...]] = OrderedDict()
+        self._generation = get_registry_generation()
+        self._lock = threading.Lock()
+        self.max_size = max_size
+
+    def fallbacks(self, model: str, requirements: Requirements | None = None) -> tuple[CatalogEntry, ...]:
+        """
+        获取模型的降级链 / Get the fallback chain of a model
+
+        Args:
+            model: 模型名称，支持 ``Provider::ModelName`` / Model name, ``Provider::ModelName`` supported
+            requirements: 请求需求；为 None 时其他家族需覆盖该模型自身的全部能力 /
+                Request requirements; when None, other families must cover all of the model's own capabilities
+
+        Returns:
+            tuple[CatalogEntry, ...]: 降级候选，不含模型本身 / Fallback candidates, excluding the model itself
+        """
+        generation = get_registry_generation()
+        if generation != self._generation:
+            with self._lock:
+                self._cache.clear()
+                self._generation = generation
+
+        bucketed = requirements.bucketed() if requirements is not None else None
+        key = (model.lower(), bucketed)
+        with self._lock:
+            chain = self._cache.get(key)
+            if chain is not None:
+                self._cache.move_to_end(key)
+
+        if chain is None:
+            chain = self._build(model, bucketed)
+            with self._lock:
+                self._cache[key] = chain
+                if len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+
+        if requirements is not None and bucketed is not requirements:
+            chain = tuple(entry for entry in chain if requirements.admits(entry))
+        return chain
+
+    def _build(self, model: str, requirements: Requirements | None) -> tuple[CatalogEntry, ...]:
+        """从目录构造降级链 / Build the fallback chain from the catalog"""
+        info = get_model_info(model)
+        index = get_capability_index()
+        eligible = index.query(**requirements.to_criteria()) if requirements is not None else list(index.entries)
+
+        # 同一家族：按 LLMeta 顺序离该模型由近到远 / Same family: nearest to the model by LLMeta order first
+        model_key = (info.version_tuple, info.variant_priority)
+        family = sorted(
+            (entry for entry in eligible if entry.family == info.family and not _same_identity(entry, info)),
+            key=order_key,
+        )
+        position = sum(1 for entry in family if (entry.version_tuple, entry.variant_priority) <= model_key)
+        same_family = sorted(
+            range(len(family)),
+            key=lambda i: (abs(i - position + 0.5), i < position),
+        )
+
+        # 其他家族：能力覆盖所需能力，按 LLMeta 顺序从高到低 / Other families: covering ones, best first
+        others = [entry for entry in eligible if entry.family != info.family]
+        if requirements is None:
+            others = [entry for entry in others if covers(entry.capabilities, info.capabilities)]
+        others.sort(key=order_key, reverse=True)
+
+        return tuple([family[i] for i in same_family] + others)
+
+    def clear(self) -> None:
+        """清空缓存 / Clear the cache"""
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# 默认规划器 / Default planner
+_DEFAULT_PLANNER = FallbackPlanner()
+
+
+def fallbacks(model: str, requirements: Requirements | None = None) -> tuple[CatalogEntry, ...]:
+    """
+    使用默认规划器获取降级链 / Get the fallback chain using the default planner
+
+    Args:
+        model: 模型名称 / Model name
+        requirements: 请求需求（可选） / Request requirements (optional)
+
+    Returns:
+        tuple[CatalogEntry, ...]: 降级候选 / Fallback candidates
+    """
+    return _DEFAULT_PLANNER.fallbacks(model, requirements)
+
+
+__all__ = [
+    "FallbackPlanner",
+    "covers",
+    "fallbacks",
+]
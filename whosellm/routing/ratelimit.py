@@ -0,0 +1,522 @@
+# filename: ratelimit.py
+# @Time    : 2026/10/19 17:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+客户端限流 / Client-side rate limiting
+
+令牌桶与并发限制原语（同步与 asyncio），按解析后的身份（Provider、家族、版本、型号）而不是原始字符串分组，
+因此 ``openai::gpt-4o`` 与 ``gpt-4o`` 共享同一组限额。模型级 RPM / TPM 默认取自
+``ModelCapabilities.max_requests_per_minute`` / ``max_tokens_per_minute``，Provider 级限额由调用方配置。
+Token bucket and concurrency limiter primitives (sync and asyncio) grouped by resolved identity
+(provider, family, version, variant) rather than raw strings, so ``openai::gpt-4o`` and ``gpt-4o`` share
+one set of limits. Model-level RPM / TPM default to ``ModelCapabilities.max_requests_per_minute`` /
+``max_tokens_per_minute``; provider-level limits are configured by the caller.
+
+Example:
+    >>> limiter = ModelRateLimiter(provider_limits={Provider.OPENAI: RateLimit(requests_per_minute=500)})
+    >>> with limiter.limit("openai::gpt-4o", tokens=1200):
+    ...     call_openai()
+    >>> async with limiter.limit_async("gpt-4o", tokens=1200):
+    ...     await call_openai_async()
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+
+from whosellm.models.base import ModelFamily, ModelInfo, get_model_info
+from whosellm.models.registry import get_registry_generation
+from whosellm.provider import Provider
+
+
+@dataclass(frozen=True)
+class ModelIdentity:
+    """
+    解析后的模型身份，作为限流键 / Resolved model identity, used as the limiter key
+    """
+
+    provider: Provider
+    family: ModelFamily
+    version: str
+    variant: str
+
+    @classmethod
+    def from_model_info(cls, info: ModelInfo) -> "ModelIdentity":
+        """
+        从模型信息构造 / Build from model information
+
+        Args:
+            info: 模型信息 / Model information
+
+        Returns:
+            ModelIdentity: 模型身份 / Model identity
+        """
+        return cls(provider=info.provider, family=info.family, version=info.version, variant=info.variant)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    限额配置，None 表示不限制 / Limit configuration, None means unlimited
+    """
+
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    max_concurrency: int | None = None
+
+
+class TokenBucket:
+    """
+    令牌桶 / Token bucket
+
+    容量为 capacity，每秒补充 refill_per_second 个令牌。内部锁只保护计算，不跨越等待，
+    因此同一个桶可同时用于线程和 asyncio。
+    Holds up to ``capacity`` tokens, refilled at ``refill_per_second``. The internal lock only guards the
+    arithmetic and is never held while waiting, so one bucket can serve threads and asyncio at once.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            capacity: 桶容量 / Bucket capacity
+            refill_per_second: 每秒补充的令牌数 / Tokens refilled per second
+            clock: 单调时钟（便于测试注入） / Monotonic clock (injectable for tests)
+
+        Raises:
+            ValueError: 容量或补充速率不为正 / Capacity or refill rate is not positive
+        """
+        if capacity <= 0 or refill_per_second <= 0:
+            msg = (
+                f"容量与补充速率必须为正 / Capacity and refill rate must be positive: "
+                f"capacity={capacity}, refill_per_second={refill_per_second}"
+            )
+            raise ValueError(msg)
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: int, clock: Callable[[], float] = time.monotonic) -> "TokenBucket":
+        """
+        按每分钟限额构造（容量为一分钟的额度） / Build from a per-minute limit (capacity is one minute's budget)
+
+        Args:
+            limit: 每分钟限额 / Per-minute limit
+            clock: 单调时钟 / Monotonic clock
+
+        Returns:
+            TokenBucket: 令牌桶 / Token bucket
+        """
+        return cls(capacity=limit, refill_per_second=limit / 60.0, clock=clock)
+
+    def _refill(self) -> None:
+        """按流逝时间补充令牌（调用方持有锁） / Refill by elapsed time (caller holds the lock)"""
+        now = self._clock()
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+            self._updated = now
+
+    def _check_amount(self, amount: float) -> None:
+        """超过容量的请求永远无法满足 / Requests above capacity can never be served"""
+        if amount > self.capacity:
+            msg = f"请求量 {amount} 超过桶容量 {self.capacity} / Requested {amount} exceeds bucket capacity {self.capacity}"
+            raise ValueError(msg)
+
+    @property
+    def available(self) -> float:
+        """当前可用令牌数 / Tokens currently available"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def time_until_available(self, amount: float = 1) -> float:
+        """
+        距离有足够令牌还需等待的秒数 / Seconds until enough tokens are available
+
+        Args:
+            amount: 令牌数 / Number of tokens
+
+        Returns:
+            float: 秒数，0 表示立即可用 / Seconds, 0 means available now
+        """
+        self._check_amount(amount)
+        with self._lock:
+            self._refill()
+            missing = amount - self._tokens
+        return max(0.0, missing / self.refill_per_second)
+
+    def try_acquire(self, amount: float = 1) -> bool:
+        """
+        尝试立即取出令牌 / Try to take tokens immediately
+
+        Args:
+            amount: 令牌数 / Number of tokens
+
+        Returns:
+            bool: 是否成功 / Whether it succeeded
+        """
+        self._check_amount(amount)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return True
+            return False
+
+    def refund(self, amount: float) -> None:
+        """
+        归还令牌（例如多桶获取中途失败时） / Return tokens (e.g. when a multi-bucket acquire fails midway)
+
+        Args:
+            amount: 令牌数 / Number of tokens
+        """
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def acquire(self, amount: float = 1, timeout: float | None = None) -> bool:
+        """
+        阻塞直到取出令牌或超时 / Block until tokens are taken or the timeout expires
+
+        Args:
+            amount: 令牌数 / Number of tokens
+            timeout: 超时秒数，None 表示一直等待 / Timeout in seconds, None waits forever
+
+        Returns:
+            bool: 是否成功 / Whether it succeeded
+        """
+        return _acquire_all([(self, amount)], timeout)
+
+    async def acquire_async(self, amount: float = 1, timeout: float | None = None) -> bool:
+        """
+        异步等待直到取出令牌或超时 / Wait asynchronously until tokens are taken or the timeout expires
+
+        Args:
+            amount: 令牌数 / Number of tokens
+            timeout: 超时秒数，None 表示一直等待 / Timeout in seconds, None waits forever
+
+        Returns:
+            bool: 是否成功 / Whether it succeeded
+        """
+        return await _acquire_all_async([(self, amount)], timeout)
+
+
+def _try_acquire_all(requests: list[tuple[TokenBucket, float]]) -> float:
+    """
+    尝试同时从多个桶取出令牌，要么全部成功要么全部归还 / Take from several buckets, all or nothing
+
+    Returns:
+        float: 0 表示成功，否则为建议等待的秒数 / 0 on success, otherwise the suggested wait in seconds
+    """
+    wait = max((bucket.time_until_available(amount) for bucket, amount in requests), default=0.0)
+    if wait > 0:
+        return wait
+    taken: list[tuple[TokenBucket, float]] = []
+    for bucket, amount in requests:
+        if not bucket.try_acquire(amount):
+            for taken_bucket, taken_amount in taken:
+                taken_bucket.refund(taken_amount)
+            # 并发竞争失败，稍后重试 / Lost a race, retry shortly
+            return max(bucket.time_until_available(amount), 1e-3)
+        taken.append((bucket, amount))
+    return 0.0
+
+
+def _remaining(deadline: float | None) -> float | None:
+    """距离截止时间的剩余秒数，None 表示不限时 / Seconds left until the deadline, None means no limit"""
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _acquire_all(requests: list[tuple[TokenBucket, float]], timeout: float | None) -> bool:
+    """同步等待多桶获取 / Wait synchronously for a multi-bucket acquire"""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        wait = _try_acquire_all(requests)
+        if wait == 0:
+            return True
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or wait > remaining:
+                return False
+        time.sleep(wait)
+
+
+async def _acquire_all_async(requests: list[tuple[TokenBucket, float]], timeout: float | None) -> bool:
+    """异步等待多桶获取 / Wait asynchronously for a multi-bucket acquire"""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        wait = _try_acquire_all(requests)
+        if wait == 0:
+            return True
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or wait > remaining:
+                return False
+        await asyncio.sleep(wait)
+
+
+class ModelRateLimiter:
+    """
+    按解析身份分组的限流器 / Rate limiter grouped by resolved identity
+
+    每次获取同时检查 Provider 级与模型级的 RPM / TPM 令牌桶，以及两级的并发上限。
+    Every acquire checks both the provider-level and model-level RPM / TPM buckets, plus the concurrency
+    caps of both levels.
+    """
+
+    def __init__(
+        self,
+        provider_limits: dict[Provider, RateLimit] | None = None,
+        model_limits: dict[str, RateLimit] | None = None,
+        use_capability_limits: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            provider_limits: Provider 级限额 / Provider-level limits
+            model_limits: 模型级覆盖限额，键为模型名称（会被解析为身份） /
+                Model-level override limits keyed by model name (resolved to an identity)
+            use_capability_limits: 是否使用 ModelCapabilities 中的 RPM / TPM /
+                Whether to use the RPM / TPM stored in ModelCapabilities
+            clock: 单调时钟 / Monotonic clock
+        """
+        self.provider_limits = dict(provider_limits or {})
+        self.use_capability_limits = use_capability_limits
+        self._clock = clock
+        self._identities: dict[str, tuple[ModelIdentity, RateLimit]] = {}
+        self._generation = get_registry_generation()
+        self._model_overrides: dict[ModelIdentity, RateLimit] = {}
+        for name, limit in (model_limits or {}).items():
+            self._model_overrides[self.resolve(name)[0]] = limit
+        # 覆盖限额写入前解析的结果不含覆盖，清空重来 / Resolutions made before the overrides existed are dropped
+        self._identities = {}
+        self._buckets: dict[tuple[object, str], TokenBucket] = {}
+        self._semaphores: dict[object, threading.BoundedSemaphore] = {}
+        self._async_semaphores: dict[object, asyncio.Semaphore] = {}
+        self._setup_lock = threading.Lock()
+
+    def resolve(self, model: str) -> tuple[ModelIdentity, RateLimit]:
+        """
+        解析模型名称为身份与模型级限额（按名称缓存） / Resolve a model name to its identity and model-level limit (cached by name)
+
+        Args:
+            model: 模型名称，支持 ``Provider::ModelName`` / Model name, ``Provider::ModelName`` supported
+
+        Returns:
+            tuple: (模型身份, 模型级限额) / (model identity, model-level limit)
+        """
+        generation = get_registry_generation()
+        if generation != self._generation:
+            self._identities = {}
+            self._generation = generation
+
+        cached = self._identities.get(model)
+        if cached is not None:
+            return cached
+
+        info = get_model_info(model)
+        identity = ModelIdentity.from_model_info(info)
+        override = self._model_overrides.get(identity)
+        if override is not None:
+            limit = override
+        elif self.use_capability_limits:
+            limit = RateLimit(
+                requests_per_minute=info.capabilities.max_requests_per_minute,
+                tokens_per_minute=info.capabilities.max_tokens_per_minute,
+            )
+        else:
+            limit = RateLimit()
+        self._identities[model] = (identity, limit)
+        return identity, limit
+
+    def _bucket(self, key: object, kind: str, per_minute: int) -> TokenBucket:
+        """获取或创建令牌桶 / Get or create a token bucket"""
+        bucket = self._buckets.get((key, kind))
+        if bucket is None:
+            with self._setup_lock:
+                bucket = self._buckets.setdefault((key, kind), TokenBucket.per_minute(per_minute, self._clock))
+        return bucket
+
+    def _requests(self, model: str, tokens: int) -> tuple[ModelIdentity, list[tuple[TokenBucket, float]]]:
+        """收集本次获取涉及的令牌桶 / Collect the buckets involved in one acquire"""
+        identity, model_limit = self.resolve(model)
+        requests: list[tuple[TokenBucket, float]] = []
+        for key, limit in ((identity.provider, self.provider_limits.get(identity.provider)), (identity, model_limit)):
+            if limit is None:
+                continue
+            if limit.requests_per_minute:
+                requests.append((self._bucket(key, "requests", limit.requests_per_minute), 1))
+            if limit.tokens_per_minute and tokens:
+                if tokens > limit.tokens_per_minute:
+                    msg = (
+                        f"请求 token 数 {tokens} 超过 TPM 限额 {limit.tokens_per_minute}，永远无法满足 / "
+                        f"Requested {tokens} tokens exceeds the TPM limit {limit.tokens_per_minute} of {key}, "
+                        f"it can never be served"
+                    )
+                    raise ValueError(msg)
+                requests.append((self._bucket(key, "tokens", limit.tokens_per_minute), tokens))
+        return identity, requests
+
+    def _concurrency_keys(self, identity: ModelIdentity) -> list[tuple[object, int]]:
+        """需要并发控制的 (键, 上限) / (key, cap) pairs that need concurrency control"""
+        keys: list[tuple[object, int]] = []
+        provider_limit = self.provider_limits.get(identity.provider)
+        if provider_limit is not None and provider_limit.max_concurrency:
+            keys.append((identity.provider, provider_limit.max_concurrency))
+        model_limit = self._model_overrides.get(identity)
+        if model_limit is not None and model_limit.max_concurrency:
+            keys.append((identity, model_limit.max_concurrency))
+        return keys
+
+    def try_acquire(self, model: str, tokens: int = 0) -> bool:
+        """
+        尝试立即获取 RPM / TPM 额度（不含并发） / Try to take RPM / TPM budget immediately (no concurrency)
+
+        Args:
+            model: 模型名称 / Model name
+            tokens: 本次请求预计消耗的 token 数 / Tokens the request is expected to use
+
+        Returns:
+            bool: 是否成功 / Whether it succeeded
+        """
+        _identity, requests = self._requests(model, tokens)
+        return _try_acquire_all(requests) == 0
+
+    def acquire(self, model: str, tokens: int = 0, timeout: float | None = None) -> bool:
+        """
+        阻塞获取 RPM / TPM 额度（不含并发） / Block for RPM / TPM budget (no concurrency)
+
+        Args:
+            model: 模型名称 / Model name
+            tokens: 本次请求预计消耗的 token 数 / Tokens the request is expected to use
+            timeout: 超时秒数 / Timeout in seconds
+
+        Returns:
+            bool: 是否成功 / Whether it succeeded
+        """
+        _identity, requests = self._requests(model, tokens)
+        return _acquire_all(requests, timeout)
+
+    async def acquire_async(self, model: str, tokens: int = 0, timeout: float | None = None) -> bool:
+        """
+        异步获取 RPM / TPM 额度（不含并发） / Asynchronously take RPM / TPM budget (no concurrency)
+
+        Args:
+            model: 模型名称 / Model name
+            tokens: 本次请求预计消耗的 token 数 / Tokens the request is expected to use
+            timeout: 超时秒数 / Timeout in seconds
+
+        Returns:
+            bool: 是否成功 / Whether it succeeded
+        """
+        _identity, requests = self._requests(model, tokens)
+        return await _acquire_all_async(requests, timeout)
+
+    @contextmanager
+    def limit(self, model: str, tokens: int = 0, timeout: float | None = None) -> Iterator[ModelIdentity]:
+        """
+        获取额度与并发槽位，退出时释放槽位 / Take budget and concurrency slots, releasing the slots on exit
+
+        Args:
+            model: 模型名称 / Model name
+            tokens: 本次请求预计消耗的 token 数 / Tokens the request is expected to use
+            timeout: 获取并发槽位与额度的总超时秒数 / Total timeout for taking the slots and the budget
+
+        Yields:
+            ModelIdentity: 解析后的身份 / Resolved identity
+
+        Raises:
+            TimeoutError: 超时未获取到额度 / Budget not obtained within the timeout
+            ValueError: 请求 token 数超过 TPM 限额 / Requested tokens exceed a TPM limit
+        """
+        identity, requests = self._requests(model, tokens)
+        # 并发槽位与令牌桶共用同一截止时间 / Concurrency slots and token buckets share one deadline
+        deadline = None if timeout is None else time.monotonic() + timeout
+        semaphores = []
+        for key, cap in self._concurrency_keys(identity):
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                with self._setup_lock:
+                    semaphore = self._semaphores.setdefault(key, threading.BoundedSemaphore(cap))
+            semaphores.append(semaphore)
+
+        acquired: list[threading.BoundedSemaphore] = []
+        try:
+            for semaphore in semaphores:
+                if not semaphore.acquire(timeout=_remaining(deadline)):
+                    msg = f"并发槽位等待超时 / Timed out waiting for a concurrency slot: {identity}"
+                    raise TimeoutError(msg)
+                acquired.append(semaphore)
+            if not _acquire_all(requests, _remaining(deadline)):
+                msg = f"限流额度等待超时 / Timed out waiting for rate limit budget: {identity}"
+                raise TimeoutError(msg)
+            yield identity
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+    @asynccontextmanager
+    async def limit_async(
+        self, model: str, tokens: int = 0, timeout: float | None = None
+    ) -> AsyncIterator[ModelIdentity]:
+        """
+        limit 的 asyncio 版本 / asyncio version of limit
+
+        Args:
+            model: 模型名称 / Model name
+            tokens: 本次请求预计消耗的 token 数 / Tokens the request is expected to use
+            timeout: 获取并发槽位与额度的总超时秒数 / Total timeout for taking the slots and the budget
+
+        Yields:
+            ModelIdentity: 解析后的身份 / Resolved identity
+
+        Raises:
+            TimeoutError: 超时未获取到额度 / Budget not obtained within the timeout
+            ValueError: 请求 token 数超过 TPM 限额 / Requested tokens exceed a TPM limit
+        """
+        identity, requests = self._requests(model, tokens)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        semaphores = [
+            self._async_semaphores.setdefault(key, asyncio.Semaphore(cap))
+            for key, cap in self._concurrency_keys(identity)
+        ]
+
+        acquired: list[asyncio.Semaphore] = []
+        try:
+            for semaphore in semaphores:
+                try:
+                    await asyncio.wait_for(semaphore.acquire(), _remaining(deadline))
+                # 3.10 上 wait_for 抛出的 asyncio.TimeoutError 不是内置 TimeoutError
+                # On 3.10 wait_for raises asyncio.TimeoutError, which is not the builtin TimeoutError
+                except asyncio.TimeoutError as exc:  # noqa: UP041
+                    msg = f"并发槽位等待超时 / Timed out waiting for a concurrency slot: {identity}"
+                    raise TimeoutError(msg) from exc
+                acquired.append(semaphore)
+            if not await _acquire_all_async(requests, _remaining(deadline)):
+                msg = f"限流额度等待超时 / Timed out waiting for rate limit budget: {identity}"
+                raise TimeoutError(msg)
+            yield identity
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+
+__all__ = [
+    "ModelIdentity",
+    "ModelRateLimiter",
+    "RateLimit",
+    "TokenBucket",
+]
@@ -0,0 +1,250 @@
+# filename: router.py
+# @Time    : 2026/10/19 16:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+基于能力的模型路由 / Capability-based model router
+
+给定请求需求（需要的能力、输入 / 输出 token 数、Provider / 家族限制），返回满足需求的目录条目，
+按 LLMeta 的比较顺序（版本 → 型号优先级 → 日期）从高到低排列。
+Given a request's requirements (needed capabilities, input / output tokens, provider / family limits),
+return the catalog entries that satisfy them, ranked high to low by LLMeta ordering
+(version → variant priority → date).
+
+需求形态高度重复，候选列表按需求签名缓存。token 数几乎每个请求都不同，因此缓存键中的 token 需求先向下取整
+到 2 的幂，命中后再按精确值过滤；缓存按 LRU 限制容量，注册表代数变化时整体失效。
+Requirement shapes repeat constantly, so candidate lists are memoized per requirement signature. Token counts
+differ on almost every request, so they are rounded down to a power of two in the cache key and the cached
+list is filtered by the exact values afterwards; the cache is bounded LRU and dropped as a whole when the
+registry generation changes.
+
+Example:
+    >>> from whosellm.routing import Requirements, route
+    >>> needs = Requirements(
+    ...     capabilities=frozenset({"supports_vision", "supports_structured_outputs", "supports_streaming"}),
+    ...     input_tokens=150_000,
+    ... )
+    >>> route(needs)[0].qualified_name
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from whosellm.catalog.entries import BOOL_CAPABILITY_FIELDS, CatalogEntry, order_key
+from whosellm.catalog.index import get_capability_index
+from whosellm.models.base import ModelFamily
+from whosellm.models.registry import get_registry_generation
+from whosellm.provider import Provider
+
+# 路由 / 降级链缓存的默认容量 / Default capacity of the route / fallback caches
+DEFAULT_CACHE_SIZE = 1024
+
+
+def bucket_tokens(tokens: int | None) -> int | None:
+    """
+    把 token 数向下取整到 2 的幂，None 与 0 保持不变 / Round a token count down to a power of two, None and 0 kept
+
+    Args:
+        tokens: token 数 / Token count
+
+    Returns:
+        int | None: 分桶后的 token 数 / Bucketed token count
+    """
+    if not tokens:
+        return tokens
+    return 1 << (tokens.bit_length() - 1)
+
+
+@dataclass(frozen=True)
+class Requirements:
+    """
+    请求需求，可哈希，作为路由缓存的键 / Request requirements, hashable, used as the router cache key
+    """
+
+    # 必须支持的能力（supports_* 字段名） / Capabilities that must be supported (supports_* field names)
+    capabilities: frozenset[str] = field(default_factory=frozenset)
+    # 预计输入 token 数，需满足 context_window >= input_tokens + output_tokens
+    # Expected input tokens, requires context_window >= input_tokens + output_tokens
+    input_tokens: int | None = None
+    # 预计输出 token 数，需满足 max_tokens >= output_tokens / Expected output tokens, requires max_tokens >= output_tokens
+    output_tokens: int | None = None
+    # 限定 Provider / 家族（可选） / Restrict providers / families (optional)
+    providers: frozenset[Provider] | None = None
+    families: frozenset[ModelFamily] | None = None
+    # 是否把家族默认条目也作为候选 / Whether family default entries are candidates too
+    include_family_defaults: bool = False
+
+    def __post_init__(self) -> None:
+        """规范化集合字段并校验能力名称 / Normalize collection fields and validate capability names"""
+        object.__setattr__(self, "capabilities", frozenset(self.capabilities))
+        if self.providers is not None:
+            object.__setattr__(self, "providers", frozenset(self.providers))
+        if self.families is not None:
+            object.__setattr__(self, "families", frozenset(self.families))
+
+        unknown = sorted(self.capabilities - set(BOOL_CAPABILITY_FIELDS))
+        if unknown:
+            msg = f"未知的能力字段 / Unknown capability fields: {unknown}"
+            raise ValueError(msg)
+        for name in ("input_tokens", "output_tokens"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                msg = f"{name} 不能为负数 / {name} must not be negative: {value}"
+                raise ValueError(msg)
+
+    @property
+    def min_context_window(self) -> int | None:
+        """所需的最小上下文窗口 / Minimum context window required"""
+        if self.input_tokens is None and self.output_tokens is None:
+            return None
+        return (self.input_tokens or 0) + (self.output_tokens or 0)
+
+    def to_criteria(self) -> dict[str, Any]:
+        """
+        转换为 CapabilityIndex 的查询条件 / Convert to CapabilityIndex query criteria
+
+        Returns:
+            dict: 查询条件 / Query criteria
+        """
+        criteria: dict[str, Any] = dict.fromkeys(sorted(self.capabilities), True)
+        if self.min_context_window is not None:
+            criteria["min_context_window"] = self.min_context_window
+        if self.output_tokens is not None:
+            criteria["min_max_tokens"] = self.output_tokens
+        if self.providers is not None:
+            criteria["provider"] = self.providers
+        if self.families is not None:
+            criteria["family"] = self.families
+        return criteria
+
+    def bucketed(self) -> "Requirements":
+        """
+        token 需求向下取整分桶后的需求，用作缓存键 / Requirements with token counts bucketed down, used as cache keys
+
+        分桶后的需求更宽松，其候选是精确需求候选的超集。/ Bucketed requirements are looser, so their candidates
+        are a superset of the exact ones.
+
+        Returns:
+            Requirements: 分桶后的需求；token 数已在桶边界上时返回自身 / Bucketed requirements, self when unchanged
+        """
+        input_tokens = bucket_tokens(self.input_tokens)
+        output_tokens = bucket_tokens(self.output_tokens)
+        if input_tokens == self.input_tokens and output_tokens == self.output_tokens:
+            return self
+        return replace(self, input_tokens=input_tokens, output_tokens=output_tokens)
+
+    def admits(self, entry: CatalogEntry) -> bool:
+        """
+        条目是否满足精确的 token 需求 / Whether an entry satisfies the exact token requirements
+
+        Args:
+            entry: 目录条目 / Catalog entry
+
+        Returns:
+            bool: 是否满足 / Whether it is satisfied
+        """
+        capabilities = entry.capabilities
+        needed = self.min_context_window
+        if needed is not None and (capabilities.context_window is None or capabilities.context_window < needed):
+            return False
+        return self.output_tokens is None or (
+            capabilities.max_tokens is not None and capabilities.max_tokens >= self.output_tokens
+        )
+
+
+class ModelRouter:
+    """
+    带缓存的模型路由器 / Model router with memoized candidate lists
+
+    LLMeta 只比较同一家族的模型；跨家族时这里沿用同一排序键，需要按家族隔离时请在 Requirements 中限定 families。
+    LLMeta only compares models of one family; across families the same key is used here, restrict
+    ``families`` in Requirements when families must not be mixed.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        Args:
+            max_size: 缓存的最大需求签名数（LRU） / Maximum number of cached requirement signatures (LRU)
+        """
+        # 格式: {bucketed requirements: candidates}
+        self._cache: OrderedDict[Requirements, tuple[CatalogEntry, ...]] = OrderedDict()
+        self._generation = get_registry_generation()
+        self._lock = threading.Lock()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def route(self, requirements: Requirements) -> tuple[CatalogEntry, ...]:
+        """
+        返回满足需求的候选模型，从高到低排列 / Return candidate models satisfying the requirements, best first
+
+        Args:
+            requirements: 请求需求 / Request requirements
+
+        Returns:
+            tuple[CatalogEntry, ...]: 候选条目；相同排序键时保持目录顺序 / Candidates; catalog order on ties
+        """
+        generation = get_registry_generation()
+        if generation != self._generation:
+            with self._lock:
+                self._cache.clear()
+                self._generation = generation
+
+        key = requirements.bucketed()
+        with self._lock:
+            candidates = self._cache.get(key)
+            if candidates is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+
+        if candidates is None:
+            matched = get_capability_index(key.include_family_defaults).query(**key.to_criteria())
+            candidates = tuple(sorted(matched, key=order_key, reverse=True))
+            with self._lock:
+                self.misses += 1
+                self._cache[key] = candidates
+                if len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+
+        if key is not requirements:
+            candidates = tuple(entry for entry in candidates if requirements.admits(entry))
+        return candidates
+
+    def clear(self) -> None:
+        """清空缓存 / Clear the cache"""
+        with self._lock:
+            self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# 默认路由器 / Default router
+_DEFAULT_ROUTER = ModelRouter()
+
+
+def route(requirements: Requirements) -> tuple[CatalogEntry, ...]:
+    """
+    使用默认路由器返回候选模型 / Return candidate models using the default router
+
+    Args:
+        requirements: 请求需求 / Request requirements
+
+    Returns:
+        tuple[CatalogEntry, ...]: 候选条目，从高到低排列 / Candidates, best first
+    """
+    return _DEFAULT_ROUTER.route(requirements)
+
+
+__all__ = [
+    "DEFAULT_CACHE_SIZE",
+    "ModelRouter",
+    "Requirements",
+    "bucket_tokens",
+    "route",
+]
@@ -0,0 +1,252 @@
+# filename: selector.py
+# @Time    : 2026/10/19 17:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+按延迟选择 Provider / Latency-aware provider selection
+
+同一家族可由多个 Provider 提供（如 DeepSeek 由 Provider.DEEPSEEK 和 Provider.TENCENT 提供），
+而 _DEFAULT_PROVIDER 只是第一个注册者。选择器根据调用方上报的延迟与错误率 EWMA 为家族 / 模型挑选 Provider，
+让网关把流量自动切到更快的实例。
+One family can be served by several providers (e.g. DeepSeek via Provider.DEEPSEEK and Provider.TENCENT),
+while _DEFAULT_PROVIDER is just the first registered. The selector picks the provider for a family / model
+from client-reported latency and error-rate EWMAs, letting a gateway shift traffic to the faster host.
+
+更新无锁：每个 (family, provider) 的统计是不可变对象，更新时整体替换字典中的引用（单次字典赋值在 CPython 中是原子的）。
+并发更新可能丢失个别样本，但读者永远看到一致的快照，这对 EWMA 足够。按模型名称的候选缓存则是加锁的有界 LRU。
+Updates are lock-free: the stats of each (family, provider) are an immutable object and an update swaps the
+reference in the dict (a single dict store is atomic in CPython). Concurrent updates may drop an occasional
+sample, but readers always see a consistent snapshot, which is good enough for an EWMA. The per-name
+candidate cache is a locked, bounded LRU instead.
+
+Example:
+    >>> selector = ProviderSelector()
+    >>> selector.record(ModelFamily.DEEPSEEK, Provider.TENCENT, latency_seconds=0.4)
+    >>> selector.record(ModelFamily.DEEPSEEK, Provider.DEEPSEEK, latency_seconds=1.2, error=True)
+    >>> selector.select("deepseek-v3")
+    <Provider.TENCENT: 'tencent'>
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from whosellm.models.base import ModelFamily, parse_model_name
+from whosellm.models.registry import _FAMILY_CONFIGS, get_default_provider, get_registry_generation, match_model_pattern
+from whosellm.provider import Provider
+from whosellm.routing.router import DEFAULT_CACHE_SIZE
+
+
+@dataclass(frozen=True)
+class ProviderStats:
+    """
+    单个 (family, provider) 的统计快照 / Stats snapshot of one (family, provider)
+    """
+
+    latency_seconds: float | None = None  # 成功调用延迟的 EWMA / EWMA of successful call latency
+    error_rate: float = 0.0  # 错误率的 EWMA（0~1） / EWMA of the error rate (0~1)
+    samples: int = 0
+
+
+class ProviderSelector:
+    """
+    基于延迟 / 错误率 EWMA 的 Provider 选择器 / Provider selector driven by latency / error-rate EWMAs
+
+    得分 = 延迟 EWMA + 错误率 EWMA × error_penalty_seconds，越低越好。没有样本的 Provider 使用有限的先验得分
+    ``unsampled_score_seconds``，因此当已观测的 Provider 持续失败、得分超过先验时，流量会切到尚未尝试的 Provider；
+    得分相同时默认 Provider 优先，其余按注册顺序。
+    Score = latency EWMA + error-rate EWMA × error_penalty_seconds, lower is better. Providers without samples
+    get the finite prior ``unsampled_score_seconds``, so once an observed provider keeps failing and its score
+    exceeds the prior, traffic moves to a provider that has not been tried yet. Ties go to the default provider
+    first, then registration order.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        error_penalty_seconds: float = 5.0,
+        unsampled_score_seconds: float = 2.0,
+        max_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        """
+        Args:
+            alpha: EWMA 平滑系数，越大越偏向最新样本 / EWMA smoothing factor, larger favors recent samples
+            error_penalty_seconds: 错误率折算的延迟惩罚（秒） / Latency penalty per unit error rate (seconds)
+            unsampled_score_seconds: 没有样本的 Provider 的先验得分（秒） / Prior score of providers without samples
+            max_size: 按名称缓存的最大候选数（LRU） / Maximum number of per-name cached candidates (LRU)
+
+        Raises:
+            ValueError: alpha 不在 (0, 1] 区间 / alpha is not in (0, 1]
+        """
+        if not 0 < alpha <= 1:
+            msg = f"alpha 必须在 (0, 1] 区间 / alpha must be in (0, 1]: {alpha}"
+            raise ValueError(msg)
+        self.alpha = alpha
+        self.error_penalty_seconds = error_penalty_seconds
+        self.unsampled_score_seconds = unsampled_score_seconds
+        self._stats: dict[tuple[ModelFamily, Provider], ProviderStats] = {}
+        # 格式: {model_name: (family, candidates)}，按注册表代数失效；未知名称也会缓存，因此限制容量
+        # Format: {model_name: (family, candidates)}, invalidated by registry generation; unknown names are
+        # cached too, so the size is bounded
+        self._model_candidates: OrderedDict[str, tuple[ModelFamily | None, tuple[Provider, ...]]] = OrderedDict()
+        self._generation = get_registry_generation()
+        self._lock = threading.Lock()
+        self.max_size = max_size
+
+    def record(
+        self,
+        family: ModelFamily,
+        provider: Provider,
+        latency_seconds: float | None = None,
+        error: bool = False,
+    ) -> ProviderStats:
+        """
+        上报一次调用结果 / Report the outcome of one call
+
+        Args:
+            family: 模型家族 / Model family
+            provider: Provider
+            latency_seconds: 调用延迟（秒）；失败调用可为 None，不计入延迟 EWMA /
+                Call latency in seconds; may be None for failed calls, not fed into the latency EWMA
+            error: 是否失败 / Whether the call failed
+
+        Returns:
+            ProviderStats: 更新后的统计 / Updated stats
+        """
+        key = (family, provider)
+        previous = self._stats.get(key, ProviderStats())
+        alpha = self.alpha
+
+        latency = previous.latency_seconds
+        if latency_seconds is not None and not error:
+            latency = latency_seconds if latency is None else latency + alpha * (latency_seconds - latency)
+        error_rate = (
+            float(error) if previous.samples == 0 else previous.error_rate + alpha * (error - previous.error_rate)
+        )
+
+        updated = ProviderStats(latency_seconds=latency, error_rate=error_rate, samples=previous.samples + 1)
+        self._stats[key] = updated
+        return updated
+
+    def stats(self, family: ModelFamily, provider: Provider) -> ProviderStats:
+        """
+        获取统计快照 / Get the stats snapshot
+
+        Args:
+            family: 模型家族 / Model family
+            provider: Provider
+
+        Returns:
+            ProviderStats: 统计（无样本时为空统计） / Stats (empty when there are no samples)
+        """
+        return self._stats.get((family, provider), ProviderStats())
+
+    def reset(self) -> None:
+        """清空所有统计 / Clear all stats"""
+        self._stats = {}
+
+    def score(self, family: ModelFamily, provider: Provider) -> float:
+        """
+        计算得分，越低越好；无样本时为先验得分 / Compute the score, lower is better; the prior without samples
+
+        Args:
+            family: 模型家族 / Model family
+            provider: Provider
+
+        Returns:
+            float: 得分 / Score
+        """
+        stats = self._stats.get((family, provider))
+        if stats is None or stats.samples == 0:
+            return self.unsampled_score_seconds
+        return (stats.latency_seconds or 0.0) + stats.error_rate * self.error_penalty_seconds
+
+    def candidates(self, target: str | ModelFamily) -> tuple[ModelFamily | None, tuple[Provider, ...]]:
+        """
+        获取可提供该家族 / 模型的 Provider / Get the providers that can serve a family / model
+
+        对模型名称，只保留其配置能匹配该名称且解析为同一家族的 Provider；结果按注册表代数缓存（LRU，最多 max_size 个名称）。
+        For a model name, only providers whose config matches the name and resolves to the same family are
+        kept; results are cached per registry generation (LRU, at most max_size names).
+
+        Args:
+            target: 模型家族或模型名称 / Model family or model name
+
+        Returns:
+            tuple: (家族，未知时为 None, Provider 列表，按注册顺序) / (family or None, providers in registration order)
+        """
+        if isinstance(target, ModelFamily):
+            return target, tuple(provider for family, provider in _FAMILY_CONFIGS if family == target)
+
+        generation = get_registry_generation()
+        if generation != self._generation:
+            with self._lock:
+                self._model_candidates.clear()
+                self._generation = generation
+
+        _specified, actual_name = parse_model_name(target)
+        model_lower = actual_name.lower()
+        with self._lock:
+            cached = self._model_candidates.get(model_lower)
+            if cached is not None:
+                self._model_candidates.move_to_end(model_lower)
+                return cached
+
+        matched = match_model_pattern(model_lower)
+        if matched is None:
+            result: tuple[ModelFamily | None, tuple[Provider, ...]] = (None, ())
+        else:
+            family = matched["family"]
+            providers = []
+            for config_family, provider in _FAMILY_CONFIGS:
+                if config_family != family:
+                    continue
+                provider_match = match_model_pattern(model_lower, provider)
+                if provider_match is not None and provider_match["family"] == family:
+                    providers.append(provider)
+            result = (family, tuple(providers))
+        with self._lock:
+            self._model_candidates[model_lower] = result
+            if len(self._model_candidates) > self.max_size:
+                self._model_candidates.popitem(last=False)
+        return result
+
+    def ranked(self, target: str | ModelFamily) -> list[Provider]:
+        """
+        按得分排序的 Provider / Providers ordered by score
+
+        Args:
+            target: 模型家族或模型名称 / Model family or model name
+
+        Returns:
+            list[Provider]: 从优到劣 / Best first
+        """
+        family, providers = self.candidates(target)
+        if family is None:
+            return []
+        default = get_default_provider(family)
+        order = {provider: position for position, provider in enumerate(providers)}
+        return sorted(
+            providers,
+            key=lambda provider: (self.score(family, provider), provider != default, order[provider]),
+        )
+
+    def select(self, target: str | ModelFamily) -> Provider | None:
+        """
+        选择最优 Provider / Select the best provider
+
+        Args:
+            target: 模型家族或模型名称 / Model family or model name
+
+        Returns:
+            Provider | None: 最优 Provider，无法识别时为 None / Best provider, None when unrecognized
+        """
+        ranked = self.ranked(target)
+        return ranked[0] if ranked else None
+
+
+__all__ = [
+    "ProviderSelector",
+    "ProviderStats",
+]
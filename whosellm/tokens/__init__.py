@@ -0,0 +1,41 @@
+# filename: __init__.py
+# @Time    : 2026/10/19 22:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+token 估算 / Token estimation
+
+按家族估算 token 数，用于对照 ``context_window`` 与 ``max_tokens`` 的预检，以及按上下文窗口流式切分长文档
+Per-family token estimation for pre-flight checks against ``context_window`` and ``max_tokens``, and
+context-window-aware streaming chunking of long documents
+"""
+
+from whosellm.tokens.chunker import TextChunk, TextChunker, chunk_budget, chunk_text
+from whosellm.tokens.estimator import (
+    Calibration,
+    MessageTokenCounter,
+    TokenEstimator,
+    context_budget,
+    estimate_tokens,
+    estimate_tokens_many,
+    get_estimator,
+    register_tokenizer,
+    unregister_tokenizer,
+)
+
+__all__ = [
+    "Calibration",
+    "MessageTokenCounter",
+    "TextChunk",
+    "TextChunker",
+    "TokenEstimator",
+    "chunk_budget",
+    "chunk_text",
+    "context_budget",
+    "estimate_tokens",
+    "estimate_tokens_many",
+    "get_estimator",
+    "register_tokenizer",
+    "unregister_tokenizer",
+]
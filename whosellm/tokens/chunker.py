@@ -0,0 +1,297 @@
+# filename: chunker.py
+# @Time    : 2026/10/19 23:00
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+按上下文窗口切分的流式分块器 / Context-window-aware streaming chunker
+
+长文档按目标模型的 ``context_window - max_tokens - prompt 开销`` 切分（默认输出预留不超过窗口的一半）。分块器消费
+文本流（任意字符串可迭代对象），按句子 / 换行边界切成片段并累加 token 数，超过预算时产出一块，并把末尾不超过
+``overlap_tokens`` 的完整片段带入下一块。单个片段超过预算时依次按空白、按字符再切分。内存中只保留当前块、
+未结束的句子（有上限）与重叠部分，不会持有整个文档。token 数由按家族的估算器（或调用方传入的计数函数）得出。
+Long documents are split to fit the target model's ``context_window - max_tokens - prompt overhead`` (the
+default output reservation is capped at half the window). The chunker consumes a text stream (any iterable
+of strings), cuts it into segments at sentence / line boundaries and accumulates their token counts; when
+the budget would be exceeded it yields a chunk and carries trailing whole segments of at most
+``overlap_tokens`` into the next one. Segments larger than the budget are split further at whitespace, then
+by characters. Only the current chunk, the unfinished sentence (bounded) and the overlap are kept in memory,
+never the whole document. Token counts come from the per-family estimator (or a counter passed by the
+caller).
+
+Example:
+    >>> from whosellm.tokens import chunk_text
+    >>> with open("book.txt", encoding="utf-8") as f:
+    ...     for chunk in chunk_text("glm-4.6", f, prompt_tokens=500, overlap_tokens=200):
+    ...         summarize(chunk.text)
+"""
+
+import re
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from whosellm.model_version import LLMeta
+from whosellm.tokens.estimator import context_budget, get_estimator
+from whosellm.validation.vrl import resolve_model
+
+# 句子 / 换行边界（分隔符保留在前一个片段末尾） / Sentence / line boundaries (delimiters stay with the segment)
+_SEGMENT_BOUNDARY = re.compile(r"(?<=[\n.!?;。！？；])")
+_WORD_BOUNDARY = re.compile(r"(?<=\s)")
+
+# 未结束句子的最大缓存字符数，超过后强制作为片段处理 / Max characters of an unfinished sentence before it is forced out
+MAX_CARRY_CHARS = 64 * 1024
+
+# 默认输出预留占上下文窗口的最大比例。部分模型的 max_tokens 不小于上下文窗口（如 glm-4v-plus、Gemini TTS），
+# 直接预留 max_tokens 会不留任何输入空间
+# Maximum share of the context window reserved for output by default. Some models have max_tokens at least as
+# large as their context window (e.g. glm-4v-plus, Gemini TTS), reserving all of it would leave no room for input
+MAX_OUTPUT_SHARE = 0.5
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """
+    产出的文本块 / A yielded text chunk
+    """
+
+    index: int
+    text: str
+    tokens: int  # 各片段 token 数之和（略偏保守） / Sum of segment token counts (slightly conservative)
+
+
+def chunk_budget(
+    model: str | LLMeta,
+    *,
+    max_tokens: int | None = None,
+    prompt_tokens: int = 0,
+    messages: Iterable[dict[str, Any]] = (),
+) -> int:
+    """
+    计算每块可用的 token 数 / Compute the tokens available per chunk
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        max_tokens: 为输出预留的 token 数，默认取 ``capabilities.max_tokens``，但不超过上下文窗口的
+            ``MAX_OUTPUT_SHARE`` / Tokens reserved for output, defaults to ``capabilities.max_tokens`` capped at
+            ``MAX_OUTPUT_SHARE`` of the context window
+        prompt_tokens: 每块附带的提示词开销 / Prompt overhead sent with every chunk
+        messages: 每块附带的固定消息（按估算器计数） / Fixed messages sent with every chunk (counted by the estimator)
+
+    Returns:
+        int: 每块的 token 预算 / Token budget per chunk
+
+    Raises:
+        ValueError: 上下文窗口未知或预算不为正 / Unknown context window or non-positive budget
+    """
+    if max_tokens is None:
+        _name, _identity, capabilities = resolve_model(model)
+        if capabilities.context_window is not None:
+            max_tokens = min(capabilities.max_tokens or 0, int(capabilities.context_window * MAX_OUTPUT_SHARE))
+    budget = context_budget(model, messages, max_tokens)
+    if budget is None:
+        msg = f"模型的上下文窗口未知 / The model's context window is unknown: {model}"
+        raise ValueError(msg)
+    budget -= prompt_tokens
+    if budget <= 0:
+        msg = f"没有剩余的上下文预算 / No context budget left: {budget}"
+        raise ValueError(msg)
+    return budget
+
+
+class TextChunker:
+    """
+    流式文本分块器 / Streaming text chunker
+    """
+
+    def __init__(
+        self,
+        budget: int,
+        counter: Callable[[str], int],
+        overlap_tokens: int = 0,
+    ) -> None:
+        """
+        Args:
+            budget: 每块的 token 预算 / Token budget per chunk
+            counter: 计算 token 数的函数 / Token counting function
+            overlap_tokens: 相邻块的重叠 token 数上限 / Maximum overlapping tokens between adjacent chunks
+
+        Raises:
+            ValueError: 预算不为正，或重叠不小于预算 / Non-positive budget, or overlap not below the budget
+        """
+        if budget <= 0:
+            msg = f"budget 必须为正 / budget must be positive: {budget}"
+            raise ValueError(msg)
+        if not 0 <= overlap_tokens < budget:
+            msg = f"overlap_tokens 必须在 [0, budget) 内 / overlap_tokens must be within [0, budget): {overlap_tokens}"
+            raise ValueError(msg)
+        self.budget = budget
+        self.counter = counter
+        self.overlap_tokens = overlap_tokens
+
+    @classmethod
+    def for_model(
+        cls,
+        model: str | LLMeta,
+        *,
+        max_tokens: int | None = None,
+        prompt_tokens: int = 0,
+        messages: Iterable[dict[str, Any]] = (),
+        overlap_tokens: int = 0,
+        counter: Callable[[str], int] | None = None,
+    ) -> "TextChunker":
+        """
+        按模型的限制与家族估算器创建分块器 / Create a chunker from a model's limits and family estimator
+
+        Args:
+            model: 模型名称或 LLMeta / Model name or LLMeta
+            max_tokens: 为输出预留的 token 数 / Tokens reserved for output
+            prompt_tokens: 每块附带的提示词开销 / Prompt overhead sent with every chunk
+            messages: 每块附带的固定消息 / Fixed messages sent with every chunk
+            overlap_tokens: 相邻块的重叠 token 数上限 / Maximum overlapping tokens between adjacent chunks
+            counter: 计算 token 数的函数，默认使用家族估算器 / Token counter, defaults to the family estimator
+
+        Returns:
+            TextChunker: 分块器 / Chunker
+        """
+        budget = chunk_budget(model, max_tokens=max_tokens, prompt_tokens=prompt_tokens, messages=messages)
+        return cls(budget, counter or get_estimator(model).count, overlap_tokens)
+
+    def _split_oversized(self, segment: str, tokens: int) -> Iterator[tuple[str, int]]:
+        """把超过预算的片段按空白、再按字符切分 / Split an oversized segment at whitespace, then by characters"""
+        words = _WORD_BOUNDARY.split(segment)
+        if len(words) > 1:
+            for word in words:
+                if word:
+                    word_tokens = self.counter(word)
+                    if word_tokens > self.budget:
+                        yield from self._split_oversized(word, word_tokens)
+                    else:
+                        yield word, word_tokens
+            return
+
+        # 按 token 密度估计切片长度，超出时缩短 / Estimate slice length from token density, shrink on overflow
+        step = max(1, len(segment) * self.budget // max(tokens, 1))
+        start = 0
+        while start < len(segment):
+            length = step
+            piece = segment[start : start + length]
+            piece_tokens = self.counter(piece)
+            while piece_tokens > self.budget and length > 1:
+                length = max(1, length * self.budget // piece_tokens - 1)
+                piece = segment[start : start + length]
+                piece_tokens = self.counter(piece)
+            yield piece, piece_tokens
+            start += length
+
+    def _segments(self, stream: Iterable[str]) -> Iterator[tuple[str, int]]:
+        """把文本流切成不超过预算的片段 / Cut the text stream into segments within the budget"""
+        carry = ""
+        for text in stream:
+            parts = _SEGMENT_BOUNDARY.split(carry + text)
+            carry = parts.pop()
+            if len(carry) > MAX_CARRY_CHARS:
+                parts.append(carry)
+                carry = ""
+            for part in parts:
+                if part:
+                    tokens = self.counter(part)
+                    if tokens > self.budget:
+                        yield from self._split_oversized(part, tokens)
+                    else:
+                        yield part, tokens
+        if carry:
+            tokens = self.counter(carry)
+            if tokens > self.budget:
+                yield from self._split_oversized(carry, tokens)
+            else:
+                yield carry, tokens
+
+    def chunks(self, stream: Iterable[str]) -> Iterator[TextChunk]:
+        """
+        消费文本流并产出文本块 / Consume a text stream and yield chunks
+
+        Args:
+            stream: 文本流，例如文件对象或字符串生成器 / Text stream, e.g. a file object or a generator of strings
+
+        Yields:
+            TextChunk: 不超过预算的文本块 / Chunks within the budget
+        """
+        buffer: deque[tuple[str, int]] = deque()
+        buffered_tokens = 0
+        # 当前块中尚未产出过的片段数，为 0 时说明只有重叠部分 / Segments not yet yielded; 0 means only overlap
+        fresh = 0
+        index = 0
+
+        for segment, tokens in self._segments(stream):
+            if buffered_tokens + tokens > self.budget and fresh:
+                yield TextChunk(index, "".join(part for part, _ in buffer), buffered_tokens)
+                index += 1
+                # 保留末尾不超过 overlap_tokens 的完整片段 / Keep trailing whole segments within overlap_tokens
+                overlap: deque[tuple[str, int]] = deque()
+                overlap_tokens = 0
+                while buffer and overlap_tokens + buffer[-1][1] <= self.overlap_tokens:
+                    part = buffer.pop()
+                    overlap.appendleft(part)
+                    overlap_tokens += part[1]
+                buffer, buffered_tokens, fresh = overlap, overlap_tokens, 0
+            # 重叠部分加上新片段仍超预算时丢弃重叠 / Drop the overlap when it plus the new segment is over budget
+            while buffer and buffered_tokens + tokens > self.budget:
+                buffered_tokens -= buffer.popleft()[1]
+            buffer.append((segment, tokens))
+            buffered_tokens += tokens
+            fresh += 1
+
+        if fresh:
+            yield TextChunk(index, "".join(part for part, _ in buffer), buffered_tokens)
+
+
+def chunk_text(
+    model: str | LLMeta,
+    stream: Iterable[str] | str,
+    *,
+    max_tokens: int | None = None,
+    prompt_tokens: int = 0,
+    messages: Iterable[dict[str, Any]] = (),
+    overlap_tokens: int = 0,
+    counter: Callable[[str], int] | None = None,
+) -> Iterator[TextChunk]:
+    """
+    按模型的上下文窗口流式切分文本 / Stream-split text to fit a model's context window
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        stream: 文本流或单个字符串 / Text stream or a single string
+        max_tokens: 为输出预留的 token 数，默认见 ``chunk_budget`` / Tokens reserved for output, see ``chunk_budget``
+        prompt_tokens: 每块附带的提示词开销 / Prompt overhead sent with every chunk
+        messages: 每块附带的固定消息 / Fixed messages sent with every chunk
+        overlap_tokens: 相邻块的重叠 token 数上限 / Maximum overlapping tokens between adjacent chunks
+        counter: 计算 token 数的函数，默认使用家族估算器 / Token counter, defaults to the family estimator
+
+    Returns:
+        Iterator[TextChunk]: 惰性产出文本块的迭代器 / Iterator lazily yielding text chunks
+
+    Raises:
+        ValueError: 上下文窗口未知或预算不足（调用时立即抛出） /
+            Unknown context window or insufficient budget (raised immediately on call)
+    """
+    chunker = TextChunker.for_model(
+        model,
+        max_tokens=max_tokens,
+        prompt_tokens=prompt_tokens,
+        messages=messages,
+        overlap_tokens=overlap_tokens,
+        counter=counter,
+    )
+    return chunker.chunks([stream] if isinstance(stream, str) else stream)
+
+
+__all__ = [
+    "MAX_CARRY_CHARS",
+    "MAX_OUTPUT_SHARE",
+    "TextChunk",
+    "TextChunker",
+    "chunk_budget",
+    "chunk_text",
+]
@@ -0,0 +1,394 @@
+# filename: estimator.py
+# @Time    : 2026/10/19 22:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+按家族的快速 token 估算 / Fast per-family token estimation
+
+预检需要 token 数来使用 ``capabilities.context_window`` 与 ``max_tokens``，但每个请求都跑完整分词器太慢。默认的
+启发式估算按家族校准：ASCII 文本按「每 token 字符数」折算，非 ASCII（中日韩等）按「每字符 token 数」折算，
+非 ASCII 字符数由字符数与 ASCII 编码（忽略非 ASCII）后的长度之差得出，全部是 C 层面的操作。可以为家族注册精确分词器（以及可选的
+批量接口）替换启发式估算。消息列表可以一次遍历（支持生成器）或用 ``MessageTokenCounter`` 增量累计。
+Pre-flight needs token counts to use ``capabilities.context_window`` and ``max_tokens``, but running a full
+tokenizer per request is too slow. The default heuristic is calibrated per family: ASCII text is converted with
+a characters-per-token ratio and non-ASCII text (CJK etc.) with a tokens-per-character ratio, where the
+non-ASCII character count is the character count minus the length of the ASCII encoding with non-ASCII
+dropped, all C-level operations. Exact tokenizers (with an optional batch interface) can be registered per family to
+replace the heuristic. Message lists are counted in one pass (generators included) or incrementally with a
+``MessageTokenCounter``.
+
+Example:
+    >>> from whosellm import ModelFamily
+    >>> from whosellm.tokens import estimate_tokens, register_tokenizer
+    >>> estimate_tokens("gpt-4o", "Hello, world!")
+    4
+    >>> import tiktoken
+    >>> encoding = tiktoken.get_encoding("o200k_base")
+    >>> register_tokenizer(
+    ...     ModelFamily.GPT_4O,
+    ...     lambda text: len(encoding.encode(text)),
+    ...     lambda texts: [len(tokens) for tokens in encoding.encode_batch(texts)],
+    ... )
+"""
+
+import math
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from whosellm.model_version import LLMeta
+from whosellm.models.base import ModelFamily
+from whosellm.validation.vrl import resolve_model
+
+# 对话格式的固定开销（OpenAI 的计数规则） / Fixed overhead of the chat format (OpenAI's counting rules)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_NAME = 1
+REPLY_PRIMING_TOKENS = 3
+
+# 计入 token 的文本内容块类型 / Content block types counted as text
+TEXT_PART_TYPES = frozenset({"text", "input_text", "output_text"})
+
+
+@dataclass(frozen=True)
+class Calibration:
+    """
+    启发式估算的校准参数 / Calibration of the heuristic estimate
+    """
+
+    chars_per_token: float  # ASCII 文本每 token 的字符数 / ASCII characters per token
+    tokens_per_non_ascii: float  # 每个非 ASCII 字符的 token 数 / Tokens per non-ASCII character
+
+
+# 默认校准（cl100k 类分词器的公开平均值） / Default calibration (published averages for cl100k-style tokenizers)
+DEFAULT_CALIBRATION = Calibration(chars_per_token=4.0, tokens_per_non_ascii=1.0)
+
+# 按家族的校准，中文优化的分词器对 CJK 更省 token
+# Per-family calibration, tokenizers tuned for Chinese spend fewer tokens on CJK
+# 格式: {family: Calibration}
+FAMILY_CALIBRATIONS: dict[ModelFamily, Calibration] = {
+    ModelFamily.GPT_4O: Calibration(chars_per_token=4.2, tokens_per_non_ascii=0.7),
+    ModelFamily.O: Calibration(chars_per_token=4.2, tokens_per_non_ascii=0.7),
+    ModelFamily.CLAUDE: Calibration(chars_per_token=3.5, tokens_per_non_ascii=1.2),
+    ModelFamily.GEMINI: Calibration(chars_per_token=4.0, tokens_per_non_ascii=0.8),
+    ModelFamily.GLM: Calibration(chars_per_token=3.8, tokens_per_non_ascii=0.6),
+    ModelFamily.GLM_VISION: Calibration(chars_per_token=3.8, tokens_per_non_ascii=0.6),
+    ModelFamily.QWEN: Calibration(chars_per_token=3.8, tokens_per_non_ascii=0.6),
+    ModelFamily.DEEPSEEK: Calibration(chars_per_token=3.8, tokens_per_non_ascii=0.6),
+    ModelFamily.MOONSHOT: Calibration(chars_per_token=3.8, tokens_per_non_ascii=0.6),
+    ModelFamily.ERNIE: Calibration(chars_per_token=3.8, tokens_per_non_ascii=0.6),
+    ModelFamily.HUNYUAN: Calibration(chars_per_token=3.8, tokens_per_non_ascii=0.6),
+}
+
+
+@dataclass(frozen=True)
+class HeuristicCounter:
+    """
+    按校准参数估算 token 数 / Estimates token counts from a calibration
+    """
+
+    calibration: Calibration
+
+    def __call__(self, text: str) -> int:
+        if not text:
+            return 0
+        length = len(text)
+        if text.isascii():
+            return math.ceil(length / self.calibration.chars_per_token)
+        # 直接统计非 ASCII 字符，与 UTF-8 字节宽度无关（2 字节的西里尔字母、4 字节的 emoji 都算 1 个字符）
+        # Count non-ASCII characters directly, independent of their UTF-8 width (2-byte Cyrillic and 4-byte
+        # emoji are one character each)
+        non_ascii = length - len(text.encode("ascii", "ignore"))
+        ascii_chars = length - non_ascii
+        return math.ceil(
+            ascii_chars / self.calibration.chars_per_token + non_ascii * self.calibration.tokens_per_non_ascii
+        )
+
+
+def _message_parts(message: dict[str, Any]) -> tuple[int, list[str]]:
+    """拆分消息为格式开销与文本内容 / Split a message into format overhead and text content"""
+    overhead = TOKENS_PER_MESSAGE + (TOKENS_PER_NAME if message.get("name") else 0)
+    content = message.get("content")
+    if isinstance(content, str):
+        return overhead, [content]
+    if isinstance(content, list):
+        return overhead, [
+            part["text"]
+            for part in content
+            if isinstance(part, dict) and part.get("type") in TEXT_PART_TYPES and isinstance(part.get("text"), str)
+        ]
+    return overhead, []
+
+
+@dataclass(frozen=True)
+class TokenEstimator:
+    """
+    单个家族的 token 估算器 / Token estimator for one family
+    """
+
+    count_text: Callable[[str], int]
+    count_batch: Callable[[Sequence[str]], list[int]] | None = None
+    exact: bool = False  # 是否为注册的精确分词器 / Whether this is a registered exact tokenizer
+
+    def count(self, text: str) -> int:
+        """
+        估算单个字符串的 token 数 / Estimate the tokens in one string
+
+        Args:
+            text: 文本 / Text
+
+        Returns:
+            int: token 数 / Token count
+        """
+        return self.count_text(text)
+
+    def count_many(self, texts: Sequence[str]) -> list[int]:
+        """
+        批量估算 token 数，注册了批量接口时一次调用 / Estimate tokens for many strings, in one call when batched
+
+        Args:
+            texts: 文本列表 / Texts
+
+        Returns:
+            list[int]: 与输入对齐的 token 数 / Token counts aligned with the input
+        """
+        if self.count_batch is not None:
+            return self.count_batch(texts)
+        count_text = self.count_text
+        return [count_text(text) for text in texts]
+
+    def count_message(self, message: dict[str, Any]) -> int:
+        """
+        估算单条消息的 token 数（含格式开销） / Estimate one message's tokens, including format overhead
+
+        只计算文本内容，图片等其他内容块不计入。/ Only text content is counted; images and other blocks are not.
+
+        Args:
+            message: OpenAI / Anthropic 风格的消息 / OpenAI / Anthropic style message
+
+        Returns:
+            int: token 数 / Token count
+        """
+        overhead, texts = _message_parts(message)
+        return overhead + sum(self.count_many(texts))
+
+    def count_messages(self, messages: Iterable[dict[str, Any]]) -> int:
+        """
+        一次遍历估算消息列表的 token 数（可以是生成器） / Estimate a message list in one pass (generators allowed)
+
+        注册了批量接口时，所有消息的文本合并为一次批量调用。
+        With a batch interface registered, the text of every message goes into a single batch call.
+
+        Args:
+            messages: 消息 / Messages
+
+        Returns:
+            int: token 数，含回复引导开销 / Token count, including reply priming
+        """
+        if self.count_batch is None:
+            return sum(self.count_message(message) for message in messages) + REPLY_PRIMING_TOKENS
+        total_overhead = REPLY_PRIMING_TOKENS
+        all_texts: list[str] = []
+        for message in messages:
+            overhead, texts = _message_parts(message)
+            total_overhead += overhead
+            all_texts.extend(texts)
+        return total_overhead + sum(self.count_batch(all_texts))
+
+    def message_counter(self) -> "MessageTokenCounter":
+        """
+        创建增量计数器 / Create an incremental counter
+
+        Returns:
+            MessageTokenCounter: 增量计数器 / Incremental counter
+        """
+        return MessageTokenCounter(self)
+
+
+class MessageTokenCounter:
+    """
+    流式消息的增量 token 计数器 / Incremental token counter for streamed messages
+    """
+
+    def __init__(self, estimator: TokenEstimator) -> None:
+        """
+        Args:
+            estimator: token 估算器 / Token estimator
+        """
+        self._estimator = estimator
+        self.messages = 0  # 已累计的消息数 / Messages counted so far
+        self._message_tokens = 0
+
+    @property
+    def total(self) -> int:
+        """当前总 token 数（含回复引导开销） / Current total, including reply priming"""
+        return self._message_tokens + REPLY_PRIMING_TOKENS
+
+    def add(self, message: dict[str, Any]) -> int:
+        """
+        累计一条消息 / Add one message
+
+        Args:
+            message: 消息 / Message
+
+        Returns:
+            int: 累计后的总 token 数 / Total after adding
+        """
+        self._message_tokens += self._estimator.count_message(message)
+        self.messages += 1
+        return self.total
+
+    def add_text(self, text: str) -> int:
+        """
+        把流式文本追加到最后一条消息 / Append streamed text to the last message
+
+        Args:
+            text: 新增文本 / New text
+
+        Returns:
+            int: 累计后的总 token 数 / Total after adding
+        """
+        self._message_tokens += self._estimator.count_text(text)
+        return self.total
+
+    def fits(self, limit: int) -> bool:
+        """
+        总数是否不超过上限 / Whether the total stays within a limit
+
+        Args:
+            limit: token 上限 / Token limit
+
+        Returns:
+            bool: 是否不超过 / Whether it fits
+        """
+        return self.total <= limit
+
+
+# 注册的精确分词器 / Registered exact tokenizers
+# 格式: {family: TokenEstimator}
+_TOKENIZERS: dict[ModelFamily, TokenEstimator] = {}
+
+# 启发式估算器缓存 / Cached heuristic estimators
+# 格式: {family: TokenEstimator}
+_HEURISTICS: dict[ModelFamily, TokenEstimator] = {}
+
+
+def register_tokenizer(
+    family: ModelFamily,
+    count: Callable[[str], int],
+    count_many: Callable[[Sequence[str]], list[int]] | None = None,
+) -> None:
+    """
+    为家族注册精确分词器 / Register an exact tokenizer for a family
+
+    Args:
+        family: 模型家族 / Model family
+        count: 计算单个字符串 token 数的函数 / Function counting the tokens of one string
+        count_many: 批量计算的函数（可选） / Batch counting function (optional)
+    """
+    _TOKENIZERS[family] = TokenEstimator(count_text=count, count_batch=count_many, exact=True)
+
+
+def unregister_tokenizer(family: ModelFamily) -> None:
+    """
+    移除家族的精确分词器，恢复启发式估算 / Remove a family's exact tokenizer, restoring the heuristic
+
+    Args:
+        family: 模型家族 / Model family
+    """
+    _TOKENIZERS.pop(family, None)
+
+
+def get_estimator(model: str | LLMeta | ModelFamily) -> TokenEstimator:
+    """
+    获取模型或家族的 token 估算器 / Get the token estimator for a model or family
+
+    Args:
+        model: 模型名称、LLMeta 或模型家族 / Model name, LLMeta or model family
+
+    Returns:
+        TokenEstimator: 注册的精确分词器，否则为按家族校准的启发式估算器 /
+            The registered exact tokenizer, otherwise the family-calibrated heuristic
+    """
+    family = model if isinstance(model, ModelFamily) else resolve_model(model)[1].family
+    estimator = _TOKENIZERS.get(family)
+    if estimator is None:
+        estimator = _HEURISTICS.get(family)
+        if estimator is None:
+            calibration = FAMILY_CALIBRATIONS.get(family, DEFAULT_CALIBRATION)
+            estimator = TokenEstimator(count_text=HeuristicCounter(calibration))
+            _HEURISTICS[family] = estimator
+    return estimator
+
+
+def estimate_tokens(model: str | LLMeta | ModelFamily, text: str) -> int:
+    """
+    估算文本的 token 数 / Estimate the tokens in a text
+
+    Args:
+        model: 模型名称、LLMeta 或模型家族 / Model name, LLMeta or model family
+        text: 文本 / Text
+
+    Returns:
+        int: token 数 / Token count
+    """
+    return get_estimator(model).count(text)
+
+
+def estimate_tokens_many(model: str | LLMeta | ModelFamily, texts: Sequence[str]) -> list[int]:
+    """
+    批量估算文本的 token 数 / Estimate the tokens in many texts
+
+    Args:
+        model: 模型名称、LLMeta 或模型家族 / Model name, LLMeta or model family
+        texts: 文本列表 / Texts
+
+    Returns:
+        list[int]: 与输入对齐的 token 数 / Token counts aligned with the input
+    """
+    return get_estimator(model).count_many(texts)
+
+
+def context_budget(
+    model: str | LLMeta,
+    messages: Iterable[dict[str, Any]] = (),
+    max_tokens: int | None = None,
+) -> int | None:
+    """
+    计算上下文窗口剩余的 token 数 / Compute the tokens left in the context window
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        messages: 已有消息 / Existing messages
+        max_tokens: 为输出预留的 token 数，默认取 ``capabilities.max_tokens`` /
+            Tokens reserved for output, defaults to ``capabilities.max_tokens``
+
+    Returns:
+        int | None: ``context_window - 输出预留 - 消息``，可能为负；上下文窗口未知时为 None /
+            ``context_window - reserved output - messages``, possibly negative; None when the window is unknown
+    """
+    _name, identity, capabilities = resolve_model(model)
+    if capabilities.context_window is None:
+        return None
+    reserved = max_tokens if max_tokens is not None else (capabilities.max_tokens or 0)
+    prompt = get_estimator(identity.family).count_messages(messages)
+    return capabilities.context_window - reserved - prompt
+
+
+__all__ = [
+    "DEFAULT_CALIBRATION",
+    "FAMILY_CALIBRATIONS",
+    "REPLY_PRIMING_TOKENS",
+    "TOKENS_PER_MESSAGE",
+    "TOKENS_PER_NAME",
+    "Calibration",
+    "HeuristicCounter",
+    "MessageTokenCounter",
+    "TokenEstimator",
+    "context_budget",
+    "estimate_tokens",
+    "estimate_tokens_many",
+    "get_estimator",
+    "register_tokenizer",
+    "unregister_tokenizer",
+]
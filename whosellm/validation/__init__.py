@@ -0,0 +1,51 @@
+# filename: __init__.py
+# @Time    : 2026/10/19 20:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+请求参数验证 / Request parameter validation
+
+按模型能力验证并整改请求参数，规则以 VRL 脚本表达并缓存编译结果
+Validates and adjusts request parameters according to model capabilities, with rules expressed as VRL
+scripts whose compilation is cached
+"""
+
+from whosellm.validation.normalizer import NormalizationPlan, RequestNormalizer, compile_plan, normalize_params
+from whosellm.validation.preflight import (
+    PreflightRejectedError,
+    PreflightResult,
+    Rejection,
+    check_payload,
+    preflight,
+)
+from whosellm.validation.vrl import (
+    ParamValidationError,
+    ParamValidator,
+    build_validation_program,
+    clear_validation_scripts,
+    register_validation_script,
+    validate_params,
+    validate_params_many,
+    validate_params_mixed,
+)
+
+__all__ = [
+    "NormalizationPlan",
+    "ParamValidationError",
+    "ParamValidator",
+    "PreflightRejectedError",
+    "PreflightResult",
+    "Rejection",
+    "RequestNormalizer",
+    "build_validation_program",
+    "check_payload",
+    "clear_validation_scripts",
+    "compile_plan",
+    "normalize_params",
+    "preflight",
+    "register_validation_script",
+    "validate_params",
+    "validate_params_many",
+    "validate_params_mixed",
+]
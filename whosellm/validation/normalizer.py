@@ -0,0 +1,209 @@
+# filename: normalizer.py
+# @Time    : 2026/10/19 21:00
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+按模型编译的请求整改计划 / Request normalization plans compiled per model
+
+VRL 验证器每次执行都会把整个请求体序列化进运行时再返回新对象，请求体携带大段 base64 图片时代价很高。
+整改计划只描述顶层参数的变换（删除不支持的参数、把 JSON Schema 降级为 JSON 模式、截断 ``max_tokens``），
+按模型身份与能力指纹编译一次，之后原地修改请求体，不复制也不遍历 ``messages``。规则与 VRL 验证器共用
+``MAX_TOKENS_PARAMS`` / ``UNSUPPORTED_PARAMS``，但不做类型校验。
+The VRL validator serializes the whole request body into the runtime and returns a new object on every call,
+which is expensive when bodies carry large base64 images. A normalization plan only describes top-level
+transformations (drop unsupported params, downgrade JSON schema to JSON mode, clamp ``max_tokens``); it is
+compiled once per model identity and capability fingerprint and then mutates the body in place, without
+copying it or walking ``messages``. The rules share ``MAX_TOKENS_PARAMS`` / ``UNSUPPORTED_PARAMS`` with the
+VRL validator, but no type checking is done.
+
+Example:
+    >>> from whosellm.validation import normalize_params
+    >>> payload = {"max_tokens": 100_000, "reasoning_effort": "high", "messages": []}
+    >>> normalize_params("gpt-4o", payload) is payload
+    True
+    >>> payload
+    {'max_tokens': 16384, 'messages': []}
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.model_version import LLMeta
+from whosellm.models.registry import get_registry_generation
+from whosellm.validation.vrl import MAX_TOKENS_PARAMS, UNSUPPORTED_PARAMS, resolve_cache_key
+
+if TYPE_CHECKING:
+    from whosellm.validation.vrl import CacheKey
+
+# response_format 的处理方式 / How a response_format is handled
+KEEP = "keep"
+JSON_OBJECT = "json_object"
+DROP = "drop"
+
+
+@dataclass(frozen=True)
+class NormalizationPlan:
+    """
+    编译后的整改计划 / Compiled normalization plan
+    """
+
+    drop: tuple[str, ...] = ()  # 需要删除的顶层参数 / Top-level params to drop
+    max_tokens: int | None = None  # 输出长度上限，None 表示不截断 / Output length limit, None means no clamping
+    json_schema: str = KEEP  # json_schema 响应格式的处理方式 / Handling of json_schema response formats
+    json_object: str = KEEP  # json_object 响应格式的处理方式 / Handling of json_object response formats
+
+    @property
+    def is_noop(self) -> bool:
+        """计划是否不做任何修改 / Whether the plan changes nothing"""
+        return not self.drop and self.max_tokens is None and self.json_schema == KEEP and self.json_object == KEEP
+
+    def apply(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        原地整改请求体 / Normalize a request body in place
+
+        Args:
+            payload: 请求体，会被原地修改 / Request body, modified in place
+
+        Returns:
+            dict[str, Any]: 同一个请求体对象 / The same request body object
+        """
+        for param in self.drop:
+            payload.pop(param, None)
+
+        if self.max_tokens is not None:
+            for param in MAX_TOKENS_PARAMS:
+                value = payload.get(param)
+                if type(value) is int and value > self.max_tokens:
+                    payload[param] = self.max_tokens
+
+        response_format = payload.get("response_format")
+        if isinstance(response_format, dict):
+            format_type = response_format.get("type")
+            if format_type == "json_schema":
+                action = self.json_schema
+            elif format_type == "json_object":
+                action = self.json_object
+            else:
+                action = KEEP
+            if action == DROP:
+                del payload["response_format"]
+            elif action == JSON_OBJECT:
+                payload["response_format"] = {"type": "json_object"}
+        return payload
+
+
+def compile_plan(capabilities: ModelCapabilities) -> NormalizationPlan:
+    """
+    根据模型能力编译整改计划 / Compile a normalization plan from a model's capabilities
+
+    Args:
+        capabilities: 模型能力 / Model capabilities
+
+    Returns:
+        NormalizationPlan: 整改计划 / Normalization plan
+    """
+    drop = tuple(
+        param
+        for capability, params in UNSUPPORTED_PARAMS.items()
+        if not getattr(capabilities, capability)
+        for param in params
+    )
+    # 结构化输出不支持时降级为 JSON 模式，JSON 模式也不支持时删除
+    # Downgrade structured outputs to JSON mode when unsupported, drop it when JSON mode is unsupported too
+    json_object = KEEP if capabilities.supports_json_outputs else DROP
+    json_schema = KEEP if capabilities.supports_structured_outputs else (JSON_OBJECT if json_object == KEEP else DROP)
+    return NormalizationPlan(
+        drop=drop,
+        max_tokens=capabilities.max_tokens,
+        json_schema=json_schema,
+        json_object=json_object,
+    )
+
+
+class RequestNormalizer:
+    """
+    缓存编译后整改计划的请求整改器 / Request normalizer caching compiled plans
+    """
+
+    def __init__(self) -> None:
+        # 格式: {(identity, fingerprint): plan}，与 VRL 程序同样的键，注册表代数变化时整体失效
+        # Format: {(identity, fingerprint): plan}, keyed like VRL programs, invalidated when the registry changes
+        self._plans: dict[CacheKey, NormalizationPlan] = {}
+        self._generation = get_registry_generation()
+        self._lock = threading.Lock()
+        self.compilations = 0  # 累计编译次数 / Number of compilations so far
+
+    def plan(self, model: str | LLMeta) -> NormalizationPlan:
+        """
+        获取（必要时编译）模型的整改计划 / Get the model's plan, compiling it if needed
+
+        Args:
+            model: 模型名称或 LLMeta / Model name or LLMeta
+
+        Returns:
+            NormalizationPlan: 整改计划 / Normalization plan
+        """
+        generation = get_registry_generation()
+        if generation != self._generation:
+            with self._lock:
+                self._plans = {}
+                self._generation = generation
+
+        _name, key, capabilities = resolve_cache_key(model)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = compile_plan(capabilities)
+            with self._lock:
+                self._plans[key] = plan
+                self.compilations += 1
+        return plan
+
+    def normalize(self, model: str | LLMeta, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        按模型原地整改请求体 / Normalize a request body for a model in place
+
+        Args:
+            model: 模型名称或 LLMeta / Model name or LLMeta
+            payload: 请求体，会被原地修改 / Request body, modified in place
+
+        Returns:
+            dict[str, Any]: 同一个请求体对象 / The same request body object
+        """
+        return self.plan(model).apply(payload)
+
+    def clear(self) -> None:
+        """清空缓存的计划 / Clear cached plans"""
+        with self._lock:
+            self._plans = {}
+
+
+# 默认整改器 / Default normalizer
+_DEFAULT_NORMALIZER = RequestNormalizer()
+
+
+def normalize_params(model: str | LLMeta, payload: dict[str, Any]) -> dict[str, Any]:
+    """
+    使用默认整改器原地整改请求体 / Normalize a request body in place with the default normalizer
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        payload: 请求体，会被原地修改 / Request body, modified in place
+
+    Returns:
+        dict[str, Any]: 同一个请求体对象 / The same request body object
+    """
+    return _DEFAULT_NORMALIZER.normalize(model, payload)
+
+
+__all__ = [
+    "DROP",
+    "JSON_OBJECT",
+    "KEEP",
+    "NormalizationPlan",
+    "RequestNormalizer",
+    "compile_plan",
+    "normalize_params",
+]
@@ -0,0 +1,230 @@
+# filename: preflight.py
+# @Time    : 2026/10/19 20:40
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+请求载荷预检 / Request payload pre-flight check
+
+大量上游失败来自模型根本无法接受的请求：给非视觉模型发图片、``supports_pdf`` 为 False 却带 PDF、
+``supports_function_calling`` 为 False 却带 ``tools``、对 Vidu 模型设置 ``stream=True`` 等。预检只遍历一次
+OpenAI / Anthropic 风格的消息载荷，对照解析后的 ``ModelCapabilities`` 给出结构化的拒绝原因，在发出网络请求前拦截。
+Many failed upstream calls are requests the model cannot accept: images to a non-vision model, PDFs where
+``supports_pdf`` is False, ``tools`` where ``supports_function_calling`` is False, ``stream=True`` on Vidu
+models. The pre-flight check walks an OpenAI / Anthropic style payload once against the resolved
+``ModelCapabilities`` and returns structured rejections before any network call.
+
+Example:
+    >>> from whosellm.validation import preflight
+    >>> result = preflight("deepseek-chat", {"messages": [{"role": "user", "content": [{"type": "image_url"}]}]})
+    >>> result.ok, result.rejections[0].code
+    (False, 'image_input')
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.model_version import LLMeta
+from whosellm.validation.vrl import ParamValidationError, resolve_model
+
+# 内容块类型 → (拒绝代码, 所需能力) / Content block type → (rejection code, required capability)
+# 覆盖 OpenAI Chat Completions / Responses 与 Anthropic Messages
+# Covers OpenAI Chat Completions / Responses and Anthropic Messages
+CONTENT_TYPES: dict[str, tuple[str, str]] = {
+    "image_url": ("image_input", "supports_vision"),
+    "input_image": ("image_input", "supports_vision"),
+    "image": ("image_input", "supports_vision"),
+    "input_audio": ("audio_input", "supports_audio"),
+    "audio": ("audio_input", "supports_audio"),
+    "video_url": ("video_input", "supports_video"),
+    "input_video": ("video_input", "supports_video"),
+    "video": ("video_input", "supports_video"),
+    "tool_use": ("tools", "supports_function_calling"),
+    "tool_result": ("tools", "supports_function_calling"),
+}
+
+# 文件类内容块，是否为 PDF 需进一步判断 / File-like blocks, whether they are PDFs needs a closer look
+FILE_TYPES = frozenset({"file", "input_file", "document"})
+
+
+@dataclass(frozen=True)
+class Rejection:
+    """
+    单条拒绝原因 / A single rejection reason
+    """
+
+    code: str  # 如 image_input / tools / streaming / e.g. image_input / tools / streaming
+    capability: str  # 缺失的能力字段 / The missing capability field
+    path: str  # 载荷中的位置，如 messages[0].content[1] / Location in the payload
+    message: str
+
+
+class PreflightRejectedError(ParamValidationError):
+    """
+    请求载荷未通过预检 / Request payload failed the pre-flight check
+    """
+
+    def __init__(self, result: "PreflightResult") -> None:
+        self.result = result
+        super().__init__(result.model, "; ".join(rejection.message for rejection in result.rejections))
+
+
+@dataclass(frozen=True)
+class PreflightResult:
+    """
+    预检结果 / Pre-flight result
+    """
+
+    model: str
+    rejections: tuple[Rejection, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        """是否可以发送 / Whether the request can be sent"""
+        return not self.rejections
+
+    def raise_for_rejection(self) -> None:
+        """
+        有拒绝原因时抛出 / Raise when there are rejections
+
+        Raises:
+            PreflightRejectedError: 载荷未通过预检 / The payload failed the pre-flight check
+        """
+        if self.rejections:
+            raise PreflightRejectedError(self)
+
+
+def _media_type(part: dict[str, Any]) -> str | None:
+    """
+    提取内容块声明的媒体类型（data URL 或 Anthropic source.media_type） /
+    Extract the media type a block declares (data URL or Anthropic source.media_type)
+    """
+    source = part.get("source")
+    if isinstance(source, dict) and isinstance(source.get("media_type"), str):
+        return str(source["media_type"]).lower()
+
+    # Chat Completions: {"image_url": {"url": ...}}、{"file": {"file_data": ...}}
+    # Responses API: {"image_url": "..."}、{"file_data": "..."}
+    for key in ("image_url", "file", "video_url", "file_data"):
+        value = part.get(key)
+        url = (value.get("url") or value.get("file_data")) if isinstance(value, dict) else value
+        if isinstance(url, str) and url.startswith("data:"):
+            return url[5:].split(";", 1)[0].split(",", 1)[0].lower()
+    return None
+
+
+def _is_pdf(part: dict[str, Any]) -> bool:
+    """文件类内容块是否为 PDF（无法判断时视为 PDF） / Whether a file block is a PDF (assumed PDF when unknown)"""
+    media_type = _media_type(part)
+    if media_type is not None:
+        return media_type == "application/pdf"
+    file = part.get("file")
+    filename = file.get("filename") if isinstance(file, dict) else part.get("filename")
+    if isinstance(filename, str):
+        return filename.lower().endswith(".pdf")
+    # Anthropic 的纯文本 document 不是 PDF / Anthropic plain-text documents are not PDFs
+    source = part.get("source")
+    return not (isinstance(source, dict) and source.get("type") in ("text", "content"))
+
+
+def check_payload(capabilities: ModelCapabilities, payload: dict[str, Any], model: str = "") -> PreflightResult:
+    """
+    对照能力检查请求载荷 / Check a request payload against capabilities
+
+    Args:
+        capabilities: 模型能力 / Model capabilities
+        payload: OpenAI / Anthropic 风格的请求体 / OpenAI / Anthropic style request body
+        model: 模型名称，仅用于结果 / Model name, only recorded in the result
+
+    Returns:
+        PreflightResult: 预检结果 / Pre-flight result
+    """
+    rejections: list[Rejection] = []
+
+    def reject(code: str, capability: str, path: str, what: str) -> None:
+        rejections.append(Rejection(code, capability, path, f"{what} 需要 {capability} / {what} requires {capability}"))
+
+    # 顶层参数 / Top-level params
+    if (payload.get("tools") or payload.get("functions")) and not capabilities.supports_function_calling:
+        reject("tools", "supports_function_calling", "tools", "tools")
+    if payload.get("stream") is True and not capabilities.supports_streaming:
+        reject("streaming", "supports_streaming", "stream", "stream=True")
+    if (payload.get("reasoning_effort") or payload.get("thinking")) and not capabilities.supports_thinking:
+        path = "reasoning_effort" if payload.get("reasoning_effort") else "thinking"
+        reject("reasoning", "supports_thinking", path, path)
+    response_format = payload.get("response_format")
+    if isinstance(response_format, dict):
+        format_type = response_format.get("type")
+        if format_type == "json_schema" and not capabilities.supports_structured_outputs:
+            reject("structured_output", "supports_structured_outputs", "response_format", "json_schema")
+        elif format_type == "json_object" and not capabilities.supports_json_outputs:
+            reject("json_output", "supports_json_outputs", "response_format", "json_object")
+    modalities = payload.get("modalities")
+    if isinstance(modalities, list) and "audio" in modalities and not capabilities.supports_audio_generation:
+        reject("audio_output", "supports_audio_generation", "modalities", "audio output")
+
+    # 消息内容（只遍历一次） / Message content (walked once)
+    messages = payload.get("messages", payload.get("input"))
+    if isinstance(messages, list):
+        allowed_images = frozenset(capabilities.supported_image_mime_type)
+        for index, message in enumerate(messages):
+            if not isinstance(message, dict):
+                continue
+            has_tool_calls = message.get("tool_calls") or message.get("role") == "tool"
+            if has_tool_calls and not capabilities.supports_function_calling:
+                reject("tools", "supports_function_calling", f"messages[{index}]", "tool messages")
+            content = message.get("content")
+            if not isinstance(content, list):
+                continue
+            for position, part in enumerate(content):
+                if not isinstance(part, dict):
+                    continue
+                part_type = part.get("type")
+                path = f"messages[{index}].content[{position}]"
+                required = CONTENT_TYPES.get(part_type) if isinstance(part_type, str) else None
+                if required is not None:
+                    code, capability = required
+                    if not getattr(capabilities, capability):
+                        reject(code, capability, path, str(part_type))
+                    elif code == "image_input":
+                        media_type = _media_type(part)
+                        if media_type is not None and media_type not in allowed_images:
+                            rejections.append(
+                                Rejection(
+                                    "image_mime_type",
+                                    "supported_image_mime_type",
+                                    path,
+                                    f"不支持的图片类型 / Unsupported image type: {media_type}",
+                                ),
+                            )
+                elif part_type in FILE_TYPES and _is_pdf(part) and not capabilities.supports_pdf:
+                    reject("pdf_input", "supports_pdf", path, "PDF")
+
+    return PreflightResult(model=model, rejections=tuple(rejections))
+
+
+def preflight(model: str | LLMeta, payload: dict[str, Any]) -> PreflightResult:
+    """
+    按模型能力预检请求载荷 / Pre-flight check a request payload against the model's capabilities
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        payload: OpenAI / Anthropic 风格的请求体 / OpenAI / Anthropic style request body
+
+    Returns:
+        PreflightResult: 预检结果 / Pre-flight result
+    """
+    name, _identity, capabilities = resolve_model(model)
+    return check_payload(capabilities, payload, name)
+
+
+__all__ = [
+    "CONTENT_TYPES",
+    "FILE_TYPES",
+    "PreflightRejectedError",
+    "PreflightResult",
+    "Rejection",
+    "check_payload",
+    "preflight",
+]
@@ -0,0 +1,515 @@
+# filename: vrl.py
+# @Time    : 2026/10/19 20:10
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+基于 VRL 的请求参数验证 / VRL-based request parameter validation
+
+根据模型能力生成 VRL 程序（把 ``max_tokens`` 截断到 ``capabilities.max_tokens``、删除模型不支持的工具 /
+流式 / 推理等参数、校验数值类型），并追加按家族 / 版本 / 型号注册的自定义脚本。每个程序按解析后的模型身份
+（Provider、家族、版本、型号）、能力指纹与注册表代数缓存，只在首次使用时编译，之后每次请求只执行。
+Generates a VRL program from the model's capabilities (clamp ``max_tokens`` to ``capabilities.max_tokens``,
+drop tool / streaming / reasoning params the model does not support, type-check numeric params) and appends
+custom scripts registered per family / version / variant. Each program is cached per resolved model identity
+(provider, family, version, variant), capability fingerprint and registry generation, compiled on first use
+only, and merely executed on every request afterwards.
+
+Example:
+    >>> from whosellm.validation import validate_params
+    >>> validate_params("gpt-4o", {"max_tokens": 100_000, "reasoning_effort": "high"})
+    {'max_tokens': 16384}
+"""
+
+import math
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+from vrl_python import VRLRuntime
+
+from whosellm.capabilities import ModelCapabilities
+from whosellm.model_version import LLMeta
+from whosellm.models.base import ModelFamily, get_model_info
+from whosellm.models.registry import get_registry_generation
+from whosellm.routing.ratelimit import ModelIdentity
+
+# 需要截断到 capabilities.max_tokens 的输出长度参数 / Output length params clamped to capabilities.max_tokens
+MAX_TOKENS_PARAMS = ("max_tokens", "max_completion_tokens")
+
+# 能力关闭时删除的参数 / Params dropped when a capability is off
+# 格式: {capability field: (param, ...)}
+UNSUPPORTED_PARAMS: dict[str, tuple[str, ...]] = {
+    "supports_function_calling": ("tools", "tool_choice", "parallel_tool_calls", "functions", "function_call"),
+    "supports_streaming": ("stream", "stream_options"),
+    "supports_thinking": ("reasoning_effort", "reasoning", "thinking"),
+    "supports_predicted_outputs": ("prediction",),
+}
+
+# 必须为数值的采样参数及其下限 / Sampling params that must be numbers, with their lower bounds
+NUMERIC_PARAMS: dict[str, float] = {
+    "temperature": 0.0,
+    "top_p": 0.0,
+    "presence_penalty": -2.0,
+    "frequency_penalty": -2.0,
+}
+
+
+class ParamValidationError(ValueError):
+    """
+    请求参数未通过验证 / Request parameters failed validation
+    """
+
+    def __init__(self, model: str, reason: str, diagnostic: str = "") -> None:
+        self.model = model
+        self.reason = reason
+        self.diagnostic = diagnostic  # VRL 的完整诊断信息 / Full VRL diagnostic
+        super().__init__(f"{model} 参数验证失败 / {model} parameter validation failed: {reason}")
+
+
+def _abort_reason(diagnostic: str) -> str:
+    """从 VRL abort 诊断中提取原因 / Extract the reason from a VRL abort diagnostic"""
+    for line in diagnostic.splitlines():
+        if line.startswith("error[") and "]: " in line:
+            return line.split("]: ", 1)[1].strip()
+    return diagnostic.strip()
+
+
+def _to_vrl(value: Any) -> Any:
+    """
+    把参数转换为 VRL 可接受的值 / Convert a parameter value into one VRL accepts
+
+    元组转为列表；VRL 没有 NaN / 无穷大（会被静默转为 0），因此直接拒绝。未变化的容器原样返回。
+    Tuples become lists; VRL has no NaN / infinity (they would silently become 0), so they are rejected.
+    Containers that need no change are returned as-is.
+
+    Raises:
+        ValueError: 非有限浮点数 / Non-finite float
+    """
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            msg = f"参数值必须是有限数值 / Parameter values must be finite numbers: {value}"
+            raise ValueError(msg)
+        return value
+    if isinstance(value, dict):
+        converted = {key: _to_vrl(item) for key, item in value.items()}
+        return value if all(converted[key] is value[key] for key in value) else converted
+    if isinstance(value, list | tuple):
+        items = [_to_vrl(item) for item in value]
+        if isinstance(value, list) and all(new is old for new, old in zip(items, value, strict=True)):
+            return value
+        return items
+    return value
+
+
+def build_validation_program(capabilities: ModelCapabilities) -> str:
+    """
+    根据模型能力生成 VRL 验证程序 / Generate the VRL validation program for a model's capabilities
+
+    Args:
+        capabilities: 模型能力 / Model capabilities
+
+    Returns:
+        str: VRL 源码，以 ``.`` 结尾 / VRL source ending with ``.``
+    """
+    lines: list[str] = []
+
+    for param in MAX_TOKENS_PARAMS:
+        lines.append(f"if exists(.{param}) && .{param} != null {{")
+        lines.append(
+            f'  if !is_integer(.{param}) || to_int!(.{param}) < 1 {{ abort "{param} must be a positive integer" }}'
+        )
+        if capabilities.max_tokens is not None:
+            limit = capabilities.max_tokens
+            lines.append(f"  if to_int!(.{param}) > {limit} {{ .{param} = {limit} }}")
+        lines.append("}")
+
+    for param, lower in NUMERIC_PARAMS.items():
+        lines.append(f"if exists(.{param}) && .{param} != null {{")
+        lines.append(f'  if !is_float(.{param}) && !is_integer(.{param}) {{ abort "{param} must be a number" }}')
+        lines.append(f'  if to_float!(.{param}) < {lower} {{ abort "{param} must be >= {lower}" }}')
+        lines.append("}")
+
+    for capability, params in UNSUPPORTED_PARAMS.items():
+        if not getattr(capabilities, capability):
+            lines.extend(f"del(.{param})" for param in params)
+
+    # 结构化输出不支持时降级为 JSON 模式，JSON 模式也不支持时删除
+    # Downgrade structured outputs to JSON mode when unsupported, drop it when JSON mode is unsupported too
+    if not capabilities.supports_structured_outputs:
+        replacement = (
+            '.response_format = {"type": "json_object"}'
+            if capabilities.supports_json_outputs
+            else "del(.response_format)"
+        )
+        lines.append(f'if is_object(.response_format) && .response_format.type == "json_schema" {{ {replacement} }}')
+    if not capabilities.supports_json_outputs:
+        lines.append(
+            'if is_object(.response_format) && .response_format.type == "json_object" { del(.response_format) }'
+        )
+
+    return "\n".join(lines)
+
+
+# 自定义脚本 / Custom scripts
+# 格式: [(family, version 或 None, variant 或 None, source)]
+_CUSTOM_SCRIPTS: list[tuple[ModelFamily, str | None, str | None, str]] = []
+
+# 自定义脚本变化时递增，参与缓存键 / Incremented when custom scripts change, part of the cache key
+_SCRIPTS_GENERATION = 0
+
+
+def register_validation_script(
+    family: ModelFamily,
+    source: str,
+    version: str | None = None,
+    variant: str | None = None,
+) -> None:
+    """
+    为家族（可限定版本 / 型号）注册自定义 VRL 脚本，追加在生成的规则之后 /
+    Register a custom VRL script for a family (optionally a version / variant), appended after generated rules
+
+    Args:
+        family: 模型家族 / Model family
+        source: VRL 源码，可修改 ``.`` 或 ``abort`` / VRL source, may modify ``.`` or ``abort``
+        version: 只作用于该版本（可选） / Only apply to this version (optional)
+        variant: 只作用于该型号（可选） / Only apply to this variant (optional)
+
+    Raises:
+        ValueError: VRL 语法错误 / VRL syntax error
+    """
+    global _SCRIPTS_GENERATION
+
+    diagnostic = VRLRuntime.check_syntax(source)
+    if diagnostic is not None:
+        msg = f"VRL 脚本语法错误 / Invalid VRL script:\n{diagnostic.formatted_message}"
+        raise ValueError(msg)
+    _CUSTOM_SCRIPTS.append((family, version, variant, source))
+    _SCRIPTS_GENERATION += 1
+
+
+def clear_validation_scripts() -> None:
+    """清空自定义脚本 / Clear custom scripts"""
+    global _SCRIPTS_GENERATION
+
+    _CUSTOM_SCRIPTS.clear()
+    _SCRIPTS_GENERATION += 1
+
+
+# 程序 / 计划的缓存键: (身份, 能力指纹)。同一身份下能力可能不同（如 ``-preview`` 与正式版），只按身份缓存会串用
+# Cache key for programs / plans: (identity, capability fingerprint). Models sharing an identity may differ in
+# capabilities (e.g. ``-preview`` vs the stable release), so keying by identity alone would mix them up
+CacheKey = tuple[ModelIdentity, tuple[Any, ...]]
+
+
+def capability_fingerprint(capabilities: ModelCapabilities) -> tuple[Any, ...]:
+    """
+    生成能力的可哈希指纹（列表字段转为元组） / Build a hashable fingerprint of capabilities (list fields become tuples)
+
+    Args:
+        capabilities: 模型能力 / Model capabilities
+
+    Returns:
+        tuple: 按字段顺序排列的能力值 / Capability values in field order
+    """
+    return tuple(tuple(value) if isinstance(value, list) else value for value in vars(capabilities).values())
+
+
+# 格式: {model_name: (identity, capabilities, cache key)}，注册表代数变化时整体失效
+# Format: {model_name: (identity, capabilities, cache key)}, invalidated when the registry generation changes
+_RESOLVED: dict[str, tuple[ModelIdentity, ModelCapabilities, CacheKey]] = {}
+_RESOLVED_GENERATION = get_registry_generation()
+
+
+def _resolve(model: str | LLMeta) -> tuple[str, ModelIdentity, ModelCapabilities, CacheKey]:
+    """解析并缓存名称、身份、能力与缓存键 / Resolve and cache the name, identity, capabilities and cache key"""
+    global _RESOLVED_GENERATION
+
+    if isinstance(model, LLMeta):
+        identity = ModelIdentity(model.provider, model.family, model.version, model.variant)
+        capabilities = model.capabilities
+        return model.model_name, identity, capabilities, (identity, capability_fingerprint(capabilities))
+
+    generation = get_registry_generation()
+    if generation != _RESOLVED_GENERATION:
+        _RESOLVED.clear()
+        _RESOLVED_GENERATION = generation
+    resolved = _RESOLVED.get(model)
+    if resolved is None:
+        info = get_model_info(model)
+        identity = ModelIdentity.from_model_info(info)
+        resolved = (identity, info.capabilities, (identity, capability_fingerprint(info.capabilities)))
+        _RESOLVED[model] = resolved
+    return model, resolved[0], resolved[1], resolved[2]
+
+
+def resolve_model(model: str | LLMeta) -> tuple[str, ModelIdentity, ModelCapabilities]:
+    """
+    解析模型名称、身份与能力，名称的解析结果会被缓存 / Resolve a model's name, identity and capabilities, names are cached
+
+    ``get_model_info`` 每次都会重新解析日期，请求路径上直接调用代价较高，因此这里按名称缓存。
+    ``get_model_info`` re-parses release dates on every call, which is costly on the request path, so results
+    are cached per name here.
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+
+    Returns:
+        tuple: (名称, 身份, 能力) / (name, identity, capabilities)
+    """
+    name, identity, capabilities, _key = _resolve(model)
+    return name, identity, capabilities
+
+
+def resolve_cache_key(model: str | LLMeta) -> tuple[str, CacheKey, ModelCapabilities]:
+    """
+    解析模型名称、缓存键与能力 / Resolve a model's name, cache key and capabilities
+
+    按名称缓存的模型不会重复计算指纹。/ Fingerprints of models cached by name are not recomputed.
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+
+    Returns:
+        tuple: (名称, 缓存键, 能力) / (name, cache key, capabilities)
+    """
+    name, _identity, capabilities, key = _resolve(model)
+    return name, key, capabilities
+
+
+class ParamValidator:
+    """
+    缓存编译后 VRL 程序的参数验证器 / Parameter validator caching compiled VRL programs
+    """
+
+    def __init__(self, timezone: str | None = None) -> None:
+        """
+        Args:
+            timezone: VRL 运行时时区（可选） / VRL runtime timezone (optional)
+        """
+        self._runtime = VRLRuntime(timezone)
+        # 格式: {(identity, fingerprint): source}，按 (注册表代数, 脚本代数) 整体失效
+        # Format: {(identity, fingerprint): source}, invalidated by (registry generation, script generation)
+        self._programs: dict[CacheKey, str] = {}
+        self._generation = (get_registry_generation(), _SCRIPTS_GENERATION)
+        self._lock = threading.Lock()
+        self.compilations = 0  # 累计编译次数 / Number of compilations so far
+
+    def _refresh(self) -> None:
+        """注册表或自定义脚本变化时清空缓存 / Drop caches when the registry or custom scripts change"""
+        generation = (get_registry_generation(), _SCRIPTS_GENERATION)
+        if generation != self._generation:
+            with self._lock:
+                self._programs = {}
+                self._generation = generation
+
+    def program(self, model: str | LLMeta) -> str:
+        """
+        获取（必要时生成并编译）模型的 VRL 程序 / Get the model's VRL program, generating and compiling it if needed
+
+        Args:
+            model: 模型名称或 LLMeta / Model name or LLMeta
+
+        Returns:
+            str: VRL 源码 / VRL source
+        """
+        self._refresh()
+        _name, key, capabilities = resolve_cache_key(model)
+        return self._program(key, capabilities)
+
+    def _program(self, key: CacheKey, capabilities: ModelCapabilities) -> str:
+        """按 (身份, 能力指纹) 缓存的程序，调用前需先 _refresh / Program cached by key, call _refresh first"""
+        source = self._programs.get(key)
+        if source is None:
+            identity = key[0]
+            parts = [build_validation_program(capabilities)]
+            parts.extend(
+                script
+                for family, version, variant, script in _CUSTOM_SCRIPTS
+                if family == identity.family
+                and (version is None or version == identity.version)
+                and (variant is None or variant == identity.variant)
+            )
+            parts.append(".")
+            source = "\n".join(parts)
+            with self._lock:
+                self._runtime.compile(source)
+                self.compilations += 1
+            self._programs[key] = source
+        return source
+
+    def _execute(self, name: str, source: str, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        执行已编译的程序 / Execute a compiled program
+
+        无法转换为 VRL 值的参数（bytes、非字符串键、NaN 等）同样报告为 ParamValidationError。
+        Values that cannot be converted to VRL (bytes, non-str keys, NaN, ...) are reported as
+        ParamValidationError as well.
+        """
+        try:
+            result = self._runtime.execute(source, _to_vrl(params))
+        except RuntimeError as e:
+            diagnostic = str(e)
+            raise ParamValidationError(name, _abort_reason(diagnostic), diagnostic) from None
+        except ValueError as e:
+            raise ParamValidationError(name, str(e)) from None
+        except TypeError as e:
+            reason = f"参数值无法转换为 VRL 值 / Unsupported parameter value: {e}"
+            raise ParamValidationError(name, reason, str(e)) from None
+        return result.processed_event
+
+    def validate(self, model: str | LLMeta, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        验证并调整请求参数 / Validate and adjust request parameters
+
+        Args:
+            model: 模型名称或 LLMeta / Model name or LLMeta
+            params: 原始参数（不会被修改） / Original parameters (left untouched)
+
+        Returns:
+            dict[str, Any]: 调整后的参数 / Adjusted parameters
+
+        Raises:
+            ParamValidationError: 参数不合法 / Invalid parameters
+        """
+        self._refresh()
+        name, key, capabilities = resolve_cache_key(model)
+        return self._execute(name, self._program(key, capabilities), params)
+
+    def validate_many(
+        self,
+        model: str | LLMeta,
+        params_list: Sequence[dict[str, Any]],
+    ) -> list[dict[str, Any] | ParamValidationError]:
+        """
+        用同一模型批量验证请求参数 / Validate many request bodies for one model
+
+        模型只解析一次、程序只查找一次；单个请求失败不影响其他请求。
+        The model is resolved and its program looked up once; one failing request does not affect the others.
+
+        Args:
+            model: 模型名称或 LLMeta / Model name or LLMeta
+            params_list: 请求参数列表 / Request bodies
+
+        Returns:
+            list: 与输入对齐，成功为调整后的参数，失败为 ParamValidationError /
+                Aligned with the input: adjusted params on success, ParamValidationError on failure
+        """
+        return self.validate_mixed([(model, params) for params in params_list])
+
+    def validate_mixed(
+        self,
+        requests: Sequence[tuple[str | LLMeta, dict[str, Any]]],
+    ) -> list[dict[str, Any] | ParamValidationError]:
+        """
+        批量验证不同模型的请求参数 / Validate request bodies for mixed models
+
+        请求按解析后的模型身份与能力指纹分组，每组只解析、生成和查找一次程序，再逐个执行已编译的程序。
+        Requests are grouped by resolved model identity and capability fingerprint; each group resolves, builds
+        and looks up its program once, then runs the compiled program for every member.
+
+        Args:
+            requests: (模型, 请求参数) 列表 / (model, request body) pairs
+
+        Returns:
+            list: 与输入对齐，成功为调整后的参数，失败（包括无法转换的参数值）为 ParamValidationError /
+                Aligned with the input: adjusted params on success, ParamValidationError on failure
+                (unconvertible values included)
+        """
+        self._refresh()
+        # 格式: {(identity, fingerprint): (program source, [(position, name)])}
+        groups: dict[CacheKey, tuple[str, list[tuple[int, str]]]] = {}
+        for position, (model, _params) in enumerate(requests):
+            name, key, capabilities = resolve_cache_key(model)
+            group = groups.get(key)
+            if group is None:
+                group = (self._program(key, capabilities), [])
+                groups[key] = group
+            group[1].append((position, name))
+
+        results: list[dict[str, Any] | ParamValidationError] = [{} for _ in requests]
+        for source, members in groups.values():
+            for position, name in members:
+                try:
+                    results[position] = self._execute(name, source, requests[position][1])
+                except ParamValidationError as e:
+                    results[position] = e
+        return results
+
+    def clear(self) -> None:
+        """清空缓存的程序 / Clear cached programs"""
+        with self._lock:
+            self._programs = {}
+            self._runtime.clear_cache()
+
+
+# 默认验证器 / Default validator
+_DEFAULT_VALIDATOR = ParamValidator()
+
+
+def validate_params(model: str | LLMeta, params: dict[str, Any]) -> dict[str, Any]:
+    """
+    使用默认验证器验证并调整请求参数 / Validate and adjust request parameters with the default validator
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        params: 原始参数 / Original parameters
+
+    Returns:
+        dict[str, Any]: 调整后的参数 / Adjusted parameters
+
+    Raises:
+        ParamValidationError: 参数不合法 / Invalid parameters
+    """
+    return _DEFAULT_VALIDATOR.validate(model, params)
+
+
+def validate_params_many(
+    model: str | LLMeta,
+    params_list: Sequence[dict[str, Any]],
+) -> list[dict[str, Any] | ParamValidationError]:
+    """
+    使用默认验证器批量验证同一模型的请求参数 / Validate many request bodies for one model with the default validator
+
+    Args:
+        model: 模型名称或 LLMeta / Model name or LLMeta
+        params_list: 请求参数列表 / Request bodies
+
+    Returns:
+        list: 与输入对齐的结果或 ParamValidationError / Results or ParamValidationError aligned with the input
+    """
+    return _DEFAULT_VALIDATOR.validate_many(model, params_list)
+
+
+def validate_params_mixed(
+    requests: Sequence[tuple[str | LLMeta, dict[str, Any]]],
+) -> list[dict[str, Any] | ParamValidationError]:
+    """
+    使用默认验证器批量验证不同模型的请求参数 / Validate request bodies for mixed models with the default validator
+
+    Args:
+        requests: (模型, 请求参数) 列表 / (model, request body) pairs
+
+    Returns:
+        list: 与输入对齐的结果或 ParamValidationError / Results or ParamValidationError aligned with the input
+    """
+    return _DEFAULT_VALIDATOR.validate_mixed(requests)
+
+
+__all__ = [
+    "MAX_TOKENS_PARAMS",
+    "NUMERIC_PARAMS",
+    "UNSUPPORTED_PARAMS",
+    "CacheKey",
+    "ParamValidationError",
+    "ParamValidator",
+    "build_validation_program",
+    "capability_fingerprint",
+    "clear_validation_scripts",
+    "register_validation_script",
+    "resolve_cache_key",
+    "resolve_model",
+    "validate_params",
+    "validate_params_many",
+    "validate_params_mixed",
+]